@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Serveur local qui remplace API-Football, FlashScore et l'API Telegram pour les bancs et tests de charge.
+
+Les réponses sont rejouées depuis l'archive des runs (data/snapshots, cf.
+snapshot_archive) : une requête /fixtures?date=... reçoit le corps enregistré
+pour les mêmes endpoint + paramètres ; /fixtures?ids=a-b-c est recomposé à partir
+des réponses /fixtures?id=... enregistrées. Les requêtes jamais enregistrées
+reçoivent une réponse vide au format API-Football. La page FlashScore est servie
+sur /football/ (page archivée, ou --flashscore-file), avec ETag pour le GET
+conditionnel. Les envois Telegram (POST /bot<token>/sendMessage) sont acquittés
+sans rien envoyer.
+
+Dégradations injectables (reproductibles avec --seed) :
+- latence fixe + gigue (--latency-ms, --jitter-ms)
+- erreurs 500 (--error-rate)
+- limite par minute (--per-minute : 429 + en-têtes X-RateLimit-*)
+- quota journalier (--daily-quota : 200 avec errors.requests, comme l'API réelle)
+
+Pour y diriger le pipeline (main.py, auto_update_results.py, pre_match_alert.py) :
+    API_FOOTBALL_BASE_URL=http://127.0.0.1:8765
+    FLASHSCORE_URL=http://127.0.0.1:8765/football/
+    TELEGRAM_API_URL=http://127.0.0.1:8765/bot
+    API_FOOTBALL_KEY=standin
+
+GET /__stats renvoie les compteurs de requêtes (par endpoint, statuts injectés).
+
+Usage:
+    python benchmarks/api_standin.py [--port 8765] [--archive data/snapshots] [--date AAAA-MM-JJ]
+        [--latency-ms 80] [--jitter-ms 40] [--error-rate 0.02] [--per-minute 300] [--daily-quota 100]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from snapshot_archive import SnapshotArchive  # noqa: E402
+
+
+DEFAULT_PAGE = os.path.join(ROOT, 'benchmarks', 'fixtures', 'flashscore_headers.html')
+
+
+class StandinState:
+    """Données rejouées, réglages de dégradation et compteurs, partagés par les threads du serveur."""
+
+    def __init__(self, archive: SnapshotArchive, date=None, page: bytes = b'', latency_ms=0.0, jitter_ms=0.0,
+                 error_rate=0.0, per_minute=0, daily_quota=0, seed=0):
+        self.archive = archive
+        self.date = date
+        self.page = page
+        self.page_etag = '"' + hashlib.sha1(page).hexdigest()[:16] + '"'
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.per_minute = per_minute
+        self.daily_quota = daily_quota
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.window = deque()
+        self.served = 0
+        self.counts = Counter()
+
+    def delay(self) -> float:
+        with self.lock:
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def admit(self):
+        """
+        Décide du sort d'une requête API.
+
+        Returns:
+            (statut injecté ou None, en-têtes de limite)
+        """
+        with self.lock:
+            now = time.monotonic()
+            while self.window and now - self.window[0] > 60:
+                self.window.popleft()
+            headers = {}
+            if self.per_minute:
+                headers['X-RateLimit-Limit'] = str(self.per_minute)
+                headers['X-RateLimit-Remaining'] = str(max(0, self.per_minute - len(self.window) - 1))
+            if self.daily_quota:
+                headers['x-ratelimit-requests-limit'] = str(self.daily_quota)
+                headers['x-ratelimit-requests-remaining'] = str(max(0, self.daily_quota - self.served - 1))
+
+            if self.per_minute and len(self.window) >= self.per_minute:
+                return 429, headers
+            if self.daily_quota and self.served >= self.daily_quota:
+                return 'quota', headers
+            if self.error_rate and self.rng.random() < self.error_rate:
+                return 500, headers
+            self.window.append(now)
+            self.served += 1
+            return None, headers
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    state: StandinState = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass  # Journal par requête trop bavard pour un banc
+
+    def _send(self, status, body: bytes, content_type='application/json', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status, payload, headers=None):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode('utf-8'), headers=headers)
+
+    def do_GET(self):
+        state = self.state
+        url = urlsplit(self.path)
+        endpoint = url.path.strip('/')
+        params = dict(parse_qsl(url.query))
+
+        if endpoint == '__stats':
+            with state.lock:
+                return self._json(200, {'served': state.served, 'counts': dict(state.counts)})
+
+        time.sleep(state.delay())
+
+        if endpoint == 'football':
+            with state.lock:
+                state.counts['flashscore'] += 1
+            if self.headers.get('If-None-Match') == state.page_etag:
+                return self._send(304, b'', headers={'ETag': state.page_etag})
+            return self._send(200, state.page, 'text/html; charset=utf-8', {'ETag': state.page_etag})
+
+        injected, headers = state.admit()
+        with state.lock:
+            state.counts[endpoint] += 1
+            if injected:
+                state.counts[f"injected_{injected}"] += 1
+
+        if injected == 429:
+            return self._json(429, {'message': 'Too many requests'}, headers)
+        if injected == 500:
+            return self._json(500, {'message': 'Internal Server Error'}, headers)
+        if injected == 'quota':
+            return self._json(200, {'get': endpoint, 'parameters': params, 'response': [], 'results': 0,
+                                    'errors': {'requests': 'You have reached the request limit for the day'}}, headers)
+
+        with state.lock:
+            data = state.archive.lookup(endpoint, params, state.date)
+            if data is None and endpoint == 'fixtures' and 'ids' in params:
+                data = self._compose_ids(params)
+        if data is None:
+            with state.lock:
+                state.counts['not_recorded'] += 1
+            data = {'get': endpoint, 'parameters': params, 'errors': [], 'results': 0,
+                    'paging': {'current': 1, 'total': 1}, 'response': []}
+        self._json(200, data, headers)
+
+    def _compose_ids(self, params):
+        """Réponse /fixtures?ids= recomposée à partir des /fixtures?id= enregistrés."""
+        response = []
+        for fixture_id in params['ids'].split('-'):
+            data = self.state.archive.lookup('fixtures', {'id': fixture_id}, self.state.date)
+            response.extend((data or {}).get('response', []))
+        return {'get': 'fixtures', 'parameters': params, 'errors': [], 'results': len(response),
+                'paging': {'current': 1, 'total': 1}, 'response': response}
+
+    def do_POST(self):
+        state = self.state
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        if not (self.path.startswith('/bot') and self.path.endswith('/sendMessage')):
+            return self._json(404, {'ok': False, 'description': 'Not Found'})
+
+        time.sleep(state.delay())
+        with state.lock:
+            state.counts['telegram'] += 1
+            message_id = state.counts['telegram']
+        try:
+            chat_id = json.loads(body).get('chat_id', 1)
+        except ValueError:
+            chat_id = dict(parse_qsl(body.decode('utf-8', 'replace'))).get('chat_id', 1)
+        self._json(200, {'ok': True, 'result': {
+            'message_id': message_id, 'date': int(time.time()), 'text': '',
+            'chat': {'id': int(chat_id) if str(chat_id).lstrip('-').isdigit() else 1, 'type': 'private'},
+        }})
+
+
+def serve(state: StandinState, host='127.0.0.1', port=8765) -> ThreadingHTTPServer:
+    """Démarre le serveur dans un thread (utilisé par les bancs) ; shutdown() pour l'arrêter."""
+    handler = type('BoundStandinHandler', (StandinHandler,), {'state': state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def load_page(archive: SnapshotArchive, date, path) -> bytes:
+    """Page FlashScore : fichier explicite, sinon page archivée, sinon page de test."""
+    if path:
+        with open(path, 'rb') as f:
+            return f.read()
+    page = archive.lookup_page('flashscore', date)
+    if page is not None:
+        return page
+    with open(DEFAULT_PAGE, 'rb') as f:
+        return f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur local de rejeu API-Football / FlashScore")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--archive', default=os.path.join(ROOT, 'data', 'snapshots'), help="Racine de l'archive")
+    parser.add_argument('--date', default=None, help="Partition à rejouer (défaut : toutes, la plus récente l'emporte)")
+    parser.add_argument('--flashscore-file', default=None, help="Page FlashScore à servir")
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Part des requêtes en 500")
+    parser.add_argument('--per-minute', type=int, default=0, help="Limite par minute (429 au-delà), 0 = aucune")
+    parser.add_argument('--daily-quota', type=int, default=0, help="Quota de requêtes du run, 0 = illimité")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    archive = SnapshotArchive(args.archive)
+    state = StandinState(
+        archive, args.date, load_page(archive, args.date, args.flashscore_file),
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        per_minute=args.per_minute, daily_quota=args.daily_quota, seed=args.seed,
+    )
+    server = serve(state, args.host, args.port)
+    print(f"🧪 Stand-in API-Football/FlashScore sur http://{args.host}:{args.port} "
+          f"({len(archive.dates())} partition(s) dans {args.archive})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n📊 {json.dumps(dict(state.counts), ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
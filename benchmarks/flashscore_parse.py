@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Banc : ancien parseur FlashScore (BeautifulSoup + find_all/find) vs parseur en
+flux (flashscore_parser.parse_event_rows, lxml iterparse).
+
+Mesures sur les pages HTML enregistrées dans benchmarks/fixtures/flashscore_*.html
+(et la copie locale data/cache/flashscore/*.body si présente) :
+temps de parsing, lignes extraites et concordance des deux parseurs.
+
+Les pages de test sont générées de façon déterministe par --write-fixtures :
+- flashscore_rows.html   : compétition dans chaque ligne (structure lue par l'ancien parseur)
+- flashscore_headers.html: compétition dans un en-tête par ligue (structure réelle du site)
+
+Usage:
+    python benchmarks/flashscore_parse.py [--runs 20] [--json] [--write-fixtures]
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from flashscore_parser import parse_event_rows  # noqa: E402
+
+
+FIXTURES_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures')
+
+LEAGUES = [
+    ('ENGLAND', 'Premier League'), ('SPAIN', 'LaLiga'), ('ITALY', 'Serie A'), ('GERMANY', 'Bundesliga'),
+    ('FRANCE', 'Ligue 1'), ('BELGIUM', 'Jupiler Pro League'), ('EUROPE', 'Champions League'),
+    ('NETHERLANDS', 'Eredivisie'), ('PORTUGAL', 'Liga Portugal'), ('BRAZIL', 'Serie A Betano'),
+    ('ARGENTINA', 'Liga Profesional'), ('USA', 'MLS'), ('JAPAN', 'J1 League'), ('TURKEY', 'Super Lig'),
+]
+
+
+def legacy_parse(content):
+    """Ancien parseur de MatchScraper._scrape_flashscore (référence)."""
+    soup = BeautifulSoup(content, 'lxml')
+    matches = []
+    for match_div in soup.find_all('div', class_='event__match'):
+        try:
+            home = match_div.find('div', class_='event__participant--home').text.strip()
+            away = match_div.find('div', class_='event__participant--away').text.strip()
+            competition = match_div.find('span', class_='event__title').text.strip()
+            time_text = match_div.find('div', class_='event__time').text.strip()
+            matches.append({'home': home, 'away': away, 'competition': competition, 'time': time_text})
+        except Exception:
+            continue
+    return matches
+
+
+def build_page(title_in_row, rows_per_league=20, seed=7):
+    """Page de test au balisage FlashScore, avec le bruit habituel (scripts, styles, cotes, icônes)."""
+    rng = random.Random(seed)
+    parts = ["<!DOCTYPE html><html><head><title>Football</title>"]
+    parts += [f"<script>window.__cfg{i} = {{'a': {i}, 'b': '{'x' * 400}'}};</script>" for i in range(40)]
+    parts.append("<style>" + ".c{color:red}" * 2000 + "</style></head><body><div id='live-table'><div class='sportName soccer'>")
+    number = 0
+    for country, name in LEAGUES:
+        if not title_in_row:
+            parts.append(
+                "<div class='event__header'><div class='event__titleBox'>"
+                f"<span class='event__title--type'>{country}</span><span class='event__title--name'>{name}</span>"
+                "</div><div class='event__info'>Standings</div></div>"
+            )
+        for _ in range(rows_per_league):
+            number += 1
+            title = f"<span class='event__title'>{country}: {name}</span>" if title_in_row else ""
+            kickoff = f"{rng.randint(12, 22)}:{rng.choice(['00', '15', '30', '45'])}"
+            parts.append(
+                f"<div id='g_1_{number:06d}' class='event__match event__match--scheduled event__match--twoLine' title='Click for match detail!'>"
+                f"<a class='eventRowLink' href='/match/{number}/'></a>{title}"
+                f"<div class='event__check'></div><div class='event__time'>{kickoff}</div>"
+                f"<div class='event__participant event__participant--home'><img class='wcl-logo' src='/res/{number}h.png'/>Team {number}A</div>"
+                f"<div class='event__participant event__participant--away'><img class='wcl-logo' src='/res/{number}a.png'/>Team {number}B</div>"
+                f"<div class='event__score event__score--home'>-</div><div class='event__score event__score--away'>-</div>"
+                + "".join(f"<div class='odds__odd event__odd--odd{k}'><span>{rng.uniform(1.2, 9):.2f}</span></div>" for k in range(1, 4))
+                + "<svg class='event__icon'><use href='#icon-tv'></use></svg></div>"
+            )
+    parts.append("</div></div><footer>" + "<a href='#'>lien</a>" * 500 + "</footer></body></html>")
+    return "".join(parts).encode('utf-8')
+
+
+def write_fixtures():
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for name, title_in_row in (('flashscore_rows.html', True), ('flashscore_headers.html', False)):
+        with open(os.path.join(FIXTURES_DIR, name), 'wb') as f:
+            f.write(build_page(title_in_row))
+        print(f"✅ {name} écrit")
+
+
+def _time(parse, content, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        rows = parse(content)
+    return rows, (time.perf_counter() - start) / runs * 1000
+
+
+def run(runs):
+    paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, 'flashscore_*.html')))
+    paths += sorted(glob.glob(os.path.join(ROOT, 'data', 'cache', 'flashscore', '*.body')))
+    report = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            content = f.read()
+        legacy_rows, legacy_ms = _time(legacy_parse, content, runs)
+        fast_rows, fast_ms = _time(parse_event_rows, content, runs)
+        report.append({
+            'file': os.path.basename(path),
+            'kb': round(len(content) / 1024),
+            'legacy_rows': len(legacy_rows),
+            'fast_rows': len(fast_rows),
+            # Sur les lignes que l'ancien parseur sait lire, les deux doivent concorder
+            'agree': not legacy_rows or legacy_rows == fast_rows,
+            'legacy_ms': round(legacy_ms, 2),
+            'fast_ms': round(fast_ms, 2),
+            'speedup': round(legacy_ms / fast_ms, 1) if fast_ms else 0.0,
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ancien parseur FlashScore vs parseur en flux")
+    parser.add_argument('--runs', type=int, default=20, help="Répétitions par page")
+    parser.add_argument('--json', action='store_true', help="Sortie JSON")
+    parser.add_argument('--write-fixtures', action='store_true', help="(Re)génère les pages de test")
+    args = parser.parse_args()
+
+    if args.write_fixtures:
+        write_fixtures()
+
+    report = run(args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"{'page':<28}{'Ko':>6}{'lignes anc.':>13}{'lignes flux':>13}{'ancien':>11}{'flux':>10}{'gain':>7}  concordance")
+    for row in report:
+        print(f"{row['file']:<28}{row['kb']:>6}{row['legacy_rows']:>13}{row['fast_rows']:>13}"
+              f"{row['legacy_ms']:>9.2f}ms{row['fast_ms']:>8.2f}ms{row['speedup']:>6}x  {'oui' if row['agree'] else 'NON'}")
+
+
+if __name__ == "__main__":
+    main()
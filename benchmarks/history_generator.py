@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Générateur d'historique synthétique (plusieurs saisons) pour les tests de volume.
+
+Produit, dans un répertoire de données (par défaut un répertoire temporaire,
+jamais data/ sans --out explicite), des fichiers au format exact du pipeline :
+- predictions/AAAA-MM-JJ.json  : analyses du jour (valides pour response_schema.validate_analysis)
+- performance_history.json     : résultats par prediction_id « date_index » (win/loss, pending récents)
+- error_analysis.json          : analyses post-match d'une partie des pronostics perdus
+- learnings.json               : apprentissages agrégés comme PostMatchAnalyzer._update_learnings
+
+Volume, période, mélange de compétitions et taux de réussite sont réglables ;
+les scores réels sont cohérents avec le résultat du pari (un Over 2.5 gagné a
+au moins 3 buts). Même graine → mêmes fichiers.
+
+Usage:
+    python benchmarks/history_generator.py --predictions 100000 [--years 3] [--out /tmp/history]
+        [--win-rate 0.55] [--leagues "Ligue 1=3,Premier League=2,UEFA Champions League=1"]
+        [--analyzed-rate 0.9] [--pending-days 1] [--detailed] [--seed 0] [--validate]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from response_schema import ERROR_CATEGORIES  # noqa: E402
+
+TEAMS = {
+    'Premier League': ['Arsenal', 'Liverpool', 'Manchester City', 'Chelsea', 'Tottenham', 'Aston Villa',
+                       'Newcastle', 'Brighton', 'Bournemouth', 'Everton'],
+    'La Liga': ['Real Madrid', 'Barcelona', 'Atletico Madrid', 'Real Sociedad', 'Athletic Club', 'Real Betis',
+                'Valencia', 'Villarreal', 'Sevilla', 'Getafe'],
+    'Serie A': ['Inter', 'AC Milan', 'Juventus', 'Napoli', 'AS Roma', 'Lazio', 'Atalanta', 'Bologna',
+                'Fiorentina', 'Torino'],
+    'Bundesliga': ['Bayern München', 'Borussia Dortmund', 'RB Leipzig', 'Bayer Leverkusen', 'VfB Stuttgart',
+                   'Eintracht Frankfurt', 'SC Freiburg', 'Werder Bremen', 'VfL Wolfsburg', 'FC Augsburg'],
+    'Ligue 1': ['Paris Saint Germain', 'Marseille', 'Monaco', 'Lille', 'Lyon', 'Nice', 'Lens', 'Rennes',
+                'Nantes', 'Paris FC'],
+    'Jupiler Pro League': ['Club Brugge KV', 'Anderlecht', 'Union St. Gilloise', 'Genk', 'Gent', 'Antwerp',
+                           'Standard Liege', 'Zulte Waregem', 'Westerlo', 'Mechelen'],
+}
+# Coupes européennes : équipes tirées de tous les championnats
+CUPS = ['UEFA Champions League', 'UEFA Europa League', 'UEFA Europa Conference League']
+
+# Répartition observée dans data/predictions
+DEFAULT_LEAGUES = {
+    'Bundesliga': 12, 'Serie A': 11, 'La Liga': 10, 'UEFA Europa League': 10, 'Ligue 1': 9,
+    'Premier League': 7, 'Jupiler Pro League': 6, 'UEFA Europa Conference League': 5, 'UEFA Champions League': 5,
+}
+
+# (type de pari, libellé du choix, marché évalué, fourchette de cotes, poids)
+BETS = [
+    ('1X2', '1 (Victoire {home})', 'home', (1.35, 2.6), 40),
+    ('1X2', '2 (Victoire {away})', 'away', (1.5, 3.2), 20),
+    ('Over/Under', 'Over 2.5 buts', 'over25', (1.5, 2.2), 12),
+    ('BTTS', 'Both Teams To Score - Oui', 'btts', (1.55, 2.1), 10),
+    ('Double Chance', '1X (Nul ou Victoire {home})', 'home_or_draw', (1.15, 1.6), 10),
+    ('Handicap (-1.5)', "1 (Victoire {home} avec au moins 2 buts d'écart)", 'home_by_2', (2.0, 3.5), 8),
+]
+KICKOFFS = ['13:30', '15:00', '16:15', '17:00', '18:30', '18:45', '19:00', '20:00', '20:45', '21:00']
+
+FACTORS = [
+    "Forme domicile solide sur les 5 derniers matchs",
+    "Absences importantes en défense chez l'adversaire",
+    "Confrontations directes favorables",
+    "Enjeu fort au classement",
+    "Fatigue liée au match européen en semaine",
+    "Attaque prolifique face à une défense perméable",
+]
+CONCLUSIONS = {
+    'absence_joueur': "Vérifier la liste des absents confirmés la veille avant de retenir le favori.",
+    'forme_recente': "Pondérer davantage les 3 derniers matchs que la moyenne de la saison.",
+    'contexte_match': "Intégrer l'enjeu réel du match (rotation, qualification acquise) avant de miser.",
+    'statistiques_trompeuses': "Croiser les moyennes de buts avec les xG avant un pari Over/BTTS.",
+    'surestimation_favori': "Éviter la victoire sèche d'un favori à l'extérieur sous 1.60 sans marge de forme nette.",
+    'sous_estimation_outsider': "Vérifier le bilan à domicile de l'outsider avant de parier contre lui.",
+    'autre': "Réduire la mise sur les matchs à forte incertitude.",
+}
+
+
+# ───────────────────────── Tirages ─────────────────────────
+
+def parse_leagues(spec: Optional[str]) -> Dict[str, float]:
+    """'Ligue 1=3,Premier League=2' → {'Ligue 1': 3.0, 'Premier League': 2.0} (défaut : DEFAULT_LEAGUES)."""
+    if not spec:
+        return dict(DEFAULT_LEAGUES)
+    leagues = {}
+    for item in spec.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in TEAMS and name not in CUPS:
+            raise ValueError(f"Compétition inconnue '{name}' (connues : {', '.join(list(TEAMS) + CUPS)})")
+        leagues[name] = float(weight or 1)
+    return leagues
+
+
+def _teams(rng: random.Random, competition: str):
+    if competition in TEAMS:
+        return rng.sample(TEAMS[competition], 2)
+    first, second = rng.sample(list(TEAMS), 2)
+    return rng.choice(TEAMS[first]), rng.choice(TEAMS[second])
+
+
+def _bet_won(market: str, home: int, away: int) -> bool:
+    return {
+        'home': home > away,
+        'away': away > home,
+        'over25': home + away >= 3,
+        'btts': home > 0 and away > 0,
+        'home_or_draw': home >= away,
+        'home_by_2': home - away >= 2,
+    }[market]
+
+
+def _score(rng: random.Random, market: str, won: bool) -> str:
+    """Score réel cohérent avec l'issue du pari."""
+    while True:
+        home, away = min(rng.randint(0, 3) + rng.randint(0, 2), 6), rng.randint(0, 3)
+        if _bet_won(market, home, away) == won:
+            return f"{home}-{away}"
+
+
+def _risk_level(confidence: float) -> str:
+    if confidence >= 80:
+        return 'Low'
+    if confidence >= 70:
+        return 'Low-Medium'
+    if confidence >= 62:
+        return 'Medium'
+    return 'Medium-High'
+
+
+def _detailed_analysis(rng: random.Random, home: str, away: str, odds: float, confidence: float,
+                       detailed: bool) -> Dict:
+    analysis = {
+        'odds_value': {
+            'bet_odds': odds,
+            'implied_probability': f"{100 / odds:.0f}%",
+            'estimated_real_probability': f"{confidence:.0f}%",
+            'value_analysis': "Value positive" if confidence > 100 / odds else "Value limite",
+        },
+        'key_factors_summary': rng.sample(FACTORS, 3),
+    }
+    if detailed:
+        # Taille proche des analyses réelles (~4 Ko par pronostic)
+        analysis.update({
+            'recent_form': {
+                'home_team': {'last_5_matches': "3V-1N-1D, 9 buts pour, 5 contre", 'trend': "Forme solide",
+                              'details': f"Derniers résultats de {home} : [V] 2-0, [V] 3-1, [N] 1-1, [D] 0-1, [V] 2-1"},
+                'away_team': {'last_5_matches': "1V-2N-2D, 5 buts pour, 8 contre", 'trend': "Forme irrégulière",
+                              'details': f"Derniers résultats de {away} : [D] 0-2, [N] 1-1, [V] 2-1, [N] 0-0, [D] 1-3"},
+            },
+            'head_to_head': {'last_5': f"3V {home}, 1N, 1V {away}",
+                             'trends': "Avantage historique à l'équipe qui reçoit"},
+            'injuries_suspensions': {
+                'home_team': {'absent': [], 'impact': "Effectif au complet"},
+                'away_team': {'absent': ["Défenseur central (blessure)", "Milieu (suspendu)"],
+                              'impact': "Impact modéré sur l'axe défensif"},
+            },
+            'tactical_analysis': {'home_style': "4-3-3, pressing haut", 'away_style': "5-3-2, bloc bas",
+                                  'key_matchup': "Ailiers domicile contre pistons extérieurs",
+                                  'predicted_approach': f"{home} aura le ballon, {away} jouera en contre"},
+            'schedule_fatigue': {'home_team': "6 jours de repos", 'away_team': "3 jours de repos",
+                                 'advantage': f"Léger avantage {home}"},
+            'context_stakes': {'home_situation': "Course à l'Europe", 'away_situation': "Maintien",
+                               'psychological': "Pression sur l'équipe visiteuse", 'overall': "Enjeu fort"},
+        })
+    return analysis
+
+
+def _day_file(rng: random.Random, date: str, count: int, leagues: List[str], weights: List[float],
+              win_rate: float, pending: bool, detailed: bool):
+    """
+    Analyse d'une journée et résultats de ses pronostics.
+
+    Returns:
+        (contenu du fichier, [(prediction_id, recommandation, marché, résultat, score)])
+    """
+    recommendations, outcomes = [], []
+    for index in range(count):
+        competition = rng.choices(leagues, weights)[0]
+        home, away = _teams(rng, competition)
+        bet_type, label, market, (low, high), _ = rng.choices(BETS, [bet[4] for bet in BETS])[0]
+        odds = round(rng.uniform(low, high), 2)
+        confidence = round(min(92, max(55, rng.gauss(70, 7))))
+        recommendations.append({
+            'match': f"{home} vs {away}",
+            'competition': competition,
+            'kickoff': rng.choice(KICKOFFS),
+            'detailed_analysis': _detailed_analysis(rng, home, away, odds, confidence, detailed),
+            'conclusion': f"{label.format(home=home, away=away)} : {rng.choice(FACTORS).lower()}.",
+            'bet_type': bet_type,
+            'prediction': label.format(home=home, away=away),
+            'odds': odds,
+            'confidence': confidence,
+            'risk_level': _risk_level(confidence),
+        })
+        if pending:
+            outcomes.append((f"{date}_{index}", recommendations[-1], market, 'pending', None))
+            continue
+        # La confiance module le taux de réussite autour de la moyenne demandée
+        won = rng.random() < min(0.97, max(0.03, win_rate + (confidence - 70) / 200))
+        outcomes.append((f"{date}_{index}", recommendations[-1], market, 'win' if won else 'loss',
+                         _score(rng, market, won)))
+
+    excluded = rng.randint(0, 3 * count + 2)
+    data = {
+        'analysis_date': date,
+        'total_analyzed': count + excluded,
+        'total_retained': count,
+        'recommendations': recommendations,
+        'matches_excluded': {'count': excluded, 'examples': [
+            {'match': ' vs '.join(_teams(rng, rng.choice(list(TEAMS)))), 'reason': "Données insuffisantes"}
+        ] if excluded else []},
+    }
+    if count >= 2:
+        picks = recommendations[:2]
+        data['combined_bet'] = {
+            'matches': [pick['match'] for pick in picks],
+            'total_odds': round(picks[0]['odds'] * picks[1]['odds'], 2),
+            'confidence': round(min(pick['confidence'] for pick in picks) * 0.8),
+            'reasoning': "Combiné des deux pronostics les plus sûrs",
+            'risk_level': 'Medium',
+        }
+    return data, outcomes
+
+
+def _error_analysis(rng: random.Random, prediction_id: str, rec: Dict, score: str, analysis_date: str) -> Dict:
+    category = rng.choice(ERROR_CATEGORIES)
+    home, away = rec['match'].split(' vs ', 1)
+    return {
+        'main_cause': f"Pronostic {rec['prediction']} contredit par le score {score}.",
+        'missed_factors': rng.sample(FACTORS, 2),
+        'actionable_conclusion': CONCLUSIONS[category],
+        'error_category': category,
+        'match_id': prediction_id,
+        'match': {'home_team': home, 'away_team': away, 'league': rec['competition'], 'date': rec['kickoff']},
+        'bet_type': rec['bet_type'],
+        'bet_choice': rec['prediction'],
+        'final_score': score,
+        'analysis_date': analysis_date,
+    }
+
+
+def _learnings(analyses: List[Dict]) -> Dict:
+    """Même agrégat que PostMatchAnalyzer._update_learnings appliqué à tout l'historique."""
+    categories: Dict[str, Dict] = {}
+    for analysis in analyses:
+        entry = categories.setdefault(analysis['error_category'], {'count': 0, 'examples': []})
+        entry['count'] += 1
+        entry['examples'] = (entry['examples'] + [{
+            'match': f"{analysis['match']['home_team']} vs {analysis['match']['away_team']}",
+            'conclusion': analysis['actionable_conclusion'],
+        }])[-5:]
+    return {
+        'last_updated': analyses[-1]['analysis_date'] if analyses else datetime.now().isoformat(),
+        'total_errors_analyzed': len(analyses),
+        'categories': categories,
+        'key_learnings': [{'date': analysis['analysis_date'], 'category': analysis['error_category'],
+                           'conclusion': analysis['actionable_conclusion']} for analysis in analyses[-20:]],
+    }
+
+
+# ───────────────────────── Génération ─────────────────────────
+
+def generate_history(data_dir: str, predictions: int = 10000, years: float = 3, end: Optional[datetime] = None,
+                     win_rate: float = 0.55, leagues: Optional[Dict[str, float]] = None,
+                     analyzed_rate: float = 0.9, pending_days: int = 1, detailed: bool = False,
+                     seed: int = 0, validate: bool = False) -> Dict:
+    """
+    Écrit un historique synthétique complet dans data_dir.
+
+    Args:
+        data_dir: Répertoire de données cible (équivalent de data/)
+        predictions: Nombre total de pronostics
+        years: Profondeur de l'historique (jusqu'à `end`, défaut : aujourd'hui)
+        win_rate: Taux de réussite moyen des pronostics terminés
+        leagues: Poids par compétition (défaut : répartition observée)
+        analyzed_rate: Part des pronostics perdus ayant une analyse post-match
+        pending_days: Derniers jours dont les pronostics sont encore 'pending'
+        detailed: Analyses détaillées complètes (~4 Ko par pronostic, comme en production)
+        seed: Graine des tirages
+        validate: Vérifie chaque fichier avec response_schema.validate_analysis
+
+    Returns:
+        Compteurs et chemins produits
+    """
+    rng = random.Random(seed)
+    leagues = leagues or dict(DEFAULT_LEAGUES)
+    names, weights = list(leagues), list(leagues.values())
+    end = (end or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    days = max(1, int(years * 365))
+
+    # Répartition aléatoire des pronostics sur les jours (certains jours sans pronostic)
+    per_day = Counter(rng.randrange(days) for _ in range(predictions))
+
+    predictions_dir = os.path.join(data_dir, 'predictions')
+    os.makedirs(predictions_dir, exist_ok=True)
+    if validate:
+        from response_schema import validate_analysis
+
+    history, analyses = [], []
+    results = Counter()
+    for offset in sorted(per_day):
+        day = end - timedelta(days=days - 1 - offset)
+        date = day.strftime('%Y-%m-%d')
+        pending = offset >= days - pending_days
+        data, outcomes = _day_file(rng, date, per_day[offset], names, weights, win_rate, pending, detailed)
+
+        recorded_at = (day + timedelta(hours=23, minutes=rng.randint(0, 59))).isoformat()
+        for prediction_id, rec, market, result, score in outcomes:
+            results[result] += 1
+            history.append({'prediction_id': prediction_id, 'result': result, 'actual_score': score,
+                            'recorded_at': recorded_at, 'updated_at': recorded_at})
+            if result == 'loss' and rng.random() < analyzed_rate:
+                rec['analyzed'] = True
+                analysis_date = (day + timedelta(days=1, hours=11, minutes=rng.randint(0, 59))).isoformat()
+                analyses.append(_error_analysis(rng, prediction_id, rec, score, analysis_date))
+
+        if validate:
+            validate_analysis(data)
+        with open(os.path.join(predictions_dir, f"{date}.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    files = {
+        'performance_history': (os.path.join(data_dir, 'performance_history.json'), history),
+        'error_analysis': (os.path.join(data_dir, 'error_analysis.json'), analyses),
+        'learnings': (os.path.join(data_dir, 'learnings.json'), _learnings(analyses)),
+    }
+    for path, content in files.values():
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(content, f, indent=2, ensure_ascii=False)
+
+    return {
+        'data_dir': data_dir,
+        'predictions': predictions,
+        'days': len(per_day),
+        'first_date': (end - timedelta(days=days - 1 - min(per_day))).strftime('%Y-%m-%d') if per_day else None,
+        'results': dict(results),
+        'error_analyses': len(analyses),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Générateur d'historique synthétique pour les tests de volume")
+    parser.add_argument('--predictions', type=int, default=10000, help="Nombre total de pronostics")
+    parser.add_argument('--years', type=float, default=3, help="Profondeur de l'historique (années)")
+    parser.add_argument('--out', default=None, help="Répertoire de données cible (défaut : répertoire temporaire)")
+    parser.add_argument('--win-rate', type=float, default=0.55, help="Taux de réussite moyen (0-1)")
+    parser.add_argument('--leagues', default=None, help="Poids par compétition : 'Ligue 1=3,Serie A=1'")
+    parser.add_argument('--analyzed-rate', type=float, default=0.9, help="Part des pertes analysées post-match")
+    parser.add_argument('--pending-days', type=int, default=1, help="Derniers jours encore en attente")
+    parser.add_argument('--detailed', action='store_true', help="Analyses détaillées complètes (fichiers plus gros)")
+    parser.add_argument('--validate', action='store_true', help="Valide chaque fichier avec le schéma d'analyse")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    out = args.out or tempfile.mkdtemp(prefix='history-')
+    if os.path.abspath(out) == os.path.join(ROOT, 'data'):
+        sys.exit("❌ Refus d'écrire dans data/ : choisir un autre répertoire")
+
+    start = time.perf_counter()
+    summary = generate_history(
+        out, args.predictions, args.years, win_rate=args.win_rate, leagues=parse_leagues(args.leagues),
+        analyzed_rate=args.analyzed_rate, pending_days=args.pending_days, detailed=args.detailed,
+        seed=args.seed, validate=args.validate,
+    )
+    print(f"✅ {summary['predictions']} pronostics sur {summary['days']} jours "
+          f"(depuis {summary['first_date']}) en {time.perf_counter() - start:.1f}s")
+    print(f"   📊 {json.dumps(summary['results'])} | {summary['error_analyses']} analyses d'erreurs")
+    print(f"   📁 {out}")
+
+
+if __name__ == "__main__":
+    main()
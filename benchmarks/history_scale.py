@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Micro-bancs de volume des chemins de données sur un historique synthétique.
+
+Pour chaque taille (10k, 100k, 1M pronostics par défaut), un historique de
+plusieurs saisons est généré par benchmarks/history_generator.py dans un
+répertoire temporaire, puis chaque chemin de lecture/écriture tourne dans un
+sous-processus (mémoire propre) dont c'est le répertoire de travail :
+
+- tracker.*          : PerformanceTracker (get_all_predictions, calculate_statistics,
+                       get_statistics_by_type/competition, *_from_list, record_result)
+- dashboard.*        : chargement de l'onglet Performance (filtre des 30 derniers
+                       jours + stats) et de l'onglet Analyses d'erreurs
+- weekly.*           : WeeklyReportGenerator (pronostics de la semaine, stats)
+- post_match         : PostMatchAnalyzer.analyze_lost_predictions sur le dernier
+                       fichier terminé, l'appel LLM remplacé par une analyse fixe
+                       (seul le chemin de données est mesuré)
+- learning.register  : enregistrement en 'pending' des pronostics du jour
+
+Mesures : temps écoulé et pic RSS à la fin de chaque étape. Le tableau final
+donne, entre les deux plus grandes tailles, l'exposant de croissance
+(1 = linéaire) : les étapes au-delà de 1.2, ou qui devraient être constantes
+(record_result, register) et croissent, sont celles qui ne passent pas l'échelle.
+
+Usage:
+    python benchmarks/history_scale.py [--sizes 10000,100000,1000000] [--years 3] [--out history_scale.json]
+        [--detailed] [--keep]
+"""
+
+import argparse
+import json
+import math
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+DEFAULT_SIZES = (10000, 100000, 1000000)
+STAGES = (
+    'tracker.get_all_predictions', 'tracker.calculate_statistics', 'tracker.by_type', 'tracker.by_competition',
+    'tracker.from_list', 'tracker.record_result', 'dashboard.performance', 'dashboard.errors',
+    'weekly.load', 'weekly.stats', 'post_match', 'learning.register',
+)
+# Exposant de croissance au-delà duquel une étape est signalée
+SUPERLINEAR = 1.2
+
+
+def _rss_mb():
+    # ru_maxrss : kilo-octets sous Linux, octets sous macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _disk_mb(path):
+    total = sum(os.path.getsize(os.path.join(directory, name))
+                for directory, _, names in os.walk(path) for name in names)
+    return round(total / 1024 / 1024, 1)
+
+
+# ───────────────────────── Mesures (sous-processus) ─────────────────────────
+
+def run_size(workdir, args):
+    """Exécute les chemins de données sur l'historique de workdir/data ; renvoie les mesures."""
+    os.environ.update({'ANTHROPIC_API_KEY': 'bench', 'GEMINI_API_KEY': '', 'RUN_REPORTS': 'false'})
+    os.chdir(workdir)
+
+    from learning_engine import LearningEngine
+    from performance_tracker import PerformanceTracker
+    from post_match_analyzer import PostMatchAnalyzer
+
+    stages = {}
+    state = {}
+
+    def stage(name, step):
+        start = time.perf_counter()
+        try:
+            state[name] = step()
+            stages[name] = {'ms': round((time.perf_counter() - start) * 1000, 1), 'peak_rss_mb': _rss_mb()}
+        except ImportError as e:
+            # Dépendance optionnelle absente (ex: python-telegram-bot) : étape non mesurée
+            stages[name] = {'skipped': str(e)}
+        except Exception as e:
+            print(f"❌ Étape {name}: {type(e).__name__}: {e}")
+            stages[name] = {'error': f"{type(e).__name__}: {e}"}
+        return state.get(name)
+
+    tracker = PerformanceTracker()
+    predictions = stage('tracker.get_all_predictions', tracker.get_all_predictions) or []
+    stage('tracker.calculate_statistics', tracker.calculate_statistics)
+    stage('tracker.by_type', tracker.get_statistics_by_type)
+    stage('tracker.by_competition', tracker.get_statistics_by_competition)
+    stage('tracker.from_list', lambda: (tracker.calculate_statistics_from_list(predictions),
+                                        tracker.get_statistics_by_type_from_list(predictions),
+                                        tracker.get_statistics_by_competition_from_list(predictions)))
+
+    def dashboard_performance():
+        # Même enchaînement que l'onglet Performance de dashboard.py (période par défaut : 30 jours)
+        all_predictions = tracker.get_all_predictions()
+        start_date, end_date = (datetime.now() - timedelta(days=30)).date(), datetime.now().date()
+        selected = [p for p in all_predictions
+                    if start_date <= datetime.strptime(p['date'], '%Y-%m-%d').date() <= end_date]
+        return (tracker.calculate_statistics_from_list(selected), tracker.get_statistics_by_type_from_list(selected),
+                tracker.get_statistics_by_competition_from_list(selected))
+
+    def dashboard_errors():
+        with open('data/error_analysis.json', 'r', encoding='utf-8') as f:
+            error_analyses = json.load(f)
+        with open('data/learnings.json', 'r', encoding='utf-8') as f:
+            learnings = json.load(f)
+        return len(error_analyses), max(learnings['categories'].items(), key=lambda x: x[1]['count'])[0]
+
+    stage('dashboard.performance', dashboard_performance)
+    stage('dashboard.errors', dashboard_errors)
+
+    def weekly_load():
+        from weekly_report import WeeklyReportGenerator
+        generator = WeeklyReportGenerator()
+        return generator, generator.get_last_week_predictions()
+
+    loaded = stage('weekly.load', weekly_load)
+    if loaded:
+        generator, week = loaded
+        stage('weekly.stats', lambda: generator.calculate_weekly_stats(week))
+
+    # Dernier pronostic terminé : son enregistrement relit et réécrit tout l'historique
+    completed = next((p for p in predictions if p['result'] in ('win', 'loss')), None)
+    if completed:
+        stage('tracker.record_result', lambda: tracker.record_result(
+            completed['id'], completed['result'], completed['actual_score']))
+
+    class OfflinePostMatchAnalyzer(PostMatchAnalyzer):
+        """Analyse post-match sans appel LLM : seul le chemin de données est mesuré."""
+
+        def _analyze_single_prediction(self, prediction):
+            home, _, away = prediction.get('match', '').partition(' vs ')
+            return {'main_cause': "Banc", 'missed_factors': [], 'actionable_conclusion': "Banc",
+                    'error_category': 'autre', 'match_id': prediction['match_id'],
+                    'match': {'home_team': home, 'away_team': away,
+                              'league': prediction.get('competition'), 'date': prediction.get('kickoff')},
+                    'bet_type': prediction.get('bet_type'), 'bet_choice': prediction.get('prediction'),
+                    'final_score': prediction.get('final_score'), 'analysis_date': datetime.now().isoformat()}
+
+    if completed:
+        path = os.path.join('data', 'predictions', f"{completed['date']}.json")
+        stage('post_match', lambda: len(OfflinePostMatchAnalyzer().analyze_lost_predictions(path)))
+
+    def register():
+        today = datetime.now().strftime('%Y-%m-%d')
+        sample = predictions[:5]
+        LearningEngine().save_predictions({
+            'analysis_date': today, 'total_analyzed': len(sample), 'total_retained': len(sample),
+            'recommendations': [{key: p[key] for key in ('match', 'competition', 'bet_type', 'prediction',
+                                                          'odds', 'confidence', 'risk_level')} for p in sample],
+        }, today)
+
+    stage('learning.register', register)
+
+    return {
+        'predictions': len(predictions),
+        'stages': stages,
+        'total_ms': round(sum(s.get('ms', 0) for s in stages.values()), 1),
+        'peak_rss_mb': _rss_mb(),
+    }
+
+
+# ───────────────────────── Croissance ─────────────────────────
+
+def growth(results):
+    """Exposant log(t2/t1) / log(n2/n1) par étape entre les deux plus grandes tailles."""
+    if len(results) < 2:
+        return {}
+    small, large = sorted(results, key=lambda entry: entry['size'])[-2:]
+    exponents = {}
+    for name in STAGES:
+        before, after = small['stages'].get(name, {}).get('ms'), large['stages'].get(name, {}).get('ms')
+        if before and after:
+            exponents[name] = round(math.log(after / before) / math.log(large['size'] / small['size']), 2)
+    return exponents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-bancs de volume sur historique synthétique")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help="Nombres de pronostics")
+    parser.add_argument('--years', type=float, default=3, help="Profondeur de l'historique (années)")
+    parser.add_argument('--detailed', action='store_true', help="Analyses détaillées complètes (~4 Ko/pronostic)")
+    parser.add_argument('--out', default=None, help="Fichier JSON des résultats (défaut : sortie standard)")
+    parser.add_argument('--keep', action='store_true', help="Conserve les historiques générés")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--worker', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        # Sous-processus : journal sur stderr, mesures JSON sur stdout
+        stdout, sys.stdout = sys.stdout, sys.stderr
+        result = run_size(args.worker, args)
+        stdout.write(json.dumps(result, ensure_ascii=False))
+        return
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(',')):
+        workdir = tempfile.mkdtemp(prefix=f"history-{size}-")
+        data_dir = os.path.join(workdir, 'data')
+        print(f"⏱️ Historique de {size} pronostics...", file=sys.stderr)
+        start = time.perf_counter()
+        generator = [sys.executable, os.path.join(ROOT, 'benchmarks', 'history_generator.py'),
+                     f"--predictions={size}", f"--years={args.years}", f"--out={data_dir}", f"--seed={args.seed}"]
+        proc = subprocess.run(generator + (['--detailed'] if args.detailed else []), capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(proc.stderr[-2000:], file=sys.stderr)
+            sys.exit(f"❌ Échec de la génération de {size} pronostics")
+        generation_s = round(time.perf_counter() - start, 1)
+        disk_mb = _disk_mb(data_dir)
+
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), f"--worker={workdir}"],
+                              capture_output=True, text=True)
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+        if proc.returncode != 0:
+            print(proc.stderr[-2000:], file=sys.stderr)
+            sys.exit(f"❌ Échec du banc à {size} pronostics")
+        results.append({'size': size, 'generation_s': generation_s, 'disk_mb': disk_mb, **json.loads(proc.stdout)})
+
+    exponents = growth(results)
+    report = {'created_at': datetime.now().isoformat(timespec='seconds'), 'python': sys.version.split()[0],
+              'settings': {'years': args.years, 'detailed': args.detailed, 'seed': args.seed},
+              'results': results, 'growth_exponents': exponents}
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    sizes = [entry['size'] for entry in results]
+    print(f"\n{'étape':<30}" + ''.join(f"{size:>12}" for size in sizes) + f"{'croissance':>12}", file=sys.stderr)
+    for name in STAGES:
+        cells = ''.join(f"{entry['stages'].get(name, {}).get('ms', '-'):>12}" for entry in results)
+        exponent = exponents.get(name)
+        flag = ' ⚠️' if exponent is not None and exponent > SUPERLINEAR else ''
+        print(f"{name:<30}{cells}{exponent if exponent is not None else '-':>12}{flag}", file=sys.stderr)
+    print(f"{'pic RSS (Mo)':<30}" + ''.join(f"{entry['peak_rss_mb']:>12}" for entry in results), file=sys.stderr)
+    print(f"{'disque (Mo)':<30}" + ''.join(f"{entry['disk_mb']:>12}" for entry in results), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
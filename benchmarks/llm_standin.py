@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Serveur LLM local pour les bancs du pipeline (ClaudeAnalyzer, PostMatchAnalyzer, Gemini).
+
+Parle le protocole Anthropic Messages (POST /v1/messages, réponse complète ou
+flux SSE : message_start, content_block_start, input_json_delta..., message_stop)
+et l'API REST Gemini generateContent (POST /v1beta/models/<modèle>:generateContent).
+
+Les sorties sont des réponses structurées préenregistrées :
+- analyse principale : un fichier data/predictions/*.json valide pour le schéma
+- analyse post-match / présélection : objets conformes générés à partir du prompt
+
+Réglages (reproductibles avec --seed) :
+- délai avant le premier token (--ttft-ms) et débit (--tokens-per-sec)
+- erreurs 429 (avec retry-after) et 529 « overloaded » (--rate-429, --rate-529)
+
+Pour y diriger les analyseurs :
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8766
+    GEMINI_API_ENDPOINT=http://127.0.0.1:8766
+    ANTHROPIC_API_KEY=standin  (et/ou GEMINI_API_KEY=standin)
+
+GET /__stats renvoie les compteurs (requêtes, flux, erreurs injectées, tokens).
+
+Usage:
+    python benchmarks/llm_standin.py [--port 8766] [--ttft-ms 800] [--tokens-per-sec 80]
+        [--rate-429 0.05] [--rate-529 0.02] [--seed 0]
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from prompt_budget import estimate_tokens  # noqa: E402
+from response_schema import (  # noqa: E402
+    ANALYSIS_TOOL_NAME, ERROR_CATEGORIES, POST_MATCH_TOOL_NAME, SCREENING_TOOL_NAME,
+    SchemaError, validate_analysis,
+)
+
+
+# Caractères de JSON par token (approximation de prompt_budget) et tokens par événement de flux
+CHARS_PER_TOKEN = 4
+TOKENS_PER_DELTA = 8
+SCREENING_LINE_RE = re.compile(r"^(\d+)\. ", re.M)
+
+
+def load_canned_analyses(pattern: str):
+    """Analyses archivées valides pour le schéma actuel (les autres sont ignorées)."""
+    analyses = []
+    for path in sorted(glob.glob(pattern)):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                analysis = json.load(f)
+            validate_analysis(analysis)
+        except (OSError, ValueError, SchemaError):
+            continue
+        analyses.append(analysis)
+    return analyses
+
+
+class LLMStandinState:
+    """Sorties préenregistrées, réglages et compteurs partagés par les threads du serveur."""
+
+    def __init__(self, analyses, ttft_ms=0.0, tokens_per_sec=0.0, rate_429=0.0, rate_529=0.0,
+                 retry_after=1.0, seed=0):
+        if not analyses:
+            raise ValueError("Aucune analyse préenregistrée valide (data/predictions/*.json)")
+        self.analyses = analyses
+        self.ttft_ms = ttft_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.rate_429 = rate_429
+        self.rate_529 = rate_529
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = Counter()
+
+    def injected_error(self):
+        with self.lock:
+            draw = self.rng.random()
+        if draw < self.rate_429:
+            return 429
+        if draw < self.rate_429 + self.rate_529:
+            return 529
+        return None
+
+    def output_for(self, tool_name: str, prompt: str):
+        """Sortie structurée conforme à l'outil demandé."""
+        if tool_name == POST_MATCH_TOOL_NAME:
+            with self.lock:
+                category = self.rng.choice(ERROR_CATEGORIES)
+            return {
+                'main_cause': "Écart de forme à l'extérieur sous-estimé",
+                'missed_factors': ["Série de 4 défaites à l'extérieur", "Absence du meneur de jeu"],
+                'actionable_conclusion': "Pondérer davantage la forme extérieure récente quand l'écart dépasse 3 matchs",
+                'error_category': category,
+            }
+        if tool_name == SCREENING_TOOL_NAME:
+            with self.lock:
+                return {'decisions': [
+                    {'index': int(index), 'score': round(self.rng.uniform(20, 90), 1), 'reason': "profil exploitable"}
+                    for index in SCREENING_LINE_RE.findall(prompt)
+                ]}
+        with self.lock:
+            return self.rng.choice(self.analyses)
+
+    def pace(self, tokens: int):
+        if self.tokens_per_sec:
+            time.sleep(tokens / self.tokens_per_sec)
+
+
+def _tool_for_gemini(prompt: str) -> str:
+    """Gemini reçoit le schéma dans le prompt (cf. GeminiProvider) : on y reconnaît l'outil."""
+    if '"main_cause"' in prompt:
+        return POST_MATCH_TOOL_NAME
+    if '"decisions"' in prompt:
+        return SCREENING_TOOL_NAME
+    return ANALYSIS_TOOL_NAME
+
+
+class LLMStandinHandler(BaseHTTPRequestHandler):
+    state: LLMStandinState = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        if self.path.startswith('/__stats'):
+            with self.state.lock:
+                return self._send_json(200, dict(self.state.counts))
+        self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        state = self.state
+        body = self._read_body()
+        path = self.path.split('?')[0]
+
+        error = state.injected_error()
+        with state.lock:
+            state.counts['requests'] += 1
+            if error:
+                state.counts[f"injected_{error}"] += 1
+
+        if path == '/v1/messages':
+            return self._anthropic(body, error)
+        if path.startswith('/v1beta/models/') and path.endswith(':generateContent'):
+            return self._gemini(body, error)
+        self._send_json(404, {'error': f"endpoint inconnu: {path}"})
+
+    # ───────────────────────── Anthropic Messages ─────────────────────────
+
+    def _anthropic(self, body, error):
+        state = self.state
+        if error == 429:
+            return self._send_json(429, {'type': 'error', 'error': {'type': 'rate_limit_error', 'message': 'Rate limited'}},
+                                   {'retry-after': str(state.retry_after)})
+        if error == 529:
+            return self._send_json(529, {'type': 'error', 'error': {'type': 'overloaded_error', 'message': 'Overloaded'}})
+
+        prompt = ''.join(
+            message['content'] if isinstance(message['content'], str)
+            else ''.join(part.get('text', '') for part in message['content'])
+            for message in body.get('messages', [])
+        )
+        tool_name = (body.get('tools') or [{}])[0].get('name', ANALYSIS_TOOL_NAME)
+        output = state.output_for(tool_name, prompt)
+        arguments = json.dumps(output, ensure_ascii=False)
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = max(1, len(arguments) // CHARS_PER_TOKEN)
+        with state.lock:
+            state.counts['output_tokens'] += output_tokens
+
+        message = {
+            'id': f"msg_{uuid.uuid4().hex[:24]}",
+            'type': 'message',
+            'role': 'assistant',
+            'model': body.get('model', 'standin'),
+            'content': [],
+            'stop_reason': None,
+            'stop_sequence': None,
+            'usage': {'input_tokens': input_tokens, 'output_tokens': 1},
+        }
+        block = {'type': 'tool_use', 'id': f"toolu_{uuid.uuid4().hex[:24]}", 'name': tool_name, 'input': {}}
+
+        time.sleep(state.ttft_ms / 1000)
+        if not body.get('stream'):
+            state.pace(output_tokens)
+            message.update(content=[{**block, 'input': output}], stop_reason='tool_use',
+                           usage={'input_tokens': input_tokens, 'output_tokens': output_tokens})
+            return self._send_json(200, message)
+
+        with state.lock:
+            state.counts['streams'] += 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        self._event('message_start', {'type': 'message_start', 'message': message})
+        self._event('content_block_start', {'type': 'content_block_start', 'index': 0, 'content_block': block})
+        self._event('ping', {'type': 'ping'})
+        step = TOKENS_PER_DELTA * CHARS_PER_TOKEN
+        for start in range(0, len(arguments), step):
+            state.pace(TOKENS_PER_DELTA)
+            self._event('content_block_delta', {
+                'type': 'content_block_delta', 'index': 0,
+                'delta': {'type': 'input_json_delta', 'partial_json': arguments[start:start + step]},
+            })
+        self._event('content_block_stop', {'type': 'content_block_stop', 'index': 0})
+        self._event('message_delta', {'type': 'message_delta',
+                                      'delta': {'stop_reason': 'tool_use', 'stop_sequence': None},
+                                      'usage': {'output_tokens': output_tokens}})
+        self._event('message_stop', {'type': 'message_stop'})
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _event(self, name, payload):
+        data = f"event: {name}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n".encode('utf-8')
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+
+    # ───────────────────────── Gemini generateContent ─────────────────────────
+
+    def _gemini(self, body, error):
+        state = self.state
+        if error:
+            status = 429 if error == 429 else 503
+            return self._send_json(status, {'error': {'code': status, 'message': 'Resource exhausted',
+                                                      'status': 'RESOURCE_EXHAUSTED' if status == 429 else 'UNAVAILABLE'}})
+
+        prompt = ''.join(part.get('text', '') for content in body.get('contents', []) for part in content.get('parts', []))
+        text = json.dumps(state.output_for(_tool_for_gemini(prompt), prompt), ensure_ascii=False)
+        output_tokens = max(1, len(text) // CHARS_PER_TOKEN)
+        with state.lock:
+            state.counts['output_tokens'] += output_tokens
+        time.sleep(state.ttft_ms / 1000)
+        state.pace(output_tokens)
+        self._send_json(200, {
+            'candidates': [{'content': {'role': 'model', 'parts': [{'text': text}]}, 'finishReason': 'STOP', 'index': 0}],
+            'usageMetadata': {'promptTokenCount': estimate_tokens(prompt), 'candidatesTokenCount': output_tokens,
+                              'totalTokenCount': estimate_tokens(prompt) + output_tokens},
+        })
+
+
+def serve(state: LLMStandinState, host='127.0.0.1', port=8766) -> ThreadingHTTPServer:
+    """Démarre le serveur dans un thread (utilisé par les bancs) ; shutdown() pour l'arrêter."""
+    handler = type('BoundLLMStandinHandler', (LLMStandinHandler,), {'state': state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur LLM local (Anthropic Messages + Gemini generateContent)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--predictions', default=os.path.join(ROOT, 'data', 'predictions', '*.json'),
+                        help="Analyses préenregistrées (motif glob)")
+    parser.add_argument('--ttft-ms', type=float, default=0.0, help="Délai avant le premier token")
+    parser.add_argument('--tokens-per-sec', type=float, default=0.0, help="Débit de sortie, 0 = instantané")
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--rate-529', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float, default=1.0, help="En-tête retry-after des 429 (s)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    state = LLMStandinState(
+        load_canned_analyses(args.predictions), ttft_ms=args.ttft_ms, tokens_per_sec=args.tokens_per_sec,
+        rate_429=args.rate_429, rate_529=args.rate_529, retry_after=args.retry_after, seed=args.seed,
+    )
+    server = serve(state, args.host, args.port)
+    print(f"🧪 Stand-in LLM sur http://{args.host}:{args.port} ({len(state.analyses)} analyse(s) préenregistrée(s))")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n📊 {json.dumps(dict(state.counts), ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
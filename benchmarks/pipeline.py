@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Banc de bout en bout du pipeline quotidien (src/main.py), étape par étape.
+
+Pour chaque taille de programme (5, 20, 60, 200 matchs par défaut), un jeu de
+réponses API-Football et une page FlashScore synthétiques mais réalistes sont
+enregistrés dans une archive temporaire (cf. snapshot_archive), puis servis par
+les serveurs locaux benchmarks/api_standin.py et benchmarks/llm_standin.py.
+Le pipeline tourne dans un sous-processus (mémoire et singletons propres), dans
+un répertoire de travail temporaire : aucun appel réseau, aucune écriture dans data/.
+
+La collecte passe par le vrai MatchScraper.get_today_matches() : ses étapes
+(scrape, filter, enrich, match_time, goal_model, ratings, market...) sont lues
+dans les spans du traceur, si bien qu'une étape ajoutée au pipeline apparaît
+ici sans modifier le banc. Suivent format, analyze, validate, save et send.
+
+Mesures par étape : temps écoulé, et pic de mémoire résidente (RSS) atteint à
+la fin des étapes hors collecte ; par programme : requêtes API-Football /
+FlashScore / LLM / Telegram. Les répertoires de travail sont supprimés après
+chaque programme, sauf avec --keep.
+
+Les résultats sont écrits en JSON ; --baseline compare à un fichier de
+référence et signale les régressions (code de sortie 1).
+
+Usage:
+    python benchmarks/pipeline.py [--slates 5,20,60,200] [--out pipeline.json]
+        [--baseline benchmarks/baselines/pipeline.json] [--tolerance 0.25] [--save-baseline]
+        [--api-latency-ms 0] [--llm-ttft-ms 0] [--llm-tokens-per-sec 0] [--keep]
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+ROOT = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+DEFAULT_SLATES = (5, 20, 60, 200)
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baselines', 'pipeline.json')
+STAGES = ('scrape', 'filter', 'enrich', 'match_time', 'goal_model', 'ratings', 'market', 'format', 'analyze', 'validate',
+          'save', 'send')
+# Spans de MatchScraper.get_today_matches renommés en étapes du banc (les autres gardent leur nom)
+SPAN_STAGES = {'sources': 'scrape'}
+# Écart absolu minimal (ms) pour signaler une régression de temps (bruit des petites étapes)
+MIN_REGRESSION_MS = 50
+
+LEAGUES = [
+    (39, 'Premier League', 'England'), (140, 'La Liga', 'Spain'), (135, 'Serie A', 'Italy'),
+    (78, 'Bundesliga', 'Germany'), (61, 'Ligue 1', 'France'), (144, 'Jupiler Pro League', 'Belgium'),
+    (2, 'UEFA Champions League', 'World'),
+]
+PLAYERS = ['Martin', 'Silva', 'Müller', 'Rossi', 'García', 'Dubois', 'Janssens', 'Smith', 'Costa', 'Novak']
+
+
+# ───────────────────────── Données synthétiques ─────────────────────────
+
+def _fixture(fixture_id, league, home, away, kickoff, goals=None):
+    league_id, league_name, country = league
+    return {
+        'fixture': {'id': fixture_id, 'date': kickoff.isoformat(), 'status': {'short': 'FT' if goals else 'NS'}},
+        'league': {'id': league_id, 'name': league_name, 'country': country},
+        'teams': {'home': {'id': home[0], 'name': home[1], 'winner': goals and goals[0] > goals[1] or None},
+                  'away': {'id': away[0], 'name': away[1], 'winner': goals and goals[1] > goals[0] or None}},
+        'goals': {'home': goals[0] if goals else None, 'away': goals[1] if goals else None},
+    }
+
+
+def _player(rng, team_name):
+    return f"{rng.choice('ABCDEFGHJKLMNPRST')}. {rng.choice(PLAYERS)} ({team_name[:3]})"
+
+
+def build_slate(size, now, seed=0):
+    """
+    Réponses API-Football brutes pour un programme de `size` matchs.
+
+    Returns:
+        (liste de (endpoint, params, corps), lignes FlashScore (home, away, competition, HH:MM))
+    """
+    rng = random.Random(seed + size)
+    today, season = now.strftime('%Y-%m-%d'), now.year
+    records, rows, fixtures = [], [], []
+    by_league = {}
+
+    def body(response, **extra):
+        return {'errors': [], 'results': len(response) if isinstance(response, list) else 1,
+                'paging': {'current': 1, 'total': 1}, 'response': response, **extra}
+
+    for index in range(size):
+        league = LEAGUES[index % len(LEAGUES)]
+        home = (10000 + 2 * index, f"{league[2]} Club {2 * index}")
+        away = (10001 + 2 * index, f"{league[2]} Club {2 * index + 1}")
+        # Un match sur quatre dans le créneau « temps réel » (< 2h)
+        kickoff = now + timedelta(hours=1 if index % 4 == 0 else 3 + index % 8, minutes=15 * (index % 4))
+        fixture_id = 900000 + index
+        fixture = _fixture(fixture_id, league, home, away, kickoff)
+        fixtures.append(fixture)
+        by_league.setdefault(league, []).extend([home, away])
+        rows.append((home[1], away[1], f"{league[2].upper()}: {league[1]}", kickoff.strftime('%H:%M')))
+
+        for team in (home, away):
+            opponents = [(20000 + rng.randrange(500), f"Opponent {rng.randrange(500)}") for _ in range(10)]
+            form = [_fixture(800000 + rng.randrange(10 ** 5), league, team if k % 2 else opp, opp if k % 2 else team,
+                             now - timedelta(days=7 * (k + 1)), (rng.randrange(4), rng.randrange(4)))
+                    for k, opp in enumerate(opponents)]
+            records += [
+                ('fixtures', {'team': team[0], 'last': 10}, body(form)),
+                ('injuries', {'team': team[0], 'season': season},
+                 body([{'player': {'name': _player(rng, team[1]), 'type': 'Missing Fixture', 'reason': 'Injury'}}
+                       for _ in range(rng.randrange(4))])),
+                ('teams/statistics', {'team': team[0], 'league': league[0], 'season': season}, body({
+                    'form': ''.join(rng.choice('WDL') for _ in range(10)),
+                    'fixtures': {'played': {'total': 10}, 'wins': {'total': 5, 'home': 3, 'away': 2},
+                                 'draws': {'total': 2}, 'loses': {'total': 3}},
+                    'goals': {'for': {'total': {'total': 17}, 'average': {'total': '1.7'}},
+                              'against': {'total': {'total': 11}, 'average': {'total': '1.1'}}},
+                    'biggest': {'wins': {'home': '4-0', 'away': '0-3'}, 'loses': {'home': '1-3', 'away': '3-0'}},
+                })),
+                ('sidelined', {'team': team[0]},
+                 body([{'player': {'name': _player(rng, team[1])}, 'type': 'Knee Injury', 'start': f"{season}-08-01"}
+                       for _ in range(rng.randrange(3))])),
+                ('coachs', {'team': team[0]},
+                 body([{'name': f"Coach {team[1]}", 'age': 50, 'nationality': league[2],
+                        'career': [{'start': f"{season - 2}-07-01"}]}])),
+                ('transfers', {'team': team[0]},
+                 body([{'player': {'name': _player(rng, team[1])}, 'transfers': [{
+                     'date': f"{season}-0{1 + k % 9}-01", 'type': 'Loan' if k % 3 else '€ 5M',
+                     'teams': {'in': {'name': team[1]}, 'out': {'name': f"Club {k}"}}}]} for k in range(12)])),
+            ]
+
+        records += [
+            ('fixtures/headtohead', {'h2h': f"{home[0]}-{away[0]}", 'last': 10},
+             body([_fixture(700000 + rng.randrange(10 ** 5), league, home, away, now - timedelta(days=180 * (k + 1)),
+                            (rng.randrange(4), rng.randrange(4))) for k in range(5)])),
+            ('predictions', {'fixture': fixture_id}, body([{
+                'predictions': {'winner': {'name': home[1]}, 'advice': f"Double chance : {home[1]} ou nul",
+                                'percent': {'home': '45%', 'draw': '30%', 'away': '25%'}},
+                'comparison': {'form': {'home': '60%', 'away': '40%'}, 'att': {'home': '55%', 'away': '45%'},
+                               'def': {'home': '50%', 'away': '50%'}},
+            }])),
+            ('fixtures', {'id': fixture_id}, body([{**fixture, 'lineups': [
+                {'team': {'id': team[0], 'name': team[1]}, 'formation': '4-3-3', 'coach': {'name': f"Coach {team[1]}"},
+                 'startXI': [{'player': {'name': _player(rng, team[1])}} for _ in range(11)]}
+                for team in (home, away)
+            ]}])),
+        ]
+
+    records.append(('fixtures', {'date': today}, body(fixtures)))
+
+    for league, teams in by_league.items():
+        table = [{
+            'rank': rank, 'team': {'id': team[0], 'name': team[1]}, 'points': 60 - 2 * rank, 'goalsDiff': 20 - rank,
+            'all': {'played': 20, 'win': 12, 'draw': 4, 'lose': 4, 'goals': {'for': 35, 'against': 20}},
+            'home': {'win': 7, 'draw': 2, 'lose': 1}, 'away': {'win': 5, 'draw': 2, 'lose': 3},
+        } for rank, team in enumerate(teams, 1)]
+        leaders = [{'player': {'name': _player(rng, team[1])},
+                    'statistics': [{'team': {'name': team[1]}, 'goals': {'total': 15 - k, 'assists': 9 - k // 2}}]}
+                   for k, team in enumerate(teams[:10])]
+        records += [
+            ('standings', {'league': league[0], 'season': season}, body([{'league': {'standings': [table]}}])),
+            ('players/topscorers', {'league': league[0], 'season': season}, body(leaders)),
+            ('players/topassists', {'league': league[0], 'season': season}, body(leaders)),
+        ]
+        near = [f for f in fixtures if f['league']['id'] == league[0]
+                and datetime.fromisoformat(f['fixture']['date']) - now < timedelta(hours=2)]
+        records.append(('odds', {'league': league[0], 'season': season, 'date': today, 'page': 1}, body([{
+            'fixture': {'id': f['fixture']['id']},
+            'bookmakers': [{'name': 'Bet365', 'bets': [
+                {'name': 'Match Winner', 'values': [{'value': 'Home', 'odd': '2.10'}, {'value': 'Draw', 'odd': '3.40'},
+                                                    {'value': 'Away', 'odd': '3.60'}]},
+                {'name': 'Goals Over/Under', 'values': [{'value': 'Over 2.5', 'odd': '1.85'},
+                                                        {'value': 'Under 2.5', 'odd': '1.95'}]},
+            ]}],
+        } for f in near])))
+
+    return records, rows
+
+
+def build_page(rows):
+    """Page FlashScore (balisage réel : un en-tête par compétition) listant les mêmes matchs."""
+    parts = ["<!DOCTYPE html><html><body><div class='sportName soccer'>"]
+    current = None
+    for number, (home, away, competition, kickoff) in enumerate(rows):
+        if competition != current:
+            country, name = competition.split(': ', 1)
+            parts.append("<div class='event__header'><div class='event__titleBox'>"
+                         f"<span class='event__title--type'>{country}</span>"
+                         f"<span class='event__title--name'>{name}</span></div></div>")
+            current = competition
+        parts.append(f"<div id='g_1_{number:06d}' class='event__match event__match--scheduled'>"
+                     f"<div class='event__time'>{kickoff}</div>"
+                     f"<div class='event__participant event__participant--home'>{home}</div>"
+                     f"<div class='event__participant event__participant--away'>{away}</div></div>")
+    parts.append("</div></body></html>")
+    return "".join(parts).encode('utf-8')
+
+
+# ───────────────────────── Exécution d'un programme (sous-processus) ─────────────────────────
+
+def _rss_mb():
+    # ru_maxrss : kilo-octets sous Linux, octets sous macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_slate(size, args):
+    """Exécute le pipeline sur un programme de `size` matchs ; renvoie les mesures."""
+    workdir = tempfile.mkdtemp(prefix=f"pipeline-{size}-")
+    try:
+        return _run_slate(size, args, workdir)
+    finally:
+        os.chdir(ROOT)
+        if args.keep:
+            print(f"📁 Répertoire de travail conservé: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _run_slate(size, args, workdir):
+    from snapshot_archive import SnapshotArchive
+
+    os.makedirs(os.path.join(workdir, 'data', 'predictions'))
+    os.symlink(os.path.join(ROOT, 'prompts'), os.path.join(workdir, 'prompts'))
+
+    # La configuration est lue à l'import (llm_standin importe déjà prompt_budget → config) :
+    # ports réservés et environnement fixé avant tout import de src/
+    api_url, llm_url = f"http://127.0.0.1:{_free_port()}", f"http://127.0.0.1:{_free_port()}"
+    os.environ.update({
+        'API_FOOTBALL_KEY': 'bench', 'API_FOOTBALL_BASE_URL': api_url, 'FLASHSCORE_URL': f"{api_url}/football/",
+        'ANTHROPIC_API_KEY': 'bench', 'ANTHROPIC_BASE_URL': llm_url, 'GEMINI_API_KEY': '',
+        'TELEGRAM_BOT_TOKEN': 'bench', 'TELEGRAM_CHAT_ID': '1', 'TELEGRAM_API_URL': f"{api_url}/bot",
+        'SNAPSHOT_ARCHIVE': 'false', 'RUN_REPORTS': 'false',
+    })
+
+    from api_standin import StandinState, serve as serve_api
+    from config import Config
+    from llm_standin import LLMStandinState, load_canned_analyses, serve as serve_llm
+
+    config = Config()
+    now = datetime.now(pytz.timezone(config.TIMEZONE))
+    records, rows = build_slate(size, now, args.seed)
+    page = build_page(rows)
+    archive = SnapshotArchive(os.path.join(workdir, 'bench_archive'))
+    for endpoint, params, data in records:
+        archive.record(endpoint, params, data)
+    archive.flush()
+
+    api_state = StandinState(archive, page=page, latency_ms=args.api_latency_ms)
+    llm_state = LLMStandinState(load_canned_analyses(os.path.join(ROOT, 'data', 'predictions', '*.json')),
+                                ttft_ms=args.llm_ttft_ms, tokens_per_sec=args.llm_tokens_per_sec, seed=args.seed)
+    api_server = serve_api(api_state, port=int(api_url.rsplit(':', 1)[1]))
+    llm_server = serve_llm(llm_state, port=int(llm_url.rsplit(':', 1)[1]))
+    os.chdir(workdir)
+
+    from analysis_cache import AnalysisCache
+    from api_football import api_football
+    from claude_analyzer import ClaudeAnalyzer
+    from compact_formatter import CompactFormatter
+    from learning_engine import LearningEngine
+    from match_scraper import MatchScraper
+    from match_screener import MatchScreener
+    from prediction_validator import PredictionValidator
+    from prompt_budget import PromptBudget
+    from rating_store import rating_store
+    from tracing import tracer
+    from value_detector import value_detector
+
+    today = now.strftime('%Y-%m-%d')
+    stages = {}
+    state = {}
+
+    def stage(name, step):
+        start = time.perf_counter()
+        try:
+            state[name] = step()
+            stages[name] = {'ms': round((time.perf_counter() - start) * 1000, 1), 'peak_rss_mb': _rss_mb()}
+        except ImportError as e:
+            # Dépendance optionnelle absente (ex: python-telegram-bot) : étape non mesurée
+            stages[name] = {'skipped': str(e)}
+        except Exception as e:
+            # Étape en échec : consignée, les étapes qui en dépendent ne tournent pas
+            print(f"❌ Étape {name}: {type(e).__name__}: {e}")
+            stages[name] = {'error': f"{type(e).__name__}: {e}"}
+        return state.get(name)
+
+    # Cotes Elo en mémoire depuis les matchs terminés du programme (forme récente, H2H)
+    rating_store.backfill(archive)
+
+    # Collecte : le vrai chemin de main.py, étapes lues dans les spans du traceur
+    scraper = MatchScraper()
+    root = tracer.start_run('pipeline_bench', slate=size)
+    try:
+        enriched = scraper.get_today_matches()
+    except Exception as e:
+        print(f"❌ Collecte: {type(e).__name__}: {e}")
+        stages['scrape'] = {'error': f"{type(e).__name__}: {e}"}
+        enriched = None
+    spans = list(root.children)
+    for span in spans:
+        stages[SPAN_STAGES.get(span.name, span.name)] = (
+            {'error': span.error} if span.error else {'ms': round(span.elapsed() * 1000, 1)})
+    counts = {span.name: span.attributes.get('matches') for span in spans}
+    matches, filtered = counts.get('sources'), counts.get('filter')
+
+    formatter = CompactFormatter() if config.PROMPT_FORMAT == 'compact' else scraper
+
+    def format_step():
+        shortlist = MatchScreener().screen(value_detector.prefilter(enriched), today)
+        return shortlist, PromptBudget(config).render(shortlist, formatter)
+
+    shortlist, prompt = stage('format', format_step) or (None, None)
+    learning = LearningEngine()
+
+    def analyze_step():
+        requests_before = llm_state.counts['requests']
+        analysis = ClaudeAnalyzer().analyze_matches(prompt, learning.get_learning_stats())
+        # analyze_matches absorbe les erreurs (None) : une analyse vide ou sans appel LLM est un échec
+        if analysis is None or llm_state.counts['requests'] == requests_before:
+            raise RuntimeError(f"aucune analyse ({llm_state.counts['requests'] - requests_before} requête(s) LLM)")
+        return analysis
+
+    result = stage('analyze', analyze_step)
+    if result:
+        result = stage('validate', lambda: PredictionValidator(enriched).validate_and_fix_predictions(
+            result, min_odds=config.MIN_ODDS))
+
+        def save_step():
+            AnalysisCache(today, config).store(shortlist, result, formatter)
+            learning.save_predictions(result, today)
+
+        stage('save', save_step)
+
+        def send_step():
+            from telegram_sender import TelegramSender
+            return TelegramSender().send_sync(result)
+
+        stage('send', send_step)
+
+    # Étapes qui n'ont pas tourné parce qu'une étape amont a échoué
+    for name in STAGES:
+        stages.setdefault(name, {'error': "non exécutée (étape amont en échec)"})
+
+    tracer.finish()
+    api_server.shutdown()
+    llm_server.shutdown()
+    return {
+        'slate': size,
+        'fixtures': {'scraped': matches or 0, 'filtered': filtered or 0, 'shortlist': len(shortlist or [])},
+        'stages': stages,
+        'total_ms': round(sum(s.get('ms', 0) for s in stages.values()), 1),
+        'peak_rss_mb': _rss_mb(),
+        'requests': {
+            'api_football': sum(v for k, v in api_state.counts.items()
+                                if k not in ('flashscore', 'telegram', 'not_recorded') and not k.startswith('injected_')),
+            'api_football_not_recorded': api_state.counts['not_recorded'],
+            'flashscore': api_state.counts['flashscore'],
+            'llm': llm_state.counts['requests'],
+            'telegram': api_state.counts['telegram'],
+            'by_endpoint': {k: v for k, v in sorted(api_state.counts.items())},
+        },
+        'api_football_report': api_football.report(),
+    }
+
+
+# ───────────────────────── Comparaison ─────────────────────────
+
+def compare(results, baseline, tolerance):
+    """Régressions : temps d'étape > référence × (1 + tolérance), pic RSS idem, requêtes en hausse."""
+    regressions = []
+    reference = {entry['slate']: entry for entry in baseline.get('results', [])}
+    for entry in results:
+        base = reference.get(entry['slate'])
+        if not base:
+            continue
+        for name in base['stages'].keys() - entry['stages'].keys():
+            regressions.append(f"{entry['slate']} matchs / {name}: étape absente")
+        for name, current in entry['stages'].items():
+            before = base['stages'].get(name, {})
+            if 'error' in current and 'error' not in before:
+                regressions.append(f"{entry['slate']} matchs / {name}: {current['error']}")
+            if 'ms' in current and 'ms' in before and current['ms'] > before['ms'] * (1 + tolerance) \
+                    and current['ms'] - before['ms'] >= MIN_REGRESSION_MS:
+                regressions.append(f"{entry['slate']} matchs / {name}: {before['ms']} → {current['ms']} ms")
+        if entry['peak_rss_mb'] > base['peak_rss_mb'] * (1 + tolerance):
+            regressions.append(f"{entry['slate']} matchs / RSS: {base['peak_rss_mb']} → {entry['peak_rss_mb']} Mo")
+        for name in ('api_football', 'flashscore', 'llm', 'telegram'):
+            if entry['requests'][name] > base['requests'].get(name, 0):
+                regressions.append(f"{entry['slate']} matchs / requêtes {name}: "
+                                   f"{base['requests'].get(name, 0)} → {entry['requests'][name]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc de bout en bout du pipeline quotidien")
+    parser.add_argument('--slates', default=','.join(map(str, DEFAULT_SLATES)), help="Tailles de programme")
+    parser.add_argument('--out', default=None, help="Fichier JSON des résultats (défaut : sortie standard)")
+    parser.add_argument('--baseline', default=None, help=f"Référence à comparer (ex: {os.path.relpath(DEFAULT_BASELINE, ROOT)})")
+    parser.add_argument('--save-baseline', action='store_true', help="Enregistre les résultats comme référence")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Marge avant régression (0.25 = +25%%)")
+    parser.add_argument('--api-latency-ms', type=float, default=0.0)
+    parser.add_argument('--llm-ttft-ms', type=float, default=0.0)
+    parser.add_argument('--llm-tokens-per-sec', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keep', action='store_true', help="Conserve les répertoires de travail temporaires")
+    parser.add_argument('--worker', type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        # Sous-processus : journal du pipeline sur stderr, mesures JSON sur stdout
+        stdout, sys.stdout = sys.stdout, sys.stderr
+        result = run_slate(args.worker, args)
+        stdout.write(json.dumps(result, ensure_ascii=False))
+        return
+
+    forwarded = [f"--seed={args.seed}", f"--api-latency-ms={args.api_latency_ms}",
+                 f"--llm-ttft-ms={args.llm_ttft_ms}", f"--llm-tokens-per-sec={args.llm_tokens_per_sec}"]
+    if args.keep:
+        forwarded.append('--keep')
+    results = []
+    for size in (int(s) for s in args.slates.split(',')):
+        print(f"⏱️ Programme de {size} matchs...", file=sys.stderr)
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), f"--worker={size}", *forwarded],
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(proc.stderr[-2000:], file=sys.stderr)
+            sys.exit(f"❌ Échec du programme de {size} matchs")
+        results.append(json.loads(proc.stdout))
+
+    report = {'created_at': datetime.now().isoformat(timespec='seconds'), 'python': sys.version.split()[0],
+              'settings': {k: getattr(args, k) for k in ('api_latency_ms', 'llm_ttft_ms', 'llm_tokens_per_sec', 'seed')},
+              'results': results}
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    print(f"\n{'matchs':>7}" + ''.join(f"{name:>11}" for name in STAGES) + f"{'total':>10}{'RSS':>8}{'API':>6}{'LLM':>5}",
+          file=sys.stderr)
+    for entry in results:
+        cells = ''.join(f"{entry['stages'].get(name, {}).get('ms', '-'):>11}" for name in STAGES)
+        print(f"{entry['slate']:>7}{cells}{entry['total_ms']:>10}{entry['peak_rss_mb']:>8}"
+              f"{entry['requests']['api_football']:>6}{entry['requests']['llm']:>5}", file=sys.stderr)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(DEFAULT_BASELINE), exist_ok=True)
+        with open(args.baseline or DEFAULT_BASELINE, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"✅ Référence enregistrée: {args.baseline or DEFAULT_BASELINE}", file=sys.stderr)
+    elif args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\n❌ Régressions:\n" + "\n".join(f"   - {line}" for line in regressions), file=sys.stderr)
+            sys.exit(1)
+        print("\n✅ Aucune régression par rapport à la référence", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Banc A/B : format classique (cadres) vs format compact du prompt d'analyse.
+
+Les prompts archivés (data/debug_prompt_*.txt) sont re-parsés en dictionnaires
+de matchs au format API-Football, puis rendus avec les deux formateurs. Pour
+chaque archive on mesure le nombre de tokens estimés et le temps de rendu.
+La fidélité du parseur est contrôlée en re-rendant au format classique et en
+comparant au texte archivé.
+
+Usage:
+    python benchmarks/prompt_format_ab.py [--runs 20] [--json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from compact_formatter import CompactFormatter  # noqa: E402
+from match_model import project_match  # noqa: E402
+from match_scraper import MatchScraper  # noqa: E402
+from prompt_budget import estimate_tokens  # noqa: E402
+
+
+MATCH_RE = re.compile(r"\n█{60}\nMATCH #\d+: (.+?) vs (.+?)\n█{60}\n\n")
+BOX_RE = re.compile(r"┌─ \S+ (.+?) ─*┐\n(.*?)└─+┘\n", re.S)
+GAME_RE = re.compile(r"^\s*\d+\. (?:\[\w\] )?(\d{4}-\d{2}-\d{2}): (.+) (\S+)-(\S+) (.+)$")
+WDL_RE = re.compile(r"(\d+)V-(\d+)N-(\d+)D")
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _game(line):
+    found = GAME_RE.match(line)
+    if not found:
+        return None
+    date, home, goals_home, goals_away, away = found.groups()
+    return {
+        'fixture': {'date': date},
+        'teams': {'home': {'name': home}, 'away': {'name': away}},
+        'goals': {'home': _int(goals_home), 'away': _int(goals_away)},
+    }
+
+
+def _wdl(text):
+    win, draw, lose = WDL_RE.search(text).groups()
+    return {'win': int(win), 'draw': int(draw), 'lose': int(lose)}
+
+
+def _parse_standings(lines, match):
+    rows = []
+    for line in lines:
+        found = re.match(r"^(?:🏠|✈️) +(.+): (\d+)e place - (\d+) pts$", line)
+        if found:
+            row = {'team': {'name': found.group(1)}, 'rank': int(found.group(2)), 'points': int(found.group(3)),
+                   'home': {}, 'away': {}}
+            rows.append(row)
+        elif line.strip().startswith('Bilan:'):
+            rows[-1]['all'] = _wdl(line)
+        elif line.strip().startswith('Buts:'):
+            goals = re.search(r"(\S+) pour, (\S+) contre \(diff: (\S+)\)", line)
+            rows[-1]['all']['goals'] = {'for': _int(goals.group(1)), 'against': _int(goals.group(2))}
+            rows[-1]['goalsDiff'] = _int(goals.group(3))
+        elif line.strip().startswith(('Domicile:', 'Extérieur:')):
+            rows[-1]['home' if 'Domicile' in line else 'away'] = _wdl(line)
+    match['league_standings'] = [{'league': {'standings': [rows]}}]
+
+
+def _parse_season_stats(lines, venue):
+    values = dict(line.split(': ', 1) for line in lines if ': ' in line)
+    played = values.get('Matchs joués')
+    wins = re.match(r"(\S+) \((\S+) ", values.get('Victoires', '- (- ')) or None
+    scored = re.match(r"(\S+) \(moy: (\S+)\)", values.get('Buts marqués', ''))
+    conceded = re.match(r"(\S+) \(moy: (\S+)\)", values.get('Buts encaissés', ''))
+    stats = {}
+    if played is not None:
+        stats['fixtures'] = {
+            'played': {'total': _int(played)},
+            'wins': {'total': _int(wins.group(1)), venue: _int(wins.group(2))},
+            'draws': {'total': _int(values.get('Nuls'))},
+            'loses': {'total': _int(values.get('Défaites'))},
+        }
+    if scored and conceded:
+        stats['goals'] = {
+            'for': {'total': {'total': _int(scored.group(1))}, 'average': {'total': scored.group(2)}},
+            'against': {'total': {'total': _int(conceded.group(1))}, 'average': {'total': conceded.group(2)}},
+        }
+    if 'Plus grande victoire' in values:
+        stats['biggest'] = {'wins': {venue: values['Plus grande victoire']},
+                            'loses': {venue: values.get('Plus lourde défaite')}}
+    return stats
+
+
+def _parse_players(lines, stat):
+    players = []
+    for line in lines:
+        found = re.match(r"^\s*\d+\. (?:🏠 |✈️ )?(.+) \((.+)\): (\S+) (?:buts|passes)$", line)
+        if found:
+            players.append({
+                'player': {'name': found.group(1)},
+                'statistics': [{'team': {'name': found.group(2)}, 'goals': {stat: _int(found.group(3))}}],
+            })
+    return players
+
+
+def parse_match_block(home, away, block):
+    """Reconstruit un match enrichi (réponses API-Football projetées par match_model) à partir d'un bloc archivé."""
+    competition = re.search(r"^📍 Compétition: (.*)$", block, re.M)
+    kickoff = re.search(r"^⏰ Coup d'envoi: (.*)$", block, re.M)
+    match = {'home': home, 'away': away,
+             'competition': competition.group(1) if competition else '',
+             'time': kickoff.group(1) if kickoff else ''}
+
+    for title, body in BOX_RE.findall(block):
+        lines = [line[2:] if line.startswith('│ ') else line[1:] for line in body.rstrip('\n').split('\n') if line]
+        if title.startswith('CLASSEMENT'):
+            _parse_standings(lines, match)
+        elif title.startswith('STATS SAISON'):
+            side = 'home' if 'DOMICILE' in title else 'away'
+            match[f'{side}_season_stats'] = _parse_season_stats(lines, side)
+        elif title.startswith('FORME'):
+            side = 'home' if 'DOMICILE' in title else 'away'
+            match[f'{side}_recent_form'] = [g for g in map(_game, lines) if g]
+        elif title.startswith('CONFRONTATIONS'):
+            match['head_to_head'] = [g for g in map(_game, lines) if g]
+        elif title.startswith('BLESSURES'):
+            side = 'home' if 'DOMICILE' in title else 'away'
+            match[f'{side}_injuries'] = [
+                {'player': {'name': name, 'reason': reason}}
+                for name, reason in (l[2:].split(': ', 1) for l in lines if l.startswith('❌ ') and ': ' in l)
+            ]
+        elif title.startswith('PRÉDICTION'):
+            values = dict(l.split(': ', 1) for l in lines if ': ' in l and not l.startswith('⚠️'))
+            pred = {'predictions': {'winner': {'name': values.get('Gagnant probable')}, 'advice': values.get('Conseil')}}
+            comparison = {}
+            for label, key in (('Forme', 'form'), ('Att', 'att'), ('Def', 'def')):
+                if label in values:
+                    home_value, away_value = values[label].split(' vs ')
+                    comparison[key] = {'home': home_value, 'away': away_value}
+            if comparison:
+                pred['comparison'] = comparison
+            match['api_prediction'] = [pred]
+        elif title.startswith('COMPOSITIONS'):
+            lineups = []
+            for line in lines:
+                found = re.match(r"^(?:🏠|✈️) (.+): Formation (.+)$", line)
+                if found:
+                    lineups.append({'team': {'name': found.group(1)}, 'formation': found.group(2), 'coach': {}})
+                elif line.strip().startswith('Entraîneur:'):
+                    lineups[-1]['coach'] = {'name': line.split(': ', 1)[1]}
+                elif line.strip().startswith('Titulaires:'):
+                    names = line.split(': ', 1)[1].rstrip('.').split(', ')
+                    lineups[-1]['startXI'] = [{'player': {'name': name}} for name in names]
+            match['lineups'] = lineups
+        elif title.startswith('TOP 10 BUTEURS'):
+            match['league_topscorers'] = _parse_players(lines, 'total')
+        elif title.startswith('TOP 10 PASSEURS'):
+            match['league_topassists'] = _parse_players(lines, 'assists')
+        elif title.startswith('JOUEURS ÉCARTÉS'):
+            side = 'home' if 'DOMICILE' in title else 'away'
+            match[f'{side}_sidelined'] = [
+                {'player': {'name': f.group(1)}, 'type': f.group(2), 'start': f.group(3)}
+                for f in (re.match(r"^⚠️ (.+): (.+) \(depuis (.+)\)$", l) for l in lines) if f
+            ]
+        elif title.startswith('ENTRAÎNEUR'):
+            side = 'home' if 'DOMICILE' in title else 'away'
+            coach = {}
+            for line in lines:
+                found = re.match(r"^Nom: (.+) \((.+), (.+) ans\)$", line)
+                if found:
+                    coach = {'name': found.group(1), 'nationality': found.group(2), 'age': _int(found.group(3))}
+                elif line.startswith('En poste depuis:'):
+                    coach['career'] = [{'start': line.split(': ', 1)[1]}]
+            match[f'{side}_coach'] = [coach] if coach else []
+        elif title.startswith('TRANSFERTS'):
+            side = 'home' if 'DOMICILE' in title else 'away'
+            transfers = []
+            for line in lines:
+                found = re.match(r"^\S+ (.+): (.+) → (.+) \((.+), (\S+)\)$", line)
+                if found:
+                    transfers.append({'player': {'name': found.group(1)}, 'transfers': [{
+                        'type': found.group(4), 'date': found.group(5),
+                        'teams': {'out': {'name': found.group(2)}, 'in': {'name': found.group(3)}},
+                    }]})
+            # Cadre vide archivé : transferts présents mais aucun ne concerne l'équipe
+            match[f'{side}_transfers'] = transfers or [{'player': {}, 'transfers': [{'teams': {}}]}]
+        elif title.startswith('COTES'):
+            # Les cotes ne sont pas re-parsées (absentes des archives hors créneau < 2h)
+            match['odds'] = [{'bookmaker': {}, 'bets': []}]
+
+    return project_match(match)
+
+
+def parse_debug_prompt(text):
+    """
+    Extrait les matchs d'un prompt archivé.
+
+    Returns:
+        (matchs reconstruits, section « matchs » archivée telle quelle)
+    """
+    start = text.index("═══════════════════════════════════════════════════════\nMATCHS DU JOUR")
+    end = text.index("NE PAS inventer de données - TOUT est fourni ci-dessus.\n\n", start)
+    archived = text[start:end + len("NE PAS inventer de données - TOUT est fourni ci-dessus.\n\n")]
+
+    headers = list(MATCH_RE.finditer(archived))
+    matches = []
+    for i, header in enumerate(headers):
+        block_end = headers[i + 1].start() if i + 1 < len(headers) else archived.index("\n🎯 INSTRUCTION")
+        matches.append(parse_match_block(header.group(1), header.group(2), archived[header.end():block_end]))
+    return matches, archived
+
+
+def _time_render(render, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        output = render()
+    return output, (time.perf_counter() - start) / runs * 1000
+
+
+def run(runs):
+    scraper = MatchScraper.__new__(MatchScraper)  # Rendu seul : pas besoin de session HTTP
+    compact = CompactFormatter()
+    report = []
+
+    for path in sorted(glob.glob(os.path.join(ROOT, 'data', 'debug_prompt_*.txt'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            matches, archived = parse_debug_prompt(f.read())
+
+        boxed, boxed_ms = _time_render(lambda: scraper.format_matches_for_prompt(matches), runs)
+        dense, compact_ms = _time_render(lambda: compact.format_matches_for_prompt(matches), runs)
+
+        boxed_tokens = estimate_tokens(boxed)
+        compact_tokens = estimate_tokens(dense)
+        report.append({
+            'file': os.path.basename(path),
+            'matches': len(matches),
+            'parser_roundtrip_exact': boxed == archived,
+            'archived_tokens': estimate_tokens(archived),
+            'boxed_tokens': boxed_tokens,
+            'compact_tokens': compact_tokens,
+            'token_reduction_pct': round((1 - compact_tokens / boxed_tokens) * 100, 1) if boxed_tokens else 0.0,
+            'boxed_render_ms': round(boxed_ms, 3),
+            'compact_render_ms': round(compact_ms, 3),
+            'boxed_chars': len(boxed),
+            'compact_chars': len(dense),
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A/B format classique vs compact sur les prompts archivés")
+    parser.add_argument('--runs', type=int, default=20, help="Répétitions pour la mesure du temps de rendu")
+    parser.add_argument('--json', action='store_true', help="Sortie JSON")
+    args = parser.parse_args()
+
+    report = run(args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"{'archive':<28}{'matchs':>7}{'classique':>11}{'compact':>9}{'gain':>8}{'rendu cl.':>11}{'rendu cp.':>11}  fidélité")
+    for row in report:
+        print(f"{row['file']:<28}{row['matches']:>7}{row['boxed_tokens']:>11}{row['compact_tokens']:>9}"
+              f"{row['token_reduction_pct']:>7}%{row['boxed_render_ms']:>9.2f}ms{row['compact_render_ms']:>9.2f}ms"
+              f"  {'exacte' if row['parser_roundtrip_exact'] else 'approchée'}")
+
+    total_boxed = sum(row['boxed_tokens'] for row in report)
+    total_compact = sum(row['compact_tokens'] for row in report)
+    if total_boxed:
+        print(f"\nTotal: {total_boxed} → {total_compact} tokens estimés "
+              f"(-{(1 - total_compact / total_boxed) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,14 @@ from datetime import datetime, timedelta
 import sys
 import os
 import json
+import hashlib
 sys.path.insert(0, 'src')
 from performance_tracker import PerformanceTracker
+from http_metrics import load_run_summaries
+from profiling import profiled
+from rating_store import RatingStore
+from backtester import PickTable
+from staking import INITIAL_BANKROLL, RUIN_LEVEL, StakingSimulator
 
 # Configuration de la page
 st.set_page_config(
@@ -87,6 +93,27 @@ st.markdown("""
 # Initialisation
 tracker = PerformanceTracker()
 
+
+@st.cache_data(show_spinner="Simulation des stratégies de mise...", max_entries=20)
+def simulate_staking(period, content, simulations, horizon, _table):
+    """
+    Historique rejoué et risque de ruine par stratégie (onglet Bankroll).
+
+    Mis en cache par période, contenu des paris (cf. pick_table_hash : un résultat
+    corrigé invalide le cache) et curseurs : le Monte Carlo n'est pas relancé à
+    chaque interaction avec le dashboard.
+    """
+    simulator = StakingSimulator(_table)
+    return simulator.simulate(), simulator.risk_of_ruin(simulations=simulations, horizon=horizon)
+
+
+def pick_table_hash(table):
+    """Empreinte des colonnes rejouées (résultat, cote, confiance) d'une PickTable."""
+    digest = hashlib.sha1()
+    for column in (table.won, table.odds, table.confidence):
+        digest.update(column.tobytes())
+    return digest.hexdigest()
+
 # Header
 col_header1, col_header2 = st.columns([4, 1])
 with col_header1:
@@ -98,7 +125,8 @@ with col_header2:
 st.markdown("---")
 
 # Navigation par onglets
-tab1, tab2 = st.tabs(["📊 Performance", "🔍 Analyses d'erreurs"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Performance", "🔍 Analyses d'erreurs", "📡 Appels externes", "📈 Cotes Elo",
+                                        "💰 Bankroll"])
 
 # ============= TAB 1: PERFORMANCE =============
 with tab1:
@@ -110,23 +138,24 @@ with tab1:
         max_value=datetime.now()
     )
 
-    # Charger les données
-    all_predictions = tracker.get_all_predictions()
-
-    # Filtrer par date
-    if isinstance(date_range, tuple) and len(date_range) == 2:
-        start_date, end_date = date_range
-        predictions = [
-            p for p in all_predictions
-            if start_date <= datetime.strptime(p['date'], '%Y-%m-%d').date() <= end_date
-        ]
-    else:
-        predictions = all_predictions
+    # Charger les données (profilables avec PROFILE=cpu|mem|wall streamlit run dashboard.py)
+    with profiled('dashboard'):
+        all_predictions = tracker.get_all_predictions()
+
+        # Filtrer par date
+        if isinstance(date_range, tuple) and len(date_range) == 2:
+            start_date, end_date = date_range
+            predictions = [
+                p for p in all_predictions
+                if start_date <= datetime.strptime(p['date'], '%Y-%m-%d').date() <= end_date
+            ]
+        else:
+            predictions = all_predictions
 
-    # Calculer les stats sur les données filtrées
-    stats = tracker.calculate_statistics_from_list(predictions)
-    stats_by_type = tracker.get_statistics_by_type_from_list(predictions)
-    stats_by_comp = tracker.get_statistics_by_competition_from_list(predictions)
+        # Calculer les stats sur les données filtrées
+        stats = tracker.calculate_statistics_from_list(predictions)
+        stats_by_type = tracker.get_statistics_by_type_from_list(predictions)
+        stats_by_comp = tracker.get_statistics_by_competition_from_list(predictions)
 
     # Section 1: Métriques principales
     st.markdown("## 📊 Vue d'ensemble")
@@ -559,6 +588,182 @@ with tab2:
         ```
         """)
 
+# ============= TAB 3: APPELS EXTERNES =============
+with tab3:
+    st.markdown("## 📡 Appels externes (API-Football, FlashScore, Claude, Gemini, Telegram)")
+
+    run_summaries = load_run_summaries(limit=30)
+
+    if run_summaries:
+        entry_points = sorted(set(r['entry_point'] for r in run_summaries))
+        selected_entry = st.selectbox("Script", entry_points, index=entry_points.index('main') if 'main' in entry_points else 0)
+        runs = [r for r in run_summaries if r['entry_point'] == selected_entry]
+        latest = runs[-1]
+        st.caption(f"Dernier run : {latest['started_at']}")
+
+        rows = [
+            {
+                'Service': service,
+                'Endpoint': endpoint,
+                'Appels': data['calls'],
+                'Erreurs': data['errors'],
+                'p50 (s)': data['p50'],
+                'p95 (s)': data['p95'],
+                'Total (s)': data['seconds'],
+                'Ko': round(data['bytes'] / 1024, 1),
+                'Retries': data['retries'],
+                'Statuts': ', '.join(f"{status}×{count}" for status, count in data['statuses'].items()),
+            }
+            for service, endpoints in latest['services'].items()
+            for endpoint, data in endpoints.items()
+        ]
+        df_calls = pd.DataFrame(rows).sort_values('Total (s)', ascending=False)
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric(label="Appels", value=int(df_calls['Appels'].sum()))
+        with col2:
+            st.metric(label="Erreurs", value=int(df_calls['Erreurs'].sum()))
+        with col3:
+            st.metric(label="Retries", value=int(df_calls['Retries'].sum()))
+        with col4:
+            quota = latest.get('quotas', {}).get('api_football', {}).get('daily')
+            st.metric(label="Quota API-Football restant", value=f"{quota:.0f}" if quota is not None else "N/A")
+
+        st.markdown("### ⏱️ Dernier run par endpoint")
+        st.dataframe(df_calls, use_container_width=True, hide_index=True)
+
+        # Évolution du p95 le plus élevé de chaque service, run après run
+        df_history = pd.DataFrame([
+            {
+                'Run': r['started_at'],
+                'Service': service,
+                'p95 (s)': max(data['p95'] for data in endpoints.values()),
+            }
+            for r in runs
+            for service, endpoints in r['services'].items()
+        ])
+        if len(runs) > 1:
+            st.markdown("### 📈 p95 par service (pire endpoint)")
+            fig = px.line(df_history, x='Run', y='p95 (s)', color='Service', markers=True)
+            fig.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='white'),
+                height=400
+            )
+            st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("Aucune métrique d'appel disponible. Elles sont ajoutées aux rapports de run (data/runs) à chaque exécution ; "
+                "en CI, télécharger les artefacts run-reports-* des workflows dans data/runs.")
+
+# ============= TAB 4: COTES ELO =============
+with tab4:
+    st.markdown("## 📈 Cotes Elo des équipes")
+
+    # Instance propre : relit data/ratings.json à chaque rafraîchissement
+    ratings = RatingStore()
+    ratings.load()
+
+    if ratings.teams:
+        league_names = {league: params.get('name', league) for league, params in ratings.leagues.items()}
+        choices = ['Toutes'] + sorted(league_names.values())
+        selected_league = st.selectbox("Compétition", choices)
+        league = next((key for key, name in league_names.items() if name == selected_league), None)
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric(label="Équipes cotées", value=len(ratings.teams))
+        with col2:
+            st.metric(label="Matchs appliqués", value=len(ratings.applied))
+        with col3:
+            advantage = ratings.home_advantage(league) if league else None
+            st.metric(label="Avantage du terrain", value=f"{advantage:+.0f} pts" if advantage is not None else "N/A")
+
+        df_ratings = pd.DataFrame([
+            {
+                'Rang': rank,
+                'Équipe': team.name,
+                'Elo': round(team.rating),
+                'Matchs': team.games,
+                'Compétition': league_names.get(team.league, team.league),
+                'Dernier match': team.last_date,
+            }
+            for rank, team in enumerate(ratings.top(limit=len(ratings.teams), league=league), 1)
+        ])
+        st.dataframe(df_ratings, use_container_width=True, hide_index=True)
+
+        st.markdown("### 🏟️ Avantage du terrain par compétition")
+        df_leagues = pd.DataFrame([
+            {
+                'Compétition': league_names[key],
+                'Avantage (pts Elo)': round(params['home_advantage']),
+                'Matchs': params['games'],
+            }
+            for key, params in sorted(ratings.leagues.items(), key=lambda item: -item[1]['games'])
+        ])
+        st.dataframe(df_leagues, use_container_width=True, hide_index=True)
+    else:
+        st.info("Aucune cote Elo disponible. Elles sont mises à jour par auto_update_results.py, "
+                "ou reconstruites depuis l'archive : python src/rating_store.py --backfill")
+
+# ============= TAB 5: BANKROLL =============
+with tab5:
+    st.markdown("## 💰 Bankroll simulée par stratégie de mise")
+    st.caption(f"Pronostics terminés de la période sélectionnée, bankroll de départ {INITIAL_BANKROLL:g} unités. "
+               "Kelly utilise la confiance annoncée comme probabilité.")
+
+    table = PickTable(predictions)
+
+    if len(table):
+        col1, col2 = st.columns(2)
+        with col1:
+            simulations = st.select_slider("Simulations Monte Carlo", options=[500, 1000, 2000, 5000], value=2000)
+        with col2:
+            horizon = st.select_slider("Paris par simulation", options=[50, 100, 250, 500, 1000], value=250)
+
+        results, risks = simulate_staking(str(date_range), pick_table_hash(table), simulations, horizon, table)
+
+        df_staking = pd.DataFrame([
+            {
+                'Stratégie': result['strategy'],
+                'Paris': result['bets'],
+                'Misé (u)': result['staked'],
+                'Gains (u)': result['profit'],
+                'ROI (%)': round(result['roi'] * 100, 1) if result['roi'] is not None else None,
+                'Bankroll finale (u)': result['final_bankroll'],
+                'Drawdown max (%)': round(result['max_drawdown'] * 100, 1),
+                f'Ruine ≤{RUIN_LEVEL:.0%} (%)': round(risks[result['strategy']]['ruin'] * 100, 1),
+                'Finale médiane MC (u)': risks[result['strategy']]['final_median'],
+            }
+            for result in results
+        ])
+        st.dataframe(df_staking, use_container_width=True, hide_index=True)
+
+        st.markdown("### 📈 Courbes de bankroll")
+        log_scale = st.checkbox("Échelle logarithmique", value=True)
+        fig = go.Figure()
+        for result in results:
+            fig.add_trace(go.Scatter(
+                x=list(range(len(result['equity']))),
+                y=result['equity'],
+                mode='lines',
+                name=result['strategy'],
+            ))
+        fig.add_hline(y=INITIAL_BANKROLL, line_dash="dash", line_color="white", opacity=0.3)
+        fig.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white'),
+            xaxis_title="Paris",
+            yaxis_title="Bankroll (u)",
+            yaxis_type='log' if log_scale else 'linear',
+            height=450
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("Aucun pronostic terminé sur la période sélectionnée.")
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -0,0 +1,174 @@
+"""
+Cache d'analyse par match pour les ré-analyses de la journée.
+
+Chaque match est identifié par une empreinte (SHA-256 de ses propres sections,
+rendues par le formateur réellement utilisé - MatchScraper ou CompactFormatter,
+bloc de ligue compris - plus les paramètres qui changent l'analyse : modèle et
+fourchette de cotes). Les sections issues du modèle de buts (modèle, marché)
+en sont exclues : ajusté sur tout le programme, il bouge dès qu'un autre match
+change ; ses entrées propres au match (forme, H2H, cotes) sont, elles, hachées.
+Le résultat de l'analyse de ce match (pronostics retenus ou raison
+d'exclusion) est stocké sous cette empreinte dans data/analysis_cache/<date>.json.
+
+Lors d'une ré-analyse, seuls les matchs dont l'empreinte a changé (composition
+publiée, cotes bougées, blessure...) repartent vers le modèle ; les autres sont
+repris du cache.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from config import Config
+
+# Sections dérivées de l'ajustement sur tout le programme (cf. goal_model) : hors empreinte
+SLATE_DEPENDENT_SECTIONS = ('model', 'market')
+
+
+class AnalysisCache:
+    """Résultats d'analyse par match, indexés par empreinte des données d'entrée."""
+
+    def __init__(self, date: str, config: Config = None):
+        self.config = config or Config()
+        self.date = date
+        self.cache_dir = os.path.join(self.config.DATA_DIR, 'analysis_cache')
+        self.cache_file = os.path.join(self.cache_dir, f"{date}.json")
+        self.data = self._load()
+
+    def _load(self) -> Dict:
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ Cache d'analyse illisible ({e}), ignoré")
+        return {'date': self.date, 'matches': {}, 'combined_bet': None}
+
+    def save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def match_key(match: Dict) -> str:
+        return f"{match['home']} vs {match['away']}"
+
+    def fingerprint(self, match: Dict, formatter) -> str:
+        """
+        Empreinte stable des données propres au match qui entrent dans le prompt.
+
+        Args:
+            match: Match enrichi
+            formatter: Formateur du prompt (MatchScraper ou CompactFormatter)
+        """
+        sections = [text for key, text in formatter.format_match_sections(match) if key not in SLATE_DEPENDENT_SECTIONS]
+        if hasattr(formatter, 'format_league_block'):
+            # Format compact : classement, buteurs et passeurs sont dans le bloc de ligue
+            sections.insert(0, formatter.format_league_block([match]))
+        payload = "\n".join([
+            *sections,
+            self.config.CLAUDE_MODEL,
+            f"{self.config.MIN_ODDS}-{self.config.MAX_ODDS}",
+        ])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def partition(self, matches: List[Dict], formatter) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Sépare les matchs à ré-analyser de ceux dont le résultat est en cache.
+
+        Returns:
+            (matchs modifiés ou inconnus, matchs inchangés)
+        """
+        changed, unchanged = [], []
+        for match in matches:
+            entry = self.data['matches'].get(self.match_key(match))
+            if entry and entry['fingerprint'] == self.fingerprint(match, formatter):
+                unchanged.append(match)
+            else:
+                changed.append(match)
+        return changed, unchanged
+
+    def store(self, matches: List[Dict], result: Dict, formatter):
+        """
+        Enregistre le résultat d'une analyse (déjà validée) match par match.
+
+        Args:
+            matches: Matchs envoyés au modèle pour cette analyse
+            result: Réponse de l'analyseur après PredictionValidator
+            formatter: Formateur du prompt utilisé (pour le calcul des empreintes)
+        """
+        from prediction_validator import PredictionValidator
+
+        validator = PredictionValidator(matches)
+        per_match = {self.match_key(match): {'recommendations': [], 'excluded': None} for match in matches}
+
+        for rec in result.get('recommendations', []):
+            found = validator._find_match(rec.get('match', ''))
+            if found:
+                per_match[self.match_key(found['original_match'])]['recommendations'].append(rec)
+
+        for example in result.get('matches_excluded', {}).get('examples', []):
+            found = validator._find_match(example.get('match', ''))
+            if found:
+                per_match[self.match_key(found['original_match'])]['excluded'] = example
+
+        analyzed_at = datetime.now().isoformat()
+        for match in matches:
+            key = self.match_key(match)
+            self.data['matches'][key] = {
+                'fingerprint': self.fingerprint(match, formatter),
+                'analyzed_at': analyzed_at,
+                **per_match[key],
+            }
+
+        if result.get('combined_bet'):
+            # Le combiné ne reste valable que si les matchs pronostiqués de cette analyse sont inchangés
+            self.data['combined_bet'] = {
+                'bet': result['combined_bet'],
+                'depends_on': [key for key, entry in per_match.items() if entry['recommendations']],
+            }
+        self.save()
+
+    def merge(self, result: Dict, unchanged: List[Dict]) -> Dict:
+        """
+        Complète une analyse partielle avec les résultats en cache des matchs inchangés.
+
+        Args:
+            result: Analyse des matchs modifiés (None si aucun match n'a changé)
+            unchanged: Matchs repris du cache
+
+        Returns:
+            Analyse complète de la journée
+        """
+        merged = dict(result or {})
+        merged['analysis_date'] = self.date
+        recommendations = list(merged.get('recommendations', []))
+        excluded = dict(merged.get('matches_excluded') or {'count': 0, 'examples': []})
+        excluded['examples'] = list(excluded.get('examples', []))
+
+        for match in unchanged:
+            entry = self.data['matches'][self.match_key(match)]
+            recommendations.extend(entry['recommendations'])
+            if not entry['recommendations']:
+                excluded['count'] = excluded.get('count', 0) + 1
+                if entry.get('excluded'):
+                    excluded['examples'].append(entry['excluded'])
+
+        recommendations.sort(key=lambda rec: rec.get('confidence', 0), reverse=True)
+        recommendations = recommendations[:self.config.MAX_PREDICTIONS]
+
+        merged['recommendations'] = recommendations
+        merged['matches_excluded'] = excluded
+        merged['total_analyzed'] = merged.get('total_analyzed', 0) + len(unchanged)
+        merged['total_retained'] = len(recommendations)
+
+        # Combiné : celui de la nouvelle analyse, sinon celui en cache s'il reste cohérent
+        cached_combined = self.data.get('combined_bet')
+        if not merged.get('combined_bet') and cached_combined:
+            unchanged_keys = {self.match_key(match) for match in unchanged}
+            if all(key in unchanged_keys for key in cached_combined['depends_on']):
+                merged['combined_bet'] = cached_combined['bet']
+
+        return merged
@@ -0,0 +1,330 @@
+"""
+Client API-Football partagé : disjoncteur par famille d'endpoints, délais
+adaptatifs et repli sur la dernière réponse connue.
+
+Quand l'API est lente ou en erreur, chacun des ~20 appels par match attendait
+son délai complet de 10 s. Ici :
+- un CircuitBreaker par famille d'endpoints (fixtures, injuries, odds...)
+  s'ouvre après des échecs consécutifs et court-circuite les appels suivants
+- le délai de chaque famille suit le p95 des latences observées (borné)
+- chaque réponse réussie est conservée sur disque ; si l'appel échoue ou si
+  le circuit est ouvert, la dernière copie est servie si elle n'est pas plus
+  ancienne que l'âge maximal de sa famille (STALE_MAX_AGE_HOURS). Les familles
+  servies depuis la copie sont relevées par match (match['stale_sources'],
+  cf. stale_sources()) et signalées dans le prompt et le rapport de run
+
+La copie locale (data/cache/api_football) n'est pas conservée entre les runs
+GitHub Actions : en CI, le repli ne couvre que les requêtes déjà servies
+pendant le même run.
+
+Les réponses brutes du run sont aussi archivées (cf. snapshot_archive) ; en
+mode replay(), elles sont servies depuis l'archive sans appel réseau.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional, Set
+
+import requests
+
+from circuit_breaker import CircuitBreaker
+from config import Config
+from http_metrics import http_metrics
+from snapshot_archive import SnapshotArchive
+from tracing import tracer
+
+# Latences conservées par famille, et nombre minimal avant d'adapter le délai
+LATENCY_WINDOW = 50
+MIN_SAMPLES = 5
+# Délai = p95 observé × marge, borné par API_FOOTBALL_MIN_TIMEOUT / API_FOOTBALL_TIMEOUT
+TIMEOUT_MARGIN = 3.0
+# Âge maximal (heures) d'une copie locale servie en repli, par famille ; au-delà elle est ignorée
+STALE_MAX_AGE_HOURS = {
+    'odds': 3,              # Les cotes bougent jusqu'au coup d'envoi
+    'fixtures': 12,         # Programme, forme récente, H2H, compositions
+    'injuries': 24,
+    'predictions': 24,
+    'standings': 24,
+    'teams': 72,            # Statistiques de saison
+    'players': 72,
+    'sidelined': 72,
+    'coachs': 168,
+    'transfers': 168,
+}
+DEFAULT_STALE_MAX_AGE_HOURS = 48
+
+
+def _percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class ApiFootballUnavailable(Exception):
+    """Appel impossible (circuit ouvert ou échec réseau) et aucune copie locale."""
+
+
+class _Family:
+    """État d'une famille d'endpoints : disjoncteur, latences, compteurs."""
+
+    def __init__(self, name: str, config: Config):
+        self.name = name
+        self.breaker = CircuitBreaker(
+            f"API-Football/{name}",
+            failure_threshold=config.API_FOOTBALL_BREAKER_THRESHOLD,
+            reset_timeout=config.API_FOOTBALL_BREAKER_RESET_SECONDS,
+        )
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.counts = {'calls': 0, 'ok': 0, 'failures': 0, 'short_circuited': 0, 'stale': 0, 'expired': 0,
+                       'unavailable': 0, 'replayed': 0}
+
+
+class ApiFootballClient:
+    """Accès GET à API-Football avec disjoncteurs, délais adaptatifs et repli."""
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.cache_dir = os.path.join(self.config.DATA_DIR, 'cache', 'api_football')
+        self._families: Dict[str, _Family] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.archive = SnapshotArchive(os.path.join(self.config.DATA_DIR, 'snapshots'))
+        self.recording = self.config.SNAPSHOT_ARCHIVE
+        self.replaying = False
+        self.replay_date = None
+        self.replay_run = None
+        if self.recording:
+            atexit.register(self.archive.flush)
+
+    @property
+    def enabled(self) -> bool:
+        """Données disponibles : clé API configurée, ou archive rejouée."""
+        return self.replaying or bool(os.getenv('API_FOOTBALL_KEY'))
+
+    def replay(self, date: Optional[str] = None, run: Optional[str] = None):
+        """
+        Sert toutes les requêtes suivantes depuis l'archive, sans appel réseau.
+
+        Args:
+            date: Partition AAAA-MM-JJ à rejouer ; None ou 'latest' = toutes (réponse la plus récente)
+            run: Run HHMMSS de la partition (toutes les réponses viennent de ce run) ; None = tous les runs
+        """
+        self.replaying = True
+        self.recording = False
+        self.replay_date = None if date in (None, 'latest') else date
+        self.replay_run = run if self.replay_date else None
+        print(f"🗄️ Mode snapshot : réponses API-Football servies depuis {self.archive.root}"
+              + (f" ({self.replay_date}" + (f", run {self.replay_run}" if self.replay_run else "") + ")"
+                 if self.replay_date else ""))
+
+    def _family(self, endpoint: str) -> _Family:
+        name = endpoint.strip('/').split('/')[0]
+        with self._lock:
+            if name not in self._families:
+                self._families[name] = _Family(name, self.config)
+            return self._families[name]
+
+    def timeout_for(self, endpoint: str) -> float:
+        """Délai adaptatif de la famille (délai maximal tant que les mesures sont insuffisantes)."""
+        family = self._family(endpoint)
+        if len(family.latencies) < MIN_SAMPLES:
+            return self.config.API_FOOTBALL_TIMEOUT
+        adaptive = _percentile(family.latencies, 0.95) * TIMEOUT_MARGIN
+        return max(self.config.API_FOOTBALL_MIN_TIMEOUT, min(self.config.API_FOOTBALL_TIMEOUT, adaptive))
+
+    # ───────────────────────── Copie locale ─────────────────────────
+
+    def _cache_path(self, endpoint: str, params: Dict) -> str:
+        key = json.dumps([endpoint.strip('/'), sorted((params or {}).items())], default=str)
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest()[:20] + '.json')
+
+    def _store(self, endpoint: str, params: Dict, data: Dict):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._cache_path(endpoint, params), 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"⚠️ Copie locale API-Football non écrite: {e}")
+
+    def _stale(self, family: _Family, endpoint: str, params: Dict) -> Optional[Dict]:
+        """Dernière copie locale, ou None si absente, illisible ou plus ancienne que l'âge maximal de la famille."""
+        path = self._cache_path(endpoint, params)
+        try:
+            age = time.time() - os.path.getmtime(path)
+            if age > STALE_MAX_AGE_HOURS.get(family.name, DEFAULT_STALE_MAX_AGE_HOURS) * 3600:
+                family.counts['expired'] += 1
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @contextmanager
+    def stale_sources(self):
+        """
+        Relève les familles servies depuis la copie locale pendant le bloc (thread courant).
+
+        Usage:
+            with api_football.stale_sources() as stale:
+                ...
+            if stale:
+                match['stale_sources'] = sorted(stale)
+        """
+        collected: Set[str] = set()
+        collectors = self._local.__dict__.setdefault('collectors', [])
+        collectors.append(collected)
+        try:
+            yield collected
+        finally:
+            collectors.remove(collected)
+
+    # ───────────────────────── Appels ─────────────────────────
+
+    def get(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+        """
+        GET sur API-Football.
+
+        Args:
+            endpoint: Chemin (ex: 'fixtures', 'fixtures/headtohead', 'odds')
+            params: Paramètres de requête
+
+        Returns:
+            Corps JSON de la réponse, la dernière copie locale si l'API est
+            indisponible, ou None (réponse non-200 sans copie, ou aucune donnée)
+        """
+        try:
+            return self.get_or_raise(endpoint, params)
+        except ApiFootballUnavailable:
+            return None
+
+    def get_or_raise(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+        """Comme get(), mais lève ApiFootballUnavailable quand rien ne peut être servi."""
+        params = params or {}
+        # Un span par appel (ex: '/transfers'), rattaché à l'étape en cours (cf. tracing)
+        with tracer.span(f"/{endpoint.strip('/')}", params=params):
+            return self._get(endpoint, params)
+
+    def _get(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        family = self._family(endpoint)
+        family.counts['calls'] += 1
+
+        if self.replaying:
+            data = self.archive.lookup(endpoint, params, self.replay_date, self.replay_run)
+            family.counts['replayed' if data is not None else 'unavailable'] += 1
+            tracer.set(served='snapshot' if data is not None else 'unavailable')
+            return data
+
+        if not family.breaker.allow():
+            family.counts['short_circuited'] += 1
+            return self._fallback(family, endpoint, params, "circuit ouvert")
+
+        start = time.monotonic()
+        try:
+            response = requests.get(
+                f"{self.config.API_FOOTBALL_BASE_URL.rstrip('/')}/{endpoint.strip('/')}",
+                headers={'x-apisports-key': os.getenv('API_FOOTBALL_KEY', '')},
+                params=params,
+                timeout=self.timeout_for(endpoint),
+            )
+        except requests.RequestException as e:
+            http_metrics.observe('api_football', f"/{endpoint.strip('/')}", type(e).__name__, time.monotonic() - start)
+            family.breaker.record_failure()
+            family.counts['failures'] += 1
+            return self._fallback(family, endpoint, params, type(e).__name__)
+
+        latency = time.monotonic() - start
+        family.latencies.append(latency)
+        tracer.set(status=response.status_code)
+        http_metrics.observe('api_football', f"/{endpoint.strip('/')}", response.status_code, latency,
+                             len(response.content))
+        http_metrics.observe_quota_headers('api_football', response.headers)
+
+        # 429 / 5xx : service dégradé (un 4xx ordinaire est une erreur de requête, pas une panne)
+        if response.status_code == 429 or response.status_code >= 500:
+            family.breaker.record_failure()
+            family.counts['failures'] += 1
+            return self._fallback(family, endpoint, params, f"HTTP {response.status_code}")
+
+        if response.status_code != 200:
+            family.breaker.record_success()
+            return None
+
+        try:
+            data = response.json()
+        except ValueError:
+            # Corps tronqué ou page d'erreur HTML malgré le 200
+            family.breaker.record_failure()
+            family.counts['failures'] += 1
+            return self._fallback(family, endpoint, params, "JSON invalide")
+        errors = data.get('errors')
+        if errors and isinstance(errors, dict) and ('rateLimit' in errors or 'requests' in errors):
+            # Quota atteint : inutile d'insister sur cette famille
+            family.breaker.record_failure()
+            family.counts['failures'] += 1
+            return self._fallback(family, endpoint, params, f"quota ({', '.join(errors)})")
+
+        family.breaker.record_success()
+        family.counts['ok'] += 1
+        if self.recording:
+            self.archive.record(endpoint, params, data)
+        if data.get('response'):
+            self._store(endpoint, params, data)
+        return data
+
+    def _fallback(self, family: _Family, endpoint: str, params: Dict, reason: str) -> Dict:
+        stale = self._stale(family, endpoint, params)
+        tracer.set(served='stale' if stale is not None else 'unavailable', reason=reason)
+        if stale is not None:
+            family.counts['stale'] += 1
+            for collected in getattr(self._local, 'collectors', []):
+                collected.add(family.name)
+            return stale
+        family.counts['unavailable'] += 1
+        raise ApiFootballUnavailable(f"{endpoint}: {reason}")
+
+    # ───────────────────────── Rapport ─────────────────────────
+
+    def report(self) -> Dict:
+        """Par famille : compteurs, latences p50/p95 (s), délai courant et état du disjoncteur."""
+        report = {}
+        for name, family in sorted(self._families.items()):
+            latencies = list(family.latencies)
+            report[name] = {
+                **family.counts,
+                'p50': round(_percentile(latencies, 0.5), 3) if latencies else None,
+                'p95': round(_percentile(latencies, 0.95), 3) if latencies else None,
+                'timeout': round(self.timeout_for(name), 2),
+                'breaker': family.breaker.state,
+            }
+        return report
+
+    def print_summary(self):
+        """Résumé console, avec alerte si des données anciennes ont été servies."""
+        report = self.report()
+        if not report:
+            return
+        stale = sum(f['stale'] for f in report.values())
+        skipped = sum(f['short_circuited'] for f in report.values())
+        unavailable = sum(f['unavailable'] for f in report.values())
+        calls = sum(f['calls'] for f in report.values())
+        if self.replaying:
+            replayed = sum(f['replayed'] for f in report.values())
+            print(f"🗄️ API-Football (snapshot): {replayed}/{calls} réponse(s) rejouée(s), {unavailable} absente(s) de l'archive")
+            return
+        expired = sum(f['expired'] for f in report.values())
+        print(f"📡 API-Football: {calls} appel(s), {skipped} court-circuité(s), "
+              f"{stale} servi(s) depuis la copie locale, {expired} copie(s) trop ancienne(s), {unavailable} sans donnée")
+        for name, family in report.items():
+            if family['breaker'] != CircuitBreaker.CLOSED or family['stale'] or family['unavailable']:
+                print(f"   ⚠️ {name}: disjoncteur {family['breaker']}, p95 {family['p95']}s, "
+                      f"délai {family['timeout']}s, {family['stale']} copie(s) locale(s)")
+
+
+# Client partagé du processus (un disjoncteur par famille pour tout le run)
+api_football = ApiFootballClient()
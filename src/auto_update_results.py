@@ -6,11 +6,16 @@ Récupère les scores via API-Football et met à jour les pronostics
 
 import sys
 sys.path.insert(0, 'src')
-import requests
 import os
+import argparse
 from datetime import datetime
 from performance_tracker import PerformanceTracker
 from config import Config
+from api_football import api_football
+from rating_store import rating_store
+from snapshot_archive import add_snapshot_option
+from tracing import tracer
+from profiling import add_profile_option, profiled
 
 class AutoResultUpdater:
     def __init__(self):
@@ -77,20 +82,21 @@ class AutoResultUpdater:
 
     def get_match_result(self, home_team, away_team, match_date):
         """Récupère le résultat d'un match via API-Football"""
-        if not self.api_key:
+        if not api_football.enabled:
             print("⚠️  API_FOOTBALL_KEY non configurée")
             return None
 
         try:
-            url = "https://v3.football.api-sports.io/fixtures"
-            headers = {'x-apisports-key': self.api_key}
             params = {
                 'date': match_date,
                 'timezone': self.config.TIMEZONE
             }
 
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            data = response.json()
+            data = api_football.get('fixtures', params) or {}
+
+            # Tous les matchs terminés du jour dans les ligues suivies alimentent les cotes Elo
+            for fixture in data.get('response') or []:
+                rating_store.update_from_fixture(fixture, self.config.INCLUDED_LEAGUE_IDS)
 
             if data.get('response'):
                 for fixture in data['response']:
@@ -215,7 +221,8 @@ class AutoResultUpdater:
             away_team = teams[1].strip()
 
             # Récupérer le résultat
-            match_result = self.get_match_result(home_team, away_team, pred['date'])
+            with tracer.span('prediction', prediction=pred['id'], match=pred['match']):
+                match_result = self.get_match_result(home_team, away_team, pred['date'])
 
             if not match_result:
                 print(f"   ⏳ Match non terminé ou non trouvé")
@@ -240,6 +247,9 @@ class AutoResultUpdater:
                 print(f"   ⚠️  Impossible de déterminer le résultat")
                 errors += 1
 
+        tracer.set(pending=len(pending), updated=updated, not_finished=not_finished, errors=errors)
+        rating_store.save()
+
         # Résumé
         print("\n" + "="*60)
         print("📊 RÉSUMÉ DE LA MISE À JOUR")
@@ -259,5 +269,13 @@ class AutoResultUpdater:
 
 
 if __name__ == "__main__":
-    updater = AutoResultUpdater()
-    updater.update_pending_predictions()
+    parser = argparse.ArgumentParser(description="Mise à jour des résultats des pronostics")
+    add_snapshot_option(parser)
+    add_profile_option(parser)
+    args = parser.parse_args()
+    if args.from_snapshot:
+        api_football.replay(args.from_snapshot)
+
+    with tracer.run('auto_update_results', snapshot=args.from_snapshot), profiled('auto_update_results', args.profile):
+        updater = AutoResultUpdater()
+        updater.update_pending_predictions()
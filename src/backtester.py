@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Backtest des règles de sélection sur l'historique des pronostics.
+
+Tous les pronostics terminés (data/predictions + data/performance_history.json,
+cf. PerformanceTracker) sont chargés une fois en colonnes numpy triées par date :
+cote, confiance, compétition, type de pari, gagné/perdu. Une configuration
+(StrategyConfig) est un filtre (cote min/max comme le min_odds de
+PredictionValidator, confiance minimale, compétitions ou types de pari exclus)
+et une mise (plate ou proportionnelle à la confiance).
+
+K configurations × N pronostics sont évaluées d'un bloc : une matrice de masques
+[K, N], les gains par pronostic, puis par configuration le taux de réussite,
+le ROI, le profit (unités) et le drawdown maximal de la courbe de gains.
+Les intervalles de confiance (95 %) du taux de réussite et du ROI viennent d'un
+bootstrap des pronostics : les B rééchantillonnages sont des poids multinomiaux
+[B, N], appliqués à toutes les configurations par un produit matriciel.
+
+Usage:
+    python src/backtester.py [--min-odds 1.6,1.8,2.0] [--max-odds 4] [--min-confidence 0,70,75]
+        [--exclude "Ligue 1"] [--exclude-each] [--stake flat,confidence] [--bootstrap 1000] [--top 20]
+        [--since 2025-01-01] [--out backtest.json]
+"""
+
+import argparse
+import itertools
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from performance_tracker import PerformanceTracker
+
+STAKES = ('flat', 'confidence')
+BOOTSTRAP_CHUNK = 100   # Rééchantillonnages traités par produit matriciel (mémoire B×N bornée)
+
+
+@dataclass(slots=True)
+class StrategyConfig:
+    min_odds: float = 0.0
+    max_odds: float = float('inf')
+    min_confidence: float = 0.0
+    excluded_leagues: Tuple[str, ...] = ()
+    excluded_bet_types: Tuple[str, ...] = ()
+    stake: str = 'flat'             # 'flat' (1 unité) ou 'confidence' (confiance / 100 unités)
+
+    def label(self) -> str:
+        parts = [f"cote {self.min_odds:g}-{self.max_odds:g}", f"conf ≥{self.min_confidence:g}", self.stake]
+        if self.excluded_leagues:
+            parts.append("sans " + "/".join(self.excluded_leagues))
+        if self.excluded_bet_types:
+            parts.append("sans " + "/".join(self.excluded_bet_types))
+        return ", ".join(parts)
+
+
+def _chronological(prediction: Dict):
+    rank = prediction['id'].rsplit('_', 1)[-1]
+    return prediction['date'], int(rank) if rank.isdigit() else 0
+
+
+class PickTable:
+    """Pronostics terminés en colonnes, triés par date."""
+
+    def __init__(self, predictions: List[Dict], since: Optional[str] = None):
+        rows = [p for p in predictions
+                if p.get('result') in ('win', 'loss') and p.get('odds') and (since is None or p['date'] >= since)]
+        # Ordre chronologique (à date égale, ordre des pronostics du jour : id 'AAAA-MM-JJ_<rang>')
+        rows.sort(key=_chronological)
+
+        self.dates = np.array([p['date'] for p in rows], dtype='U10')
+        self.odds = np.array([float(p['odds']) for p in rows])
+        self.confidence = np.array([float(p.get('confidence') or 0) for p in rows])
+        self.won = np.array([p['result'] == 'win' for p in rows])
+        self.leagues, self.league_codes = np.unique(
+            np.array([p.get('competition') or '-' for p in rows], dtype=object).astype(str), return_inverse=True)
+        self.bet_types, self.bet_type_codes = np.unique(
+            np.array([p.get('bet_type') or '-' for p in rows], dtype=object).astype(str), return_inverse=True)
+
+    def __len__(self):
+        return len(self.odds)
+
+    @classmethod
+    def load(cls, tracker: PerformanceTracker = None, since: Optional[str] = None) -> 'PickTable':
+        return cls((tracker or PerformanceTracker()).get_all_predictions(), since)
+
+
+class Backtester:
+    """Évaluation vectorisée de nombreuses configurations sur une PickTable."""
+
+    def __init__(self, table: PickTable):
+        self.table = table
+
+    def stakes(self, configs: List[StrategyConfig]) -> np.ndarray:
+        """Mises [K, N] (0 = pronostic écarté par le filtre de la configuration)."""
+        t = self.table
+        min_odds = np.array([c.min_odds for c in configs])[:, None]
+        max_odds = np.array([c.max_odds for c in configs])[:, None]
+        min_confidence = np.array([c.min_confidence for c in configs])[:, None]
+
+        # Exclusions : table [K, catégories] indexée par le code de chaque pronostic
+        excluded_leagues = np.array([np.isin(t.leagues, c.excluded_leagues) for c in configs]).reshape(len(configs), -1)
+        excluded_types = np.array([np.isin(t.bet_types, c.excluded_bet_types) for c in configs]).reshape(len(configs), -1)
+
+        selected = ((t.odds >= min_odds) & (t.odds <= max_odds) & (t.confidence >= min_confidence)
+                    & ~excluded_leagues[:, t.league_codes] & ~excluded_types[:, t.bet_type_codes])
+        by_confidence = np.array([c.stake == 'confidence' for c in configs])[:, None]
+        return np.where(selected, np.where(by_confidence, t.confidence / 100, 1.0), 0.0)
+
+    def evaluate(self, configs: List[StrategyConfig], bootstrap: int = 1000, seed: int = 0) -> List[Dict]:
+        """
+        Indicateurs de chaque configuration.
+
+        Args:
+            configs: Configurations à évaluer
+            bootstrap: Nombre de rééchantillonnages pour les intervalles de confiance (0 = aucun)
+            seed: Graine du bootstrap
+
+        Returns:
+            Une entrée par configuration : picks, hit_rate, roi, profit, staked,
+            max_drawdown, hit_rate_ci, roi_ci (bornes 2.5 % / 97.5 %)
+        """
+        t = self.table
+        stakes = self.stakes(configs)                                    # [K, N]
+        returns = np.where(t.won, t.odds - 1, -1.0)                      # Gain d'une unité misée
+        pnl = stakes * returns
+        picked = stakes > 0
+
+        picks = picked.sum(axis=1)
+        hits = (picked & t.won).sum(axis=1)
+        staked = stakes.sum(axis=1)
+        profit = pnl.sum(axis=1)
+
+        # Drawdown : plus grande baisse depuis un sommet de la courbe de gains cumulés (départ à 0)
+        equity = np.concatenate([np.zeros((len(configs), 1)), np.cumsum(pnl, axis=1)], axis=1)
+        drawdown = (np.maximum.accumulate(equity, axis=1) - equity).max(axis=1)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            hit_rate = hits / picks
+            roi = profit / staked
+            hit_ci, roi_ci = self._bootstrap(picked, stakes, pnl, bootstrap, seed)
+
+        results = []
+        for k, config in enumerate(configs):
+            results.append({
+                'config': config,
+                'label': config.label(),
+                'picks': int(picks[k]),
+                'hit_rate': _round(hit_rate[k]),
+                'roi': _round(roi[k]),
+                'profit': round(float(profit[k]), 2),
+                'staked': round(float(staked[k]), 2),
+                'max_drawdown': round(float(drawdown[k]), 2),
+                'hit_rate_ci': [_round(value) for value in hit_ci[k]] if hit_ci is not None else None,
+                'roi_ci': [_round(value) for value in roi_ci[k]] if roi_ci is not None else None,
+            })
+        return results
+
+    def _bootstrap(self, picked, stakes, pnl, samples: int, seed: int):
+        """Intervalles à 95 % du taux de réussite et du ROI ([K, 2] chacun), ou (None, None)."""
+        n = len(self.table)
+        if not samples or not n:
+            return None, None
+        rng = np.random.default_rng(seed)
+        wins = (picked & self.table.won).astype(float).T                # [N, K]
+        picked, stakes, pnl = picked.astype(float).T, stakes.T, pnl.T
+        hit_rates, rois = [], []
+        for start in range(0, samples, BOOTSTRAP_CHUNK):
+            weights = rng.multinomial(n, np.full(n, 1 / n), size=min(BOOTSTRAP_CHUNK, samples - start)).astype(float)
+            hit_rates.append((weights @ wins) / (weights @ picked))       # [B, K]
+            rois.append((weights @ pnl) / (weights @ stakes))
+        hit_rates, rois = np.concatenate(hit_rates), np.concatenate(rois)
+        return (np.nanpercentile(hit_rates, [2.5, 97.5], axis=0).T,
+                np.nanpercentile(rois, [2.5, 97.5], axis=0).T)
+
+
+def _round(value, digits: int = 4):
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+def grid(min_odds=(0.0,), max_odds=(float('inf'),), min_confidence=(0.0,), excluded_leagues=((),),
+         excluded_bet_types=((),), stakes=('flat',)) -> List[StrategyConfig]:
+    """Produit cartésien des paramètres -> configurations."""
+    return [StrategyConfig(*values) for values in
+            itertools.product(min_odds, max_odds, min_confidence, excluded_leagues, excluded_bet_types, stakes)]
+
+
+def _floats(value: str) -> List[float]:
+    return [float(item) for item in value.split(',') if item.strip()]
+
+
+def print_results(results: List[Dict], top: int):
+    print(f"\n{'configuration':<60}{'picks':>7}{'réussite':>10}{'ROI':>9}{'IC 95% ROI':>18}{'profit':>9}{'DD max':>8}")
+    for result in results[:top]:
+        ci = result['roi_ci']
+        ci = f"[{ci[0]:+.1%}, {ci[1]:+.1%}]" if ci and None not in ci else '-'
+        hit_rate = f"{result['hit_rate']:.1%}" if result['hit_rate'] is not None else '-'
+        roi = f"{result['roi']:+.1%}" if result['roi'] is not None else '-'
+        print(f"{result['label'][:59]:<60}{result['picks']:>7}{hit_rate:>10}{roi:>9}{ci:>18}"
+              f"{result['profit']:>9.1f}{result['max_drawdown']:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest de règles de sélection sur l'historique")
+    parser.add_argument('--min-odds', default='0,1.6,1.8,2.0', help="Cotes minimales (liste)")
+    parser.add_argument('--max-odds', default='inf', help="Cotes maximales (liste)")
+    parser.add_argument('--min-confidence', default='0,65,70,75,80', help="Confiances minimales (liste)")
+    parser.add_argument('--exclude', action='append', default=[], help="Compétition exclue (répétable)")
+    parser.add_argument('--exclude-each', action='store_true', help="Essaie aussi l'exclusion de chaque compétition")
+    parser.add_argument('--stake', default='flat', help=f"Mises (liste parmi {', '.join(STAKES)})")
+    parser.add_argument('--bootstrap', type=int, default=1000, help="Rééchantillonnages (0 = sans intervalles)")
+    parser.add_argument('--since', default=None, help="Date de début AAAA-MM-JJ")
+    parser.add_argument('--top', type=int, default=20, help="Configurations affichées (triées par ROI)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=None, help="Fichier JSON de toutes les configurations")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    table = PickTable.load(since=args.since)
+    if not len(table):
+        print("❌ Aucun pronostic terminé à rejouer")
+        raise SystemExit(1)
+
+    exclusions = [tuple(args.exclude)]
+    if args.exclude_each:
+        exclusions += [tuple(args.exclude) + (league,) for league in table.leagues if league not in args.exclude]
+    stakes = [stake for stake in args.stake.split(',') if stake in STAKES] or ['flat']
+    configs = grid(_floats(args.min_odds), _floats(args.max_odds), _floats(args.min_confidence),
+                   exclusions, ((),), stakes)
+
+    results = Backtester(table).evaluate(configs, bootstrap=args.bootstrap, seed=args.seed)
+    results.sort(key=lambda result: (result['roi'] is None, -(result['roi'] or 0)))
+    elapsed = time.perf_counter() - started
+
+    print(f"📊 {len(table)} pronostics terminés ({table.dates[0]} → {table.dates[-1]}), "
+          f"{len(configs)} configurations, bootstrap {args.bootstrap}: {elapsed:.1f}s")
+    print_results(results, args.top)
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump([{**result, 'config': {name: getattr(result['config'], name)
+                                              for name in StrategyConfig.__slots__}} for result in results],
+                      f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Résultats: {args.out}")
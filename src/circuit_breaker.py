@@ -0,0 +1,86 @@
+"""
+Disjoncteur (circuit breaker) partagé par les appels réseau.
+
+Après `failure_threshold` échecs consécutifs, le circuit s'ouvre : les appels
+suivants sont court-circuités pendant `reset_timeout` secondes. Passé ce délai,
+un appel de test est autorisé (état semi-ouvert) ; s'il réussit le circuit se
+referme, sinon il se rouvre pour un nouveau délai. Un appel de test dont
+l'issue n'est jamais enregistrée (exception imprévue, annulation) n'immobilise
+pas le circuit : un nouvel appel de test est autorisé après `reset_timeout`.
+"""
+
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """Levée quand un appel est refusé parce que le circuit est ouvert."""
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        """
+        Args:
+            name: Nom du service protégé (pour les logs)
+            failure_threshold: Nombre d'échecs consécutifs avant ouverture
+            reset_timeout: Durée (s) d'ouverture avant un appel de test
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_at = None
+        self.short_circuited = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Indique si un appel peut être tenté maintenant."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            now = time.monotonic()
+            if self.state == self.OPEN and now - self.opened_at >= self.reset_timeout:
+                # Un seul appel de test à la fois
+                self.state = self.HALF_OPEN
+                self.probe_at = now
+                return True
+
+            if self.state == self.HALF_OPEN and now - self.probe_at >= self.reset_timeout:
+                # Appel de test resté sans issue enregistrée : nouvel essai
+                self.probe_at = now
+                return True
+
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        """Enregistre un appel réussi : referme le circuit."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        """Enregistre un échec : ouvre le circuit si le seuil est atteint."""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"⚡ Circuit {self.name} ouvert après {self.consecutive_failures} échec(s)")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def retry_in(self) -> float:
+        """Secondes restantes avant le prochain appel de test (0 si fermé)."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return 0.0
+            since = self.opened_at if self.state == self.OPEN else self.probe_at
+            return max(0.0, self.reset_timeout - (time.monotonic() - since))
@@ -3,11 +3,13 @@ Analyseur utilisant Claude (Anthropic) au lieu de Gemini.
 Claude est plus rigoureux, moins sujet aux hallucinations, et meilleur pour suivre des instructions complexes.
 """
 
-import anthropic
 import json
 import os
 from datetime import datetime
 from config import Config
+from llm_provider import LLMRequest, LLMUnavailableError, build_router
+from prompt_budget import estimate_tokens
+from response_schema import analysis_tool, validate_analysis
 
 
 class ClaudeAnalyzer:
@@ -15,14 +17,14 @@ class ClaudeAnalyzer:
 
     def __init__(self):
         self.config = Config()
-        self.api_key = os.getenv('ANTHROPIC_API_KEY')
+        self.api_key = self.config.ANTHROPIC_API_KEY
 
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY manquante dans .env")
 
-        self.client = anthropic.Anthropic(api_key=self.api_key)
-        # Utiliser Claude Sonnet 4.5 (le meilleur modèle actuel - mai 2025)
-        self.model = "claude-sonnet-4-20250514"
+        # Claude en premier, Gemini en secours si GEMINI_API_KEY est configurée
+        self.llm = build_router(self.config, primary='claude')
+        self.model = self.config.CLAUDE_MODEL
 
     def load_prompt_template(self):
         """Charge le prompt depuis le fichier."""
@@ -43,7 +45,7 @@ RÈGLES:
 - 3-5 pronostics de QUALITÉ maximum
 - Combiné OBLIGATOIRE
 
-Réponds en JSON valide."""
+Soumets ton analyse via l'outil fourni."""
 
     def analyze_matches(self, matches_formatted, stats=None):
         """Analyse les matchs avec Claude."""
@@ -68,7 +70,7 @@ Réponds en JSON valide."""
         try:
             with open(f'data/debug_prompt_{today}.txt', 'w', encoding='utf-8') as f:
                 f.write(prompt)
-            print(f"🐛 DEBUG: Prompt sauvegardé dans data/debug_prompt_{today}.txt ({len(prompt)} caractères)")
+            print(f"🐛 DEBUG: Prompt sauvegardé dans data/debug_prompt_{today}.txt ({len(prompt)} caractères, ~{estimate_tokens(prompt)} tokens)")
         except Exception as e:
             print(f"⚠️ Impossible de sauvegarder debug prompt: {e}")
 
@@ -76,112 +78,35 @@ Réponds en JSON valide."""
         if learnings_summary:
             prompt = prompt + "\n\n" + learnings_summary
 
-        # Système de retry pour Claude avec backoff exponentiel
-        max_retries = 5  # Augmenté de 2 à 5 pour gérer les surcharges
-        import time
-
-        for attempt in range(max_retries):
-            try:
-                print(f"🤖 Analyse avec Claude (tentative {attempt + 1}/{max_retries})...")
-
-                # Appel API Claude avec streaming activé pour longues requêtes
-                result_text = ""
-                with self.client.messages.stream(
-                    model=self.model,
-                    max_tokens=32000,  # AUGMENTÉ: permet des analyses beaucoup plus détaillées sans troncature
-                    temperature=0.3,  # Raisonnement rigoureux et cohérent
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ]
-                ) as stream:
-                    for text in stream.text_stream:
-                        result_text += text
-
-                result_text = result_text.strip()
-
-                # Nettoyer markdown si présent
-                if '```json' in result_text:
-                    result_text = result_text.split('```json')[1].split('```')[0].strip()
-                elif '```' in result_text:
-                    result_text = result_text.split('```')[1].split('```')[0].strip()
-
-                # Nettoyer les caractères invisibles
-                result_text = result_text.replace('\u200b', '').replace('\ufeff', '')
-
-                # Trouver le premier { et le dernier }
-                start = result_text.find('{')
-                end = result_text.rfind('}')
-
-                if start != -1 and end != -1:
-                    result_text = result_text[start:end+1]
-
-                # Parser JSON
-                result = json.loads(result_text)
-
-                # Limiter au nombre maximum de prédictions
-                if 'recommendations' in result and len(result['recommendations']) > self.config.MAX_PREDICTIONS:
-                    result['recommendations'] = result['recommendations'][:self.config.MAX_PREDICTIONS]
-                    result['total_retained'] = len(result['recommendations'])
-
-                print(f"✅ Analyse Claude réussie ({len(result.get('recommendations', []))} pronostics)")
-                return result
-
-            except json.JSONDecodeError as e:
-                print(f"⚠️ Tentative {attempt + 1}/{max_retries} - Erreur parsing JSON: {e}")
-                if attempt < max_retries - 1:
-                    # Attendre avant de retry (backoff exponentiel)
-                    wait_time = 2 ** attempt  # 1s, 2s, 4s, 8s, 16s
-                    print(f"⏳ Attente {wait_time}s avant nouvelle tentative...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    print(f"❌ Échec après {max_retries} tentatives")
-                    print(f"Réponse brute: {result_text[:500] if 'result_text' in locals() else 'N/A'}")
-                    return None
-
-            except anthropic.APIError as e:
-                error_str = str(e)
-                print(f"❌ Erreur API Claude: {e}")
-
-                # Si c'est une erreur de surcharge (529) ou rate limit (429), attendre plus longtemps
-                if '529' in error_str or 'overloaded' in error_str.lower():
-                    if attempt < max_retries - 1:
-                        # Attendre plus longtemps pour les surcharges (backoff exponentiel agressif)
-                        wait_time = 5 * (2 ** attempt)  # 5s, 10s, 20s, 40s, 80s
-                        print(f"⏳ Serveurs Claude surchargés. Attente {wait_time}s avant nouvelle tentative...")
-                        time.sleep(wait_time)
-                        continue
-                elif '429' in error_str:
-                    if attempt < max_retries - 1:
-                        # Rate limit - attendre encore plus longtemps
-                        wait_time = 10 * (2 ** attempt)  # 10s, 20s, 40s, 80s, 160s
-                        print(f"⏳ Rate limit atteint. Attente {wait_time}s avant nouvelle tentative...")
-                        time.sleep(wait_time)
-                        continue
-                else:
-                    # Autre erreur API - retry avec délai normal
-                    if attempt < max_retries - 1:
-                        wait_time = 2 ** attempt
-                        print(f"⏳ Attente {wait_time}s avant nouvelle tentative...")
-                        time.sleep(wait_time)
-                        continue
-
-                print(f"❌ Échec après {max_retries} tentatives")
-                return None
-
-            except Exception as e:
-                print(f"❌ Erreur inattendue: {e}")
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    print(f"⏳ Attente {wait_time}s avant nouvelle tentative...")
-                    time.sleep(wait_time)
-                    continue
-                return None
-
-        return None
+        # Retries, backoff, deadline et basculement Gemini gérés par la couche fournisseurs
+        request = LLMRequest(
+            prompt=prompt,
+            tool=analysis_tool(),
+            max_tokens=32000,  # AUGMENTÉ: permet des analyses beaucoup plus détaillées sans troncature
+            temperature=0.3,  # Raisonnement rigoureux et cohérent
+            stream=True  # Streaming activé pour longues requêtes
+        )
+
+        try:
+            result = self.llm.generate_sync(request, validator=validate_analysis)
+        except LLMUnavailableError as e:
+            print(f"❌ Échec analyse: {e}")
+            return None
+        except TypeError:
+            # Appel incompatible avec le SDK installé : échec explicite plutôt qu'une analyse vide
+            raise
+        except Exception as e:
+            # Dernier recours : une erreur imprévue ne doit pas interrompre le run
+            print(f"❌ Échec analyse (erreur inattendue {type(e).__name__}): {e}")
+            return None
+
+        # Limiter au nombre maximum de prédictions
+        if 'recommendations' in result and len(result['recommendations']) > self.config.MAX_PREDICTIONS:
+            result['recommendations'] = result['recommendations'][:self.config.MAX_PREDICTIONS]
+            result['total_retained'] = len(result['recommendations'])
+
+        print(f"✅ Analyse {self.llm.last_provider} réussie ({len(result.get('recommendations', []))} pronostics)")
+        return result
 
     def _get_learnings(self):
         """Récupère les apprentissages des erreurs passées."""
@@ -0,0 +1,343 @@
+"""
+Encodage compact des matchs enrichis pour le prompt d'analyse.
+
+Alternative à MatchScraper.format_matches_for_prompt (cadres, emoji et libellés
+répétés à chaque ligne) :
+- les sections propres à une ligue (classement, buteurs, passeurs) sont émises
+  une seule fois par ligue au lieu d'être répétées sous chaque match
+- forme, H2H et classement sont rendus en tables denses type CSV, avec une
+  légende unique en tête
+
+Lit le modèle typé de match_model (matchs projetés à l'ingestion).
+Même interface que MatchScraper (format_match_sections, format_match_block,
+format_matches_for_prompt) : PromptBudget fonctionne avec les deux formats.
+Activation : PROMPT_FORMAT=compact.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+
+LEGEND = (
+    "LÉGENDE: 🏠=domicile ✈️=extérieur | V/N/D=victoire/nul/défaite | dates aa-mm-jj | '-'=inconnu\n"
+    "Tables: ligne d'en-tête (colonnes) puis une ligne par entrée. "
+    "Forme: plus récent d'abord, lieu D/E=joué à domicile/extérieur, score=buts pour-contre de l'équipe.\n"
+)
+
+
+def _short_date(value: Optional[str]) -> str:
+    """'2025-11-01T14:00:00+00:00' -> '25-11-01'."""
+    return value[2:10] if value and len(value) >= 10 else '-'
+
+
+def _value(value) -> str:
+    return '-' if value is None or value == '' else str(value)
+
+
+def _wdl(win, draw, lose) -> str:
+    return '-' if win is None else f"{win}-{draw}-{lose}"
+
+
+def _percent(*probabilities) -> str:
+    """(0.52, 0.26) -> '52/26'."""
+    return "/".join(f"{probability * 100:.0f}" for probability in probabilities)
+
+
+class CompactFormatter:
+    """Rendu dense des matchs, sections de ligue partagées."""
+
+    # ───────────────────────── Sections de ligue (une fois par ligue) ─────────────────────────
+
+    @staticmethod
+    def league_key(match: Dict):
+        return match.get('league_id') or match.get('competition')
+
+    def format_league_block(self, matches: List[Dict]) -> str:
+        """Classement des équipes du jour, buteurs et passeurs d'une ligue."""
+        first = matches[0]
+        formatted = f"== LIGUE: {first.get('competition', '-')} ==\n"
+
+        # Classement : uniquement les équipes qui jouent aujourd'hui
+        rows = {}
+        for match in matches:
+            if match.get('league_standings'):
+                for _, row in match['league_standings'].for_match(match):
+                    rows[row.team_name] = row
+
+        if rows:
+            formatted += "classement (rg,équipe,pts,V-N-D,bp:bc,diff,dom V-N-D,ext V-N-D):\n"
+            for row in sorted(rows.values(), key=lambda r: r.rank or 0):
+                formatted += (
+                    f"  {_value(row.rank)},{row.team_name},{_value(row.points)},"
+                    f"{_wdl(row.win, row.draw, row.lose)},{_value(row.goals_for)}:{_value(row.goals_against)},"
+                    f"{_value(row.goals_diff)},{_wdl(row.home_win, row.home_draw, row.home_lose)},"
+                    f"{_wdl(row.away_win, row.away_draw, row.away_lose)}\n"
+                )
+
+        teams = {name for match in matches for name in (match['home'], match['away'])}
+        for key, label, stat in (('league_topscorers', 'buteurs', 'goals'), ('league_topassists', 'passeurs', 'assists')):
+            players = next((match[key] for match in matches if match.get(key)), None)
+            if not players:
+                continue
+            formatted += f"{label} (joueur,équipe,{'buts' if stat == 'goals' else 'passes'}; * = joue aujourd'hui):\n  "
+            formatted += "; ".join(
+                f"{'*' if player.team in teams else ''}{player.player},{player.team},{_value(getattr(player, stat))}"
+                for player in players[:10]
+            ) + "\n"
+
+        return formatted + "\n"
+
+    # ───────────────────────── Sections par match ─────────────────────────
+
+    def format_match_sections(self, match: Dict) -> List[Tuple[str, str]]:
+        """
+        Sections (clé, texte) d'un match, mêmes clés que MatchScraper.format_match_sections
+        (classement, buteurs et passeurs sont dans le bloc de ligue).
+        """
+        sections = [('header', f"{match.get('competition', '-')} | {match.get('time', '-')}\n")]
+        if match.get('stale_sources'):
+            sections.append(('stale', f"⚠️ copie locale (API indisponible, possiblement ancienne): "
+                                      f"{','.join(match['stale_sources'])}\n"))
+        sections.append(('season_stats', self._season_stats(match)))
+        sections.append(('recent_form', self._form(match, 'home') + self._form(match, 'away')))
+        sections.append(('head_to_head', self._head_to_head(match)))
+        sections.append(('injuries', self._injuries(match)))
+        sections.append(('odds', self._odds(match)))
+        sections.append(('model', self._model(match)))
+        sections.append(('market', self._market(match)))
+        sections.append(('ratings', self._ratings(match)))
+        sections.append(('api_prediction', self._api_prediction(match)))
+        sections.append(('lineups', self._lineups(match)))
+        sections.append(('sidelined', self._sidelined(match)))
+        sections.append(('coaches', self._coaches(match)))
+        sections.append(('transfers', self._transfers(match)))
+        return sections
+
+    def _season_stats(self, match: Dict) -> str:
+        lines = []
+        for side, emoji in (('home', '🏠'), ('away', '✈️')):
+            stats = match.get(f'{side}_season_stats')
+            if not stats:
+                continue
+            record, goals, biggest = stats.record, stats.goals, stats.biggest
+            if record:
+                venue_wins = record.wins_home if side == 'home' else record.wins_away
+                played, wins = record.played, f"{record.wins}({venue_wins})"
+                draws, loses = record.draws, record.loses
+            else:
+                played = wins = draws = loses = '-'
+            if goals:
+                scored = f"{goals.scored}({goals.scored_avg})"
+                conceded = f"{goals.conceded}({goals.conceded_avg})"
+            else:
+                scored = conceded = '-'
+            if biggest:
+                best = _value(biggest.win_home if side == 'home' else biggest.win_away)
+                worst = _value(biggest.loss_home if side == 'home' else biggest.loss_away)
+            else:
+                best = worst = '-'
+            lines.append(f"  {emoji},{played},{wins},{draws},{loses},{scored},{conceded},{best},{worst}\n")
+
+        if not lines:
+            return ""
+        return "saison (équipe,J,V(dom|ext),N,D,bp(moy),bc(moy),+large V,+lourde D):\n" + "".join(lines)
+
+    def _form(self, match: Dict, side: str) -> str:
+        games = match.get(f'{side}_recent_form')
+        if not games:
+            return ""
+        team = match[side]
+        emoji = '🏠' if side == 'home' else '✈️'
+        rows, results = [], ""
+        for game in games[:10]:
+            at_home = game.home == team
+            opponent = game.away if at_home else game.home
+            scored, conceded = (game.home_goals, game.away_goals) if at_home else (game.away_goals, game.home_goals)
+            if scored is None or conceded is None:
+                result = '-'
+            else:
+                result = "V" if scored > conceded else ("N" if scored == conceded else "D")
+            results += result
+            rows.append(
+                f"  {_short_date(game.date)},{'D' if at_home else 'E'},"
+                f"{opponent},{_value(scored)}-{_value(conceded)},{result}\n"
+            )
+        return f"forme {emoji} {results} (date,lieu,adversaire,score,res):\n" + "".join(rows)
+
+    def _head_to_head(self, match: Dict) -> str:
+        games = match.get('head_to_head')
+        if not games:
+            return ""
+        return "h2h (date,domicile,score,extérieur):\n" + "".join(
+            f"  {_short_date(game.date)},{game.home},{_value(game.home_goals)}-{_value(game.away_goals)},{game.away}\n"
+            for game in games[:10]
+        )
+
+    def _injuries(self, match: Dict) -> str:
+        formatted = ""
+        for side, emoji in (('home', '🏠'), ('away', '✈️')):
+            injuries = match.get(f'{side}_injuries')
+            if not injuries:
+                continue
+            # L'API renvoie souvent le même joueur plusieurs fois (une entrée par match manqué)
+            seen = {}
+            for injury in injuries[:10]:
+                seen.setdefault(injury.player, injury.reason)
+            formatted += f"absents {emoji}: " + "; ".join(f"{name} ({reason})" for name, reason in seen.items()) + "\n"
+        return formatted
+
+    def _odds(self, match: Dict) -> str:
+        markets = {'Match Winner': '1X2', 'Goals Over/Under': 'O/U', 'Both Teams Score': 'BTTS'}
+        rows = []
+        for odds in (match.get('odds') or [])[:3]:
+            for market in odds.markets:
+                label = markets[market.name]
+                values = market.values[:4] if label == 'O/U' else market.values
+                rows.append(
+                    f"  {odds.bookmaker},{label}," + " ".join(f"{value}={odd}" for value, odd in values) + "\n"
+                )
+        return "cotes (bookmaker,marché,issue=cote):\n" + "".join(rows) if rows else ""
+
+    def _model(self, match: Dict) -> str:
+        model = match.get('model')
+        if not model:
+            return ""
+        return (
+            "modèle (xG 🏠-✈️,score probable,1/N/2 %,O1.5/O2.5/O3.5 %,BTTS %,🏠-1.5/+1.5 %): "
+            f"{model.home_xg}-{model.away_xg},{model.likely_score},{_percent(model.home, model.draw, model.away)},"
+            f"{_percent(model.over['1.5'], model.over['2.5'], model.over['3.5'])},{_percent(model.btts)},"
+            f"{_percent(model.handicap['-1.5'], model.handicap['+1.5'])}\n"
+        )
+
+    def _market(self, match: Dict) -> str:
+        market = match.get('market')
+        if not market:
+            return ""
+        rows = []
+        for outcome in market.outcomes:
+            fair = _percent(outcome.fair) if outcome.fair is not None else '-'
+            rows.append(f"{outcome.market} {outcome.outcome}={outcome.best_odds}/{fair}")
+        formatted = "marché (issue=cote max/proba sans marge %): " + " ".join(rows)
+        if market.overround:
+            formatted += " | marge " + " ".join(f"{label}={_percent(margin)}" for label, margin in market.overround.items())
+        formatted += "\n"
+        if market.value:
+            formatted += "value (issue@cote,modèle %,espérance %): " + " ".join(
+                f"{o.market} {o.outcome}@{o.best_odds},{_percent(o.model)},{o.edge * 100:+.0f}" for o in market.value
+            ) + "\n"
+        return formatted
+
+    def _ratings(self, match: Dict) -> str:
+        ratings = match.get('ratings')
+        if not ratings:
+            return ""
+        return (
+            "elo (🏠,✈️,avantage terrain,attendu 🏠 %): "
+            f"{ratings.home},{ratings.away},{ratings.home_advantage:+},{_percent(ratings.expected_home)}\n"
+        )
+
+    def _api_prediction(self, match: Dict) -> str:
+        pred = match.get('api_prediction')
+        if not pred:
+            return ""
+        parts = []
+        if pred.verdict:
+            parts.append(f"gagnant {pred.verdict.winner or '-'}")
+            parts.append(f"conseil {pred.verdict.advice or '-'}")
+        comp = pred.comparison
+        if comp:
+            parts.append(
+                f"forme {comp.form_home or '-'}/{comp.form_away or '-'} "
+                f"att {comp.att_home or '-'}/{comp.att_away or '-'} "
+                f"déf {comp.def_home or '-'}/{comp.def_away or '-'}"
+            )
+        return "api (indicatif, fais ta propre analyse): " + " | ".join(parts) + "\n" if parts else ""
+
+    def _lineups(self, match: Dict) -> str:
+        formatted = ""
+        for lineup in match.get('lineups') or []:
+            emoji = "🏠" if lineup.team_name == match['home'] else "✈️"
+            formatted += f"compo {emoji} {lineup.formation} ({lineup.coach}): " + ", ".join(lineup.start_xi[:11]) + "\n"
+        return formatted
+
+    def _sidelined(self, match: Dict) -> str:
+        formatted = ""
+        for side, emoji in (('home', '🏠'), ('away', '✈️')):
+            sidelined = match.get(f'{side}_sidelined')
+            if not sidelined:
+                continue
+            formatted += f"écartés {emoji}: " + "; ".join(
+                f"{s.player} ({s.type}, {_short_date(s.start)})" for s in sidelined[:5]
+            ) + "\n"
+        return formatted
+
+    def _coaches(self, match: Dict) -> str:
+        parts = []
+        for side, emoji in (('home', '🏠'), ('away', '✈️')):
+            coach = match.get(f'{side}_coach')
+            if not coach:
+                continue
+            parts.append(
+                f"{emoji} {coach.name} ({coach.nationality}, {_value(coach.age)} ans, depuis {_short_date(coach.since)})"
+            )
+        return "entraîneurs: " + "; ".join(parts) + "\n" if parts else ""
+
+    def _transfers(self, match: Dict) -> str:
+        formatted = ""
+        for side, emoji in (('home', '🏠'), ('away', '✈️')):
+            entries = []
+            for transfer in (match.get(f'{side}_transfers') or [])[:5]:
+                if match[side] not in (transfer.team_out, transfer.team_in):
+                    continue
+                incoming = transfer.team_in == match[side]
+                direction = "←" if incoming else "→"
+                other = transfer.team_out if incoming else transfer.team_in
+                entries.append(
+                    f"{transfer.player} {direction} {other} ({_value(transfer.type)}, {_short_date(transfer.date)})"
+                )
+            if entries:
+                formatted += f"transferts {emoji}: " + "; ".join(entries) + "\n"
+        return formatted
+
+    # ───────────────────────── Assemblage ─────────────────────────
+
+    def format_match_block(self, match: Dict, sections: List[Tuple[str, str]] = None) -> str:
+        if sections is None:
+            sections = self.format_match_sections(match)
+        return "".join(text for _, text in sections) + "\n"
+
+    def format_matches_for_prompt(self, matches: List[Dict], blocks: List[str] = None) -> str:
+        """
+        Formate les matchs en encodage compact, regroupés par ligue.
+
+        Args:
+            matches: Matchs enrichis
+            blocks: Blocs déjà rendus par match (ex: réduits par prompt_budget.PromptBudget)
+        """
+        if not matches:
+            return "Aucun match disponible aujourd'hui."
+
+        if blocks is None:
+            blocks = [self.format_match_block(match) for match in matches]
+
+        leagues = {}
+        for index, match in enumerate(matches):
+            leagues.setdefault(self.league_key(match), []).append(index)
+
+        formatted = "MATCHS DU JOUR - DONNÉES API-FOOTBALL (format compact)\n"
+        formatted += LEGEND + "\n"
+
+        number = 0
+        for indexes in leagues.values():
+            formatted += self.format_league_block([matches[i] for i in indexes])
+            for i in indexes:
+                number += 1
+                formatted += f"MATCH #{number}: 🏠 {matches[i]['home']} vs ✈️ {matches[i]['away']} | {blocks[i]}"
+
+        formatted += "🎯 INSTRUCTION: Analyse TOUTES ces données réelles pour identifier les VALUE BETS.\n"
+        if any(match.get('stale_sources') for match in matches):
+            formatted += "Les cotes fournies sont RÉELLES ; les données marquées ⚠️ viennent d'une copie locale, possiblement ancienne.\n"
+        else:
+            formatted += "Les cotes fournies sont RÉELLES et EN TEMPS RÉEL.\n"
+        formatted += "NE PAS inventer de données - TOUT est fourni ci-dessus.\n\n"
+
+        return formatted
@@ -11,6 +11,7 @@ class Config:
 
     # API Keys
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
     TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
     TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
@@ -20,6 +21,61 @@ class Config:
     MIN_ODDS = float(os.getenv('MIN_ODDS', 1.60))
     MAX_ODDS = float(os.getenv('MAX_ODDS', 4.00))
     MAX_PREDICTIONS = int(os.getenv('MAX_PREDICTIONS', 10))
+
+    # Fournisseurs LLM (Claude principal, Gemini en secours)
+    CLAUDE_MODEL = os.getenv('CLAUDE_MODEL', 'claude-sonnet-4-20250514')
+    GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
+    ANTHROPIC_BASE_URL = os.getenv('ANTHROPIC_BASE_URL')  # Serveur local benchmarks/llm_standin.py (optionnel)
+    GEMINI_API_ENDPOINT = os.getenv('GEMINI_API_ENDPOINT')  # Idem pour Gemini (transport REST)
+    LLM_DEADLINE_SECONDS = float(os.getenv('LLM_DEADLINE_SECONDS', 900))  # Délai global par appel (retries inclus)
+    LLM_ATTEMPT_TIMEOUT = float(os.getenv('LLM_ATTEMPT_TIMEOUT', 300))  # Délai d'une tentative (au-delà : retry/basculement)
+    LLM_MAX_ATTEMPTS = int(os.getenv('LLM_MAX_ATTEMPTS', 5))  # Tentatives par fournisseur
+    LLM_BACKOFF_BASE = float(os.getenv('LLM_BACKOFF_BASE', 2.0))
+    LLM_BACKOFF_MAX = float(os.getenv('LLM_BACKOFF_MAX', 60.0))
+    LLM_BREAKER_THRESHOLD = int(os.getenv('LLM_BREAKER_THRESHOLD', 3))
+    LLM_BREAKER_RESET_SECONDS = float(os.getenv('LLM_BREAKER_RESET_SECONDS', 120))
+
+    # Sources de matchs (FlashScore + API-Football, fusionnées et dédoublonnées)
+    SOURCES_DEADLINE_SECONDS = float(os.getenv('SOURCES_DEADLINE_SECONDS', 25))  # Délai commun aux sources lancées en parallèle
+    SOURCE_MERGE_KICKOFF_TOLERANCE_MINUTES = int(os.getenv('SOURCE_MERGE_KICKOFF_TOLERANCE_MINUTES', 20))
+
+    # URLs des sources (à rediriger vers benchmarks/api_standin.py pour les tests hors ligne)
+    API_FOOTBALL_BASE_URL = os.getenv('API_FOOTBALL_BASE_URL', 'https://v3.football.api-sports.io')
+    FLASHSCORE_URL = os.getenv('FLASHSCORE_URL', 'https://www.flashscore.com/football/')
+    TELEGRAM_API_URL = os.getenv('TELEGRAM_API_URL')  # Défaut python-telegram-bot : https://api.telegram.org/bot
+
+    # API-Football (disjoncteur par famille d'endpoints, délai adaptatif au p95 observé)
+    API_FOOTBALL_TIMEOUT = float(os.getenv('API_FOOTBALL_TIMEOUT', 10))  # Délai maximal par appel
+    API_FOOTBALL_MIN_TIMEOUT = float(os.getenv('API_FOOTBALL_MIN_TIMEOUT', 2))
+    API_FOOTBALL_BREAKER_THRESHOLD = int(os.getenv('API_FOOTBALL_BREAKER_THRESHOLD', 3))
+    API_FOOTBALL_BREAKER_RESET_SECONDS = float(os.getenv('API_FOOTBALL_BREAKER_RESET_SECONDS', 60))
+    SNAPSHOT_ARCHIVE = os.getenv('SNAPSHOT_ARCHIVE', 'true').lower() == 'true'  # Archive des réponses brutes (data/snapshots)
+    RUN_REPORTS = os.getenv('RUN_REPORTS', 'true').lower() == 'true'  # Rapport de traçage par run (data/runs)
+    METRICS_TEXTFILE = os.getenv('METRICS_TEXTFILE')  # Export Prometheus (défaut : data/metrics/football_predictor.prom)
+    PROFILE = os.getenv('PROFILE') or None  # Profilage des scripts : 'cpu', 'mem' ou 'wall' (cf. profiling, --profile)
+    PROFILE_INTERVAL_MS = float(os.getenv('PROFILE_INTERVAL_MS', 5))  # Période d'échantillonnage du mode 'wall'
+
+    # Présélection des matchs (cascade : tri rapide puis analyse approfondie)
+    SCREENING_MODE = os.getenv('SCREENING_MODE', 'local')  # 'local' (score déterministe), 'llm' (modèle rapide) ou 'off'
+    SCREENING_MODEL = os.getenv('SCREENING_MODEL', 'claude-3-5-haiku-20241022')
+    SCREENING_MIN_SCORE = float(os.getenv('SCREENING_MIN_SCORE', 45))  # Score minimum (0-100) pour l'analyse approfondie
+    SCREENING_MAX_SHORTLIST = int(os.getenv('SCREENING_MAX_SHORTLIST', 12))
+    SCREENING_MIN_SHORTLIST = int(os.getenv('SCREENING_MIN_SHORTLIST', 3))  # Toujours garder au moins N matchs
+    SCREENING_AUDIT_RATE = float(os.getenv('SCREENING_AUDIT_RATE', 0.1))  # Part des rejetés analysés quand même (mesure du rappel)
+
+    # Budget de tokens du prompt d'analyse (estimation locale, 0 = illimité)
+    PROMPT_MATCH_TOKEN_BUDGET = int(os.getenv('PROMPT_MATCH_TOKEN_BUDGET', 2500))
+    PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', 60000))  # Total, réparti entre les matchs
+    PROMPT_FORMAT = os.getenv('PROMPT_FORMAT', 'boxed')  # 'boxed' (cadres) ou 'compact' (tables denses, cf. compact_formatter)
+
+    # Modèle de buts Dixon-Coles (probabilités injectées dans le prompt, cf. goal_model)
+    GOAL_MODEL = os.getenv('GOAL_MODEL', 'true').lower() == 'true'
+    GOAL_MODEL_HALF_LIFE_DAYS = float(os.getenv('GOAL_MODEL_HALF_LIFE_DAYS', 120))  # Pondération temporelle des matchs passés
+
+    # Cotes du marché (cf. value_detector) : retrait de la marge, seuil de value, préfiltre avant le LLM
+    ODDS_DEMARGIN = os.getenv('ODDS_DEMARGIN', 'shin')  # 'shin' ou 'multiplicative'
+    VALUE_MIN_EDGE = float(os.getenv('VALUE_MIN_EDGE', 0.05))  # Espérance minimale p_modèle × cote - 1
+    ODDS_PREFILTER = os.getenv('ODDS_PREFILTER', 'true').lower() == 'true'  # Écarte les matchs sans cote dans MIN_ODDS-MAX_ODDS
     
     # IDs des ligues à inclure (API-Football)
     INCLUDED_LEAGUE_IDS = [
@@ -0,0 +1,107 @@
+"""
+Parseur rapide de la page football de FlashScore.
+
+L'ancien parseur construisait l'arbre BeautifulSoup de toute la page puis
+appelait find_all('div', class_='event__match') et quatre find() par ligne.
+Ici, lxml.etree.iterparse parcourt le document en flux. Seules les lignes
+de match et les en-têtes de compétition sont lus, chaque ligne en un seul
+passage sur ses descendants, et les éléments déjà traités sont libérés.
+"""
+
+from io import BytesIO
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+
+# Classe CSS -> champ extrait d'une ligne de match
+ROW_FIELDS = {
+    'event__participant--home': 'home',
+    'event__participant--away': 'away',
+    'event__title': 'competition',
+    'event__time': 'time',
+}
+
+
+def _classes(element) -> List[str]:
+    return (element.get('class') or '').split()
+
+
+def _text(element) -> str:
+    return ''.join(element.itertext()).strip()
+
+
+def _parse_row(row) -> Optional[Dict]:
+    """Champs d'une ligne event__match en un passage ; None si incomplète."""
+    fields = {}
+    for element in row.iter():
+        for css in _classes(element):
+            field = ROW_FIELDS.get(css)
+            if field and field not in fields:
+                fields[field] = _text(element)
+    if 'home' in fields and 'away' in fields and 'time' in fields:
+        return fields
+    return None
+
+
+def _header_title(header) -> Optional[str]:
+    """Titre d'un en-tête : 'event__title', ou 'PAYS: Compétition' (event__title--type / --name)."""
+    parts = {}
+    for element in header.iter():
+        for css in _classes(element):
+            if css in ('event__title', 'event__title--type', 'event__title--name') and css not in parts:
+                parts[css] = _text(element)
+    if parts.get('event__title'):
+        return parts['event__title']
+    return ': '.join(parts[key] for key in ('event__title--type', 'event__title--name') if parts.get(key)) or None
+
+
+def parse_event_rows(content: bytes) -> List[Dict]:
+    """
+    Extrait les matchs (home, away, competition, time) d'une page FlashScore.
+
+    La compétition est lue dans la ligne si elle y figure, sinon dans le
+    dernier en-tête event__header rencontré (structure réelle de la page).
+
+    Args:
+        content: HTML brut (octets)
+
+    Returns:
+        Liste de dicts {'home', 'away', 'competition', 'time'} dans l'ordre de la page
+    """
+    rows = []
+    current_competition = None
+    if not content or not content.strip():
+        return rows
+
+    events = etree.iterparse(BytesIO(content), events=('end',), tag='div', html=True,
+                             recover=True, no_network=True)
+    try:
+        for _, element in events:
+            current_competition = _handle(element, rows, current_competition)
+    except etree.XMLSyntaxError:
+        pass  # Document tronqué : on garde les lignes déjà lues
+
+    return rows
+
+
+def _handle(element, rows: List[Dict], current_competition: Optional[str]) -> Optional[str]:
+    """Traite un élément <div> fermé ; renvoie la compétition courante."""
+    classes = _classes(element)
+    if 'event__match' in classes:
+        fields = _parse_row(element)
+        if fields:
+            fields.setdefault('competition', current_competition)
+            if fields['competition']:
+                rows.append(fields)
+    elif 'event__header' in classes:
+        current_competition = _header_title(element) or current_competition
+    else:
+        return current_competition
+
+    # Libérer la ligne traitée et les frères précédents déjà lus
+    element.clear()
+    parent = element.getparent()
+    while parent is not None and element.getprevious() is not None:
+        del parent[0]
+    return current_competition
@@ -1,14 +1,18 @@
-import google.generativeai as genai
 import json
 import os
 from datetime import datetime
 from config import Config
+from llm_provider import LLMRequest, LLMUnavailableError, build_router
+from response_schema import analysis_tool, validate_analysis
 
 class GeminiAnalyzer:
     def __init__(self):
         self.config = Config()
-        genai.configure(api_key=self.config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+        if not self.config.GEMINI_API_KEY:
+            raise ValueError("GEMINI_API_KEY manquante dans .env")
+
+        # Gemini en premier (sortie JSON structurée), Claude en secours si configuré
+        self.llm = build_router(self.config, primary='gemini')
     
     def load_prompt_template(self):
         """Charge le prompt depuis le fichier"""
@@ -82,7 +86,7 @@ Analyser matchs européens avec probabilité gain ≥75%, cote 1.50-4.00.
 
 {matches_list}
 
-RÉPONDS UNIQUEMENT EN JSON VALIDE. PAS DE MARKDOWN, PAS DE TEXTE HORS JSON."""
+RÉPONDS UNIQUEMENT AVEC L'OBJET JSON DÉCRIT CI-DESSUS."""
     
     def _load_learnings(self):
         """Charge les apprentissages des erreurs passées."""
@@ -149,51 +153,32 @@ RÉPONDS UNIQUEMENT EN JSON VALIDE. PAS DE MARKDOWN, PAS DE TEXTE HORS JSON."""
             matches_list=matches_formatted
         ) + learning_context
         
-        # Tentatives multiples pour obtenir un JSON valide
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = self.model.generate_content(prompt)
-                result_text = response.text.strip()
-
-                # Nettoyer markdown si présent
-                result_text = result_text.replace('```json', '').replace('```', '').strip()
-
-                # Nettoyer les caractères invisibles et les espaces problématiques
-                result_text = result_text.replace('\u200b', '').replace('\ufeff', '')
-
-                # Trouver le premier { et le dernier }
-                start = result_text.find('{')
-                end = result_text.rfind('}')
-
-                if start != -1 and end != -1:
-                    result_text = result_text[start:end+1]
-
-                # Parser JSON
-                result = json.loads(result_text)
-
-                # Limiter au nombre maximum de prédictions configuré
-                if 'recommendations' in result and len(result['recommendations']) > self.config.MAX_PREDICTIONS:
-                    result['recommendations'] = result['recommendations'][:self.config.MAX_PREDICTIONS]
-                    result['total_retained'] = len(result['recommendations'])
-
-                print(f"✅ Analyse réussie ({len(result.get('recommendations', []))} pronostics)")
-                return result
-
-            except json.JSONDecodeError as e:
-                print(f"⚠️ Tentative {attempt + 1}/{max_retries} - Erreur parsing JSON: {e}")
-                if attempt < max_retries - 1:
-                    print("🔄 Nouvelle tentative...")
-                    continue
-                else:
-                    print(f"❌ Échec après {max_retries} tentatives")
-                    print(f"Réponse brute: {response.text[:500]}")
-                    return None
-            except Exception as e:
-                print(f"❌ Erreur Gemini: {e}")
-                return None
-
-        return None
+        request = LLMRequest(
+            prompt=prompt,
+            tool=analysis_tool(),
+            max_tokens=32000
+        )
+
+        try:
+            result = self.llm.generate_sync(request, validator=validate_analysis)
+        except LLMUnavailableError as e:
+            print(f"❌ Erreur Gemini: {e}")
+            return None
+        except TypeError:
+            # Appel incompatible avec le SDK installé : échec explicite plutôt qu'une analyse vide
+            raise
+        except Exception as e:
+            # Dernier recours : une erreur imprévue ne doit pas interrompre le run
+            print(f"❌ Erreur Gemini (erreur inattendue {type(e).__name__}): {e}")
+            return None
+
+        # Limiter au nombre maximum de prédictions configuré
+        if 'recommendations' in result and len(result['recommendations']) > self.config.MAX_PREDICTIONS:
+            result['recommendations'] = result['recommendations'][:self.config.MAX_PREDICTIONS]
+            result['total_retained'] = len(result['recommendations'])
+
+        print(f"✅ Analyse réussie ({len(result.get('recommendations', []))} pronostics)")
+        return result
 
 # Test
 if __name__ == "__main__":
@@ -0,0 +1,375 @@
+"""
+Modèle de buts Poisson / Dixon-Coles ajusté sur les données déjà récupérées.
+
+Aucune requête supplémentaire : les matchs passés présents dans la forme
+récente (home_recent_form, away_recent_form) et les confrontations directes
+(head_to_head) de tout le programme du jour forment l'échantillon
+d'ajustement, pondéré par l'ancienneté (demi-vie GOAL_MODEL_HALF_LIFE_DAYS,
+comme la pondération temporelle de Dixon & Coles). Les buts pour/contre du
+classement servent d'a priori (pseudo-matchs) pour les équipes peu observées.
+
+Buts attendus :  domicile = mu · h · att[dom] · déf[ext]
+                 extérieur = mu · att[ext] · déf[dom]
+avec la correction rho de Dixon-Coles sur les scores 0-0, 1-0, 0-1 et 1-1.
+
+Ajustement et prédiction sont vectorisés (NumPy) pour tout le programme :
+une matrice de scores (matchs × buts dom × buts ext) donne en une passe
+1X2, Over/Under, BTTS et handicaps de chaque match.
+
+    goal_model.annotate(matches)       # match['model'] = GoalModelPrediction
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import Config
+from team_names import normalize_team_name
+
+MAX_GOALS = 10                                   # Matrice de scores 0..10 × 0..10
+OVER_LINES = (0.5, 1.5, 2.5, 3.5, 4.5)
+HANDICAP_LINES = (-2.5, -1.5, -0.5, 0.5, 1.5, 2.5)   # Handicap appliqué à l'équipe à domicile
+RHO_GRID = np.linspace(-0.2, 0.2, 41)
+ITERATIONS = 50
+PRIOR_GAMES = 4.0    # Poids de l'a priori du classement, en matchs
+MIN_GAMES = 3.0      # Observations pondérées minimales par équipe pour prédire
+
+_GOALS = np.arange(MAX_GOALS + 1)
+_HOME, _AWAY = np.meshgrid(_GOALS, _GOALS, indexing='ij')
+_DIFF, _TOTAL = _HOME - _AWAY, _HOME + _AWAY
+_OVER_MASKS = np.stack([_TOTAL > line for line in OVER_LINES]).astype(float)
+_HANDICAP_MASKS = np.stack([_DIFF + line > 0 for line in HANDICAP_LINES]).astype(float)
+_LOG_FACTORIAL = np.cumsum(np.log(np.maximum(_GOALS, 1)))
+
+_SIDE_RE = re.compile(r"\b(over|under|plus de|moins de)\b")
+_SIDES = {'over': 'over', 'plus de': 'over', 'under': 'under', 'moins de': 'under'}
+_NUMBER_RE = re.compile(r"\d+(?:\.\d)?")
+_HANDICAP_RE = re.compile(r"handicap\s*\(?\s*([+-]?\d+(?:[.,]\d)?)")
+
+
+def _line_key(line: float) -> str:
+    return f"{line:+.1f}" if line else "0.0"
+
+
+def _total_pick(bet_type: str, choice: str) -> Optional[Tuple[str, float]]:
+    """
+    Côté et ligne d'un pronostic over/under.
+
+    Le côté est lu dans le choix (le type de pari contient souvent les deux,
+    ex: 'Over/Under 2.5' + 'Under 2.5'), la ligne dans le choix puis dans le type de pari.
+
+    Returns:
+        ('over' | 'under', ligne), ou None si le pronostic n'est pas un over/under non ambigu
+    """
+    pick = (choice or '').lower().replace(',', '.')
+    bet = (bet_type or '').lower().replace(',', '.')
+    sides = {_SIDES[word] for word in _SIDE_RE.findall(pick) or _SIDE_RE.findall(bet)}
+    if len(sides) != 1:
+        return None
+    line = _NUMBER_RE.search(pick) or _NUMBER_RE.search(bet)
+    return (sides.pop(), float(line.group())) if line else None
+
+
+@dataclass(slots=True)
+class GoalModelPrediction:
+    home_xg: float
+    away_xg: float
+    home: float                     # Probabilités 1 / N / 2
+    draw: float
+    away: float
+    over: Dict[str, float]          # '2.5' -> P(plus de 2.5 buts)
+    btts: float
+    handicap: Dict[str, float]      # '-1.5' -> P(domicile couvre le handicap -1.5)
+    likely_score: str
+    games: float                    # Observations pondérées des deux équipes
+
+    def probability(self, bet_type: str, choice: str) -> Optional[float]:
+        """
+        Probabilité modèle d'un pronostic (ex: '1X2', '2 (Victoire Bologna)').
+
+        Returns:
+            Probabilité, ou None si le marché n'est pas couvert par le modèle
+        """
+        text = f"{bet_type or ''} {choice or ''}".lower().replace(',', '.')
+        pick = (choice or '').strip().lower()
+        if any(word in text for word in ('corner', 'carton', 'card', 'mi-temps', 'half')):
+            return None  # Marchés hors modèle (corners, cartons, mi-temps)
+
+        handicap = _HANDICAP_RE.search(text)
+        if handicap and pick[:1] in ('1', '2'):
+            line = float(handicap.group(1))
+            if pick.startswith('1'):
+                return self.handicap.get(_line_key(line))
+            # Extérieur avec handicap L  ⇔  domicile ne couvre pas -L
+            covered = self.handicap.get(_line_key(-line))
+            return None if covered is None else round(1 - covered, 3)
+
+        total = _total_pick(bet_type, choice)
+        if total:
+            side, line = total
+            over = self.over.get(f"{line:.1f}")
+            if over is None:
+                return None
+            return over if side == 'over' else round(1 - over, 3)
+
+        if 'btts' in text or 'both teams' in text or 'deux équipes' in text:
+            no = re.search(r"\b(non|no)\b", pick)
+            return round(1 - self.btts, 3) if no else self.btts
+
+        for prefix, probability in (('1x', self.home + self.draw), ('x2', self.draw + self.away),
+                                    ('12', self.home + self.away)):
+            if pick.startswith(prefix):
+                return round(probability, 3)
+        if pick.startswith('1'):
+            return self.home
+        if pick.startswith('2'):
+            return self.away
+        if pick.startswith('x') or pick.startswith('nul'):
+            return self.draw
+        return None
+
+    def summary(self, bet_type: str = None, choice: str = None) -> Dict:
+        """Chiffres compacts conservés avec un pronostic (data/predictions)."""
+        summary = {
+            'xg': [self.home_xg, self.away_xg],
+            '1x2': [self.home, self.draw, self.away],
+            'over_2_5': self.over.get('2.5'),
+            'btts': self.btts,
+            'score': self.likely_score,
+        }
+        if bet_type or choice:
+            summary['p'] = self.probability(bet_type, choice)
+        return summary
+
+
+class GoalModel:
+    """Ajustement Dixon-Coles sur le programme du jour et prédictions groupées."""
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.half_life = self.config.GOAL_MODEL_HALF_LIFE_DAYS
+        self.last_report = {}
+
+    # ───────────────────────── Données ─────────────────────────
+
+    @staticmethod
+    def team_key(team_id, name: str):
+        return team_id or normalize_team_name(name or '')
+
+    def _games(self, matches: List[Dict], today: datetime) -> Dict[str, np.ndarray]:
+        """Matchs passés uniques (forme + H2H) du programme, en tableaux, avec leur poids temporel."""
+        seen = {}
+        for match in matches:
+            for key in ('home_recent_form', 'away_recent_form', 'head_to_head'):
+                for game in match.get(key) or []:
+                    if game.home_goals is None or game.away_goals is None or not game.date:
+                        continue
+                    home, away = self.team_key(game.home_id, game.home), self.team_key(game.away_id, game.away)
+                    seen[(game.date, home, away)] = (game.home_goals, game.away_goals)
+
+        if not seen:
+            return {}
+        keys = list(seen)
+        dates = np.array([date for date, _, _ in keys], dtype='datetime64[D]')
+        age = (np.datetime64(today.strftime('%Y-%m-%d'), 'D') - dates).astype(float)
+        goals = np.array(list(seen.values()), dtype=float)
+        return {
+            'home': [home for _, home, _ in keys],
+            'away': [away for _, _, away in keys],
+            'home_goals': goals[:, 0],
+            'away_goals': goals[:, 1],
+            'weight': 0.5 ** (np.maximum(age, 0) / self.half_life) if self.half_life > 0 else np.ones(len(keys)),
+        }
+
+    def _priors(self, matches: List[Dict]) -> Dict:
+        """Attaque/défense relatives tirées du classement (buts pour/contre par match / moyenne de la ligue)."""
+        priors = {}
+        done = set()
+        for match in matches:
+            standings = match.get('league_standings')
+            if not standings or id(standings) in done:
+                continue
+            done.add(id(standings))
+            rows = [row for row in standings if row.played]
+            played = sum(row.played for row in rows)
+            if not played:
+                continue
+            league_avg = sum(row.goals_for or 0 for row in rows) / played
+            if league_avg <= 0:
+                continue
+            for row in rows:
+                priors[self.team_key(row.team_id, row.team_name)] = (
+                    (row.goals_for or 0) / row.played / league_avg,
+                    (row.goals_against or 0) / row.played / league_avg,
+                )
+        return priors
+
+    # ───────────────────────── Ajustement ─────────────────────────
+
+    def fit(self, games: Dict[str, np.ndarray], priors: Dict) -> Dict:
+        """
+        Ajuste attaque/défense par équipe, mu, avantage domicile h et rho (tout vectorisé).
+
+        Returns:
+            {'teams': {clé: index}, 'attack', 'defence', 'observations', 'mu', 'h', 'rho'}
+        """
+        teams = {}
+        home = np.array([teams.setdefault(key, len(teams)) for key in games['home']])
+        away = np.array([teams.setdefault(key, len(teams)) for key in games['away']])
+        size = len(teams)
+        hg, ag, w = games['home_goals'], games['away_goals'], games['weight']
+
+        prior = np.ones((size, 2))
+        for key, index in teams.items():
+            if key in priors:
+                prior[index] = priors[key]
+        prior = np.clip(prior, 0.2, 5.0)
+        prior_attack, prior_defence = prior[:, 0], prior[:, 1]
+
+        attack, defence = prior_attack.copy(), prior_defence.copy()
+        mu = max(float(np.sum(w * (hg + ag)) / (2 * np.sum(w))), 0.1)
+        h = 1.2
+        scored = np.bincount(home, w * hg, size) + np.bincount(away, w * ag, size)
+        conceded = np.bincount(home, w * ag, size) + np.bincount(away, w * hg, size)
+        observations = np.bincount(home, w, size) + np.bincount(away, w, size)
+        k = PRIOR_GAMES
+
+        for _ in range(ITERATIONS):
+            # Mises à jour multiplicatives (point fixe du maximum de vraisemblance pondéré + a priori)
+            rate_home = mu * h * defence[away]
+            rate_away = mu * defence[home]
+            exposure = np.bincount(home, w * rate_home, size) + np.bincount(away, w * rate_away, size)
+            attack = (scored + k * mu * prior_attack) / (exposure + k * mu)
+            attack /= attack.mean()
+
+            rate_home = mu * h * attack[home]
+            rate_away = mu * attack[away]
+            exposure = np.bincount(away, w * rate_home, size) + np.bincount(home, w * rate_away, size)
+            defence = (conceded + k * mu * prior_defence) / (exposure + k * mu)
+            defence /= defence.mean()
+
+            strength_home = attack[home] * defence[away]
+            strength_away = attack[away] * defence[home]
+            h = float(np.sum(w * hg) / max(np.sum(w * mu * strength_home), 1e-9))
+            mu = float(np.sum(w * (hg + ag)) / max(np.sum(w * (h * strength_home + strength_away)), 1e-9))
+
+        lam = mu * h * attack[home] * defence[away]
+        nu = mu * attack[away] * defence[home]
+        rho = self._fit_rho(hg, ag, lam, nu, w)
+        return {'teams': teams, 'attack': attack, 'defence': defence, 'observations': observations,
+                'mu': mu, 'h': h, 'rho': rho}
+
+    @staticmethod
+    def _fit_rho(hg, ag, lam, nu, w) -> float:
+        """Rho de Dixon-Coles maximisant la vraisemblance pondérée des petits scores (grille vectorisée)."""
+        low = (hg <= 1) & (ag <= 1)
+        if not low.any():
+            return 0.0
+        hg, ag, lam, nu, w = hg[low], ag[low], lam[low], nu[low], w[low]
+        rho = RHO_GRID[None, :]
+        tau = np.select(
+            [((hg == 0) & (ag == 0))[:, None], ((hg == 0) & (ag == 1))[:, None],
+             ((hg == 1) & (ag == 0))[:, None]],
+            [1 - (lam * nu)[:, None] * rho, 1 + lam[:, None] * rho, 1 + nu[:, None] * rho],
+            default=1 - rho,
+        )
+        loglik = (w[:, None] * np.log(np.clip(tau, 1e-9, None))).sum(axis=0)
+        return float(RHO_GRID[int(np.argmax(loglik))])
+
+    # ───────────────────────── Prédiction ─────────────────────────
+
+    @staticmethod
+    def score_matrices(lam: np.ndarray, nu: np.ndarray, rho: float) -> np.ndarray:
+        """Matrices de scores (matchs × buts dom × buts ext), corrigées Dixon-Coles et normalisées."""
+        log_home = _GOALS[None, :] * np.log(lam[:, None]) - lam[:, None] - _LOG_FACTORIAL[None, :]
+        log_away = _GOALS[None, :] * np.log(nu[:, None]) - nu[:, None] - _LOG_FACTORIAL[None, :]
+        matrices = np.exp(log_home)[:, :, None] * np.exp(log_away)[:, None, :]
+        matrices[:, 0, 0] *= np.clip(1 - lam * nu * rho, 1e-9, None)
+        matrices[:, 0, 1] *= np.clip(1 + lam * rho, 1e-9, None)
+        matrices[:, 1, 0] *= np.clip(1 + nu * rho, 1e-9, None)
+        matrices[:, 1, 1] *= 1 - rho
+        return matrices / matrices.sum(axis=(1, 2), keepdims=True)
+
+    def predict(self, fit: Dict, pairs: List[Tuple]) -> List[Optional[GoalModelPrediction]]:
+        """
+        Prédictions groupées pour des couples (clé domicile, clé extérieur).
+
+        Returns:
+            Une prédiction par couple (None si une équipe est trop peu observée)
+        """
+        teams = fit['teams']
+        known = [index for index, (home, away) in enumerate(pairs)
+                 if home in teams and away in teams
+                 and fit['observations'][teams[home]] >= MIN_GAMES and fit['observations'][teams[away]] >= MIN_GAMES]
+        predictions: List[Optional[GoalModelPrediction]] = [None] * len(pairs)
+        if not known:
+            return predictions
+
+        home = np.array([teams[pairs[index][0]] for index in known])
+        away = np.array([teams[pairs[index][1]] for index in known])
+        lam = fit['mu'] * fit['h'] * fit['attack'][home] * fit['defence'][away]
+        nu = fit['mu'] * fit['attack'][away] * fit['defence'][home]
+        matrices = self.score_matrices(lam, nu, fit['rho'])
+
+        outcome = np.stack([(matrices * (_DIFF > 0)).sum(axis=(1, 2)), (matrices * (_DIFF == 0)).sum(axis=(1, 2)),
+                            (matrices * (_DIFF < 0)).sum(axis=(1, 2))], axis=1)
+        over = np.einsum('mij,lij->ml', matrices, _OVER_MASKS)
+        handicap = np.einsum('mij,lij->ml', matrices, _HANDICAP_MASKS)
+        btts = matrices[:, 1:, 1:].sum(axis=(1, 2))
+        likely = matrices.reshape(len(known), -1).argmax(axis=1)
+        games = fit['observations'][home] + fit['observations'][away]
+
+        for row, index in enumerate(known):
+            predictions[index] = GoalModelPrediction(
+                home_xg=round(float(lam[row]), 2),
+                away_xg=round(float(nu[row]), 2),
+                home=round(float(outcome[row, 0]), 3),
+                draw=round(float(outcome[row, 1]), 3),
+                away=round(float(outcome[row, 2]), 3),
+                over={f"{line:.1f}": round(float(over[row, i]), 3) for i, line in enumerate(OVER_LINES)},
+                btts=round(float(btts[row]), 3),
+                handicap={_line_key(line): round(float(handicap[row, i]), 3) for i, line in enumerate(HANDICAP_LINES)},
+                likely_score=f"{likely[row] // (MAX_GOALS + 1)}-{likely[row] % (MAX_GOALS + 1)}",
+                games=round(float(games[row]), 1),
+            )
+        return predictions
+
+    def annotate(self, matches: List[Dict], today: datetime = None) -> int:
+        """
+        Ajuste le modèle sur le programme et ajoute match['model'] aux matchs prédictibles.
+
+        Args:
+            matches: Matchs enrichis (modèle typé de match_model)
+            today: Date de référence de la pondération temporelle (défaut : maintenant)
+
+        Returns:
+            Nombre de matchs annotés
+        """
+        if not self.config.GOAL_MODEL or not matches:
+            return 0
+        games = self._games(matches, today or datetime.now())
+        if not games:
+            self.last_report = {'games': 0, 'annotated': 0}
+            return 0
+
+        fit = self.fit(games, self._priors(matches))
+        pairs = [(self.team_key(match.get('team_home_id'), match['home']),
+                  self.team_key(match.get('team_away_id'), match['away'])) for match in matches]
+        annotated = 0
+        for match, prediction in zip(matches, self.predict(fit, pairs)):
+            if prediction is not None:
+                match['model'] = prediction
+                annotated += 1
+
+        self.last_report = {'games': len(games['home_goals']), 'teams': len(fit['teams']), 'annotated': annotated,
+                            'mu': round(fit['mu'], 3), 'home_advantage': round(fit['h'], 3), 'rho': fit['rho']}
+        print(f"📐 Modèle de buts: {annotated}/{len(matches)} matchs ({len(games['home_goals'])} matchs "
+              f"d'historique, avantage domicile {fit['h']:.2f}, rho {fit['rho']:+.2f})")
+        return annotated
+
+
+# Modèle partagé du processus
+goal_model = GoalModel()
@@ -0,0 +1,96 @@
+"""
+GET conditionnel (ETag / If-Modified-Since) avec copie locale.
+
+La page est conservée sur disque avec ses validateurs. Aux appels suivants,
+le serveur répond 304 si elle n'a pas changé, et la copie locale est réutilisée
+sans retransférer la page.
+"""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from http_metrics import http_metrics
+
+
+class ConditionalCache:
+    """Copie locale d'URLs revalidée par GET conditionnel."""
+
+    def __init__(self, cache_dir: str, service: str = 'http'):
+        """
+        Args:
+            cache_dir: Répertoire des copies locales
+            service: Nom du service dans les métriques d'appels (cf. http_metrics)
+        """
+        self.cache_dir = cache_dir
+        self.service = service
+        self.last_status = None  # 'miss', 'hit' (304) ou 'nocache' (pas de validateur)
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{key}.body"), os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_meta(self, meta_path: str, body_path: str) -> Optional[Dict]:
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, url: str, headers: Dict = None, timeout: float = 10) -> Tuple[bytes, bool]:
+        """
+        GET conditionnel.
+
+        Returns:
+            (contenu, True si servi depuis la copie locale après un 304)
+        """
+        body_path, meta_path = self._paths(url)
+        meta = self._load_meta(meta_path, body_path)
+
+        request_headers = dict(headers or {})
+        if meta:
+            if meta.get('etag'):
+                request_headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request_headers['If-Modified-Since'] = meta['last_modified']
+
+        start = time.monotonic()
+        try:
+            response = requests.get(url, headers=request_headers, timeout=timeout)
+        except requests.RequestException as e:
+            http_metrics.observe(self.service, urlsplit(url).path or '/', type(e).__name__, time.monotonic() - start)
+            raise
+        http_metrics.observe(self.service, urlsplit(url).path or '/', response.status_code,
+                             time.monotonic() - start, len(response.content))
+
+        if response.status_code == 304 and meta:
+            self.last_status = 'hit'
+            with open(body_path, 'rb') as f:
+                return f.read(), True
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code == 200 and (etag or last_modified):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(body_path, 'wb') as f:
+                f.write(response.content)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'url': url,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'fetched_at': datetime.now().isoformat(),
+                }, f, indent=2)
+            self.last_status = 'miss'
+        else:
+            self.last_status = 'nocache'
+
+        return response.content, False
@@ -0,0 +1,253 @@
+"""
+Métriques des appels externes : latence, statut, octets, retries et quotas.
+
+Chaque appel à API-Football, FlashScore, Claude, Gemini et Telegram est
+enregistré dans un histogramme en mémoire, par (service, endpoint, statut) :
+
+    http_metrics.observe('api_football', '/odds', 200, seconds=1.8, size=52311)
+
+En fin de run (cf. tracing), les métriques sont :
+- ajoutées au rapport du run (section 'http', lue par dashboard.py)
+- exportées au format texte Prometheus (data/metrics/football_predictor.prom,
+  ou METRICS_TEXTFILE pour le collecteur textfile de node_exporter)
+
+Une matinée lente se lit alors directement : p95 de /odds, 529 de Claude ou
+429 de Telegram.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from tracing import tracer
+
+# Bornes des histogrammes de latence (secondes), comme les buckets Prometheus
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+METRIC_PREFIX = 'football_predictor'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+class _Series:
+    """Histogramme de latence et totaux d'une série (service, endpoint, statut)."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # Dernier bucket : +Inf
+        self.count = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.retries = 0
+
+    def observe(self, seconds: float, size: int, retries: int):
+        index = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+        self.buckets[index] += 1
+        self.count += 1
+        self.seconds += seconds
+        self.bytes += size
+        self.retries += retries
+
+
+def _quantile(buckets: List[int], q: float) -> Optional[float]:
+    """Quantile estimé par interpolation linéaire dans les buckets (comme histogram_quantile)."""
+    total = sum(buckets)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(buckets):
+        if seen + count >= rank and count:
+            if index == len(LATENCY_BUCKETS):
+                return LATENCY_BUCKETS[-1]  # Au-delà de la dernière borne : borne basse
+            lower = LATENCY_BUCKETS[index - 1] if index else 0.0
+            return lower + (LATENCY_BUCKETS[index] - lower) * (rank - seen) / count
+        seen += count
+    return LATENCY_BUCKETS[-1]
+
+
+class HttpMetrics:
+    """Registre des métriques d'appels externes du processus."""
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.textfile = self.config.METRICS_TEXTFILE or os.path.join(
+            self.config.DATA_DIR, 'metrics', f"{METRIC_PREFIX}.prom")
+        self._series: Dict[Tuple[str, str, str], _Series] = {}
+        self._quotas: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        tracer.on_finish(self._on_run_finished)
+
+    def observe(self, service: str, endpoint: str, status, seconds: float, size: int = 0, retries: int = 0):
+        """
+        Enregistre un appel.
+
+        Args:
+            service: 'api_football', 'flashscore', 'claude', 'gemini' ou 'telegram'
+            endpoint: Chemin ou opération (ex: '/odds', outil LLM, 'sendMessage')
+            status: Code HTTP, ou nom de l'erreur réseau (ex: 'ReadTimeout')
+            seconds: Latence de l'appel
+            size: Octets reçus (réponse) ou envoyés (Telegram)
+            retries: 1 si l'appel est une nouvelle tentative d'un appel précédent
+        """
+        key = (service, endpoint, str(status))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.observe(seconds, size or 0, retries)
+
+    def set_quota(self, service: str, kind: str, remaining):
+        """Quota restant annoncé par le service (en-têtes X-RateLimit-*)."""
+        try:
+            value = float(remaining)
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            self._quotas[(service, kind)] = value
+
+    def observe_quota_headers(self, service: str, headers):
+        """Relève les en-têtes de quota API-Football (journalier et par minute)."""
+        if not headers:
+            return
+        for header, kind in (('x-ratelimit-requests-remaining', 'daily'), ('X-RateLimit-Remaining', 'minute')):
+            if headers.get(header) is not None:
+                self.set_quota(service, kind, headers.get(header))
+
+    # ───────────────────────── Lecture ─────────────────────────
+
+    def summary(self) -> Dict:
+        """
+        Résumé par service puis endpoint : appels, erreurs, p50/p95 estimés, octets, retries.
+
+        Returns:
+            {'services': {service: {endpoint: {...}}}, 'quotas': {service: {kind: restant}}}
+        """
+        with self._lock:
+            series = list(self._series.items())
+            quotas = dict(self._quotas)
+
+        grouped: Dict[str, Dict[str, Dict]] = {}
+        for (service, endpoint, status), data in sorted(series):
+            entry = grouped.setdefault(service, {}).setdefault(endpoint, {
+                'calls': 0, 'errors': 0, 'statuses': {}, 'seconds': 0.0, 'bytes': 0, 'retries': 0,
+                '_buckets': [0] * (len(LATENCY_BUCKETS) + 1),
+            })
+            entry['calls'] += data.count
+            if not (status.isdigit() and int(status) < 400):
+                entry['errors'] += data.count
+            entry['statuses'][status] = entry['statuses'].get(status, 0) + data.count
+            entry['seconds'] += data.seconds
+            entry['bytes'] += data.bytes
+            entry['retries'] += data.retries
+            entry['_buckets'] = [a + b for a, b in zip(entry['_buckets'], data.buckets)]
+
+        for endpoints in grouped.values():
+            for entry in endpoints.values():
+                buckets = entry.pop('_buckets')
+                entry['p50'] = round(_quantile(buckets, 0.5), 3)
+                entry['p95'] = round(_quantile(buckets, 0.95), 3)
+                entry['seconds'] = round(entry['seconds'], 3)
+
+        by_service: Dict[str, Dict] = {}
+        for (service, kind), value in sorted(quotas.items()):
+            by_service.setdefault(service, {})[kind] = value
+        return {'services': grouped, 'quotas': by_service}
+
+    # ───────────────────────── Export ─────────────────────────
+
+    def render_textfile(self) -> str:
+        """Métriques au format d'exposition texte Prometheus."""
+        with self._lock:
+            series = sorted(self._series.items())
+            quotas = sorted(self._quotas.items())
+
+        name = f"{METRIC_PREFIX}_http_request_duration_seconds"
+        lines = [f"# HELP {name} Latence des appels externes.", f"# TYPE {name} histogram"]
+        for (service, endpoint, status), data in series:
+            cumulative = 0
+            for bound, count in zip(list(LATENCY_BUCKETS) + ['+Inf'], data.buckets):
+                cumulative += count
+                labels = _labels(service=service, endpoint=endpoint, status=status, le=bound)
+                lines.append(f"{name}_bucket{labels} {cumulative}")
+            labels = _labels(service=service, endpoint=endpoint, status=status)
+            lines.append(f"{name}_sum{labels} {data.seconds:.6f}")
+            lines.append(f"{name}_count{labels} {data.count}")
+
+        for metric, attribute, help_text in (
+            ('http_response_bytes_total', 'bytes', "Octets reçus (envoyés pour Telegram)."),
+            ('http_retries_total', 'retries', "Appels qui étaient une nouvelle tentative."),
+        ):
+            lines += [f"# HELP {METRIC_PREFIX}_{metric} {help_text}", f"# TYPE {METRIC_PREFIX}_{metric} counter"]
+            for (service, endpoint, status), data in series:
+                labels = _labels(service=service, endpoint=endpoint, status=status)
+                lines.append(f"{METRIC_PREFIX}_{metric}{labels} {getattr(data, attribute)}")
+
+        name = f"{METRIC_PREFIX}_quota_remaining"
+        lines += [f"# HELP {name} Quota restant annoncé par le service.", f"# TYPE {name} gauge"]
+        for (service, kind), value in quotas:
+            lines.append(f"{name}{_labels(service=service, kind=kind)} {value:g}")
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str = None) -> Optional[str]:
+        """Écrit le fichier textfile Prometheus (remplacement atomique pour le collecteur)."""
+        path = path or self.textfile
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, 'w', encoding='utf-8') as f:
+                f.write(self.render_textfile())
+            os.replace(temporary, path)
+        except OSError as e:
+            print(f"⚠️ Métriques Prometheus non écrites: {e}")
+            return None
+        return path
+
+    def _on_run_finished(self, report: Dict):
+        with self._lock:
+            if not self._series and not self._quotas:
+                return
+        report['http'] = self.summary()
+        self.write_textfile()
+
+
+# Registre partagé du processus
+http_metrics = HttpMetrics()
+
+
+def load_run_summaries(runs_dir: str = None, limit: int = 30) -> List[Dict]:
+    """
+    Sections 'http' des derniers rapports de run (data/runs), du plus ancien au plus récent.
+
+    Returns:
+        [{'entry_point', 'started_at', 'services', 'quotas'}, ...]
+    """
+    runs_dir = runs_dir or os.path.join(Config.DATA_DIR, 'runs')
+    if not os.path.isdir(runs_dir):
+        return []
+    # <jour>/<point d'entrée>-HHMMSS.json : tri chronologique par (jour, heure)
+    runs = sorted(
+        (day, name.rsplit('-', 1)[-1], os.path.join(runs_dir, day, name))
+        for day in os.listdir(runs_dir) if os.path.isdir(os.path.join(runs_dir, day))
+        for name in os.listdir(os.path.join(runs_dir, day)) if name.endswith('.json')
+    )
+    summaries = []
+    for _, _, path in reversed(runs):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if report.get('http'):
+            summaries.append({'entry_point': report.get('entry_point'), 'started_at': report.get('started_at'),
+                              **report['http']})
+            if len(summaries) >= limit:
+                break
+    return sorted(summaries, key=lambda summary: summary['started_at'] or '')
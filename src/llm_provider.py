@@ -0,0 +1,359 @@
+"""
+Couche fournisseurs LLM unifiée (asynchrone) avec basculement automatique.
+
+Tous les analyseurs (ClaudeAnalyzer, GeminiAnalyzer, PostMatchAnalyzer) passent
+par LLMRouter, qui gère pour eux :
+- le respect de l'en-tête Retry-After
+- un backoff exponentiel avec jitter
+- un délai global (deadline) par appel, retries inclus
+- un disjoncteur par fournisseur
+- le basculement Claude → Gemini (ou inverse) quand un fournisseur est surchargé
+"""
+
+import asyncio
+import inspect
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import anthropic
+
+from circuit_breaker import CircuitBreaker
+from config import Config
+from http_metrics import http_metrics
+from response_schema import SchemaError
+from tracing import tracer
+
+
+class ProviderError(Exception):
+    """Erreur d'un fournisseur, classée pour la politique de retry."""
+
+    def __init__(self, message: str, retryable: bool = True, overloaded: bool = False,
+                 retry_after: Optional[float] = None, status=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.overloaded = overloaded
+        self.retry_after = retry_after
+        self.status = status
+
+
+def _accepts(method, name: str) -> bool:
+    """La méthode accepte-t-elle l'argument nommé `name` (explicite ou via **kwargs) ?"""
+    parameters = inspect.signature(method).parameters.values()
+    return any(p.name == name or p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters)
+
+
+class LLMUnavailableError(Exception):
+    """Aucun fournisseur n'a pu répondre avant la deadline."""
+
+
+@dataclass
+class LLMRequest:
+    """Requête de sortie structurée envoyée à un fournisseur."""
+    prompt: str
+    tool: Dict  # Définition d'outil (name, description, input_schema) - cf. response_schema
+    max_tokens: int = 4000
+    temperature: float = 0.3
+    stream: bool = False  # Streaming conseillé pour les longues réponses Claude
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """Lit Retry-After (secondes) ou retry-after-ms dans les en-têtes HTTP."""
+    if not headers:
+        return None
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+class LLMProvider:
+    """Interface commune : renvoie l'objet structuré produit par le modèle."""
+
+    name = 'base'
+
+    async def generate(self, request: LLMRequest) -> Dict:
+        raise NotImplementedError
+
+
+class ClaudeProvider(LLMProvider):
+    name = 'claude'
+
+    def __init__(self, api_key: str, model: str, base_url: Optional[str] = None):
+        # Retries gérés par LLMRouter, pas par le SDK
+        self.client = anthropic.AsyncAnthropic(api_key=api_key, base_url=base_url, max_retries=0)
+        self.model = model
+        # Certaines versions du SDK n'acceptent plus `temperature` (TypeError) : envoyé seulement si supporté
+        self.supports_temperature = all(
+            _accepts(method, 'temperature') for method in (self.client.messages.create, self.client.messages.stream)
+        )
+        if not self.supports_temperature:
+            print(f"⚠️ SDK anthropic {anthropic.__version__}: paramètre temperature non supporté, ignoré")
+
+    async def generate(self, request: LLMRequest) -> Dict:
+        tool_name = request.tool['name']
+        params = dict(
+            model=self.model,
+            max_tokens=request.max_tokens,
+            tools=[request.tool],
+            tool_choice={"type": "tool", "name": tool_name},
+            messages=[{"role": "user", "content": request.prompt}],
+        )
+        if self.supports_temperature:
+            params['temperature'] = request.temperature
+
+        try:
+            if request.stream:
+                async with self.client.messages.stream(**params) as stream:
+                    message = await stream.get_final_message()
+            else:
+                message = await self.client.messages.create(**params)
+        except anthropic.APIStatusError as e:
+            status = e.status_code
+            raise ProviderError(
+                f"Claude HTTP {status}: {e}",
+                retryable=status in (408, 409, 429) or status >= 500,
+                overloaded=status in (429, 503, 529),
+                retry_after=parse_retry_after(e.response.headers),
+                status=status,
+            ) from e
+        except (anthropic.APIConnectionError, anthropic.APITimeoutError) as e:
+            raise ProviderError(f"Claude connexion: {e}") from e
+        except TypeError:
+            # Appel incompatible avec le SDK installé : erreur de code, pas panne du fournisseur
+            raise
+        except Exception as e:
+            # Autre erreur inattendue du SDK : inutile de réessayer ce fournisseur
+            raise ProviderError(f"Claude: erreur inattendue {type(e).__name__}: {e}", retryable=False) from e
+
+        for block in message.content:
+            if block.type == 'tool_use' and block.name == tool_name:
+                return dict(block.input)
+
+        raise ProviderError(f"Claude: aucun appel à l'outil {tool_name} (stop_reason={message.stop_reason})")
+
+
+class GeminiProvider(LLMProvider):
+    name = 'gemini'
+
+    def __init__(self, api_key: str, model: str, endpoint: Optional[str] = None):
+        # Import tardif : Gemini n'est qu'un fournisseur de secours optionnel
+        import google.generativeai as genai
+
+        if endpoint:
+            # Serveur local (benchmarks/llm_standin.py) : transport REST vers l'URL donnée
+            genai.configure(api_key=api_key, transport='rest', client_options={'api_endpoint': endpoint})
+        else:
+            genai.configure(api_key=api_key)
+        self.genai = genai
+        self.model_name = model
+
+    async def generate(self, request: LLMRequest) -> Dict:
+        try:
+            model = self.genai.GenerativeModel(
+                self.model_name,
+                generation_config={
+                    'response_mime_type': 'application/json',
+                    'max_output_tokens': request.max_tokens,
+                    'temperature': request.temperature,
+                }
+            )
+        except Exception as e:
+            raise ProviderError(f"Gemini: erreur inattendue {type(e).__name__}: {e}", retryable=False) from e
+        # Gemini n'a pas d'outil forcé : le schéma attendu est joint au prompt
+        prompt = (
+            request.prompt
+            + "\n\nRéponds uniquement avec un objet JSON conforme à ce schéma :\n"
+            + json.dumps(request.tool['input_schema'], ensure_ascii=False)
+        )
+
+        try:
+            response = await model.generate_content_async(prompt)
+        except Exception as e:
+            status = getattr(e, 'code', None)
+            status = status if isinstance(status, int) else None
+            raise ProviderError(
+                f"Gemini: {e}",
+                retryable=status is None or status == 429 or status >= 500,
+                overloaded=status in (429, 503),
+                status=status,
+            ) from e
+
+        try:
+            return json.loads(response.text)
+        except (ValueError, json.JSONDecodeError) as e:
+            raise ProviderError(f"Gemini: réponse JSON invalide ({e})") from e
+
+
+class LLMRouter:
+    """Exécute une requête sur une liste ordonnée de fournisseurs."""
+
+    def __init__(self, providers: List[LLMProvider], config: Config = None):
+        if not providers:
+            raise ValueError("Aucun fournisseur LLM configuré")
+
+        self.config = config or Config()
+        self.providers = providers
+        self.breakers = {
+            provider.name: CircuitBreaker(
+                provider.name,
+                failure_threshold=self.config.LLM_BREAKER_THRESHOLD,
+                reset_timeout=self.config.LLM_BREAKER_RESET_SECONDS,
+            )
+            for provider in providers
+        }
+        self.last_provider = None
+        self._loop = None
+
+    def _backoff(self, attempt: int) -> float:
+        """Backoff exponentiel avec jitter (entre la moitié et le plafond)."""
+        ceiling = min(self.config.LLM_BACKOFF_MAX, self.config.LLM_BACKOFF_BASE * (2 ** attempt))
+        return random.uniform(ceiling / 2, ceiling)
+
+    @staticmethod
+    def _observe(provider: LLMProvider, request: LLMRequest, attempt: int, started: float, status,
+                 result: Dict = None):
+        """Métriques d'appel (cf. http_metrics) ; taille = sortie structurée sérialisée."""
+        size = len(json.dumps(result, ensure_ascii=False).encode('utf-8')) if result is not None else 0
+        http_metrics.observe(provider.name, request.tool['name'], status, time.monotonic() - started,
+                             size, 1 if attempt else 0)
+
+    def _has_fallback(self, index: int) -> bool:
+        """Un fournisseur suivant est-il disponible pour un basculement ?"""
+        return any(
+            self.breakers[provider.name].state != CircuitBreaker.OPEN
+            for provider in self.providers[index + 1:]
+        )
+
+    async def generate(self, request: LLMRequest, validator: Callable[[Dict], Dict] = None) -> Dict:
+        """
+        Renvoie la réponse structurée du premier fournisseur qui aboutit.
+
+        Args:
+            request: Requête (prompt + outil/schéma)
+            validator: Validateur compilé appliqué à la réponse (lève en cas d'écart)
+
+        Raises:
+            LLMUnavailableError: si aucun fournisseur n'aboutit avant la deadline
+        """
+        with tracer.span('llm', tool=request.tool['name']):
+            return await self._generate(request, validator)
+
+    async def _generate(self, request: LLMRequest, validator: Callable[[Dict], Dict] = None) -> Dict:
+        deadline = time.monotonic() + self.config.LLM_DEADLINE_SECONDS
+        last_error = None
+
+        for index, provider in enumerate(self.providers):
+            breaker = self.breakers[provider.name]
+
+            for attempt in range(self.config.LLM_MAX_ATTEMPTS):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LLMUnavailableError(f"Deadline LLM dépassée ({last_error})")
+
+                if not breaker.allow():
+                    wait_time = breaker.retry_in()
+                    if self._has_fallback(index) or wait_time >= deadline - time.monotonic():
+                        print(f"⚡ {provider.name}: circuit ouvert, fournisseur ignoré")
+                        break
+                    # Dernier recours : attendre la réouverture du circuit
+                    print(f"⚡ {provider.name}: circuit ouvert, nouvel essai dans {wait_time:.0f}s")
+                    await asyncio.sleep(wait_time)
+                    if not breaker.allow():
+                        break
+
+                # Appel de test d'un circuit semi-ouvert : toute issue autre qu'un succès le rouvre
+                probe = breaker.state == CircuitBreaker.HALF_OPEN
+                print(f"🤖 {provider.name} (tentative {attempt + 1}/{self.config.LLM_MAX_ATTEMPTS})...")
+                tracer.count(f"attempts_{provider.name}")
+                started = time.monotonic()
+                timeout = min(remaining, self.config.LLM_ATTEMPT_TIMEOUT)
+                try:
+                    try:
+                        result = await asyncio.wait_for(provider.generate(request), timeout=timeout)
+                    except asyncio.TimeoutError as e:
+                        # Tentative trop longue : traitée comme une surcharge (nouvel essai ou basculement)
+                        raise ProviderError(f"{provider.name}: pas de réponse en {timeout:.0f}s",
+                                            overloaded=True, status='timeout') from e
+                    self._observe(provider, request, attempt, started, 200, result)
+                    if validator:
+                        validator(result)
+                    breaker.record_success()
+                    self.last_provider = provider.name
+                    tracer.set(provider=provider.name)
+                    return result
+
+                except ProviderError as e:
+                    self._observe(provider, request, attempt, started, e.status or 'error')
+                    last_error = e
+                    print(f"⚠️ {e}")
+                    if e.retryable or probe:
+                        breaker.record_failure()
+                    if not e.retryable or (e.overloaded and self._has_fallback(index)):
+                        # Basculement immédiat vers le fournisseur suivant
+                        break
+                    wait_time = e.retry_after if e.retry_after is not None else self._backoff(attempt)
+
+                except SchemaError as e:
+                    # Réponse hors schéma (validateur) : le fournisseur est sain, on réessaie
+                    last_error = e
+                    print(f"⚠️ {provider.name}: réponse non conforme au schéma: {e}")
+                    if probe:
+                        breaker.record_failure()
+                    wait_time = self._backoff(attempt)
+
+                if attempt < self.config.LLM_MAX_ATTEMPTS - 1:
+                    wait_time = min(wait_time, max(0.0, deadline - time.monotonic()))
+                    print(f"⏳ Attente {wait_time:.1f}s avant nouvelle tentative...")
+                    await asyncio.sleep(wait_time)
+
+            if index < len(self.providers) - 1:
+                print(f"🔀 Basculement vers {self.providers[index + 1].name}")
+
+        raise LLMUnavailableError(f"Tous les fournisseurs LLM ont échoué ({last_error})")
+
+    def generate_sync(self, request: LLMRequest, validator: Callable[[Dict], Dict] = None) -> Dict:
+        """
+        Version synchrone pour les scripts.
+
+        Une boucle d'événements persistante est réutilisée d'un appel à l'autre :
+        les clients HTTP asynchrones restent liés à la boucle qui les a créés.
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.generate(request, validator))
+
+
+def build_router(config: Config = None, primary: str = 'claude',
+                 claude_model: str = None, gemini_model: str = None) -> LLMRouter:
+    """
+    Construit le routeur avec les fournisseurs dont la clé est configurée.
+
+    Args:
+        config: Configuration de l'application
+        primary: Fournisseur essayé en premier ('claude' ou 'gemini')
+        claude_model: Modèle Claude (défaut: Config.CLAUDE_MODEL)
+        gemini_model: Modèle Gemini (défaut: Config.GEMINI_MODEL)
+    """
+    config = config or Config()
+    providers = []
+
+    if config.ANTHROPIC_API_KEY:
+        providers.append(ClaudeProvider(config.ANTHROPIC_API_KEY, claude_model or config.CLAUDE_MODEL,
+                                        config.ANTHROPIC_BASE_URL))
+
+    if config.GEMINI_API_KEY:
+        try:
+            providers.append(GeminiProvider(config.GEMINI_API_KEY, gemini_model or config.GEMINI_MODEL,
+                                            config.GEMINI_API_ENDPOINT))
+        except ImportError:
+            print("⚠️ google-generativeai non installé, pas de secours Gemini")
+
+    providers.sort(key=lambda provider: provider.name != primary)
+    return LLMRouter(providers, config)
@@ -1,22 +1,49 @@
 #!/usr/bin/env python3
 import sys
 import os
+import json
+import argparse
 from datetime import datetime
 from match_scraper import MatchScraper
 from claude_analyzer import ClaudeAnalyzer  # Remplacé Gemini par Claude
 from telegram_sender import TelegramSender
 from learning_engine import LearningEngine
 from prediction_validator import PredictionValidator  # Validateur pour corriger inversions Home/Away
+from match_screener import MatchScreener
+from analysis_cache import AnalysisCache
+from prompt_budget import PromptBudget
+from compact_formatter import CompactFormatter
+from value_detector import value_detector
+from api_football import api_football
+from snapshot_archive import add_snapshot_option
+from tracing import tracer
+from profiling import add_profile_option, profiled
 from config import Config
 
-def main():
+def main(snapshot=None):
+    """
+    Args:
+        snapshot: Date AAAA-MM-JJ (ou 'latest') d'un run archivé à rejouer sans appel API-Football
+    """
     print("🚀 Démarrage analyse football...")
     
     today = datetime.now().strftime('%Y-%m-%d')
+    config = Config()
+    reference_time = None
+    if snapshot:
+        dates = api_football.archive.dates()
+        if not dates:
+            print("❌ Aucune archive dans data/snapshots, arrêt.")
+            return
+        today = dates[-1] if snapshot == 'latest' else snapshot
+        # Un seul run de la journée : réponses et heure de référence cohérentes
+        run = api_football.archive.latest_run(today)
+        api_football.replay(today, run)
+        reference_time = api_football.archive.started_at(today, run)
     
     # 1. Récupération matchs
     print("📥 Récupération des matchs...")
-    scraper = MatchScraper()
+    scraper = MatchScraper(reference_time)
     matches = scraper.get_today_matches()
     print(f"✅ {len(matches)} matchs trouvés")
 
@@ -24,8 +51,19 @@ def main():
         print("❌ Aucun match disponible, arrêt.")
         return
 
+    # 1b. Présélection : seule la liste restreinte part en analyse approfondie
+    # (les matchs cotés sans aucune issue dans la fourchette MIN_ODDS-MAX_ODDS sont écartés d'abord)
+    screener = MatchScreener()
+    with tracer.span('screen', matches=len(matches)) as span:
+        shortlist = screener.screen(value_detector.prefilter(matches), today)
+        span.set(shortlist=len(shortlist))
 
-    matches_formatted = scraper.format_matches_for_prompt(matches)
+    # Rendu sous budget de tokens (sections secondaires réduites en premier)
+    formatter = CompactFormatter() if config.PROMPT_FORMAT == 'compact' else scraper
+    budget = PromptBudget(config)
+    with tracer.span('prompt', format=config.PROMPT_FORMAT):
+        matches_formatted = budget.render(shortlist, formatter)
+        tracer.set(tokens=budget.last_report['tokens'])
     
     # 2. Récupération stats d'apprentissage
     learning = LearningEngine()
@@ -34,19 +72,26 @@ def main():
     # 3. Analyse avec Claude (Anthropic)
     print("🤖 Analyse avec Claude en cours...")
     analyzer = ClaudeAnalyzer()
-    result = analyzer.analyze_matches(matches_formatted, stats)
+    with tracer.span('analyze'):
+        result = analyzer.analyze_matches(matches_formatted, stats)
     
     if not result:
         print("❌ Erreur analyse")
         return
     
     print(f"✅ Analyse terminée: {len(result.get('recommendations', []))} pronostics")
+    result['sources'] = scraper.merger.last_report
+    result['api_football'] = api_football.report()
+    if screener.last_summary:
+        result['screening'] = screener.last_summary
+    result['prompt_tokens'] = budget.last_report['tokens']
 
     # 3b. VALIDATION ET CORRECTION AUTOMATIQUE (Home/Away inversions + cotes trop basses)
     print("🔍 Validation et correction automatique...")
-    config = Config()
     validator = PredictionValidator(matches)
-    result = validator.validate_and_fix_predictions(result, min_odds=config.MIN_ODDS)
+    with tracer.span('validate'):
+        result = validator.validate_and_fix_predictions(result, min_odds=config.MIN_ODDS)
+        tracer.set(recommendations=len(result.get('recommendations', [])))
 
     # Afficher rapport de validation
     validation_report = validator.generate_validation_report(result)
@@ -54,8 +99,20 @@ def main():
 
     print(f"✅ Après validation: {len(result.get('recommendations', []))} pronostics retenus")
 
-    # 4. Sauvegarde prédictions
-    learning.save_predictions(result, today)
+    if snapshot:
+        # Run rejoué : ni sauvegarde des prédictions du jour, ni envoi Telegram
+        replay_file = os.path.join(api_football.archive.root, today, f"replay-{datetime.now().strftime('%H%M%S')}.json")
+        with open(replay_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"🗄️ Résultat du run rejoué: {replay_file}")
+        return
+
+    with tracer.span('save'):
+        # Résultats par match mis en cache pour les ré-analyses de la journée
+        AnalysisCache(today, config).store(shortlist, result, formatter)
+
+        # 4. Sauvegarde prédictions
+        learning.save_predictions(result, today)
     
     # 5. Envoi Telegram
     if result.get('recommendations'):
@@ -66,4 +123,9 @@ def main():
         print("ℹ️ Aucun pronostic pertinent, pas d'envoi")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Analyse football du jour")
+    add_snapshot_option(parser)
+    add_profile_option(parser)
+    args = parser.parse_args()
+    with tracer.run('main', snapshot=args.from_snapshot), profiled('main', args.profile):
+        main(args.from_snapshot)
\ No newline at end of file
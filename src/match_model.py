@@ -0,0 +1,519 @@
+"""
+Modèle typé et compact des données d'enrichissement d'un match.
+
+_enrich_match_data récupère des réponses API-Football complètes (objets
+fixture entiers pour la forme et le H2H, arbre du classement, arbres de cotes
+par bookmaker...) alors que le formatage n'en lit qu'une poignée de champs.
+Ces réponses sont projetées dès l'ingestion sur des dataclasses à __slots__ :
+seuls les champs utilisés sont conservés, ce qui réduit la mémoire et accélère
+le formatage et la sérialisation de la liste des matchs enrichis.
+
+Le match reste un dict (home, away, competition, time, ids...) ; seules les
+valeurs d'enrichissement sont typées (cf. PROJECTIONS).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from team_names import normalize_team_name
+
+
+def _get(data: Optional[Dict], *path, default=None):
+    """Lecture sûre d'un chemin dans une réponse JSON."""
+    for key in path:
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key)
+    return default if data is None else data
+
+
+# ───────────────────────── Forme récente & H2H ─────────────────────────
+
+@dataclass(slots=True)
+class FixtureResult:
+    date: str                       # YYYY-MM-DD
+    home: str
+    away: str
+    home_id: Optional[int]
+    away_id: Optional[int]
+    home_goals: Optional[int]
+    away_goals: Optional[int]
+
+    @classmethod
+    def from_api(cls, fixture: Dict) -> 'FixtureResult':
+        return cls(
+            date=(_get(fixture, 'fixture', 'date', default='') or '')[:10],
+            home=_get(fixture, 'teams', 'home', 'name', default=''),
+            away=_get(fixture, 'teams', 'away', 'name', default=''),
+            home_id=_get(fixture, 'teams', 'home', 'id'),
+            away_id=_get(fixture, 'teams', 'away', 'id'),
+            home_goals=_get(fixture, 'goals', 'home'),
+            away_goals=_get(fixture, 'goals', 'away'),
+        )
+
+    def goals_for(self, team: str) -> Tuple[Optional[int], Optional[int]]:
+        """(buts marqués, buts encaissés) du point de vue de l'équipe."""
+        if self.home == team:
+            return self.home_goals, self.away_goals
+        return self.away_goals, self.home_goals
+
+
+# ───────────────────────── Classement ─────────────────────────
+
+@dataclass(slots=True)
+class StandingRow:
+    team_id: Optional[int]
+    team_name: str
+    rank: Optional[int]
+    points: Optional[int]
+    goals_diff: Optional[int]
+    played: Optional[int]
+    win: Optional[int]
+    draw: Optional[int]
+    lose: Optional[int]
+    goals_for: Optional[int]
+    goals_against: Optional[int]
+    home_win: Optional[int]
+    home_draw: Optional[int]
+    home_lose: Optional[int]
+    away_win: Optional[int]
+    away_draw: Optional[int]
+    away_lose: Optional[int]
+
+    @classmethod
+    def from_api(cls, row: Dict) -> 'StandingRow':
+        return cls(
+            team_id=_get(row, 'team', 'id'),
+            team_name=_get(row, 'team', 'name', default=''),
+            rank=row.get('rank'),
+            points=row.get('points'),
+            goals_diff=row.get('goalsDiff'),
+            played=_get(row, 'all', 'played'),
+            win=_get(row, 'all', 'win'),
+            draw=_get(row, 'all', 'draw'),
+            lose=_get(row, 'all', 'lose'),
+            goals_for=_get(row, 'all', 'goals', 'for'),
+            goals_against=_get(row, 'all', 'goals', 'against'),
+            home_win=_get(row, 'home', 'win'),
+            home_draw=_get(row, 'home', 'draw'),
+            home_lose=_get(row, 'home', 'lose'),
+            away_win=_get(row, 'away', 'win'),
+            away_draw=_get(row, 'away', 'draw'),
+            away_lose=_get(row, 'away', 'lose'),
+        )
+
+    # Champs dérivés
+
+    @property
+    def ppg(self) -> Optional[float]:
+        """Points par match."""
+        return (self.points or 0) / self.played if self.played else None
+
+    def split(self, venue: str) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+        """Bilan (V, N, D) à domicile ('home') ou à l'extérieur ('away')."""
+        if venue == 'home':
+            return self.home_win, self.home_draw, self.home_lose
+        return self.away_win, self.away_draw, self.away_lose
+
+    def split_points(self, venue: str) -> Optional[int]:
+        """Points pris à domicile ('home') ou à l'extérieur ('away')."""
+        win, draw, _ = self.split(venue)
+        return None if win is None else 3 * win + (draw or 0)
+
+
+class StandingsIndex:
+    """
+    Classement d'une ligue, construit une fois par ligue et partagé par tous ses matchs.
+
+    Recherche par team_id (clé fiable) avec repli sur le nom normalisé, au lieu
+    d'un parcours linéaire du tableau comparant les noms pour chaque match.
+    """
+
+    __slots__ = ('league_id', 'season', 'rows', '_by_id', '_by_name', '_position')
+
+    def __init__(self, rows: List[StandingRow], league_id: Optional[int] = None, season: Optional[int] = None):
+        self.league_id = league_id
+        self.season = season
+        self.rows = rows
+        self._by_id = {row.team_id: row for row in rows if row.team_id is not None}
+        self._by_name = {normalize_team_name(row.team_name): row for row in rows}
+        self._position = {row.team_name: index for index, row in enumerate(rows)}
+
+    @classmethod
+    def from_api(cls, response: List[Dict], league_id: Optional[int] = None,
+                 season: Optional[int] = None) -> 'StandingsIndex':
+        """Réponse /standings -> index du premier tableau (comme le formatage historique)."""
+        try:
+            table = response[0]['league']['standings'][0]
+        except (KeyError, IndexError, TypeError):
+            table = []
+        return cls([StandingRow.from_api(row) for row in table], league_id, season)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def get(self, team_id: Optional[int] = None, name: Optional[str] = None) -> Optional[StandingRow]:
+        """Ligne d'une équipe (par team_id, sinon par nom), None si absente."""
+        if team_id is not None and team_id in self._by_id:
+            return self._by_id[team_id]
+        return self._by_name.get(normalize_team_name(name)) if name is not None else None
+
+    def for_match(self, match: Dict) -> List[Tuple[str, StandingRow]]:
+        """[(côté 'home'/'away', ligne)] des deux équipes d'un match, dans l'ordre du tableau."""
+        found = []
+        for side in ('home', 'away'):
+            row = self.get(match.get(f'team_{side}_id'), match.get(side))
+            if row is not None:
+                found.append((side, row))
+        return sorted(found, key=lambda item: self._position[item[1].team_name])
+
+    def rank_gap(self, match: Dict) -> Optional[int]:
+        """Écart de places entre les deux équipes d'un match."""
+        rows = dict(self.for_match(match))
+        if len(rows) < 2 or rows['home'].rank is None or rows['away'].rank is None:
+            return None
+        return abs(rows['home'].rank - rows['away'].rank)
+
+
+# ───────────────────────── Statistiques saison ─────────────────────────
+
+@dataclass(slots=True)
+class SeasonRecord:
+    played: Optional[int]
+    wins: Optional[int]
+    wins_home: Optional[int]
+    wins_away: Optional[int]
+    draws: Optional[int]
+    loses: Optional[int]
+
+
+@dataclass(slots=True)
+class SeasonGoals:
+    scored: Optional[int]
+    scored_avg: Optional[str]       # Chaîne API ("1.4")
+    conceded: Optional[int]
+    conceded_avg: Optional[str]
+
+
+@dataclass(slots=True)
+class SeasonBiggest:
+    win_home: Optional[str]         # Score ("3-0")
+    win_away: Optional[str]
+    loss_home: Optional[str]
+    loss_away: Optional[str]
+
+
+@dataclass(slots=True)
+class SeasonStats:
+    record: Optional[SeasonRecord]
+    goals: Optional[SeasonGoals]
+    biggest: Optional[SeasonBiggest]
+
+    @classmethod
+    def from_api(cls, stats: Dict) -> Optional['SeasonStats']:
+        if not stats:
+            return None
+        fixtures, goals, biggest = stats.get('fixtures'), stats.get('goals'), stats.get('biggest')
+        return cls(
+            record=SeasonRecord(
+                played=_get(fixtures, 'played', 'total'),
+                wins=_get(fixtures, 'wins', 'total'),
+                wins_home=_get(fixtures, 'wins', 'home'),
+                wins_away=_get(fixtures, 'wins', 'away'),
+                draws=_get(fixtures, 'draws', 'total'),
+                loses=_get(fixtures, 'loses', 'total'),
+            ) if fixtures else None,
+            goals=SeasonGoals(
+                scored=_get(goals, 'for', 'total', 'total'),
+                scored_avg=_get(goals, 'for', 'average', 'total'),
+                conceded=_get(goals, 'against', 'total', 'total'),
+                conceded_avg=_get(goals, 'against', 'average', 'total'),
+            ) if goals else None,
+            biggest=SeasonBiggest(
+                win_home=_get(biggest, 'wins', 'home'),
+                win_away=_get(biggest, 'wins', 'away'),
+                loss_home=_get(biggest, 'loses', 'home'),
+                loss_away=_get(biggest, 'loses', 'away'),
+            ) if biggest else None,
+        )
+
+
+# ───────────────────────── Absences ─────────────────────────
+
+@dataclass(slots=True)
+class Injury:
+    player: str
+    reason: str
+
+    @classmethod
+    def from_api(cls, injury: Dict) -> 'Injury':
+        return cls(player=_get(injury, 'player', 'name', default='N/A'),
+                   reason=_get(injury, 'player', 'reason', default='N/A'))
+
+
+@dataclass(slots=True)
+class Sidelined:
+    player: str
+    type: str
+    start: Optional[str]            # YYYY-MM-DD
+
+    @classmethod
+    def from_api(cls, sideline: Dict) -> 'Sidelined':
+        start = sideline.get('start')
+        return cls(player=_get(sideline, 'player', 'name', default='N/A'),
+                   type=sideline.get('type') or 'N/A',
+                   start=start[:10] if start else None)
+
+
+# ───────────────────────── Cotes ─────────────────────────
+
+# Marchés lus par le formatage ; les autres ne sont pas conservés
+ODDS_MARKETS = ('Match Winner', 'Goals Over/Under', 'Both Teams Score')
+
+
+@dataclass(slots=True)
+class OddsMarket:
+    name: str
+    values: Tuple[Tuple[str, str], ...]     # (issue, cote)
+
+
+@dataclass(slots=True)
+class BookmakerOdds:
+    bookmaker: str
+    markets: Tuple[OddsMarket, ...]
+
+    @classmethod
+    def from_api(cls, bookmaker: Dict) -> 'BookmakerOdds':
+        return cls(
+            bookmaker=bookmaker.get('name') or 'Unknown',
+            markets=tuple(
+                OddsMarket(
+                    name=bet['name'],
+                    values=tuple((str(v.get('value', 'N/A')), str(v.get('odd', 'N/A'))) for v in bet.get('values', [])),
+                )
+                for bet in bookmaker.get('bets', []) if bet.get('name') in ODDS_MARKETS
+            ),
+        )
+
+
+def project_odds(response: List[Dict]) -> List[BookmakerOdds]:
+    """
+    Réponse /odds -> une entrée par bookmaker.
+
+    L'API imbrique les bookmakers sous response[i]['bookmakers'] ; l'ancien
+    format à plat ({'bookmaker': {...}, 'bets': [...]}) est aussi accepté.
+    """
+    result = []
+    for item in response or []:
+        if not isinstance(item, dict):
+            continue
+        if 'bookmakers' in item:
+            result.extend(BookmakerOdds.from_api(bookmaker) for bookmaker in item['bookmakers'])
+        else:
+            result.append(BookmakerOdds.from_api({'name': _get(item, 'bookmaker', 'name'), 'bets': item.get('bets', [])}))
+    return result
+
+
+# ───────────────────────── Prédiction API-Football ─────────────────────────
+
+@dataclass(slots=True)
+class PredictionVerdict:
+    winner: Optional[str]
+    advice: Optional[str]
+    percent_home: Optional[str]     # Chaîne API ("45%")
+    percent_draw: Optional[str]
+    percent_away: Optional[str]
+
+
+@dataclass(slots=True)
+class PredictionComparison:
+    form_home: Optional[str]
+    form_away: Optional[str]
+    att_home: Optional[str]
+    att_away: Optional[str]
+    def_home: Optional[str]
+    def_away: Optional[str]
+
+
+@dataclass(slots=True)
+class ApiPrediction:
+    verdict: Optional[PredictionVerdict]
+    comparison: Optional[PredictionComparison]
+
+    @classmethod
+    def from_api(cls, response: List[Dict]) -> Optional['ApiPrediction']:
+        pred = response[0] if response else None
+        if not pred:
+            return None
+        predictions, comparison = pred.get('predictions'), pred.get('comparison')
+        return cls(
+            verdict=PredictionVerdict(
+                winner=_get(predictions, 'winner', 'name'),
+                advice=predictions.get('advice'),
+                percent_home=_get(predictions, 'percent', 'home'),
+                percent_draw=_get(predictions, 'percent', 'draw'),
+                percent_away=_get(predictions, 'percent', 'away'),
+            ) if predictions else None,
+            comparison=PredictionComparison(
+                form_home=_get(comparison, 'form', 'home'),
+                form_away=_get(comparison, 'form', 'away'),
+                att_home=_get(comparison, 'att', 'home'),
+                att_away=_get(comparison, 'att', 'away'),
+                def_home=_get(comparison, 'def', 'home'),
+                def_away=_get(comparison, 'def', 'away'),
+            ) if comparison else None,
+        )
+
+
+# ───────────────────────── Compositions, joueurs, staff ─────────────────────────
+
+@dataclass(slots=True)
+class Lineup:
+    team_id: Optional[int]
+    team_name: str
+    formation: str
+    coach: str
+    start_xi: Tuple[str, ...]
+
+    @classmethod
+    def from_api(cls, lineup: Dict) -> 'Lineup':
+        return cls(
+            team_id=_get(lineup, 'team', 'id'),
+            team_name=_get(lineup, 'team', 'name', default='N/A'),
+            formation=lineup.get('formation') or 'N/A',
+            coach=_get(lineup, 'coach', 'name', default='N/A'),
+            start_xi=tuple(_get(p, 'player', 'name', default='N/A') for p in lineup.get('startXI') or []),
+        )
+
+
+@dataclass(slots=True)
+class PlayerStat:
+    player: str
+    team: str
+    goals: Optional[int]
+    assists: Optional[int]
+
+    @classmethod
+    def from_api(cls, entry: Dict) -> 'PlayerStat':
+        statistics = (entry.get('statistics') or [{}])[0]
+        return cls(
+            player=_get(entry, 'player', 'name', default='N/A'),
+            team=_get(statistics, 'team', 'name', default='N/A'),
+            goals=_get(statistics, 'goals', 'total', default=0),
+            assists=_get(statistics, 'goals', 'assists', default=0),
+        )
+
+
+@dataclass(slots=True)
+class Coach:
+    name: str
+    age: Optional[int]
+    nationality: str
+    since: Optional[str]            # Début du poste actuel (YYYY-MM-DD)
+
+    @classmethod
+    def from_api(cls, response: List[Dict]) -> Optional['Coach']:
+        coach = response[0] if response else None
+        if not coach:
+            return None
+        career = coach.get('career') or []
+        start = career[-1].get('start') if career else None
+        return cls(
+            name=coach.get('name') or 'N/A',
+            age=coach.get('age'),
+            nationality=coach.get('nationality') or 'N/A',
+            since=start[:10] if start else None,
+        )
+
+
+@dataclass(slots=True)
+class Transfer:
+    player: str
+    type: str
+    date: Optional[str]             # YYYY-MM-DD
+    team_in: str
+    team_out: str
+
+    @classmethod
+    def from_api(cls, entry: Dict) -> 'Transfer':
+        detail = (entry.get('transfers') or [{}])[0]
+        date = detail.get('date')
+        return cls(
+            player=_get(entry, 'player', 'name', default='N/A'),
+            type=detail.get('type') or 'N/A',
+            date=date[:10] if date else None,
+            team_in=_get(detail, 'teams', 'in', 'name', default='N/A'),
+            team_out=_get(detail, 'teams', 'out', 'name', default='N/A'),
+        )
+
+
+# ───────────────────────── Projection d'un match ─────────────────────────
+
+def _each(model):
+    return lambda response: [model.from_api(item) for item in response or []]
+
+
+# Clé du match -> projection de la réponse API brute
+PROJECTIONS = {
+    'home_recent_form': _each(FixtureResult),
+    'away_recent_form': _each(FixtureResult),
+    'head_to_head': _each(FixtureResult),
+    'home_injuries': _each(Injury),
+    'away_injuries': _each(Injury),
+    'home_season_stats': SeasonStats.from_api,
+    'away_season_stats': SeasonStats.from_api,
+    'league_standings': StandingsIndex.from_api,
+    'api_prediction': ApiPrediction.from_api,
+    'odds': project_odds,
+    'lineups': _each(Lineup),
+    'league_topscorers': _each(PlayerStat),
+    'league_topassists': _each(PlayerStat),
+    'home_sidelined': _each(Sidelined),
+    'away_sidelined': _each(Sidelined),
+    'home_coach': Coach.from_api,
+    'away_coach': Coach.from_api,
+    'home_transfers': _each(Transfer),
+    'away_transfers': _each(Transfer),
+}
+
+
+def _is_raw(value) -> bool:
+    """Vrai si la valeur est encore une réponse API brute (dict/list de dicts)."""
+    if isinstance(value, dict):
+        return True
+    if isinstance(value, list):
+        return not value or isinstance(value[0], dict)
+    return False
+
+
+def project_match(match: Dict) -> Dict:
+    """
+    Remplace (en place) les réponses API brutes d'un match par le modèle typé.
+
+    Idempotent : les valeurs déjà projetées sont laissées telles quelles.
+    Une réponse malformée est retirée du match plutôt que de bloquer le formatage.
+    """
+    for key, project in PROJECTIONS.items():
+        if key in match and _is_raw(match[key]):
+            try:
+                match[key] = project(match[key])
+            except (AttributeError, KeyError, IndexError, TypeError) as e:
+                print(f"⚠️ Données '{key}' ignorées pour {match.get('home')} vs {match.get('away')}: {e}")
+                del match[key]
+    return match
+
+
+def json_default(value):
+    """
+    Hook json.dumps(..., default=json_default) : sérialise les dataclasses du modèle
+    en lisant directement leurs __slots__ (sans copie intermédiaire comme dataclasses.asdict).
+    """
+    if isinstance(value, StandingsIndex):
+        return value.rows
+    try:
+        return {name: getattr(value, name) for name in value.__slots__}
+    except AttributeError:
+        raise TypeError(f"Type non sérialisable: {type(value).__name__}")
@@ -1,94 +1,135 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 import json
 import pytz
 import os
 from config import Config
+from match_model import PROJECTIONS, project_match
+from standings_store import standings_store
+from api_football import api_football
+from goal_model import goal_model
+from rating_store import rating_store
+from value_detector import value_detector
+from source_merger import SourceMerger
+from flashscore_parser import parse_event_rows
+from http_cache import ConditionalCache
+from tracing import tracer
+from dateutil import parser as date_parser
+
+# Données temps réel (compositions, cotes) : fenêtre avant le coup d'envoi et taille des lots /fixtures?ids=
+MATCH_TIME_HOURS = 2
+FIXTURES_PER_CALL = 20
+
+
+def stale_notice(matches):
+    """Mention des cotes dans l'instruction finale : temps réel, sauf copies locales servies en repli."""
+    if any(match.get('stale_sources') for match in matches):
+        return ("Les cotes fournies sont RÉELLES, mais certaines données (⚠️ signalées par match) viennent "
+                "d'une copie locale et peuvent être anciennes.\n")
+    return "Les cotes fournies sont RÉELLES et EN TEMPS RÉEL.\n"
 
 class MatchScraper:
-    def __init__(self):
+    def __init__(self, reference_time=None):
+        """
+        Args:
+            reference_time: Heure du run rejoué (mode --from-snapshot) ; None = maintenant
+        """
+        self.reference_time = reference_time
         self.config = Config()
         self.tz = pytz.timezone(self.config.TIMEZONE)
+        self.merger = SourceMerger(self.config)
+        self.page_cache = ConditionalCache(os.path.join(self.config.DATA_DIR, 'cache', 'flashscore'), 'flashscore')
         
     def get_today_matches(self):
         """Récupère les matchs du jour depuis plusieurs sources"""
-        matches = []
-
-        # Source 1: FlashScore (via requests)
-        matches.extend(self._scrape_flashscore())
-
-        # Source 2: API-Football gratuite (limitée)
-        matches.extend(self._scrape_api_football_free())
+        # Sources interrogées en parallèle (délai commun), doublons fusionnés
+        with tracer.span('sources') as span:
+            matches = self.merger.fetch_and_merge({
+                'flashscore': self._scrape_flashscore,          # Source 1: FlashScore (via requests)
+                'api-football': self._scrape_api_football_free,  # Source 2: API-Football gratuite (limitée)
+            })
+            span.set(matches=len(matches))
 
         # Filtrer par compétitions incluses
-        filtered_matches = self._filter_matches(matches)
+        with tracer.span('filter') as span:
+            filtered_matches = self._filter_matches(matches)
+            span.set(matches=len(filtered_matches))
 
         # Enrichir avec stats supplémentaires (forme, H2H, blessures)
         print("📊 Enrichissement des matchs avec données contextuelles...")
         enriched_matches = []
-        for match in filtered_matches:
-            enriched_match = self._enrich_match_data(match)
-            enriched_matches.append(enriched_match)
+        with tracer.span('enrich', matches=len(filtered_matches)):
+            for match in filtered_matches:
+                with tracer.span('fixture', fixture=match.get('fixture_id'), match=f"{match.get('home')} vs {match.get('away')}"), \
+                        api_football.stale_sources() as stale:
+                    enriched_match = self._enrich_match_data(match)
+                self._mark_stale([enriched_match], stale)
+                enriched_matches.append(enriched_match)
+
+        # Données temps réel (compositions, cotes) des matchs proches, en appels groupés
+        with tracer.span('match_time'):
+            self._enrich_match_time(enriched_matches)
+
+        # Probabilités du modèle de buts, ajusté en une passe sur tout le programme
+        with tracer.span('goal_model') as span:
+            span.set(annotated=goal_model.annotate(enriched_matches, self._now()))
+
+        # Cotes Elo persistées (data/ratings.json, mises à jour par AutoResultUpdater)
+        with tracer.span('ratings') as span:
+            span.set(annotated=rating_store.annotate(enriched_matches))
+
+        # Cotes du marché en tableaux : meilleures cotes, probabilités sans marge, value face au modèle
+        with tracer.span('market') as span:
+            span.set(priced=value_detector.annotate(enriched_matches), value=value_detector.last_report.get('value', 0))
+
+        # Appels API-Football du run : disjoncteurs, délais, copies locales servies
+        api_football.print_summary()
 
         return enriched_matches
     
     def _scrape_flashscore(self):
-        """Scrape FlashScore pour matchs du jour"""
+        """Scrape FlashScore pour matchs du jour (GET conditionnel + parseur en flux)"""
         try:
-            today = datetime.now(self.tz).strftime('%Y-%m-%d')
-            url = f"https://www.flashscore.com/football/"
-            
+            today = self._now().strftime('%Y-%m-%d')
+            url = self.config.FLASHSCORE_URL
+
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'lxml')
-            
-            matches = []
-            # Parser le HTML (structure simplifiée)
-            for match_div in soup.find_all('div', class_='event__match'):
-                try:
-                    home = match_div.find('div', class_='event__participant--home').text.strip()
-                    away = match_div.find('div', class_='event__participant--away').text.strip()
-                    competition = match_div.find('span', class_='event__title').text.strip()
-                    time = match_div.find('div', class_='event__time').text.strip()
-                    
-                    matches.append({
-                        'home': home,
-                        'away': away,
-                        'competition': competition,
-                        'time': time,
-                        'date': today,
-                        'source': 'flashscore'
-                    })
-                except:
-                    continue
-            
-            return matches
+
+            if api_football.replaying:
+                # Mode snapshot : page archivée avec les réponses API-Football du run
+                content = api_football.archive.lookup_page('flashscore', api_football.replay_date,
+                                                           api_football.replay_run) or b''
+            else:
+                content, from_cache = self.page_cache.get(url, headers=headers, timeout=10)
+                if from_cache:
+                    print("   📄 FlashScore: page inchangée (304), copie locale réutilisée")
+                if api_football.recording:
+                    api_football.archive.record_page('flashscore', content)
+
+            return [
+                {**row, 'date': today, 'source': 'flashscore'}
+                for row in parse_event_rows(content)
+            ]
         except Exception as e:
             print(f"Erreur FlashScore: {e}")
             return []
-    
+
     def _scrape_api_football_free(self):
         """Alternative : API-Football gratuite (100 req/jour)"""
         try:
             # NOTE: Nécessite une clé API gratuite de api-football.com
             # 100 requêtes/jour gratuites
-            today = datetime.now(self.tz).strftime('%Y-%m-%d')
+            today = self._now().strftime('%Y-%m-%d')
             
             # Remplacer par votre clé API gratuite si disponible
-            api_key = os.getenv('API_FOOTBALL_KEY', None)
-            if not api_key:
+            if not api_football.enabled:
                 return []
             
-            url = "https://v3.football.api-sports.io/fixtures"
-            headers = {'x-apisports-key': api_key}
             params = {'date': today}
             
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            data = response.json()
+            with api_football.stale_sources() as stale:
+                data = api_football.get('fixtures', params) or {}
             
             matches = []
             for fixture in data.get('response', []):
@@ -97,6 +138,7 @@ class MatchScraper:
                     'away': fixture['teams']['away']['name'],
                     'competition': fixture['league']['name'],
                     'league_id': fixture['league']['id'],
+                    'season': fixture['league'].get('season'),  # Saison API (≠ année civile de janvier à juin)
                     'country': fixture['league']['country'],
                     'time': fixture['fixture']['date'],
                     'date': today,
@@ -107,6 +149,7 @@ class MatchScraper:
                 }
                 matches.append(match_data)
 
+            self._mark_stale(matches, stale)
             return matches
         except Exception as e:
             print(f"Erreur API-Football: {e}")
@@ -145,19 +188,17 @@ class MatchScraper:
 
         STRATÉGIE INTELLIGENTE:
         - ALWAYS AVAILABLE: Forme récente, H2H, blessures, stats saison, classement, top scorers/assists
-        - MATCH-TIME ONLY: Lineups, odds, stats match, events (seulement <2h avant match)
+        - MATCH-TIME ONLY: Lineups, odds (seulement <2h avant match) - groupés, cf. _enrich_match_time
 
         Cette approche évite les requêtes inutiles et garantit des données RÉELLES.
         """
         try:
-            api_key = os.getenv('API_FOOTBALL_KEY', None)
-            if not api_key or match.get('source') != 'api-football':
+            if not api_football.enabled or match.get('source') != 'api-football':
                 return match
 
-            headers = {'x-apisports-key': api_key}
             fixture_id = match.get('fixture_id')
             league_id = match.get('league_id')
-            season = datetime.now().year
+            season = self._now().year
 
             if not fixture_id:
                 return match
@@ -165,206 +206,225 @@ class MatchScraper:
             team_home_id = match.get('team_home_id')
             team_away_id = match.get('team_away_id')
 
-            # Calculer le temps avant le match
-            match_time_str = match.get('time', '')
-            time_until_match = None
-            try:
-                from dateutil import parser
-                import pytz
-                match_datetime = parser.parse(match_time_str)
-                now = datetime.now(pytz.UTC)
-                time_until_match = (match_datetime - now).total_seconds() / 3600  # heures
-            except:
-                time_until_match = 999  # Si erreur, supposer match loin
-
             # 1. FORME RÉCENTE (10 derniers matchs au lieu de 5 pour plus de contexte)
             if team_home_id:
-                url_home = f"https://v3.football.api-sports.io/fixtures"
                 params_home = {'team': team_home_id, 'last': 10}
-                resp_home = requests.get(url_home, headers=headers, params=params_home, timeout=10)
-                if resp_home.status_code == 200:
-                    match['home_recent_form'] = resp_home.json().get('response', [])
+                resp_home = api_football.get('fixtures', params_home)
+                if resp_home is not None:
+                    match['home_recent_form'] = resp_home.get('response', [])
 
             if team_away_id:
-                url_away = f"https://v3.football.api-sports.io/fixtures"
                 params_away = {'team': team_away_id, 'last': 10}
-                resp_away = requests.get(url_away, headers=headers, params=params_away, timeout=10)
-                if resp_away.status_code == 200:
-                    match['away_recent_form'] = resp_away.json().get('response', [])
+                resp_away = api_football.get('fixtures', params_away)
+                if resp_away is not None:
+                    match['away_recent_form'] = resp_away.get('response', [])
 
             # 2. CONFRONTATIONS DIRECTES (10 derniers H2H pour historique complet)
             if team_home_id and team_away_id:
-                url_h2h = f"https://v3.football.api-sports.io/fixtures/headtohead"
                 params_h2h = {'h2h': f"{team_home_id}-{team_away_id}", 'last': 10}
-                resp_h2h = requests.get(url_h2h, headers=headers, params=params_h2h, timeout=10)
-                if resp_h2h.status_code == 200:
-                    match['head_to_head'] = resp_h2h.json().get('response', [])
+                resp_h2h = api_football.get('fixtures/headtohead', params_h2h)
+                if resp_h2h is not None:
+                    match['head_to_head'] = resp_h2h.get('response', [])
 
             # 3. BLESSURES ET SUSPENSIONS (données actuelles)
             if team_home_id:
-                url_injuries_home = f"https://v3.football.api-sports.io/injuries"
                 params_injuries_home = {'team': team_home_id, 'season': season}
-                resp_injuries_home = requests.get(url_injuries_home, headers=headers, params=params_injuries_home, timeout=10)
-                if resp_injuries_home.status_code == 200:
-                    match['home_injuries'] = resp_injuries_home.json().get('response', [])
+                resp_injuries_home = api_football.get('injuries', params_injuries_home)
+                if resp_injuries_home is not None:
+                    match['home_injuries'] = resp_injuries_home.get('response', [])
 
             if team_away_id:
-                url_injuries_away = f"https://v3.football.api-sports.io/injuries"
                 params_injuries_away = {'team': team_away_id, 'season': season}
-                resp_injuries_away = requests.get(url_injuries_away, headers=headers, params=params_injuries_away, timeout=10)
-                if resp_injuries_away.status_code == 200:
-                    match['away_injuries'] = resp_injuries_away.json().get('response', [])
+                resp_injuries_away = api_football.get('injuries', params_injuries_away)
+                if resp_injuries_away is not None:
+                    match['away_injuries'] = resp_injuries_away.get('response', [])
 
             # 4. STATISTIQUES D'ÉQUIPE SAISON (forme domicile/extérieur, moyenne buts, etc.)
             if team_home_id and league_id:
-                url_stats_home = f"https://v3.football.api-sports.io/teams/statistics"
                 params_stats_home = {'team': team_home_id, 'league': league_id, 'season': season}
-                resp_stats_home = requests.get(url_stats_home, headers=headers, params=params_stats_home, timeout=10)
-                if resp_stats_home.status_code == 200:
-                    match['home_season_stats'] = resp_stats_home.json().get('response', {})
+                resp_stats_home = api_football.get('teams/statistics', params_stats_home)
+                if resp_stats_home is not None:
+                    match['home_season_stats'] = resp_stats_home.get('response', {})
 
             if team_away_id and league_id:
-                url_stats_away = f"https://v3.football.api-sports.io/teams/statistics"
                 params_stats_away = {'team': team_away_id, 'league': league_id, 'season': season}
-                resp_stats_away = requests.get(url_stats_away, headers=headers, params=params_stats_away, timeout=10)
-                if resp_stats_away.status_code == 200:
-                    match['away_season_stats'] = resp_stats_away.json().get('response', {})
+                resp_stats_away = api_football.get('teams/statistics', params_stats_away)
+                if resp_stats_away is not None:
+                    match['away_season_stats'] = resp_stats_away.get('response', {})
 
-            # 5. CLASSEMENT DE LA LIGUE (position, points, écart)
+            # 5. CLASSEMENT DE LA LIGUE (position, points, écart) - indexé une fois par ligue
             if league_id:
-                url_standings = f"https://v3.football.api-sports.io/standings"
-                params_standings = {'league': league_id, 'season': season}
-                resp_standings = requests.get(url_standings, headers=headers, params=params_standings, timeout=10)
-                if resp_standings.status_code == 200:
-                    match['league_standings'] = resp_standings.json().get('response', [])
+                standings = standings_store.get(league_id, season)
+                if standings is not None:
+                    match['league_standings'] = standings
 
             # 6. PRÉDICTIONS API-FOOTBALL (pour comparaison avec nos analyses) - TOUJOURS DISPONIBLE
-            url_predictions = f"https://v3.football.api-sports.io/predictions"
             params_predictions = {'fixture': fixture_id}
-            resp_predictions = requests.get(url_predictions, headers=headers, params=params_predictions, timeout=10)
-            if resp_predictions.status_code == 200:
-                predictions_data = resp_predictions.json().get('response', [])
-                if predictions_data and len(predictions_data) > 0:  # Vérifier que les données existent
-                    match['api_predictions'] = predictions_data
-                else:
-                    match['api_predictions'] = []
-
-            # ═══════════════════════════════════════════════════════════════
-            # DONNÉES "MATCH-TIME ONLY" - SEULEMENT si match dans <2 heures
-            # ═══════════════════════════════════════════════════════════════
-
-            if time_until_match is not None and time_until_match < 2:
-                print(f"   ⏰ Match dans {time_until_match:.1f}h - Récupération données temps réel...")
-
-                # 8. COTES EN TEMPS RÉEL (disponible ~2h avant)
-                url_odds = f"https://v3.football.api-sports.io/odds"
-                params_odds = {'fixture': fixture_id}
-                resp_odds = requests.get(url_odds, headers=headers, params=params_odds, timeout=10)
-                if resp_odds.status_code == 200:
-                    odds_data = resp_odds.json().get('response', [])
-                    if odds_data and len(odds_data) > 0:
-                        match['odds'] = odds_data
-
-                # 9. COMPOSITIONS D'ÉQUIPE CONFIRMÉES (disponible ~1-2h avant)
-                url_lineups = f"https://v3.football.api-sports.io/fixtures/lineups"
-                params_lineups = {'fixture': fixture_id}
-                resp_lineups = requests.get(url_lineups, headers=headers, params=params_lineups, timeout=10)
-                if resp_lineups.status_code == 200:
-                    lineups_data = resp_lineups.json().get('response', [])
-                    if lineups_data and len(lineups_data) > 0:
-                        match['lineups'] = lineups_data
-
-                # 10. ÉVÉNEMENTS DU MATCH (seulement si match en cours ou terminé)
-                url_events = f"https://v3.football.api-sports.io/fixtures/events"
-                params_events = {'fixture': fixture_id}
-                resp_events = requests.get(url_events, headers=headers, params=params_events, timeout=10)
-                if resp_events.status_code == 200:
-                    events_data = resp_events.json().get('response', [])
-                    if events_data and len(events_data) > 0:
-                        match['match_events'] = events_data
-
-                # 11. STATISTIQUES DÉTAILLÉES DU MATCH (seulement si match en cours/terminé)
-                url_match_stats = f"https://v3.football.api-sports.io/fixtures/statistics"
-                params_match_stats = {'fixture': fixture_id}
-                resp_match_stats = requests.get(url_match_stats, headers=headers, params=params_match_stats, timeout=10)
-                if resp_match_stats.status_code == 200:
-                    stats_data = resp_match_stats.json().get('response', [])
-                    if stats_data and len(stats_data) > 0:
-                        match['match_statistics'] = stats_data
-            else:
-                print(f"   ⏳ Match dans {time_until_match:.1f}h - Données temps réel non encore disponibles")
+            resp_predictions = api_football.get('predictions', params_predictions)
+            if resp_predictions is not None:
+                match['api_prediction'] = resp_predictions.get('response', [])
 
             # 11. TOP BUTEURS DE LA LIGUE (cache par ligue pour économiser requêtes)
             if league_id and not hasattr(self, f'_topscorers_cache_{league_id}'):
-                url_topscorers = f"https://v3.football.api-sports.io/players/topscorers"
                 params_topscorers = {'league': league_id, 'season': season}
-                resp_topscorers = requests.get(url_topscorers, headers=headers, params=params_topscorers, timeout=10)
-                if resp_topscorers.status_code == 200:
-                    setattr(self, f'_topscorers_cache_{league_id}', resp_topscorers.json().get('response', []))
+                resp_topscorers = api_football.get('players/topscorers', params_topscorers)
+                if resp_topscorers is not None:
+                    setattr(self, f'_topscorers_cache_{league_id}', PROJECTIONS['league_topscorers'](resp_topscorers.get('response', [])))
             match['league_topscorers'] = getattr(self, f'_topscorers_cache_{league_id}', [])
 
             # 12. TOP PASSEURS DE LA LIGUE (cache par ligue)
             if league_id and not hasattr(self, f'_topassists_cache_{league_id}'):
-                url_topassists = f"https://v3.football.api-sports.io/players/topassists"
                 params_topassists = {'league': league_id, 'season': season}
-                resp_topassists = requests.get(url_topassists, headers=headers, params=params_topassists, timeout=10)
-                if resp_topassists.status_code == 200:
-                    setattr(self, f'_topassists_cache_{league_id}', resp_topassists.json().get('response', []))
+                resp_topassists = api_football.get('players/topassists', params_topassists)
+                if resp_topassists is not None:
+                    setattr(self, f'_topassists_cache_{league_id}', PROJECTIONS['league_topassists'](resp_topassists.get('response', [])))
             match['league_topassists'] = getattr(self, f'_topassists_cache_{league_id}', [])
 
             # 13. JOUEURS ÉCARTÉS LONG TERME (sidelined)
             if team_home_id:
-                url_sidelined_home = f"https://v3.football.api-sports.io/sidelined"
                 params_sidelined_home = {'team': team_home_id}
-                resp_sidelined_home = requests.get(url_sidelined_home, headers=headers, params=params_sidelined_home, timeout=10)
-                if resp_sidelined_home.status_code == 200:
-                    match['home_sidelined'] = resp_sidelined_home.json().get('response', [])
+                resp_sidelined_home = api_football.get('sidelined', params_sidelined_home)
+                if resp_sidelined_home is not None:
+                    match['home_sidelined'] = resp_sidelined_home.get('response', [])
 
             if team_away_id:
-                url_sidelined_away = f"https://v3.football.api-sports.io/sidelined"
                 params_sidelined_away = {'team': team_away_id}
-                resp_sidelined_away = requests.get(url_sidelined_away, headers=headers, params=params_sidelined_away, timeout=10)
-                if resp_sidelined_away.status_code == 200:
-                    match['away_sidelined'] = resp_sidelined_away.json().get('response', [])
+                resp_sidelined_away = api_football.get('sidelined', params_sidelined_away)
+                if resp_sidelined_away is not None:
+                    match['away_sidelined'] = resp_sidelined_away.get('response', [])
 
             # 14. INFO ENTRAÎNEURS (récent, tactiques)
             if team_home_id:
-                url_coach_home = f"https://v3.football.api-sports.io/coachs"
                 params_coach_home = {'team': team_home_id}
-                resp_coach_home = requests.get(url_coach_home, headers=headers, params=params_coach_home, timeout=10)
-                if resp_coach_home.status_code == 200:
-                    match['home_coach'] = resp_coach_home.json().get('response', [])
+                resp_coach_home = api_football.get('coachs', params_coach_home)
+                if resp_coach_home is not None:
+                    match['home_coach'] = resp_coach_home.get('response', [])
 
             if team_away_id:
-                url_coach_away = f"https://v3.football.api-sports.io/coachs"
                 params_coach_away = {'team': team_away_id}
-                resp_coach_away = requests.get(url_coach_away, headers=headers, params=params_coach_away, timeout=10)
-                if resp_coach_away.status_code == 200:
-                    match['away_coach'] = resp_coach_away.json().get('response', [])
+                resp_coach_away = api_football.get('coachs', params_coach_away)
+                if resp_coach_away is not None:
+                    match['away_coach'] = resp_coach_away.get('response', [])
 
             # 15. TRANSFERTS RÉCENTS (nouveaux joueurs, adaptations)
             if team_home_id:
-                url_transfers_home = f"https://v3.football.api-sports.io/transfers"
                 params_transfers_home = {'team': team_home_id}
-                resp_transfers_home = requests.get(url_transfers_home, headers=headers, params=params_transfers_home, timeout=10)
-                if resp_transfers_home.status_code == 200:
-                    match['home_transfers'] = resp_transfers_home.json().get('response', [])[:10]  # 10 derniers transferts
+                resp_transfers_home = api_football.get('transfers', params_transfers_home)
+                if resp_transfers_home is not None:
+                    match['home_transfers'] = resp_transfers_home.get('response', [])[:10]  # 10 derniers transferts
 
             if team_away_id:
-                url_transfers_away = f"https://v3.football.api-sports.io/transfers"
                 params_transfers_away = {'team': team_away_id}
-                resp_transfers_away = requests.get(url_transfers_away, headers=headers, params=params_transfers_away, timeout=10)
-                if resp_transfers_away.status_code == 200:
-                    match['away_transfers'] = resp_transfers_away.json().get('response', [])[:10]
+                resp_transfers_away = api_football.get('transfers', params_transfers_away)
+                if resp_transfers_away is not None:
+                    match['away_transfers'] = resp_transfers_away.get('response', [])[:10]
 
-            return match
+            return project_match(match)
 
         except Exception as e:
             print(f"⚠️ Erreur enrichissement match {match.get('home')} vs {match.get('away')}: {e}")
-            return match
+            return project_match(match)
+
+    def _now(self):
+        """Heure de référence du run (heure d'archivage en mode --from-snapshot)"""
+        return self.reference_time or datetime.now(self.tz)
+
+    def _hours_until(self, match):
+        """Heures avant le coup d'envoi (999 si l'heure est illisible : match supposé loin)"""
+        try:
+            match_datetime = date_parser.parse(match.get('time', ''))
+            return (match_datetime - self._now()).total_seconds() / 3600
+        except (ValueError, TypeError, OverflowError):
+            return 999
+
+    @staticmethod
+    def _mark_stale(matches, families):
+        """Ajoute à match['stale_sources'] les familles API-Football servies depuis la copie locale."""
+        if not families:
+            return
+        for match in matches:
+            match['stale_sources'] = sorted(set(match.get('stale_sources', [])) | set(families))
+
+    def _enrich_match_time(self, matches):
+        """
+        Données "MATCH-TIME ONLY" des matchs dans moins de 2 heures, en appels groupés :
+        - compositions : /fixtures?ids= (jusqu'à 20 matchs par appel, sous-ressources incluses)
+        - cotes : /odds par ligue et par date (pages de résultats)
+
+        Soit ~N/20 + pages appels au lieu de 2 par match.
+        """
+        near = {}
+        for match in matches:
+            if match.get('source') != 'api-football' or not match.get('fixture_id'):
+                continue
+            hours = self._hours_until(match)
+            if hours < MATCH_TIME_HOURS:
+                near[match['fixture_id']] = match
+            else:
+                print(f"   ⏳ {match['home']} vs {match['away']} dans {hours:.1f}h - Données temps réel non encore disponibles")
+
+        if not api_football.enabled or not near:
+            return
+
+        calls = 0
+        print(f"   ⏰ {len(near)} match(s) dans <{MATCH_TIME_HOURS}h - Récupération groupée des données temps réel...")
+
+        try:
+            # COMPOSITIONS D'ÉQUIPE CONFIRMÉES (disponible ~1-2h avant)
+            ids = list(near)
+            for start in range(0, len(ids), FIXTURES_PER_CALL):
+                chunk = ids[start:start + FIXTURES_PER_CALL]
+                with api_football.stale_sources() as stale:
+                    resp_fixtures = api_football.get('fixtures', {'ids': '-'.join(str(i) for i in chunk)})
+                calls += 1
+                self._mark_stale([near[i] for i in chunk], stale)
+                if resp_fixtures is None:
+                    continue
+                for fixture in resp_fixtures.get('response', []):
+                    match = near.get(fixture.get('fixture', {}).get('id'))
+                    if match is None:
+                        continue
+                    if not match.get('season'):
+                        match['season'] = fixture.get('league', {}).get('season')
+                    if fixture.get('lineups'):
+                        match['lineups'] = fixture['lineups']
+
+            # COTES EN TEMPS RÉEL (disponible ~2h avant) - une série de pages par ligue, saison et date
+            # (saison lue dans /fixtures ; l'année civile n'est qu'un repli)
+            groups = {(m.get('league_id'), m.get('season') or self._now().year, m.get('date'))
+                      for m in near.values() if m.get('league_id')}
+            for league_id, season, date in sorted(groups):
+                page, total_pages = 1, 1
+                with api_football.stale_sources() as stale:
+                    while page <= total_pages:
+                        data = api_football.get('odds', {'league': league_id, 'season': season, 'date': date, 'page': page})
+                        calls += 1
+                        if data is None:
+                            break
+                        total_pages = data.get('paging', {}).get('total', 1) or 1
+                        for odds in data.get('response', []):
+                            match = near.get(odds.get('fixture', {}).get('id'))
+                            if match is not None:
+                                match.setdefault('odds', []).append(odds)
+                        page += 1
+                self._mark_stale([m for m in near.values()
+                                  if (m.get('league_id'), m.get('season') or self._now().year, m.get('date')) == (league_id, season, date)],
+                                 stale)
+        except Exception as e:
+            print(f"⚠️ Erreur données temps réel: {e}")
+
+        for match in near.values():
+            project_match(match)
+        print(f"   ✅ Données temps réel: {calls} appel(s) pour {len(near)} match(s) (au lieu de {2 * len(near)})")
+
+    def format_matches_for_prompt(self, matches, blocks=None):
+        """
+        Formate les matchs pour le prompt avec TOUTES les données enrichies
 
-    def format_matches_for_prompt(self, matches):
-        """Formate les matchs pour le prompt avec TOUTES les données enrichies"""
+        Args:
+            matches: Matchs enrichis
+            blocks: Blocs déjà rendus par match (ex: réduits par prompt_budget.PromptBudget)
+        """
         if not matches:
             return "Aucun match disponible aujourd'hui."
 
@@ -376,332 +436,343 @@ class MatchScraper:
             formatted += f"\n{'█' * 60}\n"
             formatted += f"MATCH #{i}: {match['home']} vs {match['away']}\n"
             formatted += f"{'█' * 60}\n\n"
-            formatted += f"📍 Compétition: {match['competition']}\n"
-            formatted += f"⏰ Coup d'envoi: {match['time']}\n\n"
-
-            # 1. CLASSEMENT & POSITION
-            if match.get('league_standings'):
-                formatted += "┌─ 📊 CLASSEMENT ACTUEL ─────────────────────────────────┐\n"
-                standings = match['league_standings'][0]['league']['standings'][0] if match['league_standings'] else []
-                home_team_name = match['home']
-                away_team_name = match['away']
-
-                for team in standings:
-                    if team['team']['name'] == home_team_name:
-                        formatted += f"│ 🏠 {home_team_name}: {team['rank']}e place - {team['points']} pts\n"
-                        formatted += f"│    Bilan: {team['all']['win']}V-{team['all']['draw']}N-{team['all']['lose']}D\n"
-                        formatted += f"│    Buts: {team['all']['goals']['for']} pour, {team['all']['goals']['against']} contre (diff: {team['goalsDiff']})\n"
-                        formatted += f"│    Domicile: {team['home']['win']}V-{team['home']['draw']}N-{team['home']['lose']}D\n"
-                    elif team['team']['name'] == away_team_name:
-                        formatted += f"│ ✈️  {away_team_name}: {team['rank']}e place - {team['points']} pts\n"
-                        formatted += f"│    Bilan: {team['all']['win']}V-{team['all']['draw']}N-{team['all']['lose']}D\n"
-                        formatted += f"│    Buts: {team['all']['goals']['for']} pour, {team['all']['goals']['against']} contre (diff: {team['goalsDiff']})\n"
-                        formatted += f"│    Extérieur: {team['away']['win']}V-{team['away']['draw']}N-{team['away']['lose']}D\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            # 2. STATISTIQUES SAISON COMPLÈTES
-            if match.get('home_season_stats'):
-                stats_home = match['home_season_stats']
-                formatted += "┌─ 📈 STATS SAISON ÉQUIPE DOMICILE ──────────────────────┐\n"
-                if stats_home.get('fixtures'):
-                    formatted += f"│ Matchs joués: {stats_home['fixtures']['played']['total']}\n"
-                    formatted += f"│ Victoires: {stats_home['fixtures']['wins']['total']} ({stats_home['fixtures']['wins']['home']} domicile)\n"
-                    formatted += f"│ Nuls: {stats_home['fixtures']['draws']['total']}\n"
-                    formatted += f"│ Défaites: {stats_home['fixtures']['loses']['total']}\n"
-                if stats_home.get('goals'):
-                    formatted += f"│ Buts marqués: {stats_home['goals']['for']['total']['total']} (moy: {stats_home['goals']['for']['average']['total']})\n"
-                    formatted += f"│ Buts encaissés: {stats_home['goals']['against']['total']['total']} (moy: {stats_home['goals']['against']['average']['total']})\n"
-                if stats_home.get('biggest'):
-                    formatted += f"│ Plus grande victoire: {stats_home['biggest']['wins']['home']}\n"
-                    formatted += f"│ Plus lourde défaite: {stats_home['biggest']['loses']['home']}\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            if match.get('away_season_stats'):
-                stats_away = match['away_season_stats']
-                formatted += "┌─ 📈 STATS SAISON ÉQUIPE EXTÉRIEURE ────────────────────┐\n"
-                if stats_away.get('fixtures'):
-                    formatted += f"│ Matchs joués: {stats_away['fixtures']['played']['total']}\n"
-                    formatted += f"│ Victoires: {stats_away['fixtures']['wins']['total']} ({stats_away['fixtures']['wins']['away']} extérieur)\n"
-                    formatted += f"│ Nuls: {stats_away['fixtures']['draws']['total']}\n"
-                    formatted += f"│ Défaites: {stats_away['fixtures']['loses']['total']}\n"
-                if stats_away.get('goals'):
-                    formatted += f"│ Buts marqués: {stats_away['goals']['for']['total']['total']} (moy: {stats_away['goals']['for']['average']['total']})\n"
-                    formatted += f"│ Buts encaissés: {stats_away['goals']['against']['total']['total']} (moy: {stats_away['goals']['against']['average']['total']})\n"
-                if stats_away.get('biggest'):
-                    formatted += f"│ Plus grande victoire: {stats_away['biggest']['wins']['away']}\n"
-                    formatted += f"│ Plus lourde défaite: {stats_away['biggest']['loses']['away']}\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            # 3. FORME RÉCENTE (10 derniers matchs)
-            if match.get('home_recent_form'):
-                formatted += "┌─ 🔥 FORME RÉCENTE DOMICILE (10 derniers) ─────────────┐\n"
-                for idx, game in enumerate(match['home_recent_form'][:10], 1):
-                    home_team = game['teams']['home']['name']
-                    away_team = game['teams']['away']['name']
-                    score_home = game['goals']['home']
-                    score_away = game['goals']['away']
-                    date_game = game['fixture']['date'][:10]
-                    result = "V" if (home_team == match['home'] and score_home > score_away) or (away_team == match['home'] and score_away > score_home) else ("N" if score_home == score_away else "D")
-                    formatted += f"│ {idx:2}. [{result}] {date_game}: {home_team} {score_home}-{score_away} {away_team}\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            if match.get('away_recent_form'):
-                formatted += "┌─ 🔥 FORME RÉCENTE EXTÉRIEUR (10 derniers) ────────────┐\n"
-                for idx, game in enumerate(match['away_recent_form'][:10], 1):
-                    home_team = game['teams']['home']['name']
-                    away_team = game['teams']['away']['name']
-                    score_home = game['goals']['home']
-                    score_away = game['goals']['away']
-                    date_game = game['fixture']['date'][:10]
-                    result = "V" if (home_team == match['away'] and score_home > score_away) or (away_team == match['away'] and score_away > score_home) else ("N" if score_home == score_away else "D")
-                    formatted += f"│ {idx:2}. [{result}] {date_game}: {home_team} {score_home}-{score_away} {away_team}\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            # 4. CONFRONTATIONS DIRECTES
-            if match.get('head_to_head'):
-                formatted += "┌─ 🔄 CONFRONTATIONS DIRECTES (10 derniers H2H) ────────┐\n"
-                for idx, game in enumerate(match['head_to_head'][:10], 1):
-                    home_team = game['teams']['home']['name']
-                    away_team = game['teams']['away']['name']
-                    score_home = game['goals']['home']
-                    score_away = game['goals']['away']
-                    date_game = game['fixture']['date'][:10]
-                    formatted += f"│ {idx:2}. {date_game}: {home_team} {score_home}-{score_away} {away_team}\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            # 5. BLESSURES ET SUSPENSIONS
-            if match.get('home_injuries'):
-                formatted += "┌─ 🏥 BLESSURES/SUSPENSIONS DOMICILE ───────────────────┐\n"
-                if len(match['home_injuries']) == 0:
-                    formatted += "│ ✅ Aucune blessure signalée\n"
-                else:
-                    for injury in match['home_injuries'][:10]:
-                        player = injury['player']['name']
-                        reason = injury['player']['reason']
-                        formatted += f"│ ❌ {player}: {reason}\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            if match.get('away_injuries'):
-                formatted += "┌─ 🏥 BLESSURES/SUSPENSIONS EXTÉRIEUR ──────────────────┐\n"
-                if len(match['away_injuries']) == 0:
-                    formatted += "│ ✅ Aucune blessure signalée\n"
-                else:
-                    for injury in match['away_injuries'][:10]:
-                        player = injury['player']['name']
-                        reason = injury['player']['reason']
-                        formatted += f"│ ❌ {player}: {reason}\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            # 6. COTES EN TEMPS RÉEL
-            if match.get('odds') and len(match['odds']) > 0:
-                formatted += "┌─ 💰 COTES EN TEMPS RÉEL (marchés principaux) ─────────┐\n"
-                try:
-                    for odds_data in match['odds'][:3]:  # Top 3 bookmakers
-                        if not isinstance(odds_data, dict):
-                            continue
-                        bm_name = odds_data.get('bookmaker', {}).get('name', 'Unknown')
-                        bets = odds_data.get('bets', [])
-
-                        for bet in bets:
-                            bet_name = bet.get('name', '')
-                            values = bet.get('values', [])
-
-                            if bet_name == 'Match Winner':
-                                formatted += f"│ [{bm_name}] 1X2:\n"
-                                for value in values:
-                                    formatted += f"│   - {value.get('value', 'N/A')}: {value.get('odd', 'N/A')}\n"
-                            elif bet_name == 'Goals Over/Under':
-                                formatted += f"│ [{bm_name}] Over/Under:\n"
-                                for value in values[:4]:
-                                    formatted += f"│   - {value.get('value', 'N/A')}: {value.get('odd', 'N/A')}\n"
-                            elif bet_name == 'Both Teams Score':
-                                formatted += f"│ [{bm_name}] BTTS:\n"
-                                for value in values:
-                                    formatted += f"│   - {value.get('value', 'N/A')}: {value.get('odd', 'N/A')}\n"
-                    formatted += "└────────────────────────────────────────────────────────┘\n\n"
-                except Exception as e:
-                    formatted += "│ ⚠️ Erreur parsing cotes - données non disponibles\n"
-                    formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            # 7. PRÉDICTIONS API-FOOTBALL (référence)
-            if match.get('api_predictions'):
-                pred = match['api_predictions'][0] if match['api_predictions'] else {}
-                if pred:
-                    formatted += "┌─ 🤖 PRÉDICTION API-FOOTBALL (référence) ──────────────┐\n"
-                    if pred.get('predictions'):
-                        formatted += f"│ Gagnant probable: {pred['predictions'].get('winner', {}).get('name', 'N/A')}\n"
-                        formatted += f"│ Conseil: {pred['predictions'].get('advice', 'N/A')}\n"
-                    if pred.get('comparison'):
-                        comp = pred['comparison']
-                        formatted += f"│ Forme: {comp.get('form', {}).get('home', 'N/A')} vs {comp.get('form', {}).get('away', 'N/A')}\n"
-                        formatted += f"│ Att: {comp.get('att', {}).get('home', 'N/A')} vs {comp.get('att', {}).get('away', 'N/A')}\n"
-                        formatted += f"│ Def: {comp.get('def', {}).get('home', 'N/A')} vs {comp.get('def', {}).get('away', 'N/A')}\n"
-                    formatted += "│ ⚠️ IMPORTANT: Ces prédictions sont INDICATIVES, tu dois faire ta propre analyse\n"
-                    formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            # 8. COMPOSITIONS D'ÉQUIPE & SYSTÈMES TACTIQUES
-            if match.get('lineups'):
-                formatted += "┌─ ⚽ COMPOSITIONS & TACTIQUES ──────────────────────────┐\n"
-                for lineup in match['lineups']:
-                    team_name = lineup.get('team', {}).get('name', 'N/A')
-                    formation = lineup.get('formation', 'N/A')
-                    coach_name = lineup.get('coach', {}).get('name', 'N/A')
-
-                    emoji = "🏠" if team_name == match['home'] else "✈️"
-                    formatted += f"│ {emoji} {team_name}: Formation {formation}\n"
-                    formatted += f"│    Entraîneur: {coach_name}\n"
-
-                    # Afficher les 11 titulaires
-                    startXI = lineup.get('startXI', [])
-                    if startXI:
-                        formatted += f"│    Titulaires: "
-                        players_list = [p.get('player', {}).get('name', 'N/A') for p in startXI[:11]]
-                        formatted += f"{', '.join(players_list[:5])}...\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            # 9. TOP BUTEURS DE LA LIGUE (menaces offensives)
-            if match.get('league_topscorers'):
-                formatted += "┌─ ⚽ TOP 10 BUTEURS DE LA LIGUE ────────────────────────┐\n"
-                home_team = match['home']
-                away_team = match['away']
-
-                for idx, scorer in enumerate(match['league_topscorers'][:10], 1):
-                    player_name = scorer.get('player', {}).get('name', 'N/A')
-                    team_name = scorer.get('statistics', [{}])[0].get('team', {}).get('name', 'N/A')
-                    goals = scorer.get('statistics', [{}])[0].get('goals', {}).get('total', 0)
-
-                    marker = ""
-                    if team_name == home_team:
-                        marker = "🏠 "
-                    elif team_name == away_team:
-                        marker = "✈️ "
-
-                    formatted += f"│ {idx:2}. {marker}{player_name} ({team_name}): {goals} buts\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            # 10. TOP PASSEURS DE LA LIGUE (créativité offensive)
-            if match.get('league_topassists'):
-                formatted += "┌─ 🎯 TOP 10 PASSEURS DE LA LIGUE ──────────────────────┐\n"
-                home_team = match['home']
-                away_team = match['away']
-
-                for idx, assister in enumerate(match['league_topassists'][:10], 1):
-                    player_name = assister.get('player', {}).get('name', 'N/A')
-                    team_name = assister.get('statistics', [{}])[0].get('team', {}).get('name', 'N/A')
-                    assists = assister.get('statistics', [{}])[0].get('goals', {}).get('assists', 0)
-
-                    marker = ""
-                    if team_name == home_team:
-                        marker = "🏠 "
-                    elif team_name == away_team:
-                        marker = "✈️ "
-
-                    formatted += f"│ {idx:2}. {marker}{player_name} ({team_name}): {assists} passes\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            # 11. JOUEURS ÉCARTÉS LONG TERME (sidelined)
-            if match.get('home_sidelined'):
-                formatted += "┌─ 🚑 JOUEURS ÉCARTÉS LONG TERME DOMICILE ──────────────┐\n"
-                if len(match['home_sidelined']) == 0:
-                    formatted += "│ ✅ Aucun joueur écarté long terme\n"
-                else:
-                    for sideline in match['home_sidelined'][:5]:
-                        player = sideline.get('player', {}).get('name', 'N/A')
-                        reason = sideline.get('type', 'N/A')
-                        start_date = sideline.get('start', 'N/A')[:10] if sideline.get('start') else 'N/A'
-                        formatted += f"│ ⚠️ {player}: {reason} (depuis {start_date})\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            if match.get('away_sidelined'):
-                formatted += "┌─ 🚑 JOUEURS ÉCARTÉS LONG TERME EXTÉRIEUR ─────────────┐\n"
-                if len(match['away_sidelined']) == 0:
-                    formatted += "│ ✅ Aucun joueur écarté long terme\n"
-                else:
-                    for sideline in match['away_sidelined'][:5]:
-                        player = sideline.get('player', {}).get('name', 'N/A')
-                        reason = sideline.get('type', 'N/A')
-                        start_date = sideline.get('start', 'N/A')[:10] if sideline.get('start') else 'N/A'
-                        formatted += f"│ ⚠️ {player}: {reason} (depuis {start_date})\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            # 12. INFO ENTRAÎNEURS (expérience, arrivée récente)
-            if match.get('home_coach'):
-                formatted += "┌─ 👔 ENTRAÎNEUR DOMICILE ───────────────────────────────┐\n"
-                coach = match['home_coach'][0] if match['home_coach'] else {}
-                if coach:
-                    coach_name = coach.get('name', 'N/A')
-                    coach_age = coach.get('age', 'N/A')
-                    nationality = coach.get('nationality', 'N/A')
-                    formatted += f"│ Nom: {coach_name} ({nationality}, {coach_age} ans)\n"
-
-                    career = coach.get('career', [])
-                    if career:
-                        current_team = career[-1]
-                        start_date = current_team.get('start', 'N/A')[:10] if current_team.get('start') else 'N/A'
-                        formatted += f"│ En poste depuis: {start_date}\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            if match.get('away_coach'):
-                formatted += "┌─ 👔 ENTRAÎNEUR EXTÉRIEUR ──────────────────────────────┐\n"
-                coach = match['away_coach'][0] if match['away_coach'] else {}
-                if coach:
-                    coach_name = coach.get('name', 'N/A')
-                    coach_age = coach.get('age', 'N/A')
-                    nationality = coach.get('nationality', 'N/A')
-                    formatted += f"│ Nom: {coach_name} ({nationality}, {coach_age} ans)\n"
-
-                    career = coach.get('career', [])
-                    if career:
-                        current_team = career[-1]
-                        start_date = current_team.get('start', 'N/A')[:10] if current_team.get('start') else 'N/A'
-                        formatted += f"│ En poste depuis: {start_date}\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            # 13. TRANSFERTS RÉCENTS (nouveaux joueurs, adaptation)
-            if match.get('home_transfers'):
-                formatted += "┌─ 🔄 TRANSFERTS RÉCENTS DOMICILE (derniers) ───────────┐\n"
-                if len(match['home_transfers']) == 0:
-                    formatted += "│ ℹ️ Aucun transfert récent\n"
-                else:
-                    for transfer in match['home_transfers'][:5]:
-                        player_name = transfer.get('player', {}).get('name', 'N/A')
-                        transfer_type = transfer.get('transfers', [{}])[0].get('type', 'N/A')
-                        from_team = transfer.get('transfers', [{}])[0].get('teams', {}).get('out', {}).get('name', 'N/A')
-                        to_team = transfer.get('transfers', [{}])[0].get('teams', {}).get('in', {}).get('name', 'N/A')
-                        date = transfer.get('transfers', [{}])[0].get('date', 'N/A')[:10] if transfer.get('transfers', [{}])[0].get('date') else 'N/A'
-
-                        if to_team == match['home']:
-                            formatted += f"│ ⬇️ {player_name}: {from_team} → {to_team} ({transfer_type}, {date})\n"
-                        elif from_team == match['home']:
-                            formatted += f"│ ⬆️ {player_name}: {from_team} → {to_team} ({transfer_type}, {date})\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            if match.get('away_transfers'):
-                formatted += "┌─ 🔄 TRANSFERTS RÉCENTS EXTÉRIEUR (derniers) ──────────┐\n"
-                if len(match['away_transfers']) == 0:
-                    formatted += "│ ℹ️ Aucun transfert récent\n"
-                else:
-                    for transfer in match['away_transfers'][:5]:
-                        player_name = transfer.get('player', {}).get('name', 'N/A')
-                        transfer_type = transfer.get('transfers', [{}])[0].get('type', 'N/A')
-                        from_team = transfer.get('transfers', [{}])[0].get('teams', {}).get('out', {}).get('name', 'N/A')
-                        to_team = transfer.get('transfers', [{}])[0].get('teams', {}).get('in', {}).get('name', 'N/A')
-                        date = transfer.get('transfers', [{}])[0].get('date', 'N/A')[:10] if transfer.get('transfers', [{}])[0].get('date') else 'N/A'
-
-                        if to_team == match['away']:
-                            formatted += f"│ ⬇️ {player_name}: {from_team} → {to_team} ({transfer_type}, {date})\n"
-                        elif from_team == match['away']:
-                            formatted += f"│ ⬆️ {player_name}: {from_team} → {to_team} ({transfer_type}, {date})\n"
-                formatted += "└────────────────────────────────────────────────────────┘\n\n"
-
-            formatted += "\n" + "═" * 60 + "\n\n"
+            formatted += blocks[i - 1] if blocks is not None else self.format_match_block(match)
 
         formatted += "\n🎯 INSTRUCTION: Analyse TOUTES ces données réelles pour identifier les VALUE BETS.\n"
-        formatted += "Les cotes fournies sont RÉELLES et EN TEMPS RÉEL.\n"
+        formatted += stale_notice(matches)
         formatted += "NE PAS inventer de données - TOUT est fourni ci-dessus.\n\n"
 
         return formatted
 
+    def format_match_block(self, match, sections=None):
+        """
+        Formate les données enrichies d'un seul match (sans l'en-tête numéroté).
+
+        Le bloc ne dépend que du match : il sert aussi d'empreinte pour le cache
+        d'analyse par match (cf. analysis_cache).
+
+        Args:
+            match: Match enrichi
+            sections: Sections déjà calculées (éventuellement réduites par prompt_budget)
+        """
+        if sections is None:
+            sections = self.format_match_sections(match)
+        return "".join(text for _, text in sections) + "\n" + "═" * 60 + "\n\n"
+
+    def format_match_sections(self, match):
+        """
+        Découpe le bloc d'un match en sections nommées, dans l'ordre du prompt.
+
+        Returns:
+            Liste de tuples (clé de section, texte) - cf. prompt_budget.SECTION_PRIORITIES
+        """
+        sections = [('header', f"📍 Compétition: {match['competition']}\n⏰ Coup d'envoi: {match['time']}\n\n")]
+        if match.get('stale_sources'):
+            sections.append(('stale', f"⚠️ DONNÉES DE SECOURS: {', '.join(match['stale_sources'])} servies depuis une copie "
+                                      f"locale (API indisponible) - possiblement anciennes, à pondérer\n\n"))
+
+        # 1. CLASSEMENT & POSITION
+        formatted = ""
+        if match.get('league_standings'):
+            formatted += "┌─ 📊 CLASSEMENT ACTUEL ─────────────────────────────────┐\n"
+            for side, team in match['league_standings'].for_match(match):
+                emoji, venue = ("🏠", "Domicile") if side == 'home' else ("✈️ ", "Extérieur")
+                win, draw, lose = team.split(side)
+                formatted += f"│ {emoji} {match[side]}: {team.rank}e place - {team.points} pts\n"
+                formatted += f"│    Bilan: {team.win}V-{team.draw}N-{team.lose}D\n"
+                formatted += f"│    Buts: {team.goals_for} pour, {team.goals_against} contre (diff: {team.goals_diff})\n"
+                formatted += f"│    {venue}: {win}V-{draw}N-{lose}D\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('standings', formatted))
+
+        # 2. STATISTIQUES SAISON COMPLÈTES
+        formatted = ""
+        if match.get('home_season_stats'):
+            stats_home = match['home_season_stats']
+            formatted += "┌─ 📈 STATS SAISON ÉQUIPE DOMICILE ──────────────────────┐\n"
+            if stats_home.record:
+                formatted += f"│ Matchs joués: {stats_home.record.played}\n"
+                formatted += f"│ Victoires: {stats_home.record.wins} ({stats_home.record.wins_home} domicile)\n"
+                formatted += f"│ Nuls: {stats_home.record.draws}\n"
+                formatted += f"│ Défaites: {stats_home.record.loses}\n"
+            if stats_home.goals:
+                formatted += f"│ Buts marqués: {stats_home.goals.scored} (moy: {stats_home.goals.scored_avg})\n"
+                formatted += f"│ Buts encaissés: {stats_home.goals.conceded} (moy: {stats_home.goals.conceded_avg})\n"
+            if stats_home.biggest:
+                formatted += f"│ Plus grande victoire: {stats_home.biggest.win_home}\n"
+                formatted += f"│ Plus lourde défaite: {stats_home.biggest.loss_home}\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        if match.get('away_season_stats'):
+            stats_away = match['away_season_stats']
+            formatted += "┌─ 📈 STATS SAISON ÉQUIPE EXTÉRIEURE ────────────────────┐\n"
+            if stats_away.record:
+                formatted += f"│ Matchs joués: {stats_away.record.played}\n"
+                formatted += f"│ Victoires: {stats_away.record.wins} ({stats_away.record.wins_away} extérieur)\n"
+                formatted += f"│ Nuls: {stats_away.record.draws}\n"
+                formatted += f"│ Défaites: {stats_away.record.loses}\n"
+            if stats_away.goals:
+                formatted += f"│ Buts marqués: {stats_away.goals.scored} (moy: {stats_away.goals.scored_avg})\n"
+                formatted += f"│ Buts encaissés: {stats_away.goals.conceded} (moy: {stats_away.goals.conceded_avg})\n"
+            if stats_away.biggest:
+                formatted += f"│ Plus grande victoire: {stats_away.biggest.win_away}\n"
+                formatted += f"│ Plus lourde défaite: {stats_away.biggest.loss_away}\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('season_stats', formatted))
+
+        # 3. FORME RÉCENTE (10 derniers matchs)
+        formatted = ""
+        if match.get('home_recent_form'):
+            formatted += "┌─ 🔥 FORME RÉCENTE DOMICILE (10 derniers) ─────────────┐\n"
+            for idx, game in enumerate(match['home_recent_form'][:10], 1):
+                result = self._form_result(game, match['home'])
+                formatted += f"│ {idx:2}. [{result}] {game.date}: {game.home} {game.home_goals}-{game.away_goals} {game.away}\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        if match.get('away_recent_form'):
+            formatted += "┌─ 🔥 FORME RÉCENTE EXTÉRIEUR (10 derniers) ────────────┐\n"
+            for idx, game in enumerate(match['away_recent_form'][:10], 1):
+                result = self._form_result(game, match['away'])
+                formatted += f"│ {idx:2}. [{result}] {game.date}: {game.home} {game.home_goals}-{game.away_goals} {game.away}\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('recent_form', formatted))
+
+        # 4. CONFRONTATIONS DIRECTES
+        formatted = ""
+        if match.get('head_to_head'):
+            formatted += "┌─ 🔄 CONFRONTATIONS DIRECTES (10 derniers H2H) ────────┐\n"
+            for idx, game in enumerate(match['head_to_head'][:10], 1):
+                formatted += f"│ {idx:2}. {game.date}: {game.home} {game.home_goals}-{game.away_goals} {game.away}\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('head_to_head', formatted))
+
+        # 5. BLESSURES ET SUSPENSIONS
+        formatted = ""
+        if match.get('home_injuries'):
+            formatted += "┌─ 🏥 BLESSURES/SUSPENSIONS DOMICILE ───────────────────┐\n"
+            for injury in match['home_injuries'][:10]:
+                formatted += f"│ ❌ {injury.player}: {injury.reason}\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        if match.get('away_injuries'):
+            formatted += "┌─ 🏥 BLESSURES/SUSPENSIONS EXTÉRIEUR ──────────────────┐\n"
+            for injury in match['away_injuries'][:10]:
+                formatted += f"│ ❌ {injury.player}: {injury.reason}\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('injuries', formatted))
+
+        # 6. COTES EN TEMPS RÉEL
+        formatted = ""
+        if match.get('odds'):
+            formatted += "┌─ 💰 COTES EN TEMPS RÉEL (marchés principaux) ─────────┐\n"
+            for odds in match['odds'][:3]:  # Top 3 bookmakers
+                for market in odds.markets:
+                    if market.name == 'Match Winner':
+                        formatted += f"│ [{odds.bookmaker}] 1X2:\n"
+                        values = market.values
+                    elif market.name == 'Goals Over/Under':
+                        formatted += f"│ [{odds.bookmaker}] Over/Under:\n"
+                        values = market.values[:4]
+                    else:
+                        formatted += f"│ [{odds.bookmaker}] BTTS:\n"
+                        values = market.values
+                    for value, odd in values:
+                        formatted += f"│   - {value}: {odd}\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('odds', formatted))
+
+        # 6b. MODÈLE STATISTIQUE (Dixon-Coles, cf. goal_model)
+        formatted = ""
+        model = match.get('model')
+        if model:
+            formatted += "┌─ 📐 MODÈLE STATISTIQUE (Dixon-Coles) ─────────────────┐\n"
+            formatted += f"│ Buts attendus: {model.home_xg} - {model.away_xg} (score le plus probable: {model.likely_score})\n"
+            formatted += f"│ 1X2: {model.home:.0%} / {model.draw:.0%} / {model.away:.0%}\n"
+            formatted += f"│ Over 1.5/2.5/3.5: {model.over['1.5']:.0%} / {model.over['2.5']:.0%} / {model.over['3.5']:.0%}"
+            formatted += f" | BTTS: {model.btts:.0%}\n"
+            formatted += f"│ Handicap domicile -1.5: {model.handicap['-1.5']:.0%} | +1.5: {model.handicap['+1.5']:.0%}\n"
+            formatted += "│ ⚠️ Probabilités indicatives (forme, H2H et classement pondérés par date)\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('model', formatted))
+
+        # 6b'. MARCHÉ (cf. value_detector)
+        formatted = ""
+        market = match.get('market')
+        if market:
+            formatted += "┌─ ⚖️ MARCHÉ (cote max, proba sans marge, marge) ───────┐\n"
+            by_market = {}
+            for outcome in market.outcomes:
+                by_market.setdefault(outcome.market, []).append(outcome)
+            for label, outcomes in by_market.items():
+                margin = market.overround.get(label)
+                formatted += f"│ {label}: " + " | ".join(
+                    f"{o.outcome} {o.best_odds} ({o.bookmaker})" + (f" {o.fair:.0%}" if o.fair is not None else "")
+                    for o in outcomes
+                ) + (f" | marge {margin:.1%}" if margin is not None else "") + "\n"
+            for o in market.value:
+                formatted += f"│ 💎 Value: {o.market} {o.outcome} @{o.best_odds} - modèle {o.model:.0%} (espérance {o.edge:+.0%})\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('market', formatted))
+
+        # 6c. COTES ELO (cf. rating_store)
+        formatted = ""
+        ratings = match.get('ratings')
+        if ratings:
+            formatted += "┌─ 📈 COTES ELO (historique des résultats) ─────────────┐\n"
+            formatted += f"│ {match['home']}: {ratings.home} ({ratings.home_games} matchs)"
+            formatted += f" | {match['away']}: {ratings.away} ({ratings.away_games} matchs)\n"
+            formatted += f"│ Avantage du terrain de la compétition: {ratings.home_advantage:+} pts\n"
+            formatted += f"│ Score attendu domicile: {ratings.expected_home:.0%}\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('ratings', formatted))
+
+        # 7. PRÉDICTIONS API-FOOTBALL (référence)
+        formatted = ""
+        pred = match.get('api_prediction')
+        if pred:
+            formatted += "┌─ 🤖 PRÉDICTION API-FOOTBALL (référence) ──────────────┐\n"
+            if pred.verdict:
+                formatted += f"│ Gagnant probable: {pred.verdict.winner or 'N/A'}\n"
+                formatted += f"│ Conseil: {pred.verdict.advice or 'N/A'}\n"
+            if pred.comparison:
+                comp = pred.comparison
+                formatted += f"│ Forme: {comp.form_home or 'N/A'} vs {comp.form_away or 'N/A'}\n"
+                formatted += f"│ Att: {comp.att_home or 'N/A'} vs {comp.att_away or 'N/A'}\n"
+                formatted += f"│ Def: {comp.def_home or 'N/A'} vs {comp.def_away or 'N/A'}\n"
+            formatted += "│ ⚠️ IMPORTANT: Ces prédictions sont INDICATIVES, tu dois faire ta propre analyse\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('api_prediction', formatted))
+
+        # 8. COMPOSITIONS D'ÉQUIPE & SYSTÈMES TACTIQUES
+        formatted = ""
+        if match.get('lineups'):
+            formatted += "┌─ ⚽ COMPOSITIONS & TACTIQUES ──────────────────────────┐\n"
+            for lineup in match['lineups']:
+                emoji = "🏠" if lineup.team_name == match['home'] else "✈️"
+                formatted += f"│ {emoji} {lineup.team_name}: Formation {lineup.formation}\n"
+                formatted += f"│    Entraîneur: {lineup.coach}\n"
+
+                # Afficher les 5 premiers titulaires
+                if lineup.start_xi:
+                    formatted += f"│    Titulaires: {', '.join(lineup.start_xi[:5])}...\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('lineups', formatted))
+
+        # 9. TOP BUTEURS DE LA LIGUE (menaces offensives)
+        formatted = ""
+        if match.get('league_topscorers'):
+            formatted += "┌─ ⚽ TOP 10 BUTEURS DE LA LIGUE ────────────────────────┐\n"
+            for idx, scorer in enumerate(match['league_topscorers'][:10], 1):
+                marker = self._team_marker(scorer.team, match)
+                formatted += f"│ {idx:2}. {marker}{scorer.player} ({scorer.team}): {scorer.goals} buts\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('topscorers', formatted))
+
+        # 10. TOP PASSEURS DE LA LIGUE (créativité offensive)
+        formatted = ""
+        if match.get('league_topassists'):
+            formatted += "┌─ 🎯 TOP 10 PASSEURS DE LA LIGUE ──────────────────────┐\n"
+            for idx, assister in enumerate(match['league_topassists'][:10], 1):
+                marker = self._team_marker(assister.team, match)
+                formatted += f"│ {idx:2}. {marker}{assister.player} ({assister.team}): {assister.assists} passes\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('topassists', formatted))
+
+        # 11. JOUEURS ÉCARTÉS LONG TERME (sidelined)
+        formatted = ""
+        if match.get('home_sidelined'):
+            formatted += "┌─ 🚑 JOUEURS ÉCARTÉS LONG TERME DOMICILE ──────────────┐\n"
+            for sideline in match['home_sidelined'][:5]:
+                formatted += f"│ ⚠️ {sideline.player}: {sideline.type} (depuis {sideline.start or 'N/A'})\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        if match.get('away_sidelined'):
+            formatted += "┌─ 🚑 JOUEURS ÉCARTÉS LONG TERME EXTÉRIEUR ─────────────┐\n"
+            for sideline in match['away_sidelined'][:5]:
+                formatted += f"│ ⚠️ {sideline.player}: {sideline.type} (depuis {sideline.start or 'N/A'})\n"
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('sidelined', formatted))
+
+        # 12. INFO ENTRAÎNEURS (expérience, arrivée récente)
+        formatted = ""
+        if match.get('home_coach'):
+            formatted += "┌─ 👔 ENTRAÎNEUR DOMICILE ───────────────────────────────┐\n"
+            formatted += self._format_coach(match['home_coach'])
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        if match.get('away_coach'):
+            formatted += "┌─ 👔 ENTRAÎNEUR EXTÉRIEUR ──────────────────────────────┐\n"
+            formatted += self._format_coach(match['away_coach'])
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('coaches', formatted))
+
+        # 13. TRANSFERTS RÉCENTS (nouveaux joueurs, adaptation)
+        formatted = ""
+        if match.get('home_transfers'):
+            formatted += "┌─ 🔄 TRANSFERTS RÉCENTS DOMICILE (derniers) ───────────┐\n"
+            formatted += self._format_transfers(match['home_transfers'], match['home'])
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        if match.get('away_transfers'):
+            formatted += "┌─ 🔄 TRANSFERTS RÉCENTS EXTÉRIEUR (derniers) ──────────┐\n"
+            formatted += self._format_transfers(match['away_transfers'], match['away'])
+            formatted += "└────────────────────────────────────────────────────────┘\n\n"
+
+        sections.append(('transfers', formatted))
+
+        return sections
+
+    @staticmethod
+    def _form_result(game, team):
+        """Résultat V/N/D d'un match de forme du point de vue de l'équipe"""
+        scored, conceded = game.goals_for(team)
+        if game.home_goals == game.away_goals:
+            return "N"
+        if team in (game.home, game.away) and scored is not None and conceded is not None and scored > conceded:
+            return "V"
+        return "D"
+
+    @staticmethod
+    def _team_marker(team_name, match):
+        if team_name == match['home']:
+            return "🏠 "
+        if team_name == match['away']:
+            return "✈️ "
+        return ""
+
+    @staticmethod
+    def _format_coach(coach):
+        formatted = f"│ Nom: {coach.name} ({coach.nationality}, {coach.age if coach.age is not None else 'N/A'} ans)\n"
+        if coach.since:
+            formatted += f"│ En poste depuis: {coach.since}\n"
+        return formatted
+
+    @staticmethod
+    def _format_transfers(transfers, team):
+        formatted = ""
+        for transfer in transfers[:5]:
+            line = f"{transfer.player}: {transfer.team_out} → {transfer.team_in} ({transfer.type}, {transfer.date or 'N/A'})\n"
+            if transfer.team_in == team:
+                formatted += f"│ ⬇️ {line}"
+            elif transfer.team_out == team:
+                formatted += f"│ ⬆️ {line}"
+        return formatted
+
 # Test
 if __name__ == "__main__":
     scraper = MatchScraper()
@@ -0,0 +1,339 @@
+"""
+Présélection des matchs avant l'analyse approfondie (cascade à deux niveaux).
+
+Niveau 1 : chaque match est noté (0-100) sur un résumé compact, soit par un
+score local déterministe, soit par un modèle rapide et peu coûteux.
+Niveau 2 : seule la liste restreinte part vers le modèle d'analyse approfondie
+avec le contexte complet de format_matches_for_prompt.
+
+Chaque décision est journalisée dans data/screening/<date>.jsonl afin de
+mesurer le rappel de la présélection (cf. screening_recall_report).
+"""
+
+import glob
+import json
+import os
+import random
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+
+
+class MatchScreener:
+    """Note les matchs sur un résumé compact et retient une liste restreinte."""
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.mode = self.config.SCREENING_MODE
+        self.log_dir = os.path.join(self.config.DATA_DIR, 'screening')
+        self.last_summary = {}
+
+    # ───────────────────────── Résumé compact ─────────────────────────
+
+    def summarize(self, match: Dict) -> Dict:
+        """Extrait les quelques indicateurs utiles au tri d'un match enrichi."""
+        home_id = match.get('team_home_id')
+        away_id = match.get('team_away_id')
+
+        return {
+            'match': f"{match['home']} vs {match['away']}",
+            'competition': match.get('competition', ''),
+            'time': match.get('time', ''),
+            'home_standing': self._standing_row(match, home_id, match['home']),
+            'away_standing': self._standing_row(match, away_id, match['away']),
+            'league_size': self._league_size(match),
+            'home_form': self._form(match.get('home_recent_form', []), home_id, match['home']),
+            'away_form': self._form(match.get('away_recent_form', []), away_id, match['away']),
+            'home_goals': self._goal_averages(match.get('home_season_stats')),
+            'away_goals': self._goal_averages(match.get('away_season_stats')),
+            'api_percent': self._api_percent(match),
+        }
+
+    def _league_size(self, match: Dict) -> int:
+        return len(match.get('league_standings') or [])
+
+    def _standing_row(self, match: Dict, team_id: Optional[int], team_name: str) -> Optional[Dict]:
+        row = match['league_standings'].get(team_id, team_name) if match.get('league_standings') else None
+        if row is None:
+            return None
+        return {'rank': row.rank, 'points': row.points, 'ppg': row.ppg}
+
+    def _form(self, games: List, team_id: Optional[int], team_name: str, last: int = 5) -> str:
+        """Forme sous forme 'VVNDV' (du plus récent au plus ancien)."""
+        form = ""
+        for game in games[:last]:
+            if game.home_goals is None or game.away_goals is None:
+                continue
+            is_home = (game.home_id == team_id) if team_id else (game.home == team_name)
+            scored, conceded = (game.home_goals, game.away_goals) if is_home else (game.away_goals, game.home_goals)
+            form += "V" if scored > conceded else ("N" if scored == conceded else "D")
+        return form
+
+    def _goal_averages(self, stats) -> Optional[Tuple[float, float]]:
+        """(buts marqués, buts encaissés) par match sur la saison."""
+        try:
+            return float(stats.goals.scored_avg), float(stats.goals.conceded_avg)
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def _api_percent(self, match: Dict) -> Optional[Dict]:
+        """Probabilités 1/N/2 de la prédiction API-Football (en %)."""
+        try:
+            verdict = match['api_prediction'].verdict
+            percents = (verdict.percent_home, verdict.percent_draw, verdict.percent_away)
+            return {side: float(str(value).rstrip('%')) for side, value in zip(('home', 'draw', 'away'), percents)}
+        except (KeyError, AttributeError, TypeError, ValueError):
+            return None
+
+    # ───────────────────────── Score local ─────────────────────────
+
+    def score_local(self, summary: Dict) -> Tuple[float, List[str]]:
+        """
+        Score déterministe (0-100) : un match est intéressant si les données
+        sont complètes et s'il présente un déséquilibre ou un profil de buts
+        marqué (matière à un pari 1X2, handicap, Over/Under ou BTTS).
+        """
+        score = 0.0
+        reasons = []
+
+        # 1. Complétude des données (20 pts)
+        available = [
+            summary['home_standing'] and summary['away_standing'],
+            summary['home_form'] and summary['away_form'],
+            summary['home_goals'] and summary['away_goals'],
+            summary['api_percent'],
+        ]
+        score += 5 * sum(1 for item in available if item)
+
+        # 2. Écart au classement (25 pts) et en points par match (15 pts)
+        home_st, away_st = summary['home_standing'], summary['away_standing']
+        if home_st and away_st and summary['league_size']:
+            rank_gap = abs(home_st['rank'] - away_st['rank'])
+            score += 25 * min(1.0, rank_gap / max(1, summary['league_size'] / 2))
+            if rank_gap >= summary['league_size'] / 3:
+                reasons.append(f"écart classement {rank_gap} places")
+            if home_st['ppg'] is not None and away_st['ppg'] is not None:
+                score += 15 * min(1.0, abs(home_st['ppg'] - away_st['ppg']) / 1.5)
+
+        # 3. Écart de forme sur 5 matchs (15 pts)
+        if summary['home_form'] and summary['away_form']:
+            def points(form):
+                return sum(3 if r == 'V' else (1 if r == 'N' else 0) for r in form) / len(form)
+            form_gap = abs(points(summary['home_form']) - points(summary['away_form']))
+            score += 15 * min(1.0, form_gap / 2)
+            if form_gap >= 1.2:
+                reasons.append(f"forme {summary['home_form']} vs {summary['away_form']}")
+
+        # 4. Favori net selon API-Football (15 pts)
+        if summary['api_percent']:
+            top = max(summary['api_percent'].values())
+            score += 15 * max(0.0, min(1.0, (top - 33) / 40))
+
+        # 5. Profil de buts marqué (10 pts) : angle Over/Under ou BTTS
+        if summary['home_goals'] and summary['away_goals']:
+            expected_goals = (
+                (summary['home_goals'][0] + summary['away_goals'][1]) / 2
+                + (summary['away_goals'][0] + summary['home_goals'][1]) / 2
+            )
+            score += 10 * min(1.0, abs(expected_goals - 2.6) / 1.2)
+            if abs(expected_goals - 2.6) >= 0.8:
+                reasons.append(f"profil buts {expected_goals:.1f}/match")
+
+        if not any(available):
+            reasons.append("données insuffisantes")
+
+        return round(score, 1), reasons
+
+    # ───────────────────────── Score par modèle rapide ─────────────────────────
+
+    def _summary_line(self, index: int, summary: Dict) -> str:
+        line = f"{index}. {summary['match']} | {summary['competition']} | {summary['time']}"
+        if summary['home_standing'] and summary['away_standing']:
+            line += (f" | rang {summary['home_standing']['rank']} ({summary['home_standing']['points']}pts)"
+                     f" vs {summary['away_standing']['rank']} ({summary['away_standing']['points']}pts)")
+        if summary['home_form'] or summary['away_form']:
+            line += f" | forme {summary['home_form'] or '-'} vs {summary['away_form'] or '-'}"
+        if summary['home_goals'] and summary['away_goals']:
+            line += (f" | buts moy {summary['home_goals'][0]:.1f}/{summary['home_goals'][1]:.1f}"
+                     f" vs {summary['away_goals'][0]:.1f}/{summary['away_goals'][1]:.1f}")
+        if summary['api_percent']:
+            p = summary['api_percent']
+            line += f" | API {p['home']:.0f}/{p['draw']:.0f}/{p['away']:.0f}"
+        return line
+
+    def _score_llm(self, summaries: List[Dict]) -> Optional[List[Tuple[float, List[str]]]]:
+        """Note tous les matchs en un seul appel au modèle rapide (None si échec)."""
+        from llm_provider import LLMRequest, LLMUnavailableError, build_router
+        from response_schema import screening_tool, validate_screening
+
+        prompt = (
+            "Tu présélectionnes des matchs de football pour une analyse VALUE BET approfondie.\n"
+            f"Cotes visées: {self.config.MIN_ODDS}-{self.config.MAX_ODDS}. "
+            "Donne à chaque match un score d'intérêt de 0 à 100 (déséquilibre exploitable, "
+            "profil de buts marqué, données fiables) et une raison très courte.\n\n"
+            + "\n".join(self._summary_line(i, summary) for i, summary in enumerate(summaries, 1))
+        )
+
+        try:
+            router = build_router(self.config, primary='claude', claude_model=self.config.SCREENING_MODEL)
+            result = router.generate_sync(
+                LLMRequest(prompt=prompt, tool=screening_tool(), max_tokens=4000, temperature=0.0),
+                validator=validate_screening
+            )
+        except (LLMUnavailableError, ValueError) as e:
+            print(f"⚠️ Présélection LLM indisponible ({e}), repli sur le score local")
+            return None
+
+        scores = [(0.0, ["non noté par le modèle"]) for _ in summaries]
+        for decision in result['decisions']:
+            idx = decision['index'] - 1
+            if 0 <= idx < len(summaries):
+                scores[idx] = (float(decision['score']), [decision.get('reason', '')])
+        return scores
+
+    # ───────────────────────── Sélection ─────────────────────────
+
+    def screen(self, matches: List[Dict], date: str) -> List[Dict]:
+        """
+        Retient la liste restreinte des matchs à analyser en profondeur.
+
+        Args:
+            matches: Matchs enrichis
+            date: Date d'analyse (YYYY-MM-DD), pour le journal des décisions
+
+        Returns:
+            Sous-liste des matchs retenus (ordre d'origine conservé)
+        """
+        if self.mode == 'off' or len(matches) <= self.config.SCREENING_MIN_SHORTLIST:
+            return matches
+
+        summaries = [self.summarize(match) for match in matches]
+
+        mode = self.mode
+        scores = self._score_llm(summaries) if mode == 'llm' else None
+        if scores is None:
+            mode = 'local'
+            scores = [self.score_local(summary) for summary in summaries]
+
+        # Classement par score décroissant
+        ranking = sorted(range(len(matches)), key=lambda i: scores[i][0], reverse=True)
+        kept = set()
+        for position, i in enumerate(ranking):
+            if len(kept) >= self.config.SCREENING_MAX_SHORTLIST:
+                break
+            if scores[i][0] >= self.config.SCREENING_MIN_SCORE or position < self.config.SCREENING_MIN_SHORTLIST:
+                kept.add(i)
+
+        # Échantillon d'audit : quelques rejetés analysés quand même pour mesurer le rappel
+        rng = random.Random(date)
+        audited = {
+            i for i in range(len(matches))
+            if i not in kept and rng.random() < self.config.SCREENING_AUDIT_RATE
+        }
+
+        decisions = []
+        for i, match in enumerate(matches):
+            decisions.append({
+                'date': date,
+                'match': summaries[i]['match'],
+                'home': match['home'],
+                'away': match['away'],
+                'competition': summaries[i]['competition'],
+                'fixture_id': match.get('fixture_id'),
+                'mode': mode,
+                'score': scores[i][0],
+                'reasons': scores[i][1],
+                'kept': i in kept,
+                'audit': i in audited,
+            })
+        self._log_decisions(date, decisions)
+
+        self.last_summary = {
+            'mode': mode,
+            'screened': len(matches),
+            'shortlisted': len(kept),
+            'audited': len(audited),
+            'min_score': self.config.SCREENING_MIN_SCORE,
+        }
+        print(f"🔎 Présélection ({mode}): {len(kept)}/{len(matches)} matchs retenus"
+              + (f" + {len(audited)} en audit" if audited else ""))
+
+        return [match for i, match in enumerate(matches) if i in kept or i in audited]
+
+    def _log_decisions(self, date: str, decisions: List[Dict]):
+        """Ajoute les décisions au journal JSONL du jour."""
+        os.makedirs(self.log_dir, exist_ok=True)
+        logged_at = datetime.now().isoformat()
+        with open(os.path.join(self.log_dir, f"{date}.jsonl"), 'a', encoding='utf-8') as f:
+            for decision in decisions:
+                decision['logged_at'] = logged_at
+                f.write(json.dumps(decision, ensure_ascii=False) + "\n")
+
+
+def screening_recall_report(config: Config = None) -> Dict:
+    """
+    Estime le rappel de la présélection à partir des journaux et des pronostics.
+
+    Un match « positif » est un match finalement recommandé par l'analyse
+    approfondie. Les positifs manqués sont estimés à partir de l'échantillon
+    d'audit (rejetés analysés quand même), extrapolé à l'ensemble des rejetés.
+    """
+    from prediction_validator import PredictionValidator
+
+    config = config or Config()
+    totals = {'days': 0, 'screened': 0, 'kept': 0, 'rejected': 0, 'audited': 0,
+              'kept_positives': 0, 'audit_positives': 0}
+
+    for log_file in sorted(glob.glob(os.path.join(config.DATA_DIR, 'screening', '*.jsonl'))):
+        date = os.path.basename(log_file).replace('.jsonl', '')
+        predictions_file = os.path.join(config.PREDICTIONS_DIR, f"{date}.json")
+        if not os.path.exists(predictions_file):
+            continue
+
+        with open(log_file, 'r', encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        # Ne garder que la dernière présélection de la journée
+        last_run = max(entry['logged_at'] for entry in entries)
+        entries = [entry for entry in entries if entry['logged_at'] == last_run]
+
+        with open(predictions_file, 'r', encoding='utf-8') as f:
+            predictions = json.load(f)
+
+        validator = PredictionValidator(entries)
+        positives = set()
+        for rec in predictions.get('recommendations', []):
+            found = validator._find_match(rec.get('match', ''))
+            if found:
+                positives.add(f"{found['home']} vs {found['away']}")
+
+        totals['days'] += 1
+        for entry in entries:
+            totals['screened'] += 1
+            is_positive = entry['match'] in positives
+            if entry['kept']:
+                totals['kept'] += 1
+                totals['kept_positives'] += is_positive
+            else:
+                totals['rejected'] += 1
+                if entry['audit']:
+                    totals['audited'] += 1
+                    totals['audit_positives'] += is_positive
+
+    estimated_missed = None
+    recall = None
+    if totals['audited']:
+        estimated_missed = totals['audit_positives'] * totals['rejected'] / totals['audited']
+        found = totals['kept_positives'] + estimated_missed
+        recall = (totals['kept_positives'] / found * 100) if found else None
+
+    totals['estimated_missed'] = estimated_missed
+    totals['recall'] = recall
+    return totals
+
+
+if __name__ == "__main__":
+    report = screening_recall_report()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if report['recall'] is None:
+        print("ℹ️ Rappel non estimable : activez SCREENING_AUDIT_RATE pour échantillonner les rejetés")
@@ -1,8 +1,10 @@
+import argparse
 import json
 import os
 from datetime import datetime
 from typing import Dict, List
 import glob
+from profiling import add_profile_option, profiled
 
 class PerformanceTracker:
     def __init__(self, predictions_dir='data/predictions', results_file='data/performance_history.json'):
@@ -252,8 +254,14 @@ class PerformanceTracker:
 
 
 if __name__ == "__main__":
-    # Test
-    tracker = PerformanceTracker()
-    stats = tracker.calculate_statistics()
+    # Test (mêmes chemins de données que dashboard.py, profilables avec --profile)
+    parser = argparse.ArgumentParser(description="Statistiques de performance")
+    add_profile_option(parser)
+    args = parser.parse_args()
+    with profiled('performance_tracker', args.profile):
+        tracker = PerformanceTracker()
+        stats = tracker.calculate_statistics()
+        tracker.get_statistics_by_type()
+        tracker.get_statistics_by_competition()
     print(json.dumps(stats, indent=2))
 
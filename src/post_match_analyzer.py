@@ -3,12 +3,16 @@ Analyse post-match pour identifier les erreurs et en tirer des conclusions.
 Ce module analyse les pronostics perdus pour améliorer les futures prédictions.
 """
 
+import argparse
 import json
 import os
 from datetime import datetime
 from typing import Dict, List, Optional
-import anthropic
 from config import Config
+from llm_provider import LLMRequest, build_router
+from response_schema import POST_MATCH_TOOL_NAME, post_match_tool, validate_post_match
+from tracing import tracer
+from profiling import add_profile_option, profiled
 
 
 class PostMatchAnalyzer:
@@ -23,13 +27,12 @@ class PostMatchAnalyzer:
         """
         self.config = config or Config()
 
-        # Configuration Claude pour l'analyse post-match
-        self.api_key = os.getenv('ANTHROPIC_API_KEY')
+        # Configuration Claude pour l'analyse post-match (Gemini en secours)
+        self.api_key = self.config.ANTHROPIC_API_KEY
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY manquante dans .env")
 
-        self.client = anthropic.Anthropic(api_key=self.api_key)
-        self.model = "claude-sonnet-4-20250514"  # Claude Sonnet 4.5 pour l'analyse
+        self.llm = build_router(self.config, primary='claude')
 
         self.analysis_file = os.path.join(self.config.DATA_DIR, 'error_analysis.json')
         self.learnings_file = os.path.join(self.config.DATA_DIR, 'learnings.json')
@@ -82,7 +85,8 @@ class PostMatchAnalyzer:
                 pred_enriched['final_score'] = final_score
                 pred_enriched['match_id'] = pred_id
 
-                analysis = self._analyze_single_prediction(pred_enriched)
+                with tracer.span('prediction', prediction=pred_id, match=pred.get('match')):
+                    analysis = self._analyze_single_prediction(pred_enriched)
                 if analysis:
                     analyses.append(analysis)
                     # Marquer comme analysé
@@ -175,48 +179,21 @@ Statut: PERDU
    - DOIT être utilisable dans une future analyse similaire
    - DOIT être spécifique, pas un principe général vague
 
-Réponds en JSON:
-{{
-  "main_cause": "...",
-  "missed_factors": ["...", "...", "..."],
-  "actionable_conclusion": "...",
-  "error_category": "absence_joueur" | "forme_recente" | "contexte_match" | "statistiques_trompeuses" | "surestimation_favori" | "sous_estimation_outsider" | "autre"
-}}
+Soumets ton analyse via l'outil {POST_MATCH_TOOL_NAME} (main_cause, missed_factors, actionable_conclusion, error_category).
 """
 
         try:
-            # Appel API Claude
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=2000,
-                temperature=0.3,  # Analyse rigoureuse
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
+            # Sortie contrainte par le schéma, vérifiée par le validateur compilé
+            analysis = self.llm.generate_sync(
+                LLMRequest(
+                    prompt=prompt,
+                    tool=post_match_tool(),
+                    max_tokens=2000,
+                    temperature=0.3  # Analyse rigoureuse
+                ),
+                validator=validate_post_match
             )
 
-            analysis_text = message.content[0].text.strip()
-
-            # Extraire le JSON de la réponse
-            if '```json' in analysis_text:
-                analysis_text = analysis_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in analysis_text:
-                analysis_text = analysis_text.split('```')[1].split('```')[0].strip()
-
-            # Nettoyer les caractères invisibles
-            analysis_text = analysis_text.replace('\u200b', '').replace('\ufeff', '')
-
-            # Trouver le JSON
-            start = analysis_text.find('{')
-            end = analysis_text.rfind('}')
-            if start != -1 and end != -1:
-                analysis_text = analysis_text[start:end+1]
-
-            analysis = json.loads(analysis_text)
-
             # Ajouter métadonnées
             analysis['match_id'] = prediction.get('match_id')
             analysis['match'] = match_info
@@ -364,7 +341,9 @@ def analyze_recent_predictions():
     for filename in prediction_files:
         filepath = os.path.join(predictions_dir, filename)
         print(f"\n📊 Analyse de {filename}...")
-        analyses = analyzer.analyze_lost_predictions(filepath)
+        with tracer.span('file', file=filename) as span:
+            analyses = analyzer.analyze_lost_predictions(filepath)
+            span.set(analyses=len(analyses))
         total_analyses += len(analyses)
 
     print(f"\n✅ Analyse terminée: {total_analyses} erreurs analysées au total")
@@ -378,4 +357,8 @@ def analyze_recent_predictions():
 
 
 if __name__ == '__main__':
-    analyze_recent_predictions()
+    parser = argparse.ArgumentParser(description="Analyse des pronostics perdus")
+    add_profile_option(parser)
+    args = parser.parse_args()
+    with tracer.run('post_match_analyzer'), profiled('post_match_analyzer', args.profile):
+        analyze_recent_predictions()
@@ -7,13 +7,16 @@ Envoie une alerte Telegram si changements importants (joueurs clés, tactique)
 
 import sys
 sys.path.insert(0, 'src')
+import argparse
 import json
 import os
-import requests
 from datetime import datetime, timedelta
 import pytz
 from telegram_sender import TelegramSender
 from config import Config
+from api_football import api_football
+from tracing import tracer
+from profiling import add_profile_option, profiled
 
 class PreMatchAlertSystem:
     def __init__(self):
@@ -40,12 +43,9 @@ class PreMatchAlertSystem:
             return None
 
         try:
-            url = "https://v3.football.api-sports.io/fixtures/lineups"
-            headers = {'x-apisports-key': self.api_key}
             params = {'fixture': fixture_id}
 
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            data = response.json()
+            data = api_football.get('fixtures/lineups', params) or {}
 
             if data.get('response'):
                 return data['response']
@@ -61,15 +61,12 @@ class PreMatchAlertSystem:
             return None
 
         try:
-            url = "https://v3.football.api-sports.io/fixtures"
-            headers = {'x-apisports-key': self.api_key}
             params = {
                 'date': match_date,
                 'timezone': self.config.TIMEZONE
             }
 
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            data = response.json()
+            data = api_football.get('fixtures', params) or {}
 
             # Parser le nom du match
             teams = match_name.split(' vs ')
@@ -181,16 +178,18 @@ class PreMatchAlertSystem:
 
             print(f"\n📊 Analyse: {match_name} ({kickoff})")
 
-            # Trouver le fixture_id
-            fixture_id = self.find_fixture_id(match_name, today)
+            with tracer.span('match', match=match_name, kickoff=kickoff) as span:
+                # Trouver le fixture_id
+                fixture_id = self.find_fixture_id(match_name, today)
+                span.set(fixture=fixture_id)
+
+                # Récupérer la composition
+                lineup_data = self.get_match_lineup(fixture_id) if fixture_id else None
 
             if not fixture_id:
                 print(f"   ⏭️  Fixture non trouvé")
                 continue
 
-            # Récupérer la composition
-            lineup_data = self.get_match_lineup(fixture_id)
-
             if not lineup_data:
                 print(f"   ⏳ Composition pas encore disponible")
                 continue
@@ -253,4 +252,8 @@ def main():
     print("\n✅ Vérification terminée")
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Alertes pré-match (compositions confirmées)")
+    add_profile_option(parser)
+    args = parser.parse_args()
+    with tracer.run('pre_match_alert'), profiled('pre_match_alert', args.profile):
+        main()
@@ -8,6 +8,11 @@ import json
 import difflib
 from typing import Dict, List, Any
 
+from team_names import normalize_team_name
+
+# Score attendu Elo (cf. rating_store) sous lequel une victoire sèche est signalée comme pari d'outsider
+RATING_OUTSIDER_THRESHOLD = 0.30
+
 
 class PredictionValidator:
     """Valide et corrige les prédictions générées par Claude"""
@@ -25,26 +30,8 @@ class PredictionValidator:
             self.matches_index[key] = match
 
     def _normalize_team_name(self, team_name: str) -> str:
-        """Normalise un nom d'équipe pour comparaison"""
-        name = team_name.lower().strip()
-
-        # Supprimer suffixes courants
-        suffixes = [' kv', ' fc', ' sc', ' sv', ' ac', ' as', ' bv', ' cf', ' afc', ' ssc']
-        for suffix in suffixes:
-            if name.endswith(suffix):
-                name = name[:-len(suffix)]
-
-        # Supprimer préfixes courants
-        prefixes = ['fc ', 'sc ', 'sv ', 'ac ', 'as ', 'bv ', 'cf ', 'afc ', 'ssc ']
-        for prefix in prefixes:
-            if name.startswith(prefix):
-                name = name[len(prefix):]
-
-        # Supprimer numéros (ex: "05" dans "FSV Mainz 05")
-        import re
-        name = re.sub(r'\s*\d+\s*', '', name)
-
-        return name.strip()
+        """Normalise un nom d'équipe pour comparaison (cf. team_names)"""
+        return normalize_team_name(team_name)
 
     def _find_match(self, match_string: str) -> Dict:
         """
@@ -215,6 +202,23 @@ class PredictionValidator:
                     'corrected_match': new_match_string
                 })
 
+            # Probabilités du modèle de buts (cf. goal_model) conservées avec le pronostic
+            model = match_info['original_match'].get('model')
+            if model:
+                rec['model'] = model.summary(rec.get('bet_type'), rec.get('prediction'))
+
+            # Contrôle de cohérence avec les cotes Elo : victoire sèche d'une équipe nettement plus faible
+            ratings = match_info['original_match'].get('ratings')
+            if ratings:
+                expectancy = ratings.pick_expectancy(rec.get('bet_type'), rec.get('prediction'))
+                if expectancy is not None and expectancy < RATING_OUTSIDER_THRESHOLD:
+                    corrections_made.append({
+                        'match': rec.get('match', match_string),
+                        'issue': 'RATING_OUTSIDER',
+                        'action': f"WARNING - Score attendu Elo du côté choisi: {expectancy:.0%} "
+                                  f"({ratings.home} vs {ratings.away})"
+                    })
+
         # Ajouter métadonnées de validation
         predictions['validation'] = {
             'validated': True,
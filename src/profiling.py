@@ -0,0 +1,172 @@
+"""
+Profilage intégré des scripts : --profile={cpu,mem,wall} ou PROFILE=...
+
+    with profiled('main', args.profile):
+        main()
+
+Modes (dumps dans data/profiles/AAAA-MM-JJ/<script>-HHMMSS.*) :
+- cpu  : cProfile → .pstats (python -m pstats, snakeviz...) + top 20 en console
+- mem  : tracemalloc → .mem.txt (top lignes) et .mem.collapsed (octets par pile)
+- wall : échantillonnage de toutes les piles (threads compris, attentes réseau
+         incluses) toutes les PROFILE_INTERVAL_MS → .wall.collapsed
+
+Les fichiers .collapsed sont au format « pile;en;ligne valeur » de
+flamegraph.pl / speedscope.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+from config import Config
+
+PROFILE_MODES = ('cpu', 'mem', 'wall')
+
+# Profondeur des piles conservées par tracemalloc, et lignes affichées en console
+MEM_FRAMES = 25
+TOP_LINES = 20
+
+
+def _frame_label(code) -> str:
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _output_base(name: str) -> str:
+    now = datetime.now()
+    directory = os.path.join(Config.DATA_DIR, 'profiles', now.strftime('%Y-%m-%d'))
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{name}-{now.strftime('%H%M%S')}")
+
+
+class WallSampler:
+    """Échantillonneur temps réel : relève périodiquement la pile de chaque thread."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='wall-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            names.update((thread.ident, thread.name) for thread in threading.enumerate())
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _write_memory(snapshot, base: str):
+    """Top des allocations par ligne et piles « collapsed » pondérées en octets."""
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    by_line = snapshot.statistics('lineno')
+    with open(f"{base}.mem.txt", 'w', encoding='utf-8') as f:
+        total = sum(stat.size for stat in by_line)
+        f.write(f"Mémoire allouée encore vivante: {total / 1024 / 1024:.1f} Mo\n\n")
+        for stat in by_line[:100]:
+            f.write(f"{stat.size / 1024:10.1f} Ko {stat.count:8d} blocs  {stat.traceback}\n")
+
+    stacks = Counter()
+    for stat in snapshot.statistics('traceback'):
+        frames = [f"{os.path.basename(frame.filename)}:{frame.lineno}" for frame in reversed(stat.traceback)]
+        stacks[';'.join(frames)] += stat.size
+    with open(f"{base}.mem.collapsed", 'w', encoding='utf-8') as f:
+        for stack, size in stacks.most_common():
+            f.write(f"{stack} {size}\n")
+    return by_line
+
+
+@contextmanager
+def profiled(name: str, mode: Optional[str] = None):
+    """
+    Profile le bloc selon le mode demandé (défaut : variable PROFILE), sans effet sinon.
+
+    Args:
+        name: Nom du script (préfixe des fichiers produits)
+        mode: 'cpu', 'mem', 'wall' ou None
+    """
+    mode = mode or Config.PROFILE
+    if not mode:
+        yield
+        return
+    if mode not in PROFILE_MODES:
+        print(f"⚠️ Mode de profilage inconnu '{mode}' (attendu : {', '.join(PROFILE_MODES)}), ignoré")
+        yield
+        return
+
+    started = time.perf_counter()
+    if mode == 'cpu':
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif mode == 'mem':
+        tracemalloc.start(MEM_FRAMES)
+    else:
+        sampler = WallSampler(Config.PROFILE_INTERVAL_MS / 1000)
+        sampler.start()
+
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        base = _output_base(name)
+        if mode == 'cpu':
+            profiler.disable()
+            profiler.dump_stats(f"{base}.pstats")
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(TOP_LINES)
+            print(output.getvalue())
+            print(f"🔬 Profil CPU ({elapsed:.1f}s): {base}.pstats")
+        elif mode == 'mem':
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            for stat in _write_memory(snapshot, base)[:TOP_LINES]:
+                print(f"   {stat.size / 1024:10.1f} Ko  {stat.traceback}")
+            print(f"🔬 Profil mémoire ({elapsed:.1f}s, pic {peak / 1024 / 1024:.1f} Mo, "
+                  f"encore alloué {current / 1024 / 1024:.1f} Mo): {base}.mem.txt, {base}.mem.collapsed")
+        else:
+            sampler.stop()
+            sampler.write(f"{base}.wall.collapsed")
+            print(f"🔬 Profil temps réel ({elapsed:.1f}s, {sampler.samples} échantillons): {base}.wall.collapsed")
+
+
+def add_profile_option(parser):
+    """Ajoute --profile {cpu,mem,wall} à un argparse.ArgumentParser (défaut : variable PROFILE)."""
+    parser.add_argument(
+        '--profile', choices=PROFILE_MODES, default=Config.PROFILE or None,
+        help="Profile le run (cProfile, tracemalloc ou échantillonnage temps réel) ; "
+             "résultats dans data/profiles"
+    )
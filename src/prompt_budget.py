@@ -0,0 +1,187 @@
+"""
+Budget de tokens pour le prompt d'analyse.
+
+format_matches_for_prompt concatène toutes les sections de tous les matchs :
+la taille du prompt (donc la latence et le coût) croît sans limite avec la
+liste des ligues. Ce module estime localement le nombre de tokens et réduit
+les sections d'un match, des moins utiles (transferts, entraîneurs...) aux plus
+utiles (cotes, classement), jusqu'à respecter un budget par match.
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+from config import Config
+
+
+# Priorité des sections (plus la valeur est haute, plus la section est gardée longtemps)
+SECTION_PRIORITIES = {
+    'header': 100,          # Compétition + coup d'envoi : jamais réduit
+    'stale': 100,           # Avertissement données de secours : jamais réduit
+    'odds': 13,
+    'market': 13,           # Cotes max, probabilités sans marge, value : quelques lignes
+    'standings': 12,
+    'model': 12,            # Probabilités Dixon-Coles : quelques lignes
+    'ratings': 12,          # Cotes Elo : une ligne
+    'lineups': 11,
+    'injuries': 10,
+    'recent_form': 9,
+    'head_to_head': 8,
+    'season_stats': 7,
+    'api_prediction': 6,
+    'topscorers': 5,
+    'sidelined': 4,
+    'topassists': 3,
+    'coaches': 2,
+    'transfers': 1,
+}
+
+# À partir de cette priorité, une section est d'abord raccourcie avant d'être supprimée
+SHRINK_FROM_PRIORITY = 7
+
+# Estimation : ~4 caractères par token pour les mots, 3 chiffres par token,
+# 1 token par symbole/ponctuation, 2 par emoji, 1 pour 2 caractères de cadre
+_TOKEN_RE = re.compile(r"[^\W\d_]+|\d+|[─-▟]+|\s+|.", re.S)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation locale (sans appel réseau) du nombre de tokens d'un texte."""
+    tokens = 0
+    for piece in _TOKEN_RE.findall(text):
+        first = piece[0]
+        if first.isspace():
+            tokens += piece.count('\n')
+        elif first.isdigit():
+            tokens += (len(piece) + 2) // 3
+        elif first.isalpha():
+            tokens += (len(piece) + 3) // 4
+        elif '─' <= first <= '▟':
+            tokens += (len(piece) + 1) // 2
+        elif ord(first) > 0xFFFF:
+            tokens += 2
+        else:
+            tokens += 1
+    return tokens
+
+
+# Préfixe des lignes de contenu : cadres (format classique) ou lignes de table (format compact)
+BODY_PREFIXES = ('│', '  ')
+
+
+def shrink_section(text: str) -> str:
+    """Ne garde que la première moitié des lignes de chaque cadre (ou table) de la section."""
+    result = []
+    body = []
+    for line in text.split('\n'):
+        if line.startswith(BODY_PREFIXES):
+            body.append(line)
+            continue
+        if body:
+            kept = body[:max(1, (len(body) + 1) // 2)]
+            result.extend(kept)
+            if len(kept) < len(body):
+                prefix = '│ ' if kept[0].startswith('│') else '  '
+                result.append(f"{prefix}… ({len(body) - len(kept)} lignes omises)")
+            body = []
+        result.append(line)
+    return '\n'.join(result)
+
+
+def fit_sections(sections: List[Tuple[str, str]], budget: int) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    Réduit les sections d'un match jusqu'à respecter le budget de tokens.
+
+    Args:
+        sections: Sections (clé, texte) produites par MatchScraper.format_match_sections
+        budget: Budget de tokens du match
+
+    Returns:
+        (sections conservées dans l'ordre d'origine, actions effectuées)
+    """
+    texts = dict(sections)
+    sizes = {key: estimate_tokens(text) for key, text in sections}
+    total = sum(sizes.values())
+    actions = []
+
+    by_priority = sorted(
+        (key for key, text in sections if text and key not in ('header', 'stale')),
+        key=lambda key: SECTION_PRIORITIES.get(key, 0)
+    )
+
+    # 1er passage : suppression des sections secondaires, réduction des essentielles
+    for key in by_priority:
+        if total <= budget:
+            break
+        if SECTION_PRIORITIES.get(key, 0) >= SHRINK_FROM_PRIORITY:
+            texts[key] = shrink_section(texts[key])
+            actions.append(f"{key} réduite")
+        else:
+            texts[key] = ""
+            actions.append(f"{key} supprimée")
+        new_size = estimate_tokens(texts[key])
+        total -= sizes[key] - new_size
+        sizes[key] = new_size
+
+    # 2e passage : suppression des sections essentielles si nécessaire
+    for key in by_priority:
+        if total <= budget:
+            break
+        if texts[key]:
+            total -= sizes[key]
+            texts[key] = ""
+            actions.append(f"{key} supprimée")
+
+    return [(key, texts[key]) for key, _ in sections], actions
+
+
+class PromptBudget:
+    """Rendu des matchs sous contrainte de tokens, avec rapport."""
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.last_report = {}
+
+    def match_budget(self, match_count: int) -> int:
+        """Budget par match : le plus strict du budget par match et de la part du budget total (0 = illimité)."""
+        budgets = [self.config.PROMPT_MATCH_TOKEN_BUDGET]
+        if match_count:
+            budgets.append(self.config.PROMPT_TOKEN_BUDGET // match_count)
+        budgets = [budget for budget in budgets if budget > 0]
+        return min(budgets) if budgets else 0
+
+    def render(self, matches: List[Dict], formatter) -> str:
+        """
+        Équivalent budgété de format_matches_for_prompt.
+
+        Args:
+            matches: Matchs enrichis
+            formatter: MatchScraper ou CompactFormatter (fournit le découpage en sections)
+        """
+        budget = self.match_budget(len(matches))
+        trimmed = {}
+
+        raw_blocks, blocks = [], []
+        for match in matches:
+            sections = formatter.format_match_sections(match)
+            raw_blocks.append(formatter.format_match_block(match, sections))
+            if budget > 0:
+                sections, actions = fit_sections(sections, budget)
+                if actions:
+                    trimmed[f"{match['home']} vs {match['away']}"] = actions
+            blocks.append(formatter.format_match_block(match, sections))
+
+        raw_tokens = estimate_tokens(formatter.format_matches_for_prompt(matches, blocks=raw_blocks))
+        formatted = formatter.format_matches_for_prompt(matches, blocks=blocks)
+        tokens = estimate_tokens(formatted)
+
+        self.last_report = {
+            'matches': len(matches),
+            'match_budget': budget,
+            'tokens_before': raw_tokens,
+            'tokens': tokens,
+            'trimmed_matches': len(trimmed),
+            'trimmed': trimmed,
+        }
+        print(f"📏 Prompt matchs: ~{tokens} tokens estimés (budget {budget}/match, "
+              f"{len(trimmed)}/{len(matches)} match(s) réduit(s), ~{raw_tokens} avant réduction)")
+        return formatted
@@ -0,0 +1,319 @@
+"""
+Cotes Elo persistantes des équipes, mises à jour au fil des résultats.
+
+Au lieu de re-déduire chaque jour la force des équipes à partir du texte,
+chaque match terminé met à jour deux cotes (Elo avec multiplicateur d'écart
+de buts, comme le World Football Elo) et l'avantage du terrain de sa
+compétition, appris lui aussi au fil des matchs :
+
+    attendu_dom = 1 / (1 + 10 ** ((elo_ext - elo_dom - avantage_ligue) / 400))
+    delta       = K · G(écart) · (résultat_dom - attendu_dom)
+
+Le magasin (data/ratings.json) est mis à jour par AutoResultUpdater à chaque
+vérification de résultats (idempotent : un match n'est compté qu'une fois),
+et peut être reconstruit depuis l'archive des réponses (data/snapshots) ;
+les cotes dépendant de l'ordre des matchs, le rejeu repart toujours de zéro :
+
+    python src/rating_store.py --backfill
+
+Les lectures sont en O(1) (index par id API-Football et par nom normalisé) ;
+les matchs du jour reçoivent match['ratings'] (cf. annotate), lu par les
+formateurs du prompt, les contrôles du validateur et le dashboard.
+"""
+
+import argparse
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+from team_names import normalize_team_name
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 20.0
+INITIAL_HOME_ADVANTAGE = 60.0   # Points Elo
+HOME_ADVANTAGE_RATE = 0.075     # Part du gain de l'équipe à domicile reportée sur l'avantage de la ligue
+FINISHED_STATUSES = ('FT', 'AET', 'PEN')
+
+
+def goal_difference_multiplier(difference: int) -> float:
+    """Multiplicateur G du World Football Elo : 1, 1.5, puis (11 + écart) / 8."""
+    difference = abs(difference)
+    if difference <= 1:
+        return 1.0
+    if difference == 2:
+        return 1.5
+    return (11 + difference) / 8
+
+
+def expected_score(home_rating: float, away_rating: float, home_advantage: float) -> float:
+    """Score attendu (0-1) de l'équipe à domicile."""
+    return 1 / (1 + 10 ** ((away_rating - home_rating - home_advantage) / 400))
+
+
+@dataclass(slots=True)
+class TeamRating:
+    name: str
+    rating: float = INITIAL_RATING
+    games: int = 0
+    league: Optional[str] = None
+    last_date: Optional[str] = None
+
+
+@dataclass(slots=True)
+class MatchRatings:
+    home: float
+    away: float
+    home_advantage: float
+    expected_home: float            # Score attendu de l'équipe à domicile (victoire = 1, nul = 0.5)
+    home_games: int
+    away_games: int
+
+    def pick_expectancy(self, bet_type: str, choice: str) -> Optional[float]:
+        """
+        Score attendu du côté choisi pour un pronostic 1X2 sec ('1 (Victoire X)', '2 (...)').
+
+        Returns:
+            Score attendu (0-1), ou None pour les autres marchés
+        """
+        pick = (choice or '').strip().lower()
+        if (bet_type or '').strip().upper() != '1X2' or pick[:2] in ('1x', '12'):
+            return None
+        if pick.startswith('1'):
+            return self.expected_home
+        if pick.startswith('2'):
+            return round(1 - self.expected_home, 3)
+        return None
+
+
+class RatingStore:
+    """Cotes Elo par équipe et avantage du terrain par compétition, persistés en JSON."""
+
+    def __init__(self, path: str = None, config: Config = None):
+        self.config = config or Config()
+        self.path = path or os.path.join(self.config.DATA_DIR, 'ratings.json')
+        self.teams: Dict[str, TeamRating] = {}
+        self.leagues: Dict[str, Dict] = {}
+        self.applied: Dict[str, str] = {}
+        self._by_name: Dict[str, str] = {}
+        self._loaded = False
+        self._dirty = False
+
+    # ───────────────────────── Persistance ─────────────────────────
+
+    def load(self):
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Cotes Elo illisibles ({e}), ignorées")
+            return
+        self.teams = {key: TeamRating(**team) for key, team in data.get('teams', {}).items()}
+        self.leagues = data.get('leagues', {})
+        self.applied = data.get('applied', {})
+        self._by_name = {normalize_team_name(team.name): key for key, team in self.teams.items()}
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def save(self) -> Optional[str]:
+        """Écrit le magasin s'il a changé (remplacement atomique)."""
+        if not self._dirty:
+            return None
+        data = {
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+            'teams': {key: {name: getattr(team, name) for name in team.__slots__}
+                      for key, team in sorted(self.teams.items(), key=lambda item: -item[1].rating)},
+            'leagues': self.leagues,
+            'applied': self.applied,
+        }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, ensure_ascii=False)
+        os.replace(temporary, self.path)
+        self._dirty = False
+        print(f"✅ Cotes Elo sauvegardées: {len(self.teams)} équipes, {len(self.applied)} matchs")
+        return self.path
+
+    def reset(self):
+        self.teams, self.leagues, self.applied, self._by_name = {}, {}, {}, {}
+        self._loaded = self._dirty = True
+
+    # ───────────────────────── Lecture (O(1)) ─────────────────────────
+
+    @staticmethod
+    def team_key(team_id, name: str) -> str:
+        return str(team_id) if team_id else normalize_team_name(name or '')
+
+    def get(self, team_id=None, name: str = None) -> Optional[TeamRating]:
+        """Cote d'une équipe, par id API-Football puis par nom normalisé."""
+        self._ensure_loaded()
+        if team_id and str(team_id) in self.teams:
+            return self.teams[str(team_id)]
+        key = self._by_name.get(normalize_team_name(name or ''))
+        return self.teams.get(key) if key else None
+
+    def home_advantage(self, league) -> float:
+        self._ensure_loaded()
+        return self.leagues.get(str(league), {}).get('home_advantage', INITIAL_HOME_ADVANTAGE)
+
+    def for_match(self, match: Dict) -> Optional[MatchRatings]:
+        """Cotes des deux équipes d'un match du jour (None si l'une est inconnue)."""
+        home = self.get(match.get('team_home_id'), match.get('home'))
+        away = self.get(match.get('team_away_id'), match.get('away'))
+        if home is None or away is None:
+            return None
+        advantage = self.home_advantage(match.get('league_id') or match.get('competition'))
+        return MatchRatings(
+            home=round(home.rating), away=round(away.rating), home_advantage=round(advantage),
+            expected_home=round(expected_score(home.rating, away.rating, advantage), 3),
+            home_games=home.games, away_games=away.games,
+        )
+
+    def annotate(self, matches: List[Dict]) -> int:
+        """Ajoute match['ratings'] aux matchs dont les deux équipes sont cotées ; renvoie leur nombre."""
+        annotated = 0
+        for match in matches:
+            ratings = self.for_match(match)
+            if ratings is not None:
+                match['ratings'] = ratings
+                annotated += 1
+        return annotated
+
+    def top(self, limit: int = 20, league: str = None) -> List[TeamRating]:
+        self._ensure_loaded()
+        teams = [team for team in self.teams.values() if league is None or team.league == str(league)]
+        return sorted(teams, key=lambda team: -team.rating)[:limit]
+
+    # ───────────────────────── Mise à jour ─────────────────────────
+
+    def _team(self, team_id, name: str, league: str) -> TeamRating:
+        key = self.team_key(team_id, name)
+        team = self.teams.get(key)
+        if team is None:
+            team = self.teams[key] = TeamRating(name=name, league=league)
+            self._by_name.setdefault(normalize_team_name(name), key)
+        return team
+
+    def update(self, home_id, home_name: str, away_id, away_name: str, home_goals: int, away_goals: int,
+               league=None, date: str = None, fixture_id=None, league_name: str = None) -> bool:
+        """
+        Applique un résultat (une seule fois par match).
+
+        Args:
+            league: Id (ou nom) de la compétition, qui porte l'avantage du terrain
+            date: Date du match AAAA-MM-JJ
+            fixture_id: Id API-Football (clé d'idempotence ; défaut : date + équipes)
+            league_name: Nom de la compétition (affichage)
+
+        Returns:
+            True si le résultat a été appliqué, False s'il l'était déjà
+        """
+        self._ensure_loaded()
+        match_key = str(fixture_id) if fixture_id else \
+            f"{date}:{self.team_key(home_id, home_name)}:{self.team_key(away_id, away_name)}"
+        if match_key in self.applied:
+            return False
+
+        league = str(league) if league is not None else None
+        home = self._team(home_id, home_name, league)
+        away = self._team(away_id, away_name, league)
+        params = self.leagues.setdefault(league or '-', {'home_advantage': INITIAL_HOME_ADVANTAGE, 'games': 0})
+
+        expected = expected_score(home.rating, away.rating, params['home_advantage'])
+        actual = 1.0 if home_goals > away_goals else (0.5 if home_goals == away_goals else 0.0)
+        delta = K_FACTOR * goal_difference_multiplier(home_goals - away_goals) * (actual - expected)
+
+        home.rating += delta
+        away.rating -= delta
+        params['home_advantage'] += HOME_ADVANTAGE_RATE * delta
+        params['games'] += 1
+        if league_name:
+            params['name'] = league_name
+        for team in (home, away):
+            team.games += 1
+            if date and (team.last_date is None or date > team.last_date):
+                team.last_date = date
+        self.applied[match_key] = date or ''
+        self._dirty = True
+        return True
+
+    def update_from_fixture(self, fixture: Dict, leagues: Iterable[int] = None) -> bool:
+        """
+        Applique un objet fixture brut d'API-Football s'il est terminé.
+
+        Args:
+            leagues: Ids des compétitions retenues (None = toutes)
+        """
+        if (fixture.get('fixture') or {}).get('status', {}).get('short') not in FINISHED_STATUSES:
+            return False
+        league = fixture.get('league') or {}
+        league_id = league.get('id')
+        if leagues is not None and league_id not in leagues:
+            return False
+        teams, goals = fixture.get('teams') or {}, fixture.get('goals') or {}
+        if goals.get('home') is None or goals.get('away') is None:
+            return False
+        return self.update(
+            teams['home'].get('id'), teams['home'].get('name', ''), teams['away'].get('id'),
+            teams['away'].get('name', ''), goals['home'], goals['away'], league=league_id,
+            date=(fixture['fixture'].get('date') or '')[:10] or None, fixture_id=fixture['fixture'].get('id'),
+            league_name=league.get('name'),
+        )
+
+    def backfill(self, archive, leagues: Iterable[int] = None) -> int:
+        """
+        Reconstruit le magasin : repart de zéro puis rejoue, dans l'ordre chronologique,
+        tous les matchs terminés de l'archive (réponses /fixtures et /fixtures/headtohead :
+        programmes, forme récente, H2H). Rejouer par-dessus des cotes existantes
+        appliquerait les anciens matchs après les récents (Elo dépend de l'ordre).
+
+        Args:
+            archive: SnapshotArchive
+            leagues: Ids des compétitions retenues, comme pour la mise à jour incrémentale (None = toutes)
+
+        Returns:
+            Nombre de matchs appliqués
+        """
+        self.reset()
+        fixtures = {}
+        for record in archive.records(('fixtures', 'fixtures/headtohead')):
+            for fixture in (record.get('data') or {}).get('response') or []:
+                fixture_id = (fixture.get('fixture') or {}).get('id')
+                if fixture_id:
+                    fixtures[fixture_id] = fixture
+        ordered = sorted(fixtures.values(), key=lambda fixture: fixture['fixture'].get('date') or '')
+        return sum(self.update_from_fixture(fixture, leagues) for fixture in ordered)
+
+
+# Magasin partagé du processus (chargé au premier accès)
+rating_store = RatingStore()
+
+
+if __name__ == "__main__":
+    from snapshot_archive import SnapshotArchive
+
+    parser = argparse.ArgumentParser(description="Cotes Elo des équipes")
+    parser.add_argument('--backfill', action='store_true',
+                        help="Reconstruit les cotes depuis les matchs terminés de data/snapshots (repart de zéro)")
+    parser.add_argument('--reset', action='store_true', help="Vide le magasin")
+    parser.add_argument('--top', type=int, default=20, help="Nombre d'équipes affichées")
+    args = parser.parse_args()
+
+    if args.backfill:
+        applied = rating_store.backfill(SnapshotArchive(os.path.join(Config.DATA_DIR, 'snapshots')),
+                                        Config.INCLUDED_LEAGUE_IDS)
+        print(f"📈 {applied} match(s) appliqué(s) depuis l'archive")
+        rating_store.save()
+    elif args.reset:
+        rating_store.reset()
+        rating_store.save()
+    for rank, team in enumerate(rating_store.top(args.top), 1):
+        print(f"{rank:3}. {team.name:<30} {team.rating:7.1f}  ({team.games} matchs, dernier {team.last_date})")
@@ -4,6 +4,7 @@ Script de ré-analyse des matchs avec alerte Telegram en cas de changement
 Utilisé pour envoyer des mises à jour aux utilisateurs quand l'analyse change
 """
 
+import argparse
 import json
 import os
 import sys
@@ -11,8 +12,18 @@ from datetime import datetime
 from telegram import Bot
 import asyncio
 from config import Config
+from telegram_sender import observed_send
 from match_scraper import MatchScraper
 from claude_analyzer import ClaudeAnalyzer
+from learning_engine import LearningEngine
+from prediction_validator import PredictionValidator
+from match_screener import MatchScreener
+from analysis_cache import AnalysisCache
+from prompt_budget import PromptBudget
+from compact_formatter import CompactFormatter
+from value_detector import value_detector
+from tracing import tracer
+from profiling import add_profile_option, profiled
 
 class ReanalysisAlertSender:
     def __init__(self):
@@ -113,7 +124,8 @@ class ReanalysisAlertSender:
 
         # Envoyer le message
         try:
-            await self.bot.send_message(
+            await observed_send(
+                self.bot,
                 chat_id=self.config.TELEGRAM_CHAT_ID,
                 text=message,
                 parse_mode='Markdown'
@@ -149,7 +161,7 @@ def main():
     # Lancer nouvelle analyse
     print("🤖 Lancement nouvelle analyse avec Claude...")
     scraper = MatchScraper()
-    analyzer = ClaudeAnalyzer()
+    config = Config()
 
     # Récupérer les matchs
     matches = scraper.get_today_matches()
@@ -159,8 +171,33 @@ def main():
         print("❌ Aucun match disponible, arrêt.")
         sys.exit(0)
 
-    # Analyser avec Claude
-    new_analysis = analyzer.analyze_matches(matches)
+    with tracer.span('screen', matches=len(matches)):
+        matches = MatchScreener(config).screen(value_detector.prefilter(matches), today)
+
+    # Seuls les matchs dont les données ont changé repartent vers le modèle
+    formatter = CompactFormatter() if config.PROMPT_FORMAT == 'compact' else scraper
+    cache = AnalysisCache(today, config)
+    changed, unchanged = cache.partition(matches, formatter)
+    print(f"🗂️ Cache d'analyse: {len(unchanged)} match(s) inchangé(s), {len(changed)} à ré-analyser")
+
+    partial_analysis = None
+    if changed:
+        analyzer = ClaudeAnalyzer()
+        stats = LearningEngine().get_learning_stats()
+        with tracer.span('analyze', matches=len(changed)):
+            partial_analysis = analyzer.analyze_matches(PromptBudget(config).render(changed, formatter), stats)
+
+        if not partial_analysis:
+            print("❌ Erreur analyse, ancienne analyse conservée")
+            sys.exit(1)
+
+        validator = PredictionValidator(changed)
+        with tracer.span('validate'):
+            partial_analysis = validator.validate_and_fix_predictions(partial_analysis, min_odds=config.MIN_ODDS)
+        cache.store(changed, partial_analysis, formatter)
+
+    new_analysis = cache.merge(partial_analysis, unchanged)
+    new_analysis['cache'] = {'reused': len(unchanged), 'reanalyzed': len(changed)}
 
     # Sauvegarder la nouvelle analyse
     with open(old_prediction_file, 'w', encoding='utf-8') as f:
@@ -194,7 +231,8 @@ def main():
     if has_changes:
         print("📤 Envoi alerte Telegram...")
         sender = ReanalysisAlertSender()
-        success = sender.send_reanalysis_alert_sync(old_analysis, new_analysis)
+        with tracer.span('telegram'):
+            success = sender.send_reanalysis_alert_sync(old_analysis, new_analysis)
 
         if success:
             print("✅ Alerte envoyée avec succès")
@@ -205,4 +243,8 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Ré-analyse des matchs du jour avec alerte en cas de changement")
+    add_profile_option(parser)
+    args = parser.parse_args()
+    with tracer.run('reanalyze_and_alert'), profiled('reanalyze_and_alert', args.profile):
+        main()
@@ -0,0 +1,226 @@
+"""
+Schémas JSON des réponses des analyseurs (mode tool-use / sortie structurée).
+
+Les schémas sont dérivés des champs réellement lus par
+TelegramSender.format_detailed_message et PredictionValidator : le modèle est
+contraint de remplir ces champs via un outil, puis la réponse est vérifiée par
+un validateur compilé une seule fois au chargement du module.
+"""
+
+from typing import Dict
+
+import fastjsonschema
+
+
+# Nom des outils exposés au modèle
+ANALYSIS_TOOL_NAME = "submit_match_analysis"
+POST_MATCH_TOOL_NAME = "submit_error_analysis"
+SCREENING_TOOL_NAME = "submit_screening"
+
+ERROR_CATEGORIES = [
+    "absence_joueur",
+    "forme_recente",
+    "contexte_match",
+    "statistiques_trompeuses",
+    "surestimation_favori",
+    "sous_estimation_outsider",
+    "autre",
+]
+
+
+def _text_object(*fields: str) -> Dict:
+    """Objet dont tous les champs sont des textes libres (optionnels)."""
+    return {
+        "type": "object",
+        "properties": {field: {"type": "string"} for field in fields},
+    }
+
+
+def _home_away(item_schema: Dict) -> Dict:
+    """Section avec une entrée home_team et une entrée away_team."""
+    return {
+        "type": "object",
+        "properties": {
+            "home_team": item_schema,
+            "away_team": item_schema,
+        },
+    }
+
+
+_NUMBER_OR_TEXT = {"type": ["number", "string"]}
+
+DETAILED_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "recent_form": _home_away(
+            _text_object("last_5_matches", "home_record", "away_record", "trend", "details")
+        ),
+        "head_to_head": _text_object("last_5", "at_home", "details", "trends"),
+        "injuries_suspensions": _home_away({
+            "type": "object",
+            "properties": {
+                "absent": {"type": "array", "items": {"type": "string"}},
+                "impact": {"type": "string"},
+            },
+        }),
+        "tactical_analysis": _text_object("home_style", "away_style", "key_matchup", "predicted_approach"),
+        "schedule_fatigue": _home_away({"type": "string"}),
+        "context_stakes": _text_object("home_situation", "away_situation", "psychological", "overall"),
+        "home_advantage": _text_object(
+            "home_record_season", "away_record_opponent", "atmosphere", "weather", "advantage_score"
+        ),
+        "odds_value": {
+            "type": "object",
+            "properties": {
+                "bet_odds": _NUMBER_OR_TEXT,
+                "implied_probability": _NUMBER_OR_TEXT,
+                "estimated_real_probability": _NUMBER_OR_TEXT,
+                "value_analysis": {"type": "string"},
+                "odds_movement": {"type": "string"},
+            },
+        },
+        "key_factors_summary": {"type": "array", "items": {"type": "string"}},
+    },
+}
+
+RECOMMENDATION_SCHEMA = {
+    "type": "object",
+    "required": ["match", "competition", "kickoff", "bet_type", "prediction", "odds", "confidence"],
+    "properties": {
+        "match": {"type": "string", "description": "Équipe Domicile vs Équipe Extérieur"},
+        "competition": {"type": "string"},
+        "kickoff": {"type": "string", "description": "HH:MM"},
+        "detailed_analysis": DETAILED_ANALYSIS_SCHEMA,
+        "conclusion": {"type": "string"},
+        "bet_type": {"type": "string"},
+        "prediction": {"type": "string"},
+        "odds": {"type": "number", "minimum": 1},
+        "confidence": {"type": "number", "minimum": 0, "maximum": 100},
+        "risk_level": {"type": "string"},
+        "alternative_bets": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["type", "odds"],
+                "properties": {
+                    "type": {"type": "string"},
+                    "odds": {"type": "number"},
+                    "reasoning": {"type": "string"},
+                },
+            },
+        },
+    },
+}
+
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "required": ["analysis_date", "total_analyzed", "recommendations"],
+    "properties": {
+        "analysis_date": {"type": "string"},
+        "total_analyzed": {"type": "integer", "minimum": 0},
+        "total_retained": {"type": "integer", "minimum": 0},
+        "recommendations": {"type": "array", "items": RECOMMENDATION_SCHEMA},
+        "matches_excluded": {
+            "type": "object",
+            "properties": {
+                "count": {"type": "integer", "minimum": 0},
+                "examples": {
+                    "type": "array",
+                    "items": _text_object("match", "reason"),
+                },
+            },
+        },
+        "combined_bet": {
+            "type": "object",
+            "required": ["matches", "total_odds", "confidence"],
+            "properties": {
+                "matches": {"type": "array", "items": {"type": "string"}},
+                "total_odds": {"type": "number"},
+                "confidence": {"type": "number", "minimum": 0, "maximum": 100},
+                "detailed_reasoning": {"type": "string"},
+                "reasoning": {"type": "string"},
+                "risk_level": {"type": "string"},
+            },
+        },
+    },
+}
+
+POST_MATCH_SCHEMA = {
+    "type": "object",
+    "required": ["main_cause", "missed_factors", "actionable_conclusion", "error_category"],
+    "properties": {
+        "main_cause": {"type": "string"},
+        "missed_factors": {"type": "array", "items": {"type": "string"}},
+        "actionable_conclusion": {"type": "string"},
+        "error_category": {"type": "string", "enum": ERROR_CATEGORIES},
+    },
+}
+
+SCREENING_SCHEMA = {
+    "type": "object",
+    "required": ["decisions"],
+    "properties": {
+        "decisions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["index", "score"],
+                "properties": {
+                    "index": {"type": "integer", "minimum": 1},
+                    "score": {"type": "number", "minimum": 0, "maximum": 100},
+                    "reason": {"type": "string"},
+                },
+            },
+        },
+    },
+}
+
+
+# Validateurs compilés une seule fois
+_validate_analysis = fastjsonschema.compile(ANALYSIS_SCHEMA)
+_validate_post_match = fastjsonschema.compile(POST_MATCH_SCHEMA)
+_validate_screening = fastjsonschema.compile(SCREENING_SCHEMA)
+
+SchemaError = fastjsonschema.JsonSchemaValueException
+
+
+def validate_analysis(result: Dict) -> Dict:
+    """Vérifie une analyse principale. Lève SchemaError si invalide."""
+    return _validate_analysis(result)
+
+
+def validate_post_match(result: Dict) -> Dict:
+    """Vérifie une analyse post-match. Lève SchemaError si invalide."""
+    return _validate_post_match(result)
+
+
+def validate_screening(result: Dict) -> Dict:
+    """Vérifie une réponse de présélection. Lève SchemaError si invalide."""
+    return _validate_screening(result)
+
+
+def analysis_tool() -> Dict:
+    """Définition de l'outil Anthropic pour l'analyse principale."""
+    return {
+        "name": ANALYSIS_TOOL_NAME,
+        "description": "Soumet l'analyse complète des matchs du jour et les pronostics retenus.",
+        "input_schema": ANALYSIS_SCHEMA,
+    }
+
+
+def post_match_tool() -> Dict:
+    """Définition de l'outil Anthropic pour l'analyse d'un pronostic perdu."""
+    return {
+        "name": POST_MATCH_TOOL_NAME,
+        "description": "Soumet l'analyse de la cause d'erreur d'un pronostic perdu.",
+        "input_schema": POST_MATCH_SCHEMA,
+    }
+
+
+def screening_tool() -> Dict:
+    """Définition de l'outil Anthropic pour la présélection rapide des matchs."""
+    return {
+        "name": SCREENING_TOOL_NAME,
+        "description": "Soumet un score d'intérêt (0-100) pour chaque match présélectionné.",
+        "input_schema": SCREENING_SCHEMA,
+    }
@@ -0,0 +1,291 @@
+"""
+Archive des réponses brutes API-Football, pour ré-enrichir des journées passées.
+
+Chaque réponse reçue pendant un run est conservée telle quelle :
+
+    data/snapshots/
+        2026-10-19/
+            api_football-091503.jsonl.gz   # une ligne JSON par réponse (run de 09:15:03)
+            flashscore-091503.html.gz      # page FlashScore brute du même run
+            index.json                     # clé (endpoint + params) -> fichier, ligne, heure
+
+En mode --from-snapshot, ApiFootballClient (et MatchScraper pour la page
+FlashScore, clé 'page:flashscore') sert les réponses depuis l'archive
+sans aucun appel réseau : reformater une journée, tester un autre prompt ou
+rejouer un backtest ne consomme plus de quota.
+
+Une partition peut contenir plusieurs runs (analyse, alertes, résultats) : un
+rejeu de main.py est épinglé sur un seul run (par défaut le dernier run ayant
+archivé la page FlashScore, cf. latest_run) ; réponses et heure de référence
+viennent alors toutes de ce run.
+"""
+
+import gzip
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+def request_key(endpoint: str, params: Dict) -> str:
+    """Clé d'une requête : endpoint + paramètres triés (indépendante de l'ordre)."""
+    params = '&'.join(f"{name}={params[name]}" for name in sorted(params or {}))
+    return f"{endpoint.strip('/')}?{params}"
+
+
+class SnapshotArchive:
+    """Archive compressée des réponses brutes, partitionnée par date de run."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._pending: List[Dict] = []
+        self._pages: Dict[str, bytes] = {}
+        self._started_at = None
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, Dict] = {}
+        self._files: Dict[str, List[Dict]] = {}
+        self._runs: Dict[str, Dict[str, Dict]] = {}
+
+    # ───────────────────────── Écriture ─────────────────────────
+
+    def record(self, endpoint: str, params: Dict, data: Dict):
+        """Ajoute une réponse au run courant (écrite sur disque par flush())."""
+        now = datetime.now().astimezone()
+        with self._lock:
+            if self._started_at is None:
+                self._started_at = now
+            self._pending.append({
+                'key': request_key(endpoint, params),
+                'endpoint': endpoint.strip('/'),
+                'params': params,
+                'recorded_at': now.isoformat(timespec='seconds'),
+                'data': data,
+            })
+
+    def record_page(self, source: str, content: bytes):
+        """Conserve la page brute d'une source HTML (ex: 'flashscore') pour le run courant."""
+        with self._lock:
+            if self._started_at is None:
+                self._started_at = datetime.now().astimezone()
+            self._pages[source] = content
+
+    def flush(self) -> Optional[str]:
+        """
+        Écrit les réponses du run dans la partition du jour et met à jour l'index.
+
+        Returns:
+            Partition écrite, ou None si rien à archiver
+        """
+        with self._lock:
+            records, self._pending = self._pending, []
+            pages, self._pages = self._pages, {}
+            started_at = self._started_at
+        if not records and not pages:
+            return None
+
+        date = started_at.strftime('%Y-%m-%d')
+        partition = os.path.join(self.root, date)
+        os.makedirs(partition, exist_ok=True)
+        run = started_at.strftime('%H%M%S')
+        index = self._load_index(date)
+
+        for source, content in pages.items():
+            page_name = f"{source}-{run}.html.gz"
+            with gzip.open(os.path.join(partition, page_name), 'wb') as f:
+                f.write(content)
+            index[f"page:{source}"] = {
+                'endpoint': source,
+                'params': {},
+                'file': page_name,
+                'line': None,
+                'recorded_at': started_at.isoformat(timespec='seconds'),
+            }
+
+        name = f"api_football-{run}.jsonl.gz"
+        path = os.path.join(partition, name)
+
+        # Un run peut être flushé plusieurs fois : on complète le fichier existant
+        previous = self._read_file(path) if os.path.exists(path) else []
+        records = previous + records
+        if records:
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+        for line, record in enumerate(records):
+            index[record['key']] = {
+                'endpoint': record['endpoint'],
+                'params': record['params'],
+                'file': name,
+                'line': line,
+                'recorded_at': record['recorded_at'],
+            }
+        with open(os.path.join(partition, 'index.json'), 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=1, ensure_ascii=False, sort_keys=True)
+
+        self._indexes[date] = index
+        self._files[path] = records
+        self._runs.pop(path, None)
+        print(f"🗄️ {len(records)} réponse(s) API-Football et {len(pages)} page(s) archivée(s) dans {partition}")
+        return partition
+
+    # ───────────────────────── Lecture ─────────────────────────
+
+    def dates(self) -> List[str]:
+        """Partitions disponibles, de la plus ancienne à la plus récente."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(d for d in os.listdir(self.root)
+                      if os.path.exists(os.path.join(self.root, d, 'index.json')))
+
+    def _load_index(self, date: str) -> Dict:
+        if date not in self._indexes:
+            path = os.path.join(self.root, date, 'index.json')
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._indexes[date] = json.load(f)
+            except (OSError, ValueError):
+                self._indexes[date] = {}
+        return self._indexes[date]
+
+    @staticmethod
+    def _read_file(path: str) -> List[Dict]:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def runs(self, date: str, source: str = 'api_football') -> List[str]:
+        """Runs (HHMMSS) de la partition ayant archivé `source` ('api_football' ou une page, ex: 'flashscore')."""
+        partition = os.path.join(self.root, date)
+        if not os.path.isdir(partition):
+            return []
+        suffix = '.jsonl.gz' if source == 'api_football' else '.html.gz'
+        return sorted(name[len(source) + 1:-len(suffix)] for name in os.listdir(partition)
+                      if name.startswith(f"{source}-") and name.endswith(suffix))
+
+    def latest_run(self, date: str) -> Optional[str]:
+        """Dernier run complet de la partition (page FlashScore archivée), sinon dernier run API-Football."""
+        runs = self.runs(date, 'flashscore') or self.runs(date)
+        return runs[-1] if runs else None
+
+    def _run_records(self, date: str, run: str) -> Dict[str, Dict]:
+        """Réponses d'un run, par clé de requête."""
+        path = os.path.join(self.root, date, f"api_football-{run}.jsonl.gz")
+        if path not in self._runs:
+            try:
+                records = self._files[path] if path in self._files else self._read_file(path)
+            except (OSError, ValueError, EOFError) as e:
+                print(f"⚠️ Archive illisible {path}: {e}")
+                records = []
+            self._files[path] = records
+            self._runs[path] = {record['key']: record for record in records}
+        return self._runs[path]
+
+    def _find(self, key: str, date: Optional[str]):
+        best = None
+        for partition in ([date] if date else self.dates()):
+            entry = self._load_index(partition).get(key)
+            if entry and (best is None or entry['recorded_at'] > best[1]['recorded_at']):
+                best = (partition, entry)
+        return best
+
+    def lookup(self, endpoint: str, params: Dict, date: Optional[str] = None,
+               run: Optional[str] = None) -> Optional[Dict]:
+        """
+        Réponse archivée d'une requête.
+
+        Args:
+            endpoint: Chemin API (ex: 'fixtures')
+            params: Paramètres de la requête
+            date: Partition à lire ; None = toutes, la réponse la plus récente l'emporte
+            run: Run HHMMSS de la partition (réponses de ce seul run) ; None = tous les runs
+
+        Returns:
+            Corps JSON archivé, ou None si la requête n'a jamais été archivée
+        """
+        if date and run:
+            record = self._run_records(date, run).get(request_key(endpoint, params))
+            return record['data'] if record else None
+
+        found = self._find(request_key(endpoint, params), date)
+        if found is None:
+            return None
+
+        partition, entry = found
+        path = os.path.join(self.root, partition, entry['file'])
+        if path not in self._files:
+            try:
+                self._files[path] = self._read_file(path)
+            except (OSError, ValueError, EOFError) as e:
+                print(f"⚠️ Archive illisible {path}: {e}")
+                self._files[path] = []
+        records = self._files[path]
+        return records[entry['line']]['data'] if entry['line'] < len(records) else None
+
+    def lookup_page(self, source: str, date: Optional[str] = None, run: Optional[str] = None) -> Optional[bytes]:
+        """Page brute archivée d'une source HTML (celle du run, sinon la plus récente de la partition), ou None."""
+        if date and run:
+            partition, name = date, f"{source}-{run}.html.gz"
+        else:
+            found = self._find(f"page:{source}", date)
+            if found is None:
+                return None
+            partition, name = found[0], found[1]['file']
+        try:
+            with gzip.open(os.path.join(self.root, partition, name), 'rb') as f:
+                return f.read()
+        except (OSError, EOFError) as e:
+            print(f"⚠️ Archive illisible {name}: {e}")
+            return None
+
+    def records(self, endpoints: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """
+        Parcourt toutes les réponses archivées, partition par partition (sans les garder en mémoire).
+
+        Args:
+            endpoints: Endpoints retenus (ex: ('fixtures',)) ; None = tous
+        """
+        wanted = {endpoint.strip('/') for endpoint in endpoints} if endpoints else None
+        for date in self.dates():
+            partition = os.path.join(self.root, date)
+            for name in sorted(os.listdir(partition)):
+                if not (name.startswith('api_football-') and name.endswith('.jsonl.gz')):
+                    continue
+                try:
+                    with gzip.open(os.path.join(partition, name), 'rt', encoding='utf-8') as f:
+                        for line in f:
+                            if not line.strip():
+                                continue
+                            record = json.loads(line)
+                            if wanted is None or record.get('endpoint') in wanted:
+                                yield record
+                except (OSError, ValueError, EOFError) as e:
+                    print(f"⚠️ Archive illisible {name}: {e}")
+
+    def started_at(self, date: str, run: Optional[str] = None) -> Optional[datetime]:
+        """
+        Heure de début d'un run (heure de référence du run rejoué).
+
+        Args:
+            date: Partition AAAA-MM-JJ
+            run: Run HHMMSS ; None = latest_run(date)
+        """
+        run = run or self.latest_run(date)
+        if run is None:
+            return None
+        times = [record['recorded_at'] for record in self._run_records(date, run).values()]
+        times += [entry['recorded_at'] for entry in self._load_index(date).values()
+                  if entry['file'] in (f"api_football-{run}.jsonl.gz", f"flashscore-{run}.html.gz")]
+        if times:
+            return datetime.fromisoformat(min(times))
+        # Run sans réponse encore indexée : l'identifiant du run est son heure de début locale
+        return datetime.strptime(f"{date} {run}", '%Y-%m-%d %H%M%S').astimezone()
+
+
+def add_snapshot_option(parser):
+    """Ajoute --from-snapshot [DATE] à un argparse.ArgumentParser."""
+    parser.add_argument(
+        '--from-snapshot', nargs='?', const='latest', default=None, metavar='DATE',
+        help="Rejoue les réponses API-Football archivées (data/snapshots) sans appel réseau ; "
+             "DATE = partition AAAA-MM-JJ (défaut : toutes, la plus récente l'emporte)"
+    )
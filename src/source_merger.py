@@ -0,0 +1,195 @@
+"""
+Fusion et dédoublonnage des matchs issus de plusieurs sources.
+
+FlashScore et API-Football listent souvent les mêmes rencontres. Sans fusion,
+un match présent dans les deux sources est filtré deux fois, apparaît deux
+fois dans le prompt (le modèle le paie deux fois) et seule la copie API est
+enrichie. Ici :
+- les sources sont interrogées en parallèle sous un délai commun
+- les rencontres sont rapprochées par noms d'équipes normalisés et coup d'envoi
+- l'enregistrement le plus riche est conservé, complété par les autres, avec
+  la provenance de chaque champ complété
+"""
+
+import contextvars
+import difflib
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import pytz
+from dateutil import parser as date_parser
+
+from config import Config
+from team_names import normalize_team_name
+from tracing import tracer
+
+
+# Ordre de préférence à richesse égale (API-Football : ids, enrichissement possible)
+SOURCE_PRIORITY = ['api-football', 'flashscore']
+
+# Similarité minimale entre deux noms normalisés (difflib) pour un rapprochement approché
+NAME_SIMILARITY = 0.85
+
+
+def _richness(match: Dict) -> int:
+    """Nombre de champs renseignés d'un enregistrement."""
+    return sum(1 for value in match.values() if value not in (None, '', [], {}))
+
+
+def _same_team(a: str, b: str) -> bool:
+    if not a or not b:
+        return False
+    if a == b:
+        return True
+    # « manchester united » / « manchester utd » ; « inter » / « inter milan »
+    shorter, longer = sorted((a, b), key=len)
+    if len(shorter) >= 4 and re.search(rf"\b{re.escape(shorter)}\b", longer):
+        return True
+    return difflib.SequenceMatcher(None, a, b).ratio() >= NAME_SIMILARITY
+
+
+class SourceMerger:
+    """Collecte concurrente des sources et fusion des doublons."""
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.tz = pytz.timezone(self.config.TIMEZONE)
+        self.tolerance = self.config.SOURCE_MERGE_KICKOFF_TOLERANCE_MINUTES * 60
+        self.last_report = {}
+
+    # ───────────────────────── Collecte ─────────────────────────
+
+    def collect(self, sources: Dict[str, Callable[[], List[Dict]]]) -> Dict[str, List[Dict]]:
+        """
+        Interroge toutes les sources en parallèle sous un même délai.
+
+        Args:
+            sources: {nom de source: fonction sans argument renvoyant ses matchs}
+
+        Returns:
+            {nom de source: matchs} - une source hors délai ou en erreur renvoie []
+        """
+        deadline = self.config.SOURCES_DEADLINE_SECONDS
+        started = time.monotonic()
+        results, report = {}, {}
+
+        executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='source')
+        # Contexte copié : chaque source trace ses appels sous l'étape en cours
+        futures = {name: executor.submit(contextvars.copy_context().run, self._timed, name, fetch)
+                   for name, fetch in sources.items()}
+        wait(futures.values(), timeout=deadline)
+        # Ne pas attendre une source hors délai (sa requête se termine en arrière-plan)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        for name, future in futures.items():
+            if not future.done():
+                print(f"⏱️ Source {name}: hors délai ({deadline:.0f}s), ignorée")
+                results[name] = []
+                report[name] = {'status': 'timeout', 'matches': 0, 'seconds': round(time.monotonic() - started, 2)}
+                continue
+            try:
+                matches, seconds = future.result()
+                results[name] = matches or []
+                report[name] = {'status': 'ok', 'matches': len(results[name]), 'seconds': seconds}
+            except Exception as e:
+                print(f"⚠️ Source {name}: {e}")
+                results[name] = []
+                report[name] = {'status': 'error', 'matches': 0, 'error': str(e)}
+
+        self.last_report = {'sources': report}
+        return results
+
+    @staticmethod
+    def _timed(name, fetch):
+        start = time.monotonic()
+        with tracer.span('source', source=name) as span:
+            matches = fetch()
+            span.set(matches=len(matches or []))
+        return matches, round(time.monotonic() - start, 2)
+
+    # ───────────────────────── Rapprochement ─────────────────────────
+
+    def kickoff(self, match: Dict) -> Optional[datetime]:
+        """Coup d'envoi en datetime (ISO API-Football, ou 'HH:MM' local FlashScore + date)."""
+        value = (match.get('time') or '').strip()
+        try:
+            if re.fullmatch(r"\d{1,2}:\d{2}", value):
+                naive = datetime.strptime(f"{match.get('date')} {value}", '%Y-%m-%d %H:%M')
+                return self.tz.localize(naive)
+            parsed = date_parser.isoparse(value)
+            return parsed if parsed.tzinfo else self.tz.localize(parsed)
+        except (ValueError, TypeError, OverflowError):
+            return None
+
+    def is_same_fixture(self, a: Dict, b: Dict) -> bool:
+        """Même rencontre : mêmes équipes (noms normalisés) et coups d'envoi compatibles."""
+        if not (_same_team(normalize_team_name(a.get('home')), normalize_team_name(b.get('home')))
+                and _same_team(normalize_team_name(a.get('away')), normalize_team_name(b.get('away')))):
+            return False
+        kickoff_a, kickoff_b = self.kickoff(a), self.kickoff(b)
+        if kickoff_a is None or kickoff_b is None:
+            # Heure illisible (« Postp. », « FT »...) : les noms suffisent le même jour
+            return a.get('date') == b.get('date')
+        return abs((kickoff_a - kickoff_b).total_seconds()) <= self.tolerance
+
+    # ───────────────────────── Fusion ─────────────────────────
+
+    def merge(self, results: Dict[str, List[Dict]]) -> List[Dict]:
+        """
+        Fusionne les matchs de toutes les sources en une liste sans doublon.
+
+        Returns:
+            Matchs fusionnés ; chacun porte 'provenance' = {'sources', 'primary', 'filled'}
+        """
+        order = sorted(results, key=lambda name: SOURCE_PRIORITY.index(name) if name in SOURCE_PRIORITY else len(SOURCE_PRIORITY))
+        groups: List[List[Dict]] = []
+
+        for name in order:
+            for match in results[name]:
+                match.setdefault('source', name)
+                group = next((g for g in groups if self.is_same_fixture(g[0], match)), None)
+                if group is None:
+                    groups.append([match])
+                else:
+                    group.append(match)
+
+        merged = [self._merge_group(group) for group in groups]
+        total = sum(len(matches) for matches in results.values())
+        self.last_report.update({'raw': total, 'merged': len(merged), 'duplicates': total - len(merged)})
+        return merged
+
+    def _merge_group(self, group: List[Dict]) -> Dict:
+        """Garde l'enregistrement le plus riche et complète ses champs vides avec les autres."""
+        def rank(match):
+            source = match.get('source')
+            priority = SOURCE_PRIORITY.index(source) if source in SOURCE_PRIORITY else len(SOURCE_PRIORITY)
+            return (-_richness(match), priority)
+
+        ordered = sorted(group, key=rank)
+        primary = dict(ordered[0])
+        filled = {}
+        for other in ordered[1:]:
+            for key, value in other.items():
+                if key in ('source', 'provenance') or value in (None, '', [], {}):
+                    continue
+                if primary.get(key) in (None, '', [], {}):
+                    primary[key] = value
+                    filled[key] = other['source']
+
+        primary['provenance'] = {
+            'sources': [match['source'] for match in ordered],
+            'primary': primary['source'],
+            'filled': filled,
+        }
+        return primary
+
+    def fetch_and_merge(self, sources: Dict[str, Callable[[], List[Dict]]]) -> List[Dict]:
+        """Collecte concurrente puis fusion, avec un résumé en console."""
+        merged = self.merge(self.collect(sources))
+        counts = ", ".join(f"{name}: {info['matches']}" for name, info in self.last_report['sources'].items())
+        print(f"🔀 Sources ({counts}) → {len(merged)} match(s) unique(s), "
+              f"{self.last_report['duplicates']} doublon(s) fusionné(s)")
+        return merged
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Simulation de bankroll selon la stratégie de mise.
+
+Les pronostics terminés (colonnes de backtester.PickTable, dans l'ordre
+chronologique) sont rejoués avec une bankroll de départ de 100 unités sous
+plusieurs stratégies :
+- flat          : 1 unité par pari
+- proportional  : part fixe de la bankroll courante
+- kelly         : fraction × critère de Kelly, avec p = confiance annoncée / 100 :
+                  f* = (p·(cote-1) - (1-p)) / (cote-1), bornée à [0, plafond]
+
+Pour chaque stratégie : mises, gains (unités), ROI, bankroll finale, drawdown
+maximal et courbe de bankroll. Le risque de ruine (bankroll qui passe sous
+RUIN_LEVEL × bankroll de départ) est estimé par Monte Carlo : les séquences
+de paris sont rééchantillonnées avec remise et toutes les trajectoires d'une
+stratégie sont calculées d'un bloc ([simulations, paris]).
+
+Usage:
+    python src/staking.py [--since 2025-01-01] [--simulations 2000] [--horizon 500]
+"""
+
+import argparse
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backtester import PickTable
+from performance_tracker import PerformanceTracker
+
+INITIAL_BANKROLL = 100.0
+RUIN_LEVEL = 0.5            # Ruine : bankroll ≤ 50 % de la bankroll de départ
+DEFAULT_SIMULATIONS = 2000
+DEFAULT_HORIZON = 500       # Paris par trajectoire simulée
+
+
+@dataclass(slots=True)
+class StakingStrategy:
+    name: str
+    kind: str                       # 'flat', 'proportional' ou 'kelly'
+    fraction: float = 1.0           # Unités (flat), part de bankroll (proportional) ou multiplicateur de Kelly
+    cap: Optional[float] = None     # Part maximale de la bankroll par pari
+
+
+DEFAULT_STRATEGIES = (
+    StakingStrategy('Mise fixe 1u', 'flat', 1.0),
+    StakingStrategy('Proportionnelle 2%', 'proportional', 0.02),
+    StakingStrategy('Kelly', 'kelly', 1.0),
+    StakingStrategy('Kelly 1/2', 'kelly', 0.5),
+    StakingStrategy('Kelly 1/4', 'kelly', 0.25),
+    StakingStrategy('Kelly 1/2 plafonné 5%', 'kelly', 0.5, cap=0.05),
+)
+
+
+def kelly_fraction(odds: np.ndarray, probability: np.ndarray) -> np.ndarray:
+    """Critère de Kelly (part de bankroll), 0 si le pari n'a pas d'espérance positive."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        edge = (probability * (odds - 1) - (1 - probability)) / (odds - 1)
+    return np.clip(np.nan_to_num(edge, nan=0.0), 0.0, 1.0)
+
+
+def run_strategy(strategy: StakingStrategy, odds: np.ndarray, probability: np.ndarray, won: np.ndarray,
+                 initial: float = INITIAL_BANKROLL) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trajectoires de bankroll d'une stratégie.
+
+    Args:
+        odds, probability, won: Séquences de paris [trajectoires, paris]
+        initial: Bankroll de départ
+
+    Returns:
+        (bankroll [trajectoires, paris + 1], mises [trajectoires, paris])
+    """
+    returns = np.where(won, odds - 1, -1.0)
+    start = np.full(odds.shape[:-1] + (1,), initial)
+    if strategy.kind == 'flat':
+        stakes = np.full(odds.shape, strategy.fraction)
+        bankroll = np.concatenate([start, initial + np.cumsum(stakes * returns, axis=-1)], axis=-1)
+        return bankroll, stakes
+
+    if strategy.kind == 'proportional':
+        share = np.full(odds.shape, strategy.fraction)
+    else:
+        share = strategy.fraction * kelly_fraction(odds, probability)
+    if strategy.cap is not None:
+        share = np.minimum(share, strategy.cap)
+    with np.errstate(divide='ignore'):
+        growth = np.exp(np.cumsum(np.log1p(share * returns), axis=-1))
+    bankroll = np.concatenate([start, initial * growth], axis=-1)
+    return bankroll, share * bankroll[..., :-1]
+
+
+def max_drawdown(bankroll: np.ndarray) -> np.ndarray:
+    """Plus forte baisse relative depuis un sommet (0-1), par trajectoire."""
+    peaks = np.maximum.accumulate(bankroll, axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.nan_to_num((peaks - bankroll) / peaks).max(axis=-1)
+
+
+class StakingSimulator:
+    """Rejoue l'historique et simule le risque de ruine de chaque stratégie."""
+
+    def __init__(self, table: PickTable, initial: float = INITIAL_BANKROLL):
+        self.table = table
+        self.initial = initial
+        self.probability = np.where(table.confidence > 0, table.confidence / 100, np.nan)
+
+    @classmethod
+    def load(cls, tracker: PerformanceTracker = None, since: Optional[str] = None) -> 'StakingSimulator':
+        return cls(PickTable.load(tracker, since))
+
+    def simulate(self, strategies=DEFAULT_STRATEGIES) -> List[Dict]:
+        """
+        Historique rejoué sous chaque stratégie.
+
+        Returns:
+            Une entrée par stratégie : staked, profit, roi, final_bankroll,
+            max_drawdown (0-1) et equity (bankroll après chaque pari, départ compris)
+        """
+        t = self.table
+        results = []
+        for strategy in strategies:
+            bankroll, stakes = run_strategy(strategy, t.odds, self.probability, t.won, self.initial)
+            staked = float(stakes.sum())
+            profit = float(bankroll[-1] - self.initial)
+            results.append({
+                'strategy': strategy.name,
+                'bets': int((stakes > 0).sum()),
+                'staked': round(staked, 2),
+                'profit': round(profit, 2),
+                'roi': round(profit / staked, 4) if staked else None,
+                'final_bankroll': round(float(bankroll[-1]), 2),
+                'max_drawdown': round(float(max_drawdown(bankroll)), 4),
+                'equity': bankroll,
+            })
+        return results
+
+    def risk_of_ruin(self, strategies=DEFAULT_STRATEGIES, simulations: int = DEFAULT_SIMULATIONS,
+                     horizon: int = DEFAULT_HORIZON, ruin_level: float = RUIN_LEVEL, seed: int = 0) -> Dict[str, Dict]:
+        """
+        Monte Carlo : séquences de `horizon` paris tirées avec remise dans l'historique.
+
+        Returns:
+            Par stratégie : ruin (probabilité), final_median, final_p5, final_p95, drawdown_median
+        """
+        if not len(self.table):
+            return {}
+        rng = np.random.default_rng(seed)
+        # Mêmes séquences pour toutes les stratégies (comparaison à tirage égal)
+        picks = rng.integers(0, len(self.table), size=(simulations, horizon))
+        odds, probability, won = self.table.odds[picks], self.probability[picks], self.table.won[picks]
+
+        risks = {}
+        for strategy in strategies:
+            bankroll, _ = run_strategy(strategy, odds, probability, won, self.initial)
+            final = bankroll[:, -1]
+            risks[strategy.name] = {
+                'ruin': round(float((bankroll.min(axis=1) <= ruin_level * self.initial).mean()), 4),
+                'final_median': round(float(np.median(final)), 2),
+                'final_p5': round(float(np.percentile(final, 5)), 2),
+                'final_p95': round(float(np.percentile(final, 95)), 2),
+                'drawdown_median': round(float(np.median(max_drawdown(bankroll))), 4),
+            }
+        return risks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulation de bankroll par stratégie de mise")
+    parser.add_argument('--since', default=None, help="Date de début AAAA-MM-JJ")
+    parser.add_argument('--simulations', type=int, default=DEFAULT_SIMULATIONS, help="Trajectoires Monte Carlo")
+    parser.add_argument('--horizon', type=int, default=DEFAULT_HORIZON, help="Paris par trajectoire")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    simulator = StakingSimulator.load(since=args.since)
+    if not len(simulator.table):
+        print("❌ Aucun pronostic terminé à rejouer")
+        raise SystemExit(1)
+
+    results = simulator.simulate()
+    risks = simulator.risk_of_ruin(simulations=args.simulations, horizon=args.horizon, seed=args.seed)
+    print(f"💰 {len(simulator.table)} paris rejoués, bankroll de départ {INITIAL_BANKROLL:g}u ; "
+          f"Monte Carlo {args.simulations} × {args.horizon} paris, ruine ≤ {RUIN_LEVEL:.0%}\n")
+    print(f"{'stratégie':<24}{'misé':>10}{'gains':>10}{'ROI':>9}{'finale':>11}{'DD max':>8}"
+          f"{'ruine':>8}{'finale p5-p95 (MC)':>24}")
+    for result in results:
+        risk = risks[result['strategy']]
+        roi = f"{result['roi']:+.1%}" if result['roi'] is not None else '-'
+        # Les stratégies proportionnelles composent : montants affichés en notation courte
+        print(f"{result['strategy']:<24}{result['staked']:>10.4g}{result['profit']:>+10.4g}{roi:>9}"
+              f"{result['final_bankroll']:>11.4g}{result['max_drawdown']:>8.0%}{risk['ruin']:>8.1%}"
+              f"{risk['final_p5']:>12.4g}-{risk['final_p95']:<11.4g}")
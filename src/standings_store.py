@@ -0,0 +1,41 @@
+"""
+Classements de ligue partagés (un appel /standings par ligue et par saison).
+
+MatchScraper et StatsFetcher passent par le même magasin : le classement est
+récupéré et indexé par team_id une seule fois, puis réutilisé par tous les
+matchs de la ligue.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from api_football import api_football
+from match_model import StandingsIndex
+
+
+class StandingsStore:
+    """Cache en mémoire des StandingsIndex, par (ligue, saison)."""
+
+    def __init__(self):
+        self._indexes: Dict[Tuple[int, int], StandingsIndex] = {}
+
+    def get(self, league_id: int, season: int) -> Optional[StandingsIndex]:
+        """
+        Classement indexé d'une ligue (appel API au premier accès uniquement).
+
+        Returns:
+            StandingsIndex, ou None si l'API ne répond pas (non mis en cache : nouvel essai au prochain appel)
+        """
+        key = (league_id, season)
+        if key not in self._indexes:
+            data = api_football.get('standings', {'league': league_id, 'season': season})
+            if data is None:
+                return None
+            self._indexes[key] = StandingsIndex.from_api(data.get('response', []), league_id, season)
+        return self._indexes[key]
+
+    def clear(self):
+        self._indexes.clear()
+
+
+# Magasin partagé du processus
+standings_store = StandingsStore()
@@ -3,23 +3,22 @@ Module pour récupérer des statistiques RÉELLES via API-Football.
 Fournit des données factuelles à jour au lieu de laisser Gemini inventer.
 """
 
-import requests
-import os
+import argparse
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from api_football import api_football
+from snapshot_archive import add_snapshot_option
+from match_model import StandingsIndex
+from standings_store import standings_store
+
 load_dotenv()
 
 
 class StatsFetcher:
     """Récupère les statistiques réelles via API-Football."""
 
-    def __init__(self):
-        self.api_key = os.getenv('API_FOOTBALL_KEY')
-        self.base_url = "https://v3.football.api-sports.io"
-        self.headers = {'x-apisports-key': self.api_key}
-
     def get_team_stats(self, team_id: int, league_id: int, season: int = 2025) -> Dict:
         """
         Récupère les statistiques d'une équipe pour la saison en cours.
@@ -28,15 +27,13 @@ class StatsFetcher:
             Dict avec forme récente, stats domicile/extérieur, buts marqués/encaissés
         """
         try:
-            url = f"{self.base_url}/teams/statistics"
             params = {
                 'team': team_id,
                 'league': league_id,
                 'season': season
             }
 
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            data = response.json()
+            data = api_football.get('teams/statistics', params) or {}
 
             if data.get('response'):
                 stats = data['response']
@@ -58,6 +55,19 @@ class StatsFetcher:
             print(f"Erreur récupération stats équipe {team_id}: {e}")
             return {}
 
+    def get_standings(self, league_id: int, season: int = 2025) -> Optional[StandingsIndex]:
+        """
+        Récupère le classement d'une ligue, indexé par team_id.
+
+        Returns:
+            StandingsIndex partagé avec MatchScraper (un seul appel par ligue), None si indisponible
+        """
+        try:
+            return standings_store.get(league_id, season)
+        except Exception as e:
+            print(f"Erreur récupération classement ligue {league_id}: {e}")
+            return None
+
     def get_h2h(self, team1_id: int, team2_id: int, last: int = 5) -> List[Dict]:
         """
         Récupère les dernières confrontations directes entre 2 équipes.
@@ -66,14 +76,12 @@ class StatsFetcher:
             Liste des derniers matchs H2H avec scores et dates
         """
         try:
-            url = f"{self.base_url}/fixtures/headtohead"
             params = {
                 'h2h': f"{team1_id}-{team2_id}",
                 'last': last
             }
 
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            data = response.json()
+            data = api_football.get('fixtures/headtohead', params) or {}
 
             h2h_matches = []
             for fixture in data.get('response', [])[:last]:
@@ -99,14 +107,12 @@ class StatsFetcher:
             Liste des derniers matchs avec résultats réels
         """
         try:
-            url = f"{self.base_url}/fixtures"
             params = {
                 'team': team_id,
                 'last': last_matches
             }
 
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            data = response.json()
+            data = api_football.get('fixtures', params) or {}
 
             recent_matches = []
             for fixture in data.get('response', [])[:last_matches]:
@@ -137,11 +143,9 @@ class StatsFetcher:
             Liste des joueurs absents avec raison
         """
         try:
-            url = f"{self.base_url}/injuries"
             params = {'team': team_id}
 
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            data = response.json()
+            data = api_football.get('injuries', params) or {}
 
             injuries = []
             for injury in data.get('response', []):
@@ -164,11 +168,9 @@ class StatsFetcher:
             Dict avec stats complètes du match
         """
         try:
-            url = f"{self.base_url}/fixtures"
             params = {'id': fixture_id}
 
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            data = response.json()
+            data = api_football.get('fixtures', params) or {}
 
             if data.get('response'):
                 fixture = data['response'][0]
@@ -197,6 +199,19 @@ class StatsFetcher:
         """
         context = "### DONNÉES RÉELLES ET VÉRIFIÉES\n\n"
 
+        # Classement (index partagé par ligue)
+        standings = self.get_standings(league_id)
+        if standings:
+            rows = [('Domicile', 'home', standings.get(home_team_id)), ('Extérieur', 'away', standings.get(away_team_id))]
+            if any(row for _, _, row in rows):
+                context += "**Classement:**\n"
+                for label, venue, row in rows:
+                    if row:
+                        win, draw, lose = row.split(venue)
+                        context += (f"- {label}: {row.team_name} {row.rank}e - {row.points} pts "
+                                    f"(diff {row.goals_diff}, {label.lower()} {win}V-{draw}N-{lose}D)\n")
+                context += "\n"
+
         # Stats équipe domicile
         home_stats = self.get_team_stats(home_team_id, league_id)
         if home_stats:
@@ -262,6 +277,12 @@ class StatsFetcher:
 
 if __name__ == '__main__':
     # Test
+    parser = argparse.ArgumentParser(description="Contexte réel d'un match (test)")
+    add_snapshot_option(parser)
+    args = parser.parse_args()
+    if args.from_snapshot:
+        api_football.replay(args.from_snapshot)
+
     fetcher = StatsFetcher()
 
     # Exemple: Paris SG (id=85) vs Marseille (id=81) en Ligue 1 (id=61)
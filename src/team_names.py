@@ -0,0 +1,39 @@
+"""
+Normalisation des noms d'équipes.
+
+Les sources (FlashScore, API-Football, réponses du modèle) n'écrivent pas les
+noms de la même façon : « FSV Mainz 05 » / « Mainz », « Atlético Madrid » /
+« Atletico Madrid », « Brighton & Hove Albion » / « Brighton and Hove Albion ».
+"""
+
+import re
+import unicodedata
+
+
+SUFFIXES = [' kv', ' fc', ' sc', ' sv', ' ac', ' as', ' bv', ' cf', ' afc', ' ssc']
+PREFIXES = ['fc ', 'sc ', 'sv ', 'ac ', 'as ', 'bv ', 'cf ', 'afc ', 'ssc ']
+
+
+def normalize_team_name(team_name: str) -> str:
+    """Normalise un nom d'équipe pour comparaison"""
+    # Accents et ponctuation (« Atlético » -> « atletico », « & » -> « and »)
+    name = unicodedata.normalize('NFKD', team_name or '')
+    name = ''.join(c for c in name if not unicodedata.combining(c)).lower().strip()
+    name = name.replace('&', ' and ')
+    name = re.sub(r"[.'\-/]", ' ', name)
+    name = re.sub(r'\s+', ' ', name).strip()
+
+    # Supprimer suffixes courants
+    for suffix in SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+
+    # Supprimer préfixes courants
+    for prefix in PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+
+    # Supprimer numéros (ex: "05" dans "FSV Mainz 05")
+    name = re.sub(r'\s*\d+\s*', '', name)
+
+    return name.strip()
@@ -1,12 +1,34 @@
 from telegram import Bot
 import asyncio
+import time
 from config import Config
+from http_metrics import http_metrics
+from tracing import tracer
 import json
 
+
+async def observed_send(bot, **kwargs):
+    """bot.send_message avec métriques d'appel (cf. http_metrics) ; 429 si Telegram impose une pause."""
+    started = time.monotonic()
+    size = len(kwargs.get('text', '').encode('utf-8'))
+    try:
+        result = await bot.send_message(**kwargs)
+    except Exception as e:
+        status = 429 if type(e).__name__ == 'RetryAfter' else type(e).__name__
+        http_metrics.observe('telegram', 'sendMessage', status, time.monotonic() - started, size)
+        raise
+    http_metrics.observe('telegram', 'sendMessage', 200, time.monotonic() - started, size)
+    return result
+
+
 class TelegramSender:
     def __init__(self):
         self.config = Config()
-        self.bot = Bot(token=self.config.TELEGRAM_BOT_TOKEN)
+        if self.config.TELEGRAM_API_URL:
+            # Serveur local (benchmarks/api_standin.py) pour les bancs
+            self.bot = Bot(token=self.config.TELEGRAM_BOT_TOKEN, base_url=self.config.TELEGRAM_API_URL)
+        else:
+            self.bot = Bot(token=self.config.TELEGRAM_BOT_TOKEN)
     
     def format_detailed_message(self, analysis_result):
         """Formate l'analyse détaillée en message Telegram"""
@@ -197,13 +219,20 @@ class TelegramSender:
     
     async def send_message(self, message):
         """Envoie le message sur Telegram"""
+        with tracer.span('telegram', chars=len(message)) as span:
+            sent = await self._send_parts(message)
+            span.set(sent=sent)
+            return sent
+
+    async def _send_parts(self, message):
         try:
             # Telegram a une limite de 4096 caractères
             # Si trop long, diviser en plusieurs messages
             max_length = 4000
             
             if len(message) <= max_length:
-                await self.bot.send_message(
+                await observed_send(
+                    self.bot,
                     chat_id=self.config.TELEGRAM_CHAT_ID,
                     text=message,
                     parse_mode='Markdown'
@@ -225,7 +254,8 @@ class TelegramSender:
                 
                 # Envoyer chaque partie
                 for i, part in enumerate(parts, 1):
-                    await self.bot.send_message(
+                    await observed_send(
+                        self.bot,
                         chat_id=self.config.TELEGRAM_CHAT_ID,
                         text=f"**[Partie {i}/{len(parts)}]**\n\n{part}",
                         parse_mode='Markdown'
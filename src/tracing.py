@@ -0,0 +1,237 @@
+"""
+Traçage léger des runs : spans imbriqués, compteurs et attributs.
+
+    from tracing import tracer
+
+    with tracer.run('main'):
+        with tracer.span('fixture', fixture=12) as span:
+            span.count('api_calls')
+            ...                      # les appels API-Football ouvrent leur propre span ('/transfers')
+
+Chaque point d'entrée (main, auto_update_results, post_match_analyzer,
+pre_match_alert, weekly_report, reanalyze_and_alert) écrit à la fin de son run
+un rapport JSON dans data/runs/AAAA-MM-JJ/<point d'entrée>-HHMMSS.json :
+l'arbre des spans (durées, compteurs, attributs) et, en tête, les spans les
+plus lents avec leur chemin complet, ex :
+
+    enrich > fixture 12 > /transfers   9.02s
+
+Sans run() (modules importés par un banc, un test...), les spans ne sont
+pas conservés et ne coûtent qu'un appel à perf_counter.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from config import Config
+
+# Spans les plus lents listés en tête du rapport et dans le résumé console
+SLOWEST_SPANS = 10
+
+# Span courant du contexte (propagé aux threads via contextvars.copy_context)
+_current: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    """Étape chronométrée : attributs, compteurs et sous-étapes."""
+
+    def __init__(self, name: str, attributes: Dict = None):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.counters: Dict[str, float] = {}
+        self.children: List['Span'] = []
+        self.error = None
+        self.start = time.perf_counter()
+        self.duration = None
+        self._lock = threading.Lock()
+
+    @property
+    def label(self) -> str:
+        """Nom affiché : 'enrich > fixture 12' pour un span 'fixture' portant fixture=12."""
+        value = self.attributes.get(self.name)
+        return f"{self.name} {value}" if value is not None else self.name
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def count(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def _add(self, child: 'Span'):
+        with self._lock:
+            self.children.append(child)
+
+    def elapsed(self) -> float:
+        return self.duration if self.duration is not None else time.perf_counter() - self.start
+
+    def to_dict(self) -> Dict:
+        span = {'name': self.name, 'seconds': round(self.elapsed(), 4)}
+        if self.attributes:
+            span['attributes'] = self.attributes
+        if self.counters:
+            span['counters'] = self.counters
+        if self.error:
+            span['error'] = self.error
+        if self.children:
+            span['children'] = [child.to_dict() for child in self.children]
+        return span
+
+
+class Tracer:
+    """Un run tracé par processus : racine, span courant, rapport final."""
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.runs_dir = os.path.join(self.config.DATA_DIR, 'runs')
+        self.entry_point = None
+        self.root: Optional[Span] = None
+        self.started_at = None
+        self._hooks: List[Callable[[Dict], None]] = []
+
+    def start_run(self, entry_point: str, **attributes) -> Span:
+        """Ouvre le run ; le rapport est écrit par finish()."""
+        self.entry_point = entry_point
+        self.root = Span(entry_point, attributes)
+        self.started_at = datetime.now().astimezone()
+        _current.set(self.root)
+        return self.root
+
+    @contextmanager
+    def run(self, entry_point: str, **attributes):
+        """Run complet d'un point d'entrée ; le rapport est écrit même après sys.exit() ou une exception."""
+        root = self.start_run(entry_point, **attributes)
+        status = 'ok'
+        try:
+            yield root
+        except SystemExit as e:
+            status = 'ok' if e.code in (None, 0) else f"exit {e.code}"
+            raise
+        except BaseException as e:
+            status = f"error: {type(e).__name__}: {e}"
+            raise
+        finally:
+            self.finish(status)
+
+    def current(self) -> Optional[Span]:
+        return _current.get() or self.root
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Span enfant du span courant (ou détaché si aucun run n'est ouvert)."""
+        parent = self.current()
+        span = Span(name, attributes)
+        if parent is not None:
+            parent._add(span)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration = time.perf_counter() - span.start
+            _current.reset(token)
+
+    def count(self, name: str, value: float = 1):
+        """Incrémente un compteur du span courant."""
+        span = self.current()
+        if span is not None:
+            span.count(name, value)
+
+    def set(self, **attributes):
+        """Ajoute des attributs au span courant."""
+        span = self.current()
+        if span is not None:
+            span.set(**attributes)
+
+    def on_finish(self, callback: Callable[[Dict], None]):
+        """Appelé en fin de run avec le rapport, avant son écriture (ex: métriques HTTP, cf. http_metrics)."""
+        self._hooks.append(callback)
+
+    # ───────────────────────── Rapport ─────────────────────────
+
+    def slowest(self, limit: int = SLOWEST_SPANS) -> List[Dict]:
+        """Spans les plus lents (hors racine), avec leur chemin depuis la racine."""
+        flat = []
+
+        def walk(span: Span, path: List[str]):
+            for child in span.children:
+                child_path = path + [child.label]
+                flat.append({'path': ' > '.join(child_path), 'seconds': round(child.elapsed(), 3),
+                             'self_seconds': round(child.elapsed() - sum(c.elapsed() for c in child.children), 3)})
+                walk(child, child_path)
+
+        if self.root is not None:
+            walk(self.root, [])
+        # Temps propre : un parent lent à cause de ses enfants ne masque pas l'enfant fautif
+        return sorted(flat, key=lambda span: span['self_seconds'], reverse=True)[:limit]
+
+    def totals(self) -> Dict[str, Dict]:
+        """Par nom de span : nombre, durée cumulée et maximale."""
+        totals = {}
+
+        def walk(span: Span):
+            for child in span.children:
+                entry = totals.setdefault(child.name, {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+                entry['count'] += 1
+                entry['seconds'] += child.elapsed()
+                entry['max_seconds'] = max(entry['max_seconds'], child.elapsed())
+                walk(child)
+
+        if self.root is not None:
+            walk(self.root)
+        return {name: {key: round(value, 3) if isinstance(value, float) else value for key, value in entry.items()}
+                for name, entry in sorted(totals.items(), key=lambda item: -item[1]['seconds'])}
+
+    def finish(self, status: str = 'ok') -> Optional[str]:
+        """
+        Ferme le run et écrit son rapport dans data/runs/.
+
+        Returns:
+            Chemin du rapport, ou None si aucun run n'était ouvert
+        """
+        root = self.root
+        if root is None:
+            return None
+        root.duration = time.perf_counter() - root.start
+        report = {
+            'entry_point': self.entry_point,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'seconds': round(root.duration, 3),
+            'status': status,
+            'slowest': self.slowest(),
+            'totals': self.totals(),
+            'trace': root.to_dict(),
+        }
+        self.root = None
+        _current.set(None)
+        for callback in self._hooks:
+            callback(report)
+
+        if not self.config.RUN_REPORTS:
+            return None
+        directory = os.path.join(self.runs_dir, self.started_at.strftime('%Y-%m-%d'))
+        path = os.path.join(directory, f"{self.entry_point}-{self.started_at.strftime('%H%M%S')}.json")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=1, ensure_ascii=False, default=str)
+        except OSError as e:
+            print(f"⚠️ Rapport de run non écrit: {e}")
+            return None
+
+        print(f"🧭 Run {self.entry_point}: {root.duration:.1f}s, rapport {path}")
+        for span in report['slowest'][:3]:
+            print(f"   ⏱️ {span['path']}: {span['self_seconds']}s")
+        return path
+
+
+# Traceur partagé du processus
+tracer = Tracer()
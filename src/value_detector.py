@@ -0,0 +1,230 @@
+"""
+Cotes du marché en tableaux et détection des value bets.
+
+Les cotes de tous les matchs du jour (match['odds'], cf. match_model.BookmakerOdds)
+sont lues une seule fois dans un tableau
+
+    cotes[match, marché, issue, bookmaker]      (NaN = cote absente)
+
+sur lequel tout est calculé d'un bloc :
+- meilleure cote de chaque issue (et son bookmaker)
+- marge (overround) de chaque livre complet : Σ 1/cote - 1
+- probabilité « juste » de consensus : chaque livre est débarrassé de sa marge
+  (méthode de Shin par défaut, ou multiplicative), puis moyenné sur les bookmakers
+- espérance de gain à la meilleure cote selon le modèle de buts (cf. goal_model) :
+  value = p_modèle × cote_max - 1
+
+Chaque match coté reçoit match['market'] (MarketSummary), lu par les formateurs
+du prompt. prefilter() écarte avant tout appel LLM les matchs cotés dont
+aucune issue n'est dans la fourchette MIN_ODDS-MAX_ODDS.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import Config
+
+# (libellé, marché API-Football, issues API, libellés courts des issues)
+MARKETS = (
+    ('1X2', 'Match Winner', ('Home', 'Draw', 'Away'), ('1', 'N', '2')),
+    ('O/U 1.5', 'Goals Over/Under', ('Over 1.5', 'Under 1.5'), ('Over', 'Under')),
+    ('O/U 2.5', 'Goals Over/Under', ('Over 2.5', 'Under 2.5'), ('Over', 'Under')),
+    ('O/U 3.5', 'Goals Over/Under', ('Over 3.5', 'Under 3.5'), ('Over', 'Under')),
+    ('BTTS', 'Both Teams Score', ('Yes', 'No'), ('Oui', 'Non')),
+)
+OUTCOMES = max(len(market[2]) for market in MARKETS)
+# (marché API, issue API) -> (indice du marché, indice de l'issue)
+_SLOTS = {(api, value): (m, o) for m, (_, api, values, _) in enumerate(MARKETS) for o, value in enumerate(values)}
+# Issues existantes de chaque marché (les autres cases restent NaN)
+_OUTCOME_MASK = np.array([[o < len(market[2]) for o in range(OUTCOMES)] for market in MARKETS])
+
+SHIN_ITERATIONS = 50
+
+
+@dataclass(slots=True)
+class MarketOutcome:
+    market: str
+    outcome: str
+    best_odds: float
+    bookmaker: str
+    fair: Optional[float]           # Probabilité de consensus sans marge
+    model: Optional[float]          # Probabilité du modèle de buts
+    edge: Optional[float]           # p_modèle × cote_max - 1
+
+
+@dataclass(slots=True)
+class MarketSummary:
+    bookmakers: int
+    overround: Dict[str, float]     # Marge moyenne des livres complets, par marché
+    outcomes: List[MarketOutcome]
+    value: List[MarketOutcome]      # Issues dans la fourchette de cotes avec edge >= VALUE_MIN_EDGE
+
+    def in_range(self, min_odds: float, max_odds: float) -> bool:
+        """Au moins une issue dont la meilleure cote est dans la fourchette visée."""
+        return any(min_odds <= outcome.best_odds <= max_odds for outcome in self.outcomes)
+
+
+def _model_probabilities(model) -> np.ndarray:
+    """Probabilités du modèle de buts dans la grille marché × issue (NaN hors modèle)."""
+    grid = np.full((len(MARKETS), OUTCOMES), np.nan)
+    if model is None:
+        return grid
+    grid[0, :3] = (model.home, model.draw, model.away)
+    for m, line in ((1, '1.5'), (2, '2.5'), (3, '3.5')):
+        if line in model.over:
+            grid[m, :2] = (model.over[line], 1 - model.over[line])
+    grid[4, :2] = (model.btts, 1 - model.btts)
+    return grid
+
+
+def shin_probabilities(implied: np.ndarray) -> np.ndarray:
+    """
+    Probabilités de Shin de chaque livre (axe des issues = 2, NaN hors marché).
+
+    p_i(z) = (√(z² + 4(1-z)·q_i²/S) - z) / (2(1-z)), avec z (part des parieurs
+    informés) tel que Σ p_i = 1 : bissection menée en parallèle sur tous les livres.
+    """
+    total = np.nansum(implied, axis=2, keepdims=True)
+    low = np.zeros_like(total)
+    high = np.full_like(total, 0.5)
+    for _ in range(SHIN_ITERATIONS):
+        z = (low + high) / 2
+        probabilities = (np.sqrt(z ** 2 + 4 * (1 - z) * implied ** 2 / total) - z) / (2 * (1 - z))
+        too_high = np.nansum(probabilities, axis=2, keepdims=True) > 1
+        low = np.where(too_high, z, low)
+        high = np.where(too_high, high, z)
+    z = (low + high) / 2
+    return (np.sqrt(z ** 2 + 4 * (1 - z) * implied ** 2 / total) - z) / (2 * (1 - z))
+
+
+class ValueDetector:
+    """Tableau des cotes du jour, probabilités sans marge et value bets face au modèle."""
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.last_report = {}
+
+    def build(self, matches: List[Dict]) -> Tuple[np.ndarray, List[List[str]]]:
+        """
+        Lit les cotes des matchs dans un tableau [match, marché, issue, bookmaker].
+
+        Returns:
+            (cotes, noms des bookmakers de chaque match)
+        """
+        width = max((len(match.get('odds') or []) for match in matches), default=0)
+        odds = np.full((len(matches), len(MARKETS), OUTCOMES, max(width, 1)), np.nan)
+        bookmakers = []
+        for f, match in enumerate(matches):
+            names = []
+            for b, book in enumerate(match.get('odds') or []):
+                names.append(book.bookmaker)
+                for market in book.markets:
+                    for value, odd in market.values:
+                        slot = _SLOTS.get((market.name, value))
+                        if slot is None:
+                            continue
+                        try:
+                            price = float(odd)
+                        except ValueError:
+                            continue
+                        if price > 1:
+                            odds[f, slot[0], slot[1], b] = price
+            bookmakers.append(names)
+        return odds, bookmakers
+
+    def evaluate(self, odds: np.ndarray, model: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Calculs vectorisés sur le tableau des cotes.
+
+        Args:
+            odds: Cotes [match, marché, issue, bookmaker]
+            model: Probabilités du modèle [match, marché, issue]
+
+        Returns:
+            best, best_index, overround, fair, edge ([match, marché(, issue)])
+        """
+        present = ~np.isnan(odds)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            best = np.where(present, odds, -np.inf).max(axis=3)
+            best_index = np.where(present, odds, -np.inf).argmax(axis=3)
+            best[np.isinf(best)] = np.nan
+
+            # Livre complet : toutes les issues du marché cotées par le bookmaker
+            complete = (present | ~_OUTCOME_MASK[None, :, :, None]).all(axis=2) & present.any(axis=2)
+            implied = np.where(complete[:, :, None, :], 1 / odds, np.nan)
+            books = complete.sum(axis=2)
+            margins = np.where(complete, np.nansum(implied, axis=2) - 1, 0)
+            overround = np.where(books > 0, margins.sum(axis=2) / np.maximum(books, 1), np.nan)
+
+            if self.config.ODDS_DEMARGIN == 'multiplicative':
+                per_book = implied / np.nansum(implied, axis=2, keepdims=True)
+            else:
+                per_book = shin_probabilities(implied)
+            fair = np.nansum(per_book, axis=3) / np.maximum(books, 1)[:, :, None]
+            fair = np.where((books > 0)[:, :, None] & _OUTCOME_MASK[None], fair, np.nan)
+            fair = fair / np.nansum(fair, axis=2, keepdims=True)
+
+            edge = model * best - 1
+        return {'best': best, 'best_index': best_index, 'overround': overround, 'fair': fair, 'edge': edge}
+
+    def annotate(self, matches: List[Dict]) -> int:
+        """Ajoute match['market'] aux matchs cotés ; renvoie leur nombre."""
+        priced = [match for match in matches if match.get('odds')]
+        self.last_report = {'priced': len(priced), 'value': 0}
+        if not priced:
+            return 0
+
+        odds, bookmakers = self.build(priced)
+        model = np.stack([_model_probabilities(match.get('model')) for match in priced])
+        result = self.evaluate(odds, model)
+        min_edge, min_odds, max_odds = self.config.VALUE_MIN_EDGE, self.config.MIN_ODDS, self.config.MAX_ODDS
+
+        for f, match in enumerate(priced):
+            outcomes = []
+            for m, (label, _, values, short) in enumerate(MARKETS):
+                for o in range(len(values)):
+                    best = result['best'][f, m, o]
+                    if np.isnan(best):
+                        continue
+                    fair, model_p, edge = result['fair'][f, m, o], model[f, m, o], result['edge'][f, m, o]
+                    outcomes.append(MarketOutcome(
+                        market=label, outcome=short[o], best_odds=round(float(best), 2),
+                        bookmaker=bookmakers[f][result['best_index'][f, m, o]],
+                        fair=None if np.isnan(fair) else round(float(fair), 3),
+                        model=None if np.isnan(model_p) else round(float(model_p), 3),
+                        edge=None if np.isnan(edge) else round(float(edge), 3),
+                    ))
+            value = [outcome for outcome in outcomes if outcome.edge is not None and outcome.edge >= min_edge
+                     and min_odds <= outcome.best_odds <= max_odds]
+            match['market'] = MarketSummary(
+                bookmakers=len(bookmakers[f]),
+                overround={label: round(float(result['overround'][f, m]), 3)
+                           for m, (label, *_) in enumerate(MARKETS) if not np.isnan(result['overround'][f, m])},
+                outcomes=outcomes,
+                value=sorted(value, key=lambda outcome: -outcome.edge),
+            )
+            self.last_report['value'] += len(value)
+
+        print(f"💰 Marché: {len(priced)} match(s) coté(s), {self.last_report['value']} value bet(s) "
+              f"(edge ≥ {min_edge:.0%}, cotes {min_odds}-{max_odds})")
+        return len(priced)
+
+    def prefilter(self, matches: List[Dict]) -> List[Dict]:
+        """
+        Écarte les matchs cotés sans aucune issue dans la fourchette MIN_ODDS-MAX_ODDS
+        (aucun pari possible). Les matchs non cotés sont conservés.
+        """
+        if not self.config.ODDS_PREFILTER:
+            return matches
+        min_odds, max_odds = self.config.MIN_ODDS, self.config.MAX_ODDS
+        kept = [match for match in matches
+                if match.get('market') is None or match['market'].in_range(min_odds, max_odds)]
+        if len(kept) < len(matches):
+            print(f"💰 {len(matches) - len(kept)} match(s) écarté(s): aucune cote entre {min_odds} et {max_odds}")
+        return kept
+
+
+# Détecteur partagé du processus
+value_detector = ValueDetector()
@@ -1,9 +1,19 @@
+import argparse
 import sys
 sys.path.insert(0, 'src')
 from performance_tracker import PerformanceTracker
+from backtester import PickTable
+from staking import DEFAULT_STRATEGIES, INITIAL_BANKROLL, StakingSimulator
 from telegram_sender import TelegramSender
 from datetime import datetime, timedelta
 from config import Config
+from tracing import tracer
+from profiling import add_profile_option, profiled
+
+# Stratégies de mise simulées dans le rapport (cf. staking)
+WEEKLY_STRATEGIES = tuple(strategy for strategy in DEFAULT_STRATEGIES
+                          if strategy.name in ('Mise fixe 1u', 'Kelly 1/4', 'Kelly 1/2 plafonné 5%'))
+
 
 class WeeklyReportGenerator:
     def __init__(self):
@@ -89,7 +99,8 @@ class WeeklyReportGenerator:
             'by_competition': by_competition,
             'best_bet': best_bet,
             'current_streak': current_streak,
-            'streak_type': streak_type
+            'streak_type': streak_type,
+            'staking': StakingSimulator(PickTable(predictions)).simulate(WEEKLY_STRATEGIES) if completed else []
         }
 
     def format_report(self, stats):
@@ -151,6 +162,14 @@ Période: {week_start} - {week_end}
                 comp_short = comp[:30] + "..." if len(comp) > 30 else comp
                 report += f"\n{emoji} *{comp_short}*: {data['wins']}/{data['total']} ({win_rate_comp:.0f}%)"
 
+        # Gains simulés selon la stratégie de mise
+        if stats.get('staking'):
+            report += f"\n\n━━━━━━━━━━━━━━━━━━━━━━\n\n💰 *BANKROLL SIMULÉE* (départ {INITIAL_BANKROLL:g}u)\n"
+            for result in stats['staking']:
+                emoji = "📈" if result['profit'] >= 0 else "📉"
+                roi = f" (ROI {result['roi'] * 100:+.1f}%)" if result['roi'] is not None else ""
+                report += f"\n{emoji} *{result['strategy']}*: {result['profit']:+.1f}u{roi}"
+
         # Meilleur pari
         if stats['best_bet']:
             report += f"""
@@ -186,11 +205,14 @@ Période: {week_start} - {week_end}
         print("📊 Génération du rapport hebdomadaire...")
 
         # Récupérer les prédictions de la semaine
-        predictions = self.get_last_week_predictions()
+        with tracer.span('load') as span:
+            predictions = self.get_last_week_predictions()
+            span.set(predictions=len(predictions))
         print(f"   📈 {len(predictions)} pronostics cette semaine")
 
         # Calculer les stats
-        stats = self.calculate_weekly_stats(predictions)
+        with tracer.span('stats'):
+            stats = self.calculate_weekly_stats(predictions)
 
         # Formater le rapport
         report = self.format_report(stats)
@@ -210,5 +232,9 @@ Période: {week_start} - {week_end}
 
 if __name__ == "__main__":
     # Test
-    generator = WeeklyReportGenerator()
-    generator.generate_and_send()
+    parser = argparse.ArgumentParser(description="Rapport hebdomadaire")
+    add_profile_option(parser)
+    args = parser.parse_args()
+    with tracer.run('weekly_report'), profiled('weekly_report', args.profile):
+        generator = WeeklyReportGenerator()
+        generator.generate_and_send()